@@ -0,0 +1,259 @@
+"""准入控制
+
+限制每个 worker 进程内搜索 / 对话的并发数（全局 + 单个信息源），超出时进入有界等待队列，
+队列已满或等待超时立即拒绝（ServiceOverloadedError → 503 + Retry-After），
+避免突发流量把所有请求一起拖到超时。
+
+使用方式：
+    async with admit("search", source_config_ids):
+        ...
+
+    # 流式响应：在生成器结束时释放
+    ticket = await acquire_admission("chat", source_config_ids)
+    ...
+    ticket.release()
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Iterable, Optional, Tuple
+
+from dataflow.core.config.settings import get_settings
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.exceptions import ServiceOverloadedError
+from dataflow.utils import get_logger
+
+logger = get_logger("api.admission")
+
+
+class AdmissionTicket:
+    """一次准入许可（release 可重复调用）"""
+
+    def __init__(self, controller: Optional["AdmissionController"], sources: Tuple[str, ...]) -> None:
+        self.controller = controller
+        self.sources = sources
+        self.released = controller is None
+
+    def release(self) -> None:
+        """归还许可"""
+        if self.released:
+            return
+        self.released = True
+        self.controller._release(self.sources)
+
+
+class AdmissionController:
+    """单个接口的准入控制器"""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        per_source_concurrency: int = 0,
+        queue_size: int = 32,
+        queue_timeout: float = 2.0,
+        retry_after: int = 2,
+    ) -> None:
+        """
+        初始化准入控制器
+
+        Args:
+            name: 接口名称（指标标签）
+            max_concurrency: 最大并发数
+            per_source_concurrency: 单个信息源最大并发数（0=不限）
+            queue_size: 排队请求数上限
+            queue_timeout: 排队最长等待时间（秒）
+            retry_after: 拒绝时建议的重试等待（秒）
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.per_source_concurrency = per_source_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self.in_flight = 0
+        self.per_source: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[Tuple[str, ...], asyncio.Future]] = deque()
+
+        registry = get_metrics_registry()
+        self._in_flight_gauge = registry.gauge(
+            "dataflow_admission_in_flight", "准入控制：执行中的请求数", ["endpoint"]
+        )
+        self._queue_gauge = registry.gauge(
+            "dataflow_admission_queue_depth", "准入控制：排队中的请求数", ["endpoint"]
+        )
+        self._rejected = registry.counter(
+            "dataflow_admission_rejected", "准入控制：拒绝的请求数", ["endpoint", "reason"]
+        )
+        self._wait_seconds = registry.histogram(
+            "dataflow_admission_wait_seconds", "准入控制：排队等待耗时", ["endpoint"]
+        )
+
+    # ============ 计数 ============
+
+    def _can_admit(self, sources: Tuple[str, ...]) -> bool:
+        if self.in_flight >= self.max_concurrency:
+            return False
+        if self.per_source_concurrency > 0:
+            return all(self.per_source.get(s, 0) < self.per_source_concurrency for s in sources)
+        return True
+
+    def _take(self, sources: Tuple[str, ...]) -> None:
+        self.in_flight += 1
+        for source in sources:
+            self.per_source[source] = self.per_source.get(source, 0) + 1
+        self._in_flight_gauge.set(self.in_flight, endpoint=self.name)
+
+    def _release(self, sources: Tuple[str, ...]) -> None:
+        self.in_flight -= 1
+        for source in sources:
+            remaining = self.per_source.get(source, 0) - 1
+            if remaining > 0:
+                self.per_source[source] = remaining
+            else:
+                self.per_source.pop(source, None)
+        self._in_flight_gauge.set(self.in_flight, endpoint=self.name)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """按到达顺序放行可执行的排队请求（信息源已满的请求不阻塞其他信息源）"""
+        if not self._waiters:
+            return
+        remaining: Deque[Tuple[Tuple[str, ...], asyncio.Future]] = deque()
+        while self._waiters:
+            sources, future = self._waiters.popleft()
+            if future.done():
+                continue
+            if self._can_admit(sources):
+                self._take(sources)
+                future.set_result(None)
+            else:
+                remaining.append((sources, future))
+        self._waiters = remaining
+        self._queue_gauge.set(len(self._waiters), endpoint=self.name)
+
+    def _reject(self, reason: str) -> ServiceOverloadedError:
+        self._rejected.inc(endpoint=self.name, reason=reason)
+        logger.warning(
+            f"🚦 准入拒绝: endpoint={self.name}, reason={reason}, "
+            f"in_flight={self.in_flight}, queue={len(self._waiters)}"
+        )
+        return ServiceOverloadedError(
+            f"服务繁忙（{self.name}），请 {self.retry_after}s 后重试",
+            retry_after=self.retry_after,
+        )
+
+    # ============ 对外接口 ============
+
+    async def acquire(self, source_config_ids: Iterable[str] = ()) -> AdmissionTicket:
+        """
+        获取准入许可
+
+        Args:
+            source_config_ids: 请求涉及的信息源ID
+
+        Returns:
+            AdmissionTicket（使用完毕必须 release）
+
+        Raises:
+            ServiceOverloadedError: 队列已满或排队超时
+        """
+        sources = tuple(sorted({s for s in source_config_ids if s}))
+        if self._can_admit(sources):
+            self._take(sources)
+            return AdmissionTicket(self, sources)
+
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((sources, future))
+        self._queue_gauge.set(len(self._waiters), endpoint=self.name)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # 超时/取消与放行同时发生：归还已分配的许可
+                self._release(sources)
+            else:
+                self._waiters = deque(w for w in self._waiters if w[1] is not future)
+                self._queue_gauge.set(len(self._waiters), endpoint=self.name)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject("timeout") from None
+        finally:
+            self._wait_seconds.observe(time.monotonic() - start, endpoint=self.name)
+
+        return AdmissionTicket(self, sources)
+
+    def stats(self) -> Dict[str, object]:
+        """当前状态"""
+        return {
+            "endpoint": self.name,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "per_source": dict(self.per_source),
+        }
+
+
+# 全局实例（按接口名）
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(name: str) -> Optional[AdmissionController]:
+    """
+    获取接口的准入控制器（进程内单例）
+
+    Args:
+        name: 接口名称（search / chat）
+
+    Returns:
+        AdmissionController实例（未启用准入控制时返回 None）
+    """
+    settings = get_settings()
+    if not settings.admission_enabled:
+        return None
+
+    controller = _controllers.get(name)
+    if controller is None:
+        max_concurrency = (
+            settings.admission_chat_concurrency if name == "chat" else settings.admission_search_concurrency
+        )
+        controller = AdmissionController(
+            name,
+            max_concurrency=max_concurrency,
+            per_source_concurrency=settings.admission_per_source_concurrency,
+            queue_size=settings.admission_queue_size,
+            queue_timeout=settings.admission_queue_timeout,
+            retry_after=settings.admission_retry_after,
+        )
+        _controllers[name] = controller
+    return controller
+
+
+async def acquire_admission(name: str, source_config_ids: Iterable[str] = ()) -> AdmissionTicket:
+    """获取准入许可（未启用准入控制时返回空许可）"""
+    controller = get_admission_controller(name)
+    if controller is None:
+        return AdmissionTicket(None, ())
+    return await controller.acquire(source_config_ids)
+
+
+@asynccontextmanager
+async def admit(name: str, source_config_ids: Iterable[str] = ()) -> AsyncIterator[AdmissionTicket]:
+    """准入控制上下文（退出时释放许可）"""
+    ticket = await acquire_admission(name, source_config_ids)
+    try:
+        yield ticket
+    finally:
+        ticket.release()
+
+
+def reset_admission_controllers() -> None:
+    """清空控制器（配置变更 / 测试）"""
+    _controllers.clear()
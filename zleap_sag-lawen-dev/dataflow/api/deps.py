@@ -9,6 +9,7 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dataflow.core.storage.mysql import get_mysql_client
+from dataflow.db import get_read_session_factory
 from dataflow.exceptions import DatabaseError
 
 
@@ -34,3 +35,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     finally:
         await session.close()
 
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取只读数据库会话（仅用于不写入的接口：搜索、统计）
+
+    与搜索引擎共用 dataflow.db.get_read_session_factory：配置了只读副本时走副本，否则回退主库
+    """
+    session = get_read_session_factory()()
+
+    try:
+        yield session
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise DatabaseError(f"数据库操作失败: {e}") from e
+    finally:
+        # 只读会话不提交，关闭时回滚未结束的事务
+        await session.close()
@@ -3,16 +3,18 @@
 FastAPI 应用入口，配置路由、中间件、全局异常处理
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from dataflow import __version__
 from dataflow.api.middleware import LoggingMiddleware, TimingMiddleware
+from dataflow.api.warmup import WarmupState, run_warmup
 from dataflow.api.routers import (
     chat,
     documents,
@@ -24,7 +26,17 @@ from dataflow.api.routers import (
 )
 from dataflow.api.schemas.common import ErrorResponse
 from dataflow.core.config.settings import get_settings
-from dataflow.exceptions import DataFlowError
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.exceptions import DataFlowError, ServiceOverloadedError
+
+
+def _log_purge_resume(task: "asyncio.Task") -> None:
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        print(f"⚠️ 续跑清理任务失败: {task.exception()}")
+    elif task.result():
+        print(f"🗑️ 已续跑完成 {task.result()} 个清理任务")
 
 
 @asynccontextmanager
@@ -40,9 +52,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     print(f"   - Elasticsearch: {settings.elasticsearch_url}")
     print(f"   - Redis: {settings.redis_host}:{settings.redis_port}")
 
+    # 续跑上次中断的数据清理任务（删除信息源/文档）
+    from dataflow.api.services.purge_service import resume_purge_tasks
+
+    purge_resume = asyncio.create_task(resume_purge_tasks())
+    purge_resume.add_done_callback(_log_purge_resume)
+
+    # 后台预热分词器、提示词模板与连接池，完成后 /ready 才返回就绪
+    app.state.warmup = WarmupState()
+    warmup = None
+    if settings.warmup_enabled:
+        warmup = asyncio.create_task(run_warmup(app.state.warmup))
+    else:
+        app.state.warmup.ready = True
+
     yield
 
+    for background in (purge_resume, warmup):
+        if background is not None and not background.done():
+            background.cancel()
+
     # 关闭时清理
+    from dataflow.core.ai.tokensize import shutdown_tokenizer_pool
+
+    shutdown_tokenizer_pool()
     print("👋 DataFlow API 关闭...")
 
 
@@ -89,6 +122,23 @@ async def dataflow_exception_handler(request: Request, exc: DataFlowError):
     )
 
 
+@app.exception_handler(ServiceOverloadedError)
+async def overloaded_exception_handler(request: Request, exc: ServiceOverloadedError):
+    """过载异常处理（准入控制拒绝）"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(int(exc.retry_after or 1))},
+        content=ErrorResponse(
+            success=False,
+            error={
+                "code": "SERVICE_OVERLOADED",
+                "message": str(exc),
+                "details": None,
+            },
+        ).model_dump(),
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """参数验证异常处理"""
@@ -155,6 +205,31 @@ async def health_check():
     }
 
 
+# 就绪检查
+@app.get("/ready", tags=["系统"])
+async def readiness_check(request: Request):
+    """就绪检查（启动预热完成前返回 503，供负载均衡/探针摘流）"""
+    state = getattr(request.app.state, "warmup", None)
+    if state is None or not state.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=state.to_dict() if state is not None else {"status": "warming_up"},
+        )
+    return state.to_dict()
+
+
+# Prometheus 指标
+@app.get("/metrics", tags=["系统"], include_in_schema=False)
+async def metrics():
+    """Prometheus 指标（文本格式 0.0.4）"""
+    if not get_settings().metrics_enabled:
+        return PlainTextResponse("metrics disabled\n", status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(
+        get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # 首页
 @app.get("/", tags=["系统"])
 async def root():
@@ -166,6 +241,7 @@ async def root():
         "docs": "/api/docs",
         "redoc": "/api/redoc",
         "health": "/health",
+        "ready": "/ready",
         "features": {
             "source_management": "信息源配置管理",
             "custom_entity_types": "自定义实体维度",
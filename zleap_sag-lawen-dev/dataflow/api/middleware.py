@@ -1,38 +1,96 @@
 """中间件
 
 提供请求日志、性能监控等功能
+
+均为纯 ASGI 中间件：不经过 BaseHTTPMiddleware 的任务组与响应体转发，
+流式响应（SSE）逐块直通，请求处理的协程不会被额外包一层。
 """
 
 import time
-from typing import Callable
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from dataflow.core.config import get_settings
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.utils import get_logger
+
+logger = get_logger("api.middleware")
+
+
+class TimingMiddleware:
+    """性能计时中间件（记录耗时指标并写入 X-Process-Time 响应头）"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+        start_time = time.perf_counter()
+        status = "error"
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                duration = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str(duration).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    """性能计时中间件"""
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _observe_request(scope, time.perf_counter() - start_time, status)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        response = await call_next(request)
-        duration = time.time() - start_time
 
-        response.headers["X-Process-Time"] = str(duration)
-        return response
+def _observe_request(scope: Scope, duration: float, status: str) -> None:
+    """记录 HTTP 请求耗时（按路由模板聚合，避免路径参数导致标签膨胀）"""
+    if not get_settings().metrics_enabled:
+        return
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    get_metrics_registry().histogram(
+        "dataflow_http_request_duration_seconds",
+        "HTTP 请求耗时（秒）",
+        ["method", "route", "status"],
+    ).observe(duration, method=scope["method"], route=path, status=status)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """请求日志中间件"""
+class LoggingMiddleware:
+    """请求日志中间件（每个请求结束时输出一行）"""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # 记录请求
-        print(f"📥 {request.method} {request.url.path}")
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # 记录响应
-        print(f"📤 {request.method} {request.url.path} - {response.status_code}")
+        start_time = time.perf_counter()
+        status: Optional[int] = None
 
-        return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            logger.info(
+                f"📤 {scope['method']} {scope['path']} - {status or 'error'} ({duration_ms:.1f}ms)",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round(duration_ms, 1),
+                },
+            )
@@ -10,7 +10,9 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
+from dataflow.api.admission import acquire_admission
 from dataflow.api.deps import get_db
 from dataflow.api.schemas.chat import ChatFeedback, ChatRequest
 from dataflow.api.schemas.common import SuccessResponse
@@ -55,6 +57,8 @@ async def chat_message(
     - content: 回答内容（逐字输出）
     - done: 完成（包含统计信息）
     - error: 错误信息
+
+    **过载保护**：并发已满且排队超时时返回 503（带 Retry-After）
     """
     from dataflow.core.agent.researcher import ResearcherAgent
 
@@ -77,6 +81,9 @@ async def chat_message(
     if request.context:
         context_list = [msg.model_dump() for msg in request.context]
 
+    # 准入控制（许可持有到流式响应结束）
+    ticket = await acquire_admission("chat", request.source_config_ids)
+
     # 创建 Agent
     try:
         agent = ResearcherAgent(
@@ -85,6 +92,7 @@ async def chat_message(
             conversation_history=context_list,
         )
     except Exception as e:
+        ticket.release()
         logger.error(f"创建 ResearcherAgent 失败: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,8 +118,10 @@ async def chat_message(
                 "content": f"执行失败：{str(e)}"
             }
             yield f"data: {json.dumps(error_chunk, ensure_ascii=False)}\n\n"
+        finally:
+            ticket.release()
 
-    # 返回 SSE 流
+    # 返回 SSE 流（生成器未启动即断开时由后台任务兜底释放许可）
     return StreamingResponse(
         generate(),
         media_type="text/event-stream",
@@ -119,7 +129,8 @@ async def chat_message(
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",  # 禁用 nginx 缓冲
-        }
+        },
+        background=BackgroundTask(ticket.release),
     )
 
 
@@ -23,6 +23,8 @@ from dataflow.api.deps import get_db
 from dataflow.api.schemas.common import PaginatedResponse, SuccessResponse
 from dataflow.api.schemas.document import DocumentResponse, DocumentUploadResponse, DocumentUpdate, ArticleSectionResponse, SourceEventResponse
 from dataflow.api.services.document_service import DocumentService
+from dataflow.api.services.purge_service import run_purge_task
+from dataflow.exceptions import DuplicateDocumentError, UploadTooLargeError
 
 router = APIRouter()
 
@@ -73,13 +75,18 @@ async def upload_document(
             detail=f"不支持的文件类型: {file_ext}。支持的类型: {', '.join(allowed_extensions)}",
         )
 
-    # 上传文件（立即返回）
-    result = await service.upload_document(
-        source_config_id=source_config_id,
-        file=file,
-        background=background,
-        auto_process=auto_process,
-    )
+    # 上传文件（流式落盘 + 同源去重，立即返回）
+    try:
+        result = await service.upload_document(
+            source_config_id=source_config_id,
+            file=file,
+            background=background,
+            auto_process=auto_process,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)) from e
+    except DuplicateDocumentError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
 
     # 🆕 如果提供了实体类型配置，批量创建文档专属实体类型
     if entity_types and result.article_id:
@@ -151,37 +158,39 @@ async def upload_multiple_documents(
     """
     service = DocumentService(db)
 
-    results = []
-    for file in files:
-        try:
-            result = await service.upload_document(
-                source_config_id=source_config_id,
-                file=file,
-                background=background,
-                auto_process=auto_process,
-            )
-            results.append(result)
-
-            # 如果启用自动处理，添加后台任务
-            if auto_process and result.article_id:
-                background_tasks.add_task(
-                    service.process_document_async,
-                    article_id=result.article_id,
-                    source_config_id=source_config_id,
-                    file_path=result.file_path,
-                    background=background,
-                )
+    # 文件并发落盘，单个文件失败（过大 / 重复）不影响其他文件
+    outcomes = await service.upload_documents(
+        source_config_id=source_config_id,
+        files=files,
+        background=background,
+        auto_process=auto_process,
+    )
 
-        except Exception as e:
-            # 记录错误但继续处理其他文件
+    results = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, Exception):
             results.append(
                 DocumentUploadResponse(
                     filename=file.filename or "unknown",
                     file_path="",
                     success=False,
-                    message=str(e),
+                    message=str(outcome),
                 )
             )
+            continue
+
+        results.append(outcome)
+
+        # 如果启用自动处理，添加后台任务
+        if auto_process and outcome.article_id:
+            background_tasks.add_task(
+                service.process_document_async,
+                article_id=outcome.article_id,
+                source_config_id=source_config_id,
+                file_path=outcome.file_path,
+                task_id=outcome.task_id,
+                background=background,
+            )
 
     return SuccessResponse(
         data=results,
@@ -287,23 +296,25 @@ async def get_document(
 @router.delete("/documents/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     article_id: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
     删除文档
 
     **注意**：
-    - 会级联删除所有相关数据
-    - 包括文章片段、事项、实体关联等
+    - 文档立即标记为 DELETING
+    - 文章片段、事项、实体关联、ES 索引等数据由后台任务分批清理（任务类型 document_purge）
     - 此操作不可恢复
     """
     service = DocumentService(db)
-    success = await service.delete_document(article_id)
-    if not success:
+    task_id = await service.delete_document(article_id)
+    if not task_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"文档不存在: {article_id}",
         )
+    background_tasks.add_task(run_purge_task, task_id)
 
 
 @router.get(
@@ -3,20 +3,30 @@
 提供 Load + Extract + Search 的统一调用接口
 """
 
-from typing import List, Optional
+import asyncio
+import contextlib
+import json
+import time
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 from dataflow import DataFlowEngine, ExtractBaseConfig, DocumentLoadConfig, SearchBaseConfig
-from dataflow.api.deps import get_db
+from dataflow.api.admission import acquire_admission, admit
+from dataflow.api.deps import get_db, get_read_db
 from dataflow.api.schemas.common import SuccessResponse, TaskStatusResponse
 from dataflow.api.schemas.pipeline import PipelineRequest, PipelineResponse
 from dataflow.api.services.pipeline_service import PipelineService
+from dataflow.db import get_read_session_factory
+from dataflow.modules.search.config import SearchFilters
+from dataflow.utils import get_logger
 
 router = APIRouter()
+logger = get_logger("api.pipeline")
 
 
 @router.post(
@@ -306,6 +316,12 @@ class SearchRequest(BaseModel):
     pagerank_max_iterations: Optional[int] = None
     rrf_k: Optional[int] = None
 
+    # === 结构化过滤 ===
+    filters: Optional[SearchFilters] = None  # 事项时间范围、按实体类型的数值范围
+
+    # === 返回字段 ===
+    enrich_projection: Optional[Literal["minimal", "standard", "full"]] = None  # 事项字段投影（默认 full）
+
 
 @router.post(
     "/pipeline/search",
@@ -313,7 +329,7 @@ class SearchRequest(BaseModel):
 )
 async def run_search_only(
     request: SearchRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     只执行 Search 阶段
@@ -326,7 +342,120 @@ async def run_search_only(
     - query: 查询文本
     - recall_mode: 召回模式，可选 "fuzzy"（ES精确搜索，默认）或 "exact"（MySQL精确/前缀搜索）
     - 以及 Recall/Expand/Rerank 的其他配置参数
+    - filters: 结构化过滤，如 {"time_range": {"start": "2023-01-01"}, "entity_values": [{"entity_type": "amount", "min_value": 1000000}]}
+    - enrich_projection: 事项返回字段，"minimal"（基础字段）/ "standard"（+正文、实体、来源名称）/ "full"（+原文引用，默认）
+
+    **过载保护**：并发已满且排队超时时返回 503（带 Retry-After）
+    """
+    source_config_ids = _resolve_source_config_ids(request)
+
+    # 准入控制（按 worker 全局 + 信息源限制并发）
+    async with admit("search", source_config_ids):
+        return await _run_search(request, source_config_ids, db)
+
+
+@router.post("/pipeline/search/stream")
+async def run_search_stream(request: SearchRequest):
+    """
+    只执行 Search 阶段（流式返回各阶段结果）
+
+    参数同 `/pipeline/search`。召回完成即推送候选事项，前端可先行展示，
+    重排与补全完成后再推送最终结果。
+
+    **流式输出格式（SSE）**：
+    ```
+    data: {"type": "recall", "entities": [...], "candidates": [{"id": "...", "title": "...", "summary": "...", "score": 0.82}]}
+    data: {"type": "expand", "jump": 1, "events_found": 40, "events_processed": 20, "keys_count": 12, ...}
+    data: {"type": "rerank", "count": 10}
+    data: {"type": "result", "data": {...}}
+    data: {"type": "done", "duration": 3.21}
+    ```
+
+    **type 类型**：
+    - recall: 召回实体与候选事项（score 为召回阶段临时分数，最终顺序以 result 为准）
+    - expand: 每跳扩展进度
+    - rerank: 重排完成
+    - result: 最终结果（与 `/pipeline/search` 的 data 相同）
+    - done: 完成
+    - error: 错误信息
+
+    **取消**：客户端断开连接时立即取消剩余阶段（不再发起 ES / LLM 请求）
+
+    **过载保护**：并发已满且排队超时时返回 503（带 Retry-After）
     """
+    source_config_ids = _resolve_source_config_ids(request)
+
+    # 准入控制（许可持有到流式响应结束）
+    ticket = await acquire_admission("search", source_config_ids)
+
+    try:
+        search_config = _build_search_config(request, source_config_ids)
+    except Exception:
+        ticket.release()
+        raise
+
+    progress: asyncio.Queue = asyncio.Queue()
+    search_config.progress_callback = progress.put
+
+    async def generate():
+        """SSE 流式生成器（生成器被关闭 / 取消时一并取消搜索任务）"""
+        start = time.perf_counter()
+        engine = DataFlowEngine(source_config_id=source_config_ids[0])
+        search_task = asyncio.create_task(engine.search_async(search_config))
+        getter = None
+        try:
+            # 搜索进行中：边产生边推送阶段事件
+            while not search_task.done():
+                getter = asyncio.ensure_future(progress.get())
+                await asyncio.wait({getter, search_task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield _sse(getter.result())
+                else:
+                    getter.cancel()
+            while not progress.empty():
+                yield _sse(progress.get_nowait())
+            search_task.result()
+
+            async with get_read_session_factory()() as db:
+                data = await _build_search_response(engine.get_result(), db, request.enrich_projection)
+            yield _sse({"type": "result", "data": data})
+            yield _sse({"type": "done", "duration": round(time.perf_counter() - start, 3)})
+
+        except HTTPException as e:
+            yield _sse({"type": "error", "content": e.detail})
+        except Exception as e:
+            logger.error(f"流式搜索失败: {e}", exc_info=True)
+            yield _sse({"type": "error", "content": f"搜索失败：{str(e)}"})
+        finally:
+            if getter is not None and not getter.done():
+                getter.cancel()
+            if not search_task.done():
+                search_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await search_task
+                logger.info(f"🛑 流式搜索已取消: query='{request.query}'")
+            ticket.release()
+
+    # 返回 SSE 流（生成器未启动即断开时由后台任务兜底释放许可）
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 禁用 nginx 缓冲
+        },
+        background=BackgroundTask(ticket.release),
+    )
+
+
+def _sse(chunk: dict) -> str:
+    """SSE 格式：data: {json}\n\n"""
+    return f"data: {json.dumps(chunk, ensure_ascii=False, default=str)}\n\n"
+
+
+def _resolve_source_config_ids(request: SearchRequest) -> List[str]:
+    """校验并统一为 source_config_ids 列表"""
     # 验证：至少提供一个 source_config_id 或 source_config_ids
     if not request.source_config_id and not request.source_config_ids:
         raise HTTPException(
@@ -335,12 +464,31 @@ async def run_search_only(
         )
 
     # 兼容处理：统一转为 source_config_ids
-    source_config_ids = request.source_config_ids if request.source_config_ids else [
-        request.source_config_id]
+    return request.source_config_ids if request.source_config_ids else [request.source_config_id]
+
+
+async def _run_search(
+    request: SearchRequest,
+    source_config_ids: List[str],
+    db: AsyncSession,
+):
+    """执行搜索并组装响应"""
     primary_source_config_id = source_config_ids[0]  # 用于创建引擎
 
     engine = DataFlowEngine(source_config_id=primary_source_config_id)
+    search_config = _build_search_config(request, source_config_ids)
+
+    # 使用 SearchBaseConfig，engine.search_async() 会自动添加 source_config_id 转换为 SearchConfig
+    await engine.search_async(search_config)
+
+    return SuccessResponse(
+        data=await _build_search_response(engine.get_result(), db, request.enrich_projection),
+        message="Search 完成",
+    )
+
 
+def _build_search_config(request: SearchRequest, source_config_ids: List[str]):
+    """将请求参数转换为 SearchConfig"""
     # 构建新的配置结构
     from dataflow.modules.search.config import RecallConfig, ExpandConfig, RerankConfig, RerankStrategy, RecallMode, SearchConfig
 
@@ -412,20 +560,19 @@ async def run_search_only(
                 rerank_dict[config_param] = value
 
     # 直接构建完整的 SearchConfig（包含 source_config_ids）
-    search_config = SearchConfig(
+    return SearchConfig(
         query=request.query,
         source_config_ids=source_config_ids,  # 传递多源支持
         enable_query_rewrite=request.enable_query_rewrite if request.enable_query_rewrite is not None else True,
         recall=RecallConfig(**recall_dict) if recall_dict else RecallConfig(),
         expand=ExpandConfig(**expand_dict) if expand_dict else ExpandConfig(),
         rerank=RerankConfig(**rerank_dict) if rerank_dict else RerankConfig(),
+        filters=request.filters or SearchFilters(),
     )
 
-    # 使用 SearchBaseConfig，engine.search_async() 会自动添加 source_config_id 转换为 SearchConfig
-    await engine.search_async(search_config)
-
-    result = engine.get_result()
 
+async def _build_search_response(result, db: AsyncSession, projection: Optional[str] = None) -> dict:
+    """补全事项（按投影加载实体、原文引用）并组装搜索响应数据，搜索失败时抛出 HTTPException"""
     # 打印调试信息
     print(f"🔍 搜索结果调试信息:")
     print(f"  - 任务整体状态: {result.status}")
@@ -438,9 +585,11 @@ async def run_search_only(
             print(f"  - data_full 长度: {len(result.search_result.data_full)}")
 
             # 扩展事项内容（补充实体和原文引用）
-            from dataflow.modules.search.enricher import EventEnricher
+            from dataflow.modules.search.enricher import EnrichProjection, EventEnricher
             enricher = EventEnricher(db)
-            events = await enricher.enrich_events(result.search_result.data_full)
+            events = await enricher.enrich_events(
+                result.search_result.data_full, projection or EnrichProjection.FULL
+            )
 
             # 从stats中提取clues（now from-to格式的详细线索列表）
             clues = result.search_result.stats.get(
@@ -482,10 +631,7 @@ async def run_search_only(
             if rerank_lines:
                 response_data["rerank_lines"] = rerank_lines
 
-            return SuccessResponse(
-                data=response_data,
-                message="Search 完成",
-            )
+            return response_data
         except Exception as e:
             print(f"❌ 数据处理错误: {e}")
             import traceback
@@ -513,7 +659,7 @@ class SummarizeRequest(BaseModel):
 @router.post("/pipeline/summarize")
 async def summarize_search_results(
     request: SummarizeRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     AI智能总结搜索结果（流式输出）
@@ -5,7 +5,7 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dataflow.api.deps import get_db
@@ -15,6 +15,7 @@ from dataflow.api.schemas.source import (
     SourceConfigResponse,
     SourceConfigUpdateRequest,
 )
+from dataflow.api.services.purge_service import run_purge_task
 from dataflow.api.services.source_service import SourceService
 
 router = APIRouter()
@@ -133,24 +134,26 @@ async def update_source(
 @router.delete("/sources/{source_config_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_source(
     source_config_id: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
     删除信息源
 
     **注意**：
-    - 会级联删除该信息源下的所有数据
-    - 包括文章、事项、实体等
+    - 信息源立即从列表和搜索中移除
+    - 文章、事项、实体、ES 索引等数据由后台任务分批清理（任务类型 source_purge，可在任务列表查看进度）
     - 此操作不可恢复
 
     **参数**：
     - source_config_id: 信息源ID
     """
     service = SourceService(db)
-    success = await service.delete_source(source_config_id)
-    if not success:
+    task_id = await service.delete_source(source_config_id)
+    if not task_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"信息源不存在: {source_config_id}",
         )
+    background_tasks.add_task(run_purge_task, task_id)
 
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from dataflow.api.deps import get_db
+from dataflow.api.deps import get_db, get_read_db
 from dataflow.api.schemas.common import PaginatedResponse, SuccessResponse, TaskStatusResponse
 from dataflow.api.services.pipeline_service import PipelineService
 
@@ -34,7 +34,7 @@ class TaskStatsResponse(BaseModel):
 
 @router.get("/tasks/stats", response_model=SuccessResponse[TaskStatsResponse])
 async def get_tasks_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     获取任务统计信息
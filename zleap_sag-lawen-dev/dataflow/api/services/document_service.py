@@ -1,18 +1,100 @@
 """文档服务"""
 
-import shutil
+import asyncio
+import hashlib
 import uuid
+from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import BinaryIO, List, Optional, Tuple, Union
 from datetime import datetime
 
 from fastapi import UploadFile
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dataflow.api.schemas.document import DocumentResponse, DocumentUploadResponse
+from dataflow.api.services.purge_service import PurgeService
+from dataflow.core.config.settings import get_settings
 from dataflow.db.models import Article, ArticleSection, SourceEvent, Task
+from dataflow.exceptions import DuplicateDocumentError, UploadTooLargeError
+from dataflow.utils import get_logger
+
+logger = get_logger("api.document_service")
+
+# 流式写入的分块大小（读取、哈希、写盘均按块进行，不占用事件循环）
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StoredUpload:
+    """已落盘的上传文件"""
+
+    file_id: str
+    filename: str
+    file_path: Path
+    size: int
+    content_hash: str
+
+
+def _write_chunk(handle: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    """哈希并写入一个分块（在线程池中执行）"""
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+def _remove_file(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+async def save_upload_stream(
+    file: UploadFile,
+    file_path: Path,
+    max_size: int = 0,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    流式保存上传文件（分块读写在线程池执行，边写边计算 SHA-256）
+
+    Args:
+        file: 上传文件
+        file_path: 保存路径
+        max_size: 最大字节数（0=不限），超出立即中止并删除已写入部分
+        chunk_size: 分块大小
+
+    Returns:
+        (文件大小, SHA-256 十六进制)
+
+    Raises:
+        UploadTooLargeError: 文件超过大小限制
+    """
+    # 已知大小时提前拒绝，不读取任何内容
+    if max_size and file.size is not None and file.size > max_size:
+        raise UploadTooLargeError(
+            f"文件过大: {file.filename}（{file.size} 字节，上限 {max_size} 字节）", max_size=max_size
+        )
+
+    digest = hashlib.sha256()
+    size = 0
+    handle = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size and size > max_size:
+                raise UploadTooLargeError(
+                    f"文件过大: {file.filename}（超过上限 {max_size} 字节）", max_size=max_size
+                )
+            await asyncio.to_thread(_write_chunk, handle, digest, chunk)
+    except BaseException:
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(_remove_file, file_path)
+        raise
+    await asyncio.to_thread(handle.close)
+    return size, digest.hexdigest()
 
 
 class DocumentService:
@@ -21,38 +103,60 @@ class DocumentService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def upload_document(
-        self,
-        source_config_id: str,
-        file: UploadFile,
-        background: Optional[str] = None,
-        auto_process: bool = True,
-    ) -> DocumentUploadResponse:
-        """上传文档（立即返回）"""
-        # 1. 创建上传目录
-        upload_dir = Path("./uploads") / source_config_id
-        upload_dir.mkdir(parents=True, exist_ok=True)
+    async def save_upload(self, source_config_id: str, file: UploadFile) -> StoredUpload:
+        """
+        保存上传文件到磁盘（不访问数据库，可并发调用）
+
+        Raises:
+            UploadTooLargeError: 文件超过 max_upload_size
+        """
+        settings = get_settings()
+        upload_dir = Path(settings.upload_dir) / source_config_id
+        await asyncio.to_thread(upload_dir.mkdir, parents=True, exist_ok=True)
 
-        # 2. 生成文件名
         file_ext = Path(file.filename or "unknown").suffix
         file_id = str(uuid.uuid4())
-        filename = f"{file_id}{file_ext}"
-        file_path = upload_dir / filename
+        file_path = upload_dir / f"{file_id}{file_ext}"
 
-        # 3. 保存文件
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        size, content_hash = await save_upload_stream(file, file_path, max_size=settings.max_upload_size)
+        return StoredUpload(
+            file_id=file_id,
+            filename=file.filename or "unknown",
+            file_path=file_path,
+            size=size,
+            content_hash=content_hash,
+        )
 
-        # 4. 创建占位 Article（status=PENDING）
+    async def register_upload(
+        self,
+        source_config_id: str,
+        stored: StoredUpload,
+        background: Optional[str] = None,
+        auto_process: bool = True,
+    ) -> DocumentUploadResponse:
+        """
+        为已保存的文件创建 Article / Task 记录
+
+        Raises:
+            DuplicateDocumentError: 同一信息源已存在相同内容的文档（包括并发上传时由唯一索引
+                判定的重复；已删除本次保存的文件）
+        """
+        # 1. 同源去重（在任何处理之前）
+        existing_id = await self._find_duplicate(source_config_id, stored.content_hash)
+        if existing_id:
+            await self._reject_duplicate(stored, existing_id)
+
+        # 2. 创建占位 Article（status=PENDING）
         article = Article(
-            id=file_id,
+            id=stored.file_id,
             source_config_id=source_config_id,
-            title=file.filename or "未命名文档",
+            title=stored.filename if stored.filename != "unknown" else "未命名文档",
             status="PENDING",
+            content_hash=stored.content_hash,
         )
         self.db.add(article)
 
-        # 5. 如果启用自动处理，创建任务记录
+        # 3. 如果启用自动处理，创建任务记录
         task_id = None
         if auto_process:
             task_id = str(uuid.uuid4())
@@ -63,31 +167,118 @@ class DocumentService:
                 progress=Decimal("0.00"),
                 message="文档上传成功，等待处理",
                 source_config_id=source_config_id,
-                article_id=file_id,
+                article_id=stored.file_id,
                 extra_data={
-                    "filename": file.filename,
-                    "file_path": str(file_path),
+                    "filename": stored.filename,
+                    "file_path": str(stored.file_path),
                     "background": background,
                 },
             )
             self.db.add(task)
 
-        await self.db.commit()
-
-        # 6. 立即返回（不等待处理）
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # 并发上传相同内容：唯一索引 uk_source_config_content_hash 拒绝后写入的一方
+            await self.db.rollback()
+            existing_id = await self._find_duplicate(source_config_id, stored.content_hash)
+            if not existing_id:
+                raise
+            await self._reject_duplicate(stored, existing_id)
+
+        # 4. 立即返回（不等待处理）
         message = "文档上传成功"
         if auto_process:
             message = "文档上传成功，正在后台处理..."
 
         return DocumentUploadResponse(
-            filename=file.filename or "unknown",
-            file_path=str(file_path),
-            article_id=file_id,
+            filename=stored.filename,
+            file_path=str(stored.file_path),
+            article_id=stored.file_id,
             task_id=task_id,
             success=True,
             message=message,
         )
 
+    async def _find_duplicate(self, source_config_id: str, content_hash: str) -> Optional[str]:
+        """查询同一信息源内相同内容的文档ID（删除中的文档不参与去重）"""
+        result = await self.db.execute(
+            select(Article.id).where(
+                Article.source_config_id == source_config_id,
+                Article.content_hash == content_hash,
+                Article.status != "DELETING",
+            ).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def _reject_duplicate(self, stored: StoredUpload, existing_id: str) -> None:
+        """删除本次保存的文件并抛出 DuplicateDocumentError（携带已存在的文档ID）"""
+        await asyncio.to_thread(_remove_file, stored.file_path)
+        logger.info(f"♻️ 重复上传已拒绝: {stored.filename} == article {existing_id}")
+        raise DuplicateDocumentError(
+            f"文档已存在: {stored.filename}（与文档 {existing_id} 内容相同）",
+            article_id=existing_id,
+        )
+
+    async def upload_document(
+        self,
+        source_config_id: str,
+        file: UploadFile,
+        background: Optional[str] = None,
+        auto_process: bool = True,
+    ) -> DocumentUploadResponse:
+        """上传文档（流式落盘 + 同源去重，立即返回）"""
+        stored = await self.save_upload(source_config_id, file)
+        try:
+            return await self.register_upload(source_config_id, stored, background, auto_process)
+        except DuplicateDocumentError:
+            raise
+        except BaseException:
+            await asyncio.to_thread(_remove_file, stored.file_path)
+            raise
+
+    async def upload_documents(
+        self,
+        source_config_id: str,
+        files: List[UploadFile],
+        background: Optional[str] = None,
+        auto_process: bool = True,
+    ) -> List[Union[DocumentUploadResponse, Exception]]:
+        """
+        批量上传文档
+
+        文件并发落盘（受 upload_concurrency 限制），数据库记录按原顺序逐个创建
+        （同一会话不能并发使用）；批次内内容相同的文件也会被去重。
+
+        Returns:
+            与 files 一一对应的上传结果或异常
+        """
+        semaphore = asyncio.Semaphore(get_settings().upload_concurrency)
+
+        async def save(file: UploadFile) -> StoredUpload:
+            async with semaphore:
+                return await self.save_upload(source_config_id, file)
+
+        saved = await asyncio.gather(*(save(f) for f in files), return_exceptions=True)
+
+        results: List[Union[DocumentUploadResponse, Exception]] = []
+        for stored in saved:
+            if isinstance(stored, BaseException):
+                if not isinstance(stored, Exception):
+                    raise stored
+                results.append(stored)
+                continue
+            try:
+                results.append(
+                    await self.register_upload(source_config_id, stored, background, auto_process)
+                )
+            except Exception as e:
+                if not isinstance(e, DuplicateDocumentError):
+                    await self.db.rollback()
+                    await asyncio.to_thread(_remove_file, stored.file_path)
+                results.append(e)
+        return results
+
     async def process_document_async(
         self,
         article_id: str,
@@ -365,18 +556,14 @@ class DocumentService:
 
         return doc_response
 
-    async def delete_document(self, article_id: str) -> bool:
-        """删除文档"""
-        result = await self.db.execute(select(Article).where(Article.id == article_id))
-        article = result.scalar_one_or_none()
-
-        if not article:
-            return False
-
-        await self.db.delete(article)
-        await self.db.commit()
+    async def delete_document(self, article_id: str) -> Optional[str]:
+        """
+        删除文档（标记 DELETING + 后台分批清理）
 
-        return True
+        Returns:
+            清理任务ID（文档不存在时返回 None），调用方需调度 run_purge_task 执行
+        """
+        return await PurgeService(self.db).start_document_purge(article_id)
 
     async def get_document_sections(self, article_id: str) -> List[ArticleSection]:
         """获取文档的所有片段"""
@@ -0,0 +1,404 @@
+"""数据清理服务
+
+删除信息源 / 文档不再在一个 ORM 事务里级联删除（百万行时长时间持锁、undo log 膨胀，阻塞其他信息源入库）：
+1. 立即软删除：信息源写入 deleted_time（列表和搜索不可见），文档状态置为 DELETING（搜索不可见）
+2. 后台任务按步骤分批删除 ES 文档和 MySQL 行，每批单独提交
+3. 进度记录在 Task（task_type=source_purge / document_purge）的 progress / extra_data 中，
+   中断后从记录的步骤继续；每批都重新查询剩余行，重复执行是幂等的
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dataflow.core.cache.search_cache import bump_source_version
+from dataflow.core.config.settings import get_settings
+from dataflow.core.storage.documents import (
+    EntityVectorDocument,
+    EventVectorDocument,
+    SourceChunkDocument,
+)
+from dataflow.db import (
+    Article,
+    ArticleSection,
+    ChatConversation,
+    ChatMessage,
+    Entity,
+    EntityType,
+    EventEntity,
+    SourceChunk,
+    SourceConfig,
+    SourceEvent,
+    Task,
+    get_session_factory,
+    mark_document_deleted,
+    mark_source_deleted,
+)
+from dataflow.utils import get_logger
+
+logger = get_logger("api.purge_service")
+
+PURGE_SOURCE = "source_purge"
+PURGE_DOCUMENT = "document_purge"
+PURGE_TASK_TYPES = (PURGE_SOURCE, PURGE_DOCUMENT)
+
+
+@dataclass(frozen=True)
+class PurgeStep:
+    """清理步骤：一个 ES 索引，或一张 MySQL 表（按主键分批删除）"""
+
+    name: str
+    model: Any = None
+    condition: Optional[Callable[[str], Any]] = None  # 目标ID → WHERE 条件
+    children: Sequence[Any] = ()  # 每批先删除的子表外键列（如 EventEntity.event_id）
+    es_index: Optional[str] = None
+    es_field: Optional[str] = None
+
+
+def _source_articles(source_config_id: str):
+    return select(Article.id).where(Article.source_config_id == source_config_id)
+
+
+def _source_conversations(source_config_id: str):
+    return select(ChatConversation.id).where(ChatConversation.source_config_id == source_config_id)
+
+
+def _article_entity_types(article_id: str):
+    return select(EntityType.id).where(EntityType.article_id == article_id)
+
+
+# 顺序遵循外键约束：RESTRICT 引用方（事项、实体）先于被引用方（文章、会话、实体类型）删除
+SOURCE_PURGE_STEPS: List[PurgeStep] = [
+    PurgeStep("es:event_vectors", es_index=EventVectorDocument.Index.name, es_field="source_config_id"),
+    PurgeStep("es:entity_vectors", es_index=EntityVectorDocument.Index.name, es_field="source_config_id"),
+    PurgeStep("es:source_chunks", es_index=SourceChunkDocument.Index.name, es_field="source_config_id"),
+    PurgeStep(
+        "source_event",
+        SourceEvent,
+        lambda t: SourceEvent.source_config_id == t,
+        children=(EventEntity.event_id,),
+    ),
+    PurgeStep("entity", Entity, lambda t: Entity.source_config_id == t, children=(EventEntity.entity_id,)),
+    PurgeStep("source_chunk", SourceChunk, lambda t: SourceChunk.source_config_id == t),
+    PurgeStep("article_section", ArticleSection, lambda t: ArticleSection.article_id.in_(_source_articles(t))),
+    PurgeStep("chat_message", ChatMessage, lambda t: ChatMessage.conversation_id.in_(_source_conversations(t))),
+    PurgeStep("chat_conversation", ChatConversation, lambda t: ChatConversation.source_config_id == t),
+    PurgeStep(
+        "entity_type",
+        EntityType,
+        lambda t: or_(EntityType.source_config_id == t, EntityType.article_id.in_(_source_articles(t))),
+    ),
+    PurgeStep(
+        "task",
+        Task,
+        lambda t: or_(Task.source_config_id == t, Task.article_id.in_(_source_articles(t))),
+    ),
+    PurgeStep("article", Article, lambda t: Article.source_config_id == t),
+    PurgeStep("source_config", SourceConfig, lambda t: SourceConfig.id == t),
+]
+
+DOCUMENT_PURGE_STEPS: List[PurgeStep] = [
+    PurgeStep("es:event_vectors", es_index=EventVectorDocument.Index.name, es_field="source_id"),
+    PurgeStep("es:source_chunks", es_index=SourceChunkDocument.Index.name, es_field="source_id"),
+    PurgeStep(
+        "source_event",
+        SourceEvent,
+        lambda t: SourceEvent.article_id == t,
+        children=(EventEntity.event_id,),
+    ),
+    PurgeStep("source_chunk", SourceChunk, lambda t: SourceChunk.article_id == t),
+    PurgeStep("article_section", ArticleSection, lambda t: ArticleSection.article_id == t),
+    PurgeStep(
+        "entity",
+        Entity,
+        lambda t: Entity.entity_type_id.in_(_article_entity_types(t)),
+        children=(EventEntity.entity_id,),
+    ),
+    PurgeStep("entity_type", EntityType, lambda t: EntityType.article_id == t),
+    PurgeStep("task", Task, lambda t: Task.article_id == t),
+    PurgeStep("article", Article, lambda t: Article.id == t),
+]
+
+PURGE_STEPS: Dict[str, List[PurgeStep]] = {
+    PURGE_SOURCE: SOURCE_PURGE_STEPS,
+    PURGE_DOCUMENT: DOCUMENT_PURGE_STEPS,
+}
+
+
+class PurgeService:
+    """数据清理服务（软删除 + 创建后台清理任务）"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _find_active_task(self, task_type: str, target_id: str) -> Optional[str]:
+        result = await self.db.execute(
+            select(Task).where(Task.task_type == task_type, Task.status.in_(["pending", "processing"]))
+        )
+        for task in result.scalars().all():
+            if (task.extra_data or {}).get("target_id") == target_id:
+                return task.id
+        return None
+
+    def _create_task(
+        self,
+        task_type: str,
+        target_id: str,
+        source_config_id: str,
+        name: str,
+        message: str,
+        task_source_config_id: Optional[str] = None,
+    ) -> Task:
+        # 任务不关联被删除的记录（否则会被级联删除）
+        task = Task(
+            id=str(uuid.uuid4()),
+            task_type=task_type,
+            status="pending",
+            progress=Decimal("0.00"),
+            message=message,
+            source_config_id=task_source_config_id,
+            extra_data={
+                "target_id": target_id,
+                "source_config_id": source_config_id,
+                "name": name,
+                "step": 0,
+                "deleted": {},
+            },
+        )
+        self.db.add(task)
+        return task
+
+    async def start_source_purge(self, source_config_id: str) -> Optional[str]:
+        """
+        软删除信息源并创建清理任务
+
+        Returns:
+            清理任务ID（信息源不存在时返回 None；已在清理中时返回现有任务ID）
+        """
+        result = await self.db.execute(select(SourceConfig).where(SourceConfig.id == source_config_id))
+        source = result.scalar_one_or_none()
+        if not source:
+            return None
+
+        if source.deleted_time is not None:
+            existing = await self._find_active_task(PURGE_SOURCE, source_config_id)
+            if existing:
+                return existing
+
+        source.deleted_time = func.now()
+        task = self._create_task(
+            PURGE_SOURCE,
+            source_config_id,
+            source_config_id,
+            source.name,
+            "信息源已删除，等待后台清理数据",
+        )
+        await self.db.commit()
+
+        mark_source_deleted(source_config_id)
+        await bump_source_version(source_config_id)
+        logger.info(f"🗑️ 信息源已软删除: {source_config_id}, 清理任务: {task.id}")
+        return task.id
+
+    async def start_document_purge(self, article_id: str) -> Optional[str]:
+        """
+        标记文档删除中并创建清理任务
+
+        Returns:
+            清理任务ID（文档不存在时返回 None；已在清理中时返回现有任务ID）
+        """
+        result = await self.db.execute(select(Article).where(Article.id == article_id))
+        article = result.scalar_one_or_none()
+        if not article:
+            return None
+
+        if article.status == "DELETING":
+            existing = await self._find_active_task(PURGE_DOCUMENT, article_id)
+            if existing:
+                return existing
+
+        article.status = "DELETING"
+        # 释放 uk_source_config_content_hash：清理完成前即可重新上传相同内容
+        article.content_hash = None
+        task = self._create_task(
+            PURGE_DOCUMENT,
+            article_id,
+            article.source_config_id,
+            article.title,
+            "文档已删除，等待后台清理数据",
+            task_source_config_id=article.source_config_id,
+        )
+        await self.db.commit()
+
+        mark_document_deleted(article_id, article.source_config_id)
+        await bump_source_version(article.source_config_id)
+        logger.info(f"🗑️ 文档已标记删除: {article_id}, 清理任务: {task.id}")
+        return task.id
+
+
+# ============ 后台执行 ============
+
+
+async def _claim_task(session: AsyncSession, task_id: str, stale_seconds: int) -> bool:
+    """领取任务：pending，或 processing 但超过 stale_seconds 未更新（原执行者已中断）"""
+    stale_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=stale_seconds)
+    result = await session.execute(
+        update(Task)
+        .where(
+            Task.id == task_id,
+            Task.task_type.in_(PURGE_TASK_TYPES),
+            or_(
+                Task.status == "pending",
+                and_(Task.status == "processing", Task.updated_time < stale_before),
+            ),
+        )
+        .values(status="processing", updated_time=func.now())
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def _purge_es_step(es_client: Any, step: PurgeStep, target_id: str, batch_size: int) -> AsyncIterator[int]:
+    while True:
+        response = await es_client.delete_by_query(
+            index=step.es_index,
+            query={"term": {step.es_field: target_id}},
+            max_docs=batch_size,
+            conflicts="proceed",
+            refresh=True,
+            ignore_unavailable=True,
+        )
+        deleted = int(response.get("deleted", 0))
+        yield deleted
+        if deleted < batch_size:
+            return
+
+
+async def _purge_db_step(
+    session: AsyncSession, step: PurgeStep, target_id: str, batch_size: int
+) -> AsyncIterator[int]:
+    id_column = step.model.id
+    while True:
+        result = await session.execute(select(id_column).where(step.condition(target_id)).limit(batch_size))
+        ids = list(result.scalars().all())
+        if not ids:
+            return
+        for child_column in step.children:
+            await session.execute(delete(child_column.class_).where(child_column.in_(ids)))
+        await session.execute(delete(step.model).where(id_column.in_(ids)))
+        yield len(ids)
+
+
+def _record_progress(task: Task, steps: List[PurgeStep], step_index: int, deleted: Dict[str, int]) -> None:
+    # JSON 字段需整体赋值才能被检测到变更
+    task.extra_data = {**(task.extra_data or {}), "step": step_index, "deleted": dict(deleted)}
+    task.progress = Decimal(f"{100 * step_index / len(steps):.2f}")
+    if step_index < len(steps):
+        name = steps[step_index].name
+        task.message = f"正在清理 {name}（已删除 {deleted.get(name, 0)}）"
+
+
+async def run_purge_task(
+    task_id: str,
+    session_factory: Optional[async_sessionmaker] = None,
+    es_client: Any = None,
+    batch_size: Optional[int] = None,
+    es_batch_size: Optional[int] = None,
+) -> bool:
+    """
+    执行（或续跑）清理任务
+
+    Args:
+        task_id: 清理任务ID
+        session_factory: 会话工厂（默认全局）
+        es_client: AsyncElasticsearch（默认全局客户端）
+        batch_size: 每批删除的 MySQL 行数（默认 purge_batch_size）
+        es_batch_size: 每批删除的 ES 文档数（默认 purge_es_batch_size）
+
+    Returns:
+        是否执行完成（任务已被其他进程领取或执行失败时返回 False）
+    """
+    settings = get_settings()
+    session_factory = session_factory or get_session_factory()
+    batch_size = batch_size or settings.purge_batch_size
+    es_batch_size = es_batch_size or settings.purge_es_batch_size
+
+    async with session_factory() as session:
+        if not await _claim_task(session, task_id, settings.purge_stale_seconds):
+            logger.info(f"清理任务已在执行或已结束，跳过: {task_id}")
+            return False
+
+        task = (await session.execute(select(Task).where(Task.id == task_id))).scalar_one()
+        data = dict(task.extra_data or {})
+        steps = PURGE_STEPS[task.task_type]
+        target_id = data["target_id"]
+        deleted: Dict[str, int] = dict(data.get("deleted") or {})
+        start_step = int(data.get("step", 0))
+        if start_step:
+            logger.info(f"♻️ 续跑清理任务: {task_id}, 从步骤 {steps[start_step].name if start_step < len(steps) else 'done'} 开始")
+
+        try:
+            for index in range(start_step, len(steps)):
+                step = steps[index]
+                if step.es_index:
+                    if es_client is None:
+                        from dataflow.core.storage.elasticsearch import get_es_client
+
+                        es_client = get_es_client().client
+                    batches = _purge_es_step(es_client, step, target_id, es_batch_size)
+                else:
+                    batches = _purge_db_step(session, step, target_id, batch_size)
+
+                async for count in batches:
+                    deleted[step.name] = deleted.get(step.name, 0) + count
+                    _record_progress(task, steps, index, deleted)
+                    await session.commit()
+
+                _record_progress(task, steps, index + 1, deleted)
+                await session.commit()
+
+            task.status = "completed"
+            task.message = "清理完成"
+            task.result = {"target_id": target_id, "deleted": deleted}
+            await session.commit()
+        except Exception as e:
+            logger.error(f"❌ 清理任务失败: {task_id}: {e}", exc_info=True)
+            await session.rollback()
+            await session.execute(
+                update(Task).where(Task.id == task_id).values(status="failed", error=str(e)[:2000])
+            )
+            await session.commit()
+            return False
+
+    if data.get("source_config_id"):
+        await bump_source_version(data["source_config_id"])
+    logger.info(f"✅ 清理任务完成: {task_id}, 删除统计: {deleted}")
+    return True
+
+
+async def resume_purge_tasks(session_factory: Optional[async_sessionmaker] = None) -> int:
+    """
+    续跑未完成的清理任务（服务启动时调用）
+
+    Returns:
+        本进程完成的任务数
+    """
+    session_factory = session_factory or get_session_factory()
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Task.id)
+            .where(Task.task_type.in_(PURGE_TASK_TYPES), Task.status.in_(["pending", "processing"]))
+            .order_by(Task.created_time)
+        )
+        task_ids = list(result.scalars().all())
+
+    completed = 0
+    for task_id in task_ids:
+        if await run_purge_task(task_id, session_factory=session_factory):
+            completed += 1
+    return completed
@@ -7,6 +7,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dataflow.api.schemas.source import SourceConfigResponse
+from dataflow.api.services.purge_service import PurgeService
 from dataflow.db.models import SourceConfig, Article, EntityType
 
 
@@ -37,9 +38,11 @@ class SourceService:
         return SourceConfigResponse.model_validate(source)
 
     async def get_source(self, source_config_id: str) -> Optional[SourceConfigResponse]:
-        """获取信息源"""
+        """获取信息源（已删除的信息源视为不存在）"""
         result = await self.db.execute(
-            select(SourceConfig).where(SourceConfig.id == source_config_id)
+            select(SourceConfig).where(
+                SourceConfig.id == source_config_id, SourceConfig.deleted_time.is_(None)
+            )
         )
         source = result.scalar_one_or_none()
 
@@ -86,11 +89,15 @@ class SourceService:
             .outerjoin(entity_types_count_subq, SourceConfig.id == entity_types_count_subq.c.source_config_id)
         )
 
+        # 排除已删除（后台清理中）的信息源
+        query = query.where(SourceConfig.deleted_time.is_(None))
         if name_filter:
             query = query.where(SourceConfig.name.like(f"%{name_filter}%"))
 
         # 获取总数（source 的数量）
-        count_query = select(func.count()).select_from(SourceConfig)
+        count_query = select(func.count()).select_from(SourceConfig).where(
+            SourceConfig.deleted_time.is_(None)
+        )
         if name_filter:
             count_query = count_query.where(SourceConfig.name.like(f"%{name_filter}%"))
 
@@ -131,7 +138,9 @@ class SourceService:
     ) -> Optional[SourceConfigResponse]:
         """更新信息源"""
         result = await self.db.execute(
-            select(SourceConfig).where(SourceConfig.id == source_config_id)
+            select(SourceConfig).where(
+                SourceConfig.id == source_config_id, SourceConfig.deleted_time.is_(None)
+            )
         )
         source = result.scalar_one_or_none()
 
@@ -150,18 +159,11 @@ class SourceService:
 
         return SourceConfigResponse.model_validate(source)
 
-    async def delete_source(self, source_config_id: str) -> bool:
-        """删除信息源"""
-        result = await self.db.execute(
-            select(SourceConfig).where(SourceConfig.id == source_config_id)
-        )
-        source = result.scalar_one_or_none()
-
-        if not source:
-            return False
-
-        await self.db.delete(source)
-        await self.db.commit()
-
-        return True
+    async def delete_source(self, source_config_id: str) -> Optional[str]:
+        """
+        删除信息源（软删除 + 后台分批清理）
 
+        Returns:
+            清理任务ID（信息源不存在时返回 None），调用方需调度 run_purge_task 执行
+        """
+        return await PurgeService(self.db).start_source_purge(source_config_id)
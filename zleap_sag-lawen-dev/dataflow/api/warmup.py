@@ -0,0 +1,151 @@
+"""启动预热
+
+服务启动后在后台依次完成各项冷启动开销，完成后才对外报告就绪（GET /ready）：
+- 分词器：jieba 词典、spaCy 模型、NLTK 分句数据（CPU 密集，放到线程池执行）
+- 提示词模板：解析 prompts/ 下全部 YAML
+- 连接池：预建 MySQL 连接，探活 Elasticsearch / Redis
+
+单个步骤失败或超时只记录结果、不阻塞就绪；/health 仍只表示进程存活。
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dataflow.core.config.settings import get_settings
+from dataflow.utils import get_logger
+
+logger = get_logger("api.warmup")
+
+# 预热用样例文本（中英混合，覆盖 jieba 与 spaCy 两条分词路径）
+WARMUP_TEXT = "苹果公司在北京发布了新款 iPhone，Tim Cook 出席了发布会。"
+
+
+@dataclass
+class WarmupState:
+    """预热状态"""
+
+    ready: bool = False
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    steps: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round(self.finished_at - self.started_at, 3)
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "duration": duration,
+            "steps": self.steps,
+        }
+
+
+def _warm_tokenizers() -> None:
+    from dataflow.core.ai.tokensize import get_keyword_extractor, get_mixed_tokenizer
+
+    # 首次分词才会加载 jieba 词典与 spaCy 模型
+    get_mixed_tokenizer().tokenize(WARMUP_TEXT)
+    get_keyword_extractor().extract(WARMUP_TEXT)
+
+
+def _warm_summarizer() -> None:
+    # 导入时初始化 NLTK 分句数据
+    import dataflow.core.ai.sumy  # noqa: F401
+
+
+def _warm_prompts() -> int:
+    from dataflow.core.prompt import get_prompt_manager
+
+    return len(get_prompt_manager().templates)
+
+
+async def _warm_mysql(connections: int) -> int:
+    """并发建立若干连接并归还连接池，后续请求直接复用"""
+    from sqlalchemy import text
+
+    from dataflow.db.base import get_engine
+
+    engine = get_engine()
+
+    async def _open() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_open() for _ in range(connections)))
+    return connections
+
+
+async def _warm_elasticsearch() -> bool:
+    from dataflow.core.storage.elasticsearch import get_es_client
+
+    if not await get_es_client().ping():
+        raise ConnectionError("Elasticsearch ping 失败")
+    return True
+
+
+async def _warm_redis() -> bool:
+    from dataflow.core.storage.redis import get_redis_client
+
+    if not await get_redis_client().ping():
+        raise ConnectionError("Redis ping 失败")
+    return True
+
+
+def default_steps() -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+    """默认预热步骤（名称, 协程工厂）"""
+    settings = get_settings()
+    return [
+        ("tokenizer", lambda: asyncio.to_thread(_warm_tokenizers)),
+        ("summarizer", lambda: asyncio.to_thread(_warm_summarizer)),
+        ("prompts", lambda: asyncio.to_thread(_warm_prompts)),
+        ("mysql", lambda: _warm_mysql(settings.warmup_db_connections)),
+        ("elasticsearch", _warm_elasticsearch),
+        ("redis", _warm_redis),
+    ]
+
+
+async def run_warmup(
+    state: WarmupState,
+    steps: Optional[List[Tuple[str, Callable[[], Awaitable[Any]]]]] = None,
+    timeout: Optional[float] = None,
+) -> WarmupState:
+    """
+    执行预热，结束后将 state.ready 置为 True
+
+    Args:
+        state: 预热状态（逐步写入结果）
+        steps: 预热步骤，None 使用 default_steps()
+        timeout: 单个步骤超时（秒），None 使用配置 warmup_timeout
+
+    Returns:
+        预热状态
+    """
+    settings = get_settings()
+    steps = default_steps() if steps is None else steps
+    timeout = settings.warmup_timeout if timeout is None else timeout
+
+    state.started_at = time.monotonic()
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(step(), timeout=timeout)
+                state.steps[name] = {"status": "ok"}
+            except asyncio.TimeoutError:
+                state.steps[name] = {"status": "timeout"}
+                logger.warning(f"⚠️ 预热步骤超时: {name}（{timeout}s）")
+            except Exception as e:
+                state.steps[name] = {"status": "failed", "error": str(e)}
+                logger.warning(f"⚠️ 预热步骤失败: {name}: {e}")
+            state.steps[name]["duration"] = round(time.perf_counter() - start, 3)
+    finally:
+        state.finished_at = time.monotonic()
+        state.ready = True
+
+    logger.info(
+        f"🔥 预热完成，用时 {state.finished_at - state.started_at:.2f}s",
+        extra={"steps": state.steps},
+    )
+    return state
@@ -6,12 +6,14 @@ Agent 模块
 
 from dataflow.core.agent.base import BaseAgent
 from dataflow.core.agent.builder import Builder
+from dataflow.core.agent.memo import ResearchMemo
 from dataflow.core.agent.researcher import ResearcherAgent
 from dataflow.core.agent.summarizer import SummarizerAgent
 
 __all__ = [
     "BaseAgent",
     "Builder",
+    "ResearchMemo",
     "ResearcherAgent",
     "SummarizerAgent",
 ]
@@ -0,0 +1,122 @@
+"""
+研究备忘（对话内的搜索结果复用）
+
+ResearcherAgent 在多轮研究中记录：
+- 查询 → 事项：同一查询（规范化后）再次出现时直接复用结果
+- 实体 → 事项：搜索结果路径（rerank_lines）中出现过的实体，查询恰好是该实体名时复用其事项
+
+备忘绑定作用域（信息源 + 搜索参数），作用域变化时自动清空。
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from dataflow.utils import normalize_entity_name
+
+
+class ResearchMemo:
+    """查询 / 实体 → 事项备忘"""
+
+    def __init__(self, max_queries: int = 64) -> None:
+        """
+        初始化备忘
+
+        Args:
+            max_queries: 最多记录的查询数（超出后不再记录新查询）
+        """
+        self.max_queries = max_queries
+        self.scope: Optional[Hashable] = None
+        self.queries: Dict[str, List[str]] = {}
+        self.entity_events: Dict[str, List[str]] = {}
+        self.events_by_id: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """规范化查询 / 实体名（小写、去标点、合并空白）"""
+        return normalize_entity_name(text or "")
+
+    def set_scope(self, scope: Hashable) -> None:
+        """设置作用域（与当前不同则清空备忘）"""
+        if scope != self.scope:
+            self.clear()
+            self.scope = scope
+
+    def clear(self) -> None:
+        """清空备忘"""
+        self.queries.clear()
+        self.entity_events.clear()
+        self.events_by_id.clear()
+
+    def _resolve(self, event_ids: List[str]) -> List[Any]:
+        return [self.events_by_id[event_id] for event_id in event_ids if event_id in self.events_by_id]
+
+    def lookup(self, query: str) -> Optional[Tuple[List[Any], str]]:
+        """
+        查找可复用的结果
+
+        Args:
+            query: 查询文本
+
+        Returns:
+            (事项列表, 来源 query/entity)，无可复用结果时返回 None
+        """
+        key = self.normalize(query)
+        if not key:
+            return None
+
+        if key in self.queries:
+            self.hits += 1
+            return self._resolve(self.queries[key]), "query"
+        if key in self.entity_events:
+            self.hits += 1
+            return self._resolve(self.entity_events[key]), "entity"
+
+        self.misses += 1
+        return None
+
+    def record(self, query: str, result: Dict[str, Any]) -> None:
+        """
+        记录一次搜索结果
+
+        Args:
+            query: 查询文本
+            result: SAGSearcher.search 的返回（事项模式）
+        """
+        key = self.normalize(query)
+        events = result.get("events", []) or []
+        event_ids = []
+        for event in events:
+            event_id = getattr(event, "id", None)
+            if event_id is None:
+                continue
+            self.events_by_id.setdefault(event_id, event)
+            event_ids.append(event_id)
+
+        if key and (key in self.queries or len(self.queries) < self.max_queries):
+            self.queries[key] = event_ids
+
+        # 实体 → 事项（只记录最终返回事项的路径上的实体）
+        returned = set(event_ids)
+        for event_id, paths in (result.get("rerank_lines") or {}).items():
+            if event_id not in returned:
+                continue
+            for path in paths or []:
+                for item in path:
+                    entity = item.get("entity") if isinstance(item, dict) else None
+                    name = self.normalize(entity.get("name", "")) if entity else ""
+                    if not name:
+                        continue
+                    linked = self.entity_events.setdefault(name, [])
+                    if event_id not in linked:
+                        linked.append(event_id)
+
+    def stats(self) -> Dict[str, int]:
+        """备忘统计"""
+        return {
+            "queries": len(self.queries),
+            "entities": len(self.entity_events),
+            "events": len(self.events_by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
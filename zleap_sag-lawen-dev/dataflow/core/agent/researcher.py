@@ -10,8 +10,11 @@ ResearcherAgent - 智能对话研究员
 - 📝 记忆管理：结构化对话和知识记忆
 """
 
-from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dataflow.core.agent.base import BaseAgent
+from dataflow.core.agent.memo import ResearchMemo
+from dataflow.core.config.settings import get_settings
 from dataflow.modules.search import SAGSearcher, SearchConfig
 from dataflow.core.ai.models import LLMMessage, LLMRole
 from dataflow.core.prompt import get_prompt_manager
@@ -101,6 +104,9 @@ class ResearcherAgent(BaseAgent):
             "result_style": "concise"
         }
 
+        # 搜索结果备忘（同一 Agent 实例的多轮研究间复用）
+        self.research_memo = ResearchMemo()
+
         # 加载对话历史到记忆
         if conversation_history:
             self._load_conversation_memory(conversation_history)
@@ -164,6 +170,13 @@ class ResearcherAgent(BaseAgent):
 
         logger.info(f"🔍 当前搜索参数: {self.search_params}")
 
+        # 信息源或搜索参数变化后，已有备忘不再可复用
+        self.research_memo.set_scope((
+            tuple(sorted(self.source_config_ids)),
+            self.search_params.get("top_k", 10),
+            self.search_params.get("threshold", 0.5),
+        ))
+
         # kwargs 剩余的才是 LLM 参数（如 temperature, max_tokens 等）
 
         # 记录用户问题到记忆
@@ -406,10 +419,19 @@ class ResearcherAgent(BaseAgent):
                 "status": "processing"
             }
 
-            round_events = await self._execute_multi_query_search(
-                queries if isinstance(queries, list) else [queries]
-            )
+            # 子查询并发执行，每完成一个就推送进度
+            round_queries = queries if isinstance(queries, list) else [queries]
+            round_results: Dict[int, List] = {}
+            async for index, q, events, reused in self._iter_multi_query_search(round_queries):
+                round_results[index] = events
+                yield {
+                    "type": "thinking",
+                    "stage": f"round_{round_idx + 1}",
+                    "content": f"查询「{q}」找到 {len(events)} 个事项" + ("（复用已有结果）" if reused else "")
+                }
 
+            # 按计划顺序合并，保证结果与串行执行一致
+            round_events = [e for index in sorted(round_results) for e in round_results[index]]
             all_events.extend(round_events)
             all_events = self._deduplicate_events(all_events)
 
@@ -760,11 +782,83 @@ class ResearcherAgent(BaseAgent):
 
         return result
 
+    async def _search_with_memo(self, query: str) -> Tuple[List, bool]:
+        """
+        执行单个子查询（优先复用备忘中的结果）
+
+        Returns:
+            (事项列表, 是否复用)
+        """
+        use_memo = get_settings().research_memo_enabled
+        if use_memo:
+            cached = self.research_memo.lookup(query)
+            if cached is not None:
+                events, source = cached
+                logger.info(f"♻️ 复用搜索结果: query='{query}', source={source}, events={len(events)}")
+                return events, True
+
+        result = await self._execute_search(query, [query])
+        if use_memo:
+            self.research_memo.record(query, result)
+        return result.get("events", []), False
+
+    async def _iter_multi_query_search(
+        self, queries: List[str]
+    ) -> AsyncIterator[Tuple[int, str, List, bool]]:
+        """
+        并发执行多个子查询，按完成顺序产出结果
+
+        - 并发数受 research_search_concurrency 限制
+        - 规范化后重复的查询只执行一次
+        - 单个子查询失败只记录日志；全部失败时抛出最后一个异常
+
+        Yields:
+            (查询在计划中的下标, 查询, 事项列表, 是否复用)
+        """
+        unique: List[Tuple[int, str]] = []
+        seen = set()
+        for index, q in enumerate(queries):
+            key = ResearchMemo.normalize(q) or q
+            if key not in seen:
+                seen.add(key)
+                unique.append((index, q))
+        if not unique:
+            return
+
+        semaphore = asyncio.Semaphore(get_settings().research_search_concurrency)
+
+        async def run(index: int, q: str) -> Tuple[int, str, List, bool]:
+            async with semaphore:
+                events, reused = await self._search_with_memo(q)
+                return index, q, events, reused
+
+        tasks = [asyncio.create_task(run(index, q)) for index, q in unique]
+        last_error: Optional[BaseException] = None
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    index, q, events, reused = await next_done
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"⚠️ 子查询失败: {e}")
+                    continue
+                succeeded += 1
+                logger.info(f"查询 '{q}' 找到 {len(events)} 个事项")
+                yield index, q, events, reused
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        if succeeded == 0 and last_error is not None:
+            raise last_error
+
     async def _execute_multi_query_search(
         self, queries: List[str]
     ) -> List:
         """
-        执行多查询搜索并合并结果
+        执行多查询搜索并合并结果（并发执行，按查询顺序合并）
 
         Args:
             queries: 查询列表
@@ -772,16 +866,10 @@ class ResearcherAgent(BaseAgent):
         Returns:
             合并后的事项列表
         """
-        all_events = []
-
-        for q in queries:
-            result = await self._execute_search(q, [q])
-            events = result.get("events", [])
-            all_events.extend(events)
-
-            logger.info(f"查询 '{q}' 找到 {len(events)} 个事项")
-
-        return all_events
+        results: Dict[int, List] = {}
+        async for index, _, events, _ in self._iter_multi_query_search(queries):
+            results[index] = events
+        return [e for index in sorted(results) for e in results[index]]
 
     def _evaluate_knowledge(
         self, query: str, events: List
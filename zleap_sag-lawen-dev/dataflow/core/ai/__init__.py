@@ -10,6 +10,13 @@ from dataflow.core.ai.embedding import (
     batch_generate_embedding,
     generate_embedding,
 )
+from dataflow.core.ai.governor import (
+    LLMGovernor,
+    Priority,
+    get_governor_stats,
+    get_llm_governor,
+    reset_llm_governors,
+)
 from dataflow.core.ai.factory import (
     create_llm_client,
     create_embedding_client,
@@ -38,6 +45,12 @@ __all__ = [
     "LLMUsage",
     "LLMProvider",
     "LLMRole",
+    # Governor
+    "LLMGovernor",
+    "Priority",
+    "get_llm_governor",
+    "get_governor_stats",
+    "reset_llm_governors",
     # OpenAI
     "OpenAIClient",
     "create_openai_client",
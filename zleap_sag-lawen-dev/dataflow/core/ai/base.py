@@ -6,10 +6,11 @@ LLM客户端基类
 
 import asyncio
 from abc import ABC, abstractmethod
+from contextlib import aclosing
 from typing import Any, AsyncIterator, Dict, List, Optional
 
 from dataflow.core.ai.models import ModelConfig, LLMMessage, LLMResponse, LLMRole
-from dataflow.exceptions import LLMError, LLMTimeoutError
+from dataflow.exceptions import LLMCircuitOpenError, LLMError, LLMTimeoutError
 from dataflow.utils import get_logger
 
 logger = get_logger("ai.llm")
@@ -92,6 +93,7 @@ class BaseLLMClient(ABC):
         response_schema: Optional[Dict[str, Any]] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        streaming: Optional[bool] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -105,78 +107,57 @@ class BaseLLMClient(ABC):
             response_schema: JSON Schema定义（用于校验，可选）
             temperature: 温度参数
             max_tokens: 最大输出token数
+            streaming: 是否流式生成并增量校验（None 时使用 LLM_SCHEMA_STREAMING 配置；
+                流式调用不经过 LLM 缓存）
             **kwargs: 其他参数
 
         Returns:
             解析后的JSON对象
 
         Raises:
-            LLMError: LLM调用失败或JSON格式无效
-            ValidationError: 响应不符合Schema（仅当提供schema时）
+            LLMError: LLM调用失败、JSON格式无效或响应不符合Schema
         """
         import json
 
-        # 直接调用 LLM，不注入额外提示词
-        response = await self.chat(
-            messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
+        from dataflow.core.ai.structured import IncrementalJSONParser, parse_structured
+
+        if streaming is None:
+            from dataflow.core.config import get_settings
 
-        # 解析JSON响应
+            streaming = get_settings().llm_schema_streaming
+
+        content = ""
         try:
-            import re
-            
-            # 提取JSON内容（可能被markdown代码块包裹）
-            content = response.content.strip()
-            
-            # 使用正则表达式提取 ```json 或 ``` 代码块
-            json_block_match = re.search(
-                r'```(?:json)?\s*\n(.*?)\n```', 
-                content, 
-                re.DOTALL | re.IGNORECASE
-            )
-            
-            if json_block_match:
-                content = json_block_match.group(1).strip()
-                logger.debug("从 markdown 代码块中提取 JSON")
-            else:
-                logger.debug("直接解析 JSON（无代码块）")
-
-            # 解析JSON
-            result = json.loads(content)
-
-            # 如果提供了schema，进行验证
-            if response_schema:
-                # 尝试使用jsonschema进行严格验证
-                try:
-                    import jsonschema
-
-                    jsonschema.validate(instance=result, schema=response_schema)
-                    logger.debug("JSON schema validation passed")
-                except ImportError:
-                    # jsonschema未安装，使用简单验证
-                    if "properties" in response_schema:
-                        required = response_schema.get("required", [])
-                        for field in required:
-                            if field not in result:
-                                raise ValueError(f"缺少必需字段: {field}")
-                    logger.debug("JSON simple validation passed")
-                except Exception as e:
-                    # jsonschema验证失败
-                    if type(e).__name__ == "ValidationError":
-                        logger.error("JSON schema validation failed: %s", e)
-                        raise LLMError(f"响应不符合Schema: {e}") from e
-                    raise
+            if streaming and response_schema:
+                # 流式生成：数组元素一闭合即校验，不合法时提前结束
+                parser = IncrementalJSONParser(response_schema)
+                stream = self.chat_stream(
+                    messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+                async with aclosing(stream):
+                    async for piece, _ in stream:
+                        parser.feed(piece)
+                content = parser.text
+                result = parser.finish()
             else:
-                # 没有schema，只验证JSON格式（已通过json.loads）
-                logger.debug("JSON format validation passed (no schema provided)")
+                # 直接调用 LLM，不注入额外提示词
+                response = await self.chat(
+                    messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+                content = response.content
+                result = parse_structured(content, response_schema)
 
+            logger.debug("JSON schema validation passed" if response_schema else "JSON format validation passed")
             return result
 
         except json.JSONDecodeError as e:
-            logger.error("JSON解析失败: %s\n内容: %s", e, response.content)
+            logger.error("JSON解析失败: %s\n内容: %s", e, content)
             raise LLMError(f"LLM返回的不是有效的JSON: {e}") from e
         except ValueError as e:
             logger.error("Schema验证失败: %s", e)
@@ -236,6 +217,10 @@ class LLMRetryClient:
         if isinstance(error, LLMTimeoutError):
             return False
 
+        # 熔断打开不重试（冷却期内重试必然被拒绝）
+        if isinstance(error, LLMCircuitOpenError):
+            return False
+
         # 速率限制错误应该重试
         from dataflow.exceptions import LLMRateLimitError
 
@@ -249,6 +234,12 @@ class LLMRetryClient:
         # 未知错误默认不重试
         return False
 
+    @staticmethod
+    def _retry_delay(error: Exception, delay: float) -> float:
+        """重试等待时间（服务端给出 Retry-After 时取较大者）"""
+        retry_after = getattr(error, "retry_after", None)
+        return max(delay, retry_after) if retry_after else delay
+
     async def chat(
         self,
         messages: List[LLMMessage],
@@ -264,7 +255,8 @@ class LLMRetryClient:
 
         根据错误类型智能决定是否重试：
         - 超时错误：不重试
-        - 速率限制：重试
+        - 熔断打开：不重试
+        - 速率限制：重试（等待时间不少于服务端 Retry-After）
         - 其他LLM错误：重试
         """
         last_error: Optional[Exception] = None
@@ -282,14 +274,15 @@ class LLMRetryClient:
                     raise
 
                 if attempt < self.max_retries:
+                    wait = self._retry_delay(e, delay)
                     logger.warning(
                         "LLM调用失败，%s秒后重试 (尝试 %d/%d)",
-                        delay,
+                        wait,
                         attempt + 1,
                         self.max_retries,
                         extra={"error": str(e), "error_type": type(e).__name__},
                     )
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(wait)
                     delay *= self.backoff_factor
                 else:
                     logger.error(
@@ -346,14 +339,15 @@ class LLMRetryClient:
                     raise
 
                 if attempt < self.max_retries:
+                    wait = self._retry_delay(e, delay)
                     logger.warning(
                         "结构化输出失败，%s秒后重试 (尝试 %d/%d)",
-                        delay,
+                        wait,
                         attempt + 1,
                         self.max_retries,
                         extra={"error": str(e), "error_type": type(e).__name__},
                     )
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(wait)
                     delay *= self.backoff_factor
 
         raise LLMError(f"结构化输出失败，已重试{self.max_retries}次") from last_error
@@ -7,6 +7,7 @@ Embedding生成服务
 from typing import List, Optional
 
 from dataflow.core.config import get_settings
+from dataflow.core.telemetry import span
 from dataflow.exceptions import AIError
 from dataflow.utils import get_logger
 
@@ -75,10 +76,11 @@ class EmbeddingClient:
             AIError: 生成失败
         """
         try:
-            response = await self.client.embeddings.create(
-                input=text,
-                model=self.model,
-            )
+            with span("embedding.generate", kind="embedding", texts=1, chars=len(text)):
+                response = await self.client.embeddings.create(
+                    input=text,
+                    model=self.model,
+                )
             
             embedding = response.data[0].embedding
             
@@ -110,10 +112,16 @@ class EmbeddingClient:
             AIError: 生成失败
         """
         try:
-            response = await self.client.embeddings.create(
-                input=texts,
-                model=self.model,
-            )
+            with span(
+                "embedding.batch",
+                kind="embedding",
+                texts=len(texts),
+                chars=sum(len(text) for text in texts),
+            ):
+                response = await self.client.embeddings.create(
+                    input=texts,
+                    model=self.model,
+                )
             
             embeddings = [item.embedding for item in response.data]
             
@@ -9,6 +9,7 @@ import json
 from typing import Any, Dict, Optional
 
 from dataflow.core.ai.base import BaseLLMClient, LLMRetryClient
+from dataflow.core.ai.governor import priority_for_scenario
 from dataflow.core.ai.models import ModelConfig, LLMProvider
 from dataflow.core.ai.llm import OpenAIClient
 from dataflow.core.config import get_settings
@@ -167,7 +168,8 @@ async def create_llm_client(
 
     # ============ 创建客户端（统一使用OpenAIClient）============
     # OpenAIClient 兼容：OpenAI 官方 + 302.AI 中转 + 其他兼容服务
-    base_client = OpenAIClient(model_config_obj)
+    # 同一模型的调用共享调度器，按场景区分优先级（对话/搜索优先于抽取/摘要）
+    base_client = OpenAIClient(model_config_obj, priority=priority_for_scenario(scenario))
 
     # 包装重试机制
     with_retry = config.get('with_retry', True)
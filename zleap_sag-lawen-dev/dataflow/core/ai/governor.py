@@ -0,0 +1,494 @@
+"""
+LLM 调用调度器（进程级）
+
+同一 (model, base_url) 的所有 LLM 调用共享一个 LLMGovernor：
+- 令牌桶：请求数（RPM）与 token 数（TPM）限速
+- AIMD 并发：成功且延迟正常时加性增长，429 / 延迟显著升高时乘性下降
+- Retry-After：收到 429 时按服务端建议暂停整个 key 的新请求
+- 熔断：连续失败达到阈值后拒绝新请求，冷却后放行单个探测请求
+- 优先级：对话/搜索等交互流量优先于抽取/摘要等批量流量获取并发槽位
+
+使用方式：
+    governor = get_llm_governor(model, base_url)
+    async with governor.slot(priority=Priority.INTERACTIVE, estimated_tokens=1200) as slot:
+        response = await client.chat.completions.create(...)
+        slot.record_tokens(response.usage.total_tokens)
+"""
+
+import asyncio
+import heapq
+import itertools
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from dataflow.exceptions import LLMCircuitOpenError, LLMError, LLMRateLimitError, LLMTimeoutError
+from dataflow.utils import get_logger
+
+logger = get_logger("ai.governor")
+
+
+class Priority(IntEnum):
+    """调用优先级（数值越小越优先）"""
+
+    INTERACTIVE = 0  # 对话、搜索
+    NORMAL = 1  # 通用
+    BATCH = 2  # 抽取、摘要、评估
+
+
+# 场景 -> 优先级
+SCENARIO_PRIORITIES: Dict[str, Priority] = {
+    "chat": Priority.INTERACTIVE,
+    "search": Priority.INTERACTIVE,
+    "general": Priority.NORMAL,
+    "extract": Priority.BATCH,
+    "summary": Priority.BATCH,
+}
+
+
+def priority_for_scenario(scenario: str) -> Priority:
+    """根据场景获取优先级（未知场景为 NORMAL）"""
+    return SCENARIO_PRIORITIES.get(scenario, Priority.NORMAL)
+
+
+def estimate_tokens(texts: List[str]) -> int:
+    """粗略估算 token 数（中英文混合按 2 字符/token）"""
+    return max(1, sum(len(text) for text in texts) // 2)
+
+
+def _median(values: Deque[float]) -> float:
+    return statistics.median(values) if values else 0.0
+
+
+def _is_service_failure(error: LLMError) -> bool:
+    """是否计入熔断（4xx 请求错误是调用方问题，不计入）"""
+    status_code = getattr(error.__cause__, "status_code", None)
+    return not (isinstance(status_code, int) and 400 <= status_code < 500)
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    解析 Retry-After（秒数或 HTTP 日期）/ retry-after-ms 响应头
+
+    Args:
+        headers: 响应头（支持 get 的映射）
+
+    Returns:
+        等待秒数（无法解析时返回 None）
+    """
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    令牌桶（rate<=0 表示不限速）
+
+    允许余额为负：实际消耗超过预估时记账，后续请求相应等待。
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(rate_per_minute / 6.0, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        预占额度
+
+        Returns:
+            需要等待的秒数（0 表示可立即执行）
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # 单次请求超过桶容量时按容量计，避免永远无法满足
+        amount = min(amount, self.capacity)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """按实际消耗修正（delta>0 表示多扣，<0 表示退还）"""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class CircuitBreaker:
+    """熔断器（closed -> open -> half_open -> closed）"""
+
+    def __init__(self, failure_threshold: int, cooldown: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> Tuple[bool, bool]:
+        """
+        是否放行请求
+
+        Returns:
+            (是否放行, 本次是否占用了半开状态的探测名额)
+        """
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return True, False
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True, True
+        return False, False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+        self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """
+        记录失败
+
+        Returns:
+            本次是否触发熔断
+        """
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or (
+            self.failure_threshold > 0 and self.state == "closed" and self.failures >= self.failure_threshold
+        ):
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """
+        探测请求未产生成功/失败结论（被取消、被限流）时释放探测名额
+
+        只能由 allow() 返回占用了探测名额的调用方调用，否则会放行第二个探测请求
+        """
+        self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        """距离可探测的剩余秒数"""
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+
+class GovernorSlot:
+    """一次受控调用（记录实际 token 消耗）"""
+
+    def __init__(self, governor: "LLMGovernor", estimated_tokens: int) -> None:
+        self.governor = governor
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def record_tokens(self, total_tokens: int) -> None:
+        """记录实际消耗的 token 数"""
+        self.actual_tokens = total_tokens
+
+
+class LLMGovernor:
+    """单个 (model, base_url) 的调度器"""
+
+    def __init__(
+        self,
+        key: str,
+        rpm_limit: int = 0,
+        tpm_limit: int = 0,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        latency_tolerance: float = 2.0,
+        failure_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+    ) -> None:
+        """
+        初始化调度器
+
+        Args:
+            key: 调度键（model@base_url）
+            rpm_limit: 每分钟请求数上限（0=不限）
+            tpm_limit: 每分钟 token 数上限（0=不限）
+            initial_concurrency: 初始并发上限
+            min_concurrency: 并发下限
+            max_concurrency: 并发上限
+            latency_tolerance: 延迟超过基线的倍数时视为拥塞（<=0 关闭延迟信号）
+            failure_threshold: 连续失败多少次触发熔断（<=0 关闭熔断）
+            breaker_cooldown: 熔断冷却时间（秒）
+        """
+        self.key = key
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.latency_tolerance = latency_tolerance
+
+        self.request_bucket = TokenBucket(rpm_limit)
+        self.token_bucket = TokenBucket(tpm_limit)
+        self.breaker = CircuitBreaker(failure_threshold, breaker_cooldown)
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+        # 最近延迟样本：原始延迟（拥塞窗口）与每千 token 延迟（拥塞判断，消除输出长度差异）
+        self._latencies: Deque[float] = deque(maxlen=50)
+        self._unit_latencies: Deque[float] = deque(maxlen=50)
+        self.stats_counters: Dict[str, int] = {
+            "requests": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "rejected": 0,
+        }
+
+    # ============ 并发槽位 ============
+
+    def _wake_next(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    async def _acquire_slot(self, priority: int) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 已分配槽位但调用方被取消：归还
+                self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake_next()
+
+    # ============ AIMD ============
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        # 同一拥塞窗口内只下降一次（约一个典型调用耗时）
+        window = _median(self._latencies) or 1.0
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        logger.info(f"🔻 LLM 并发下调: key={self.key}, limit={self.limit:.1f}")
+
+    def _increase(self) -> None:
+        # 每个“并发窗口”约增加 1
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+        self._wake_next()
+
+    def _on_success(self, latency: float, tokens: int) -> None:
+        self.breaker.record_success()
+        unit_latency = latency * 1000.0 / max(tokens, 1)
+        # 样本足够后才启用延迟信号，基线取中位数
+        baseline = _median(self._unit_latencies) if len(self._unit_latencies) >= 10 else 0.0
+        self._latencies.append(latency)
+        self._unit_latencies.append(unit_latency)
+        if self.latency_tolerance > 0 and baseline > 0 and unit_latency > baseline * self.latency_tolerance:
+            self._decrease(0.9)
+        else:
+            self._increase()
+
+    def _on_rate_limited(self, retry_after: Optional[float]) -> None:
+        self.stats_counters["rate_limited"] += 1
+        self._count_event("rate_limited")
+        self._decrease(0.5)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            logger.warning(f"⏸️ LLM 限流，暂停 {retry_after:.1f}s: key={self.key}")
+
+    def _on_failure(self) -> None:
+        self.stats_counters["failures"] += 1
+        if self.breaker.record_failure():
+            self._count_event("breaker_open")
+            logger.error(
+                f"🚫 LLM 熔断打开: key={self.key}, 连续失败 {self.breaker.failures} 次，"
+                f"{self.breaker.cooldown:.0f}s 后探测"
+            )
+
+    def _count_event(self, event: str) -> None:
+        from dataflow.core.telemetry import get_metrics_registry
+
+        get_metrics_registry().counter(
+            "dataflow_llm_governor_events",
+            "LLM 调度事件（限流 / 熔断 / 拒绝）",
+            ["key", "event"],
+        ).inc(key=self.key, event=event)
+
+    # ============ 对外接口 ============
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: int = Priority.NORMAL,
+        estimated_tokens: int = 0,
+        measure_latency: bool = True,
+    ) -> AsyncIterator[GovernorSlot]:
+        """
+        获取一次调用许可
+
+        Args:
+            priority: 优先级（Priority）
+            estimated_tokens: 预估 token 数（用于 TPM 限速）
+            measure_latency: 是否把本次耗时计入延迟信号（流式调用的耗时取决于消费方，应关闭）
+
+        Yields:
+            GovernorSlot
+
+        Raises:
+            LLMCircuitOpenError: 熔断打开
+        """
+        allowed, probe = self.breaker.allow()
+        if not allowed:
+            self.stats_counters["rejected"] += 1
+            self._count_event("rejected")
+            raise LLMCircuitOpenError(
+                f"LLM 熔断中（{self.key}），{self.breaker.retry_in():.0f}s 后重试",
+                retry_after=self.breaker.retry_in(),
+            )
+
+        try:
+            # Retry-After 暂停期间不发新请求（暂停可能被其他调用延长）
+            while (pause := self.paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            await self._acquire_slot(int(priority))
+        except BaseException:
+            if probe:
+                self.breaker.release_probe()
+            raise
+
+        current = GovernorSlot(self, estimated_tokens)
+        try:
+            wait = max(
+                self.request_bucket.reserve(1),
+                self.token_bucket.reserve(estimated_tokens),
+            )
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            self.stats_counters["requests"] += 1
+            start = time.monotonic()
+            try:
+                yield current
+            except LLMRateLimitError as e:
+                self._on_rate_limited(getattr(e, "retry_after", None))
+                raise
+            except LLMError as e:
+                if isinstance(e, LLMTimeoutError):
+                    self._decrease(0.5)
+                if _is_service_failure(e):
+                    self._on_failure()
+                raise
+            else:
+                if measure_latency:
+                    self._on_success(time.monotonic() - start, current.actual_tokens or estimated_tokens)
+                else:
+                    self.breaker.record_success()
+                    self._increase()
+            finally:
+                if current.actual_tokens is not None:
+                    self.token_bucket.adjust(current.actual_tokens - estimated_tokens)
+        finally:
+            if probe:
+                self.breaker.release_probe()
+            self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        """调度器状态"""
+        return {
+            "key": self.key,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "breaker": self.breaker.state,
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "median_latency": round(_median(self._latencies), 3),
+            **self.stats_counters,
+        }
+
+
+# 全局实例（按 model@base_url）
+_governors: Dict[str, LLMGovernor] = {}
+
+
+def get_llm_governor(model: str, base_url: Optional[str] = None) -> LLMGovernor:
+    """
+    获取 (model, base_url) 对应的调度器（进程内单例）
+
+    Args:
+        model: 模型名称
+        base_url: API 地址
+
+    Returns:
+        LLMGovernor实例
+    """
+    key = f"{model}@{base_url or 'default'}"
+    governor = _governors.get(key)
+    if governor is None:
+        from dataflow.core.config import get_settings
+
+        settings = get_settings()
+        governor = LLMGovernor(
+            key,
+            rpm_limit=settings.llm_rpm_limit,
+            tpm_limit=settings.llm_tpm_limit,
+            initial_concurrency=settings.llm_initial_concurrency,
+            min_concurrency=settings.llm_min_concurrency,
+            max_concurrency=settings.llm_max_concurrency,
+            latency_tolerance=settings.llm_latency_tolerance,
+            failure_threshold=settings.llm_breaker_failure_threshold,
+            breaker_cooldown=settings.llm_breaker_cooldown,
+        )
+        _governors[key] = governor
+    return governor
+
+
+def get_governor_stats() -> List[Dict[str, Any]]:
+    """所有调度器状态"""
+    return [governor.stats() for governor in _governors.values()]
+
+
+def reset_llm_governors() -> None:
+    """清空调度器（配置变更 / 测试）"""
+    _governors.clear()
@@ -7,6 +7,7 @@ OpenAI LLM客户端实现
   放在reasoning_content字段中而不是content字段。本实现会自动检测并处理这种情况。
 """
 
+from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator, Iterable, List, Optional, cast
 
 from openai import (
@@ -19,8 +20,16 @@ from openai import (
 from openai.types.chat import ChatCompletionMessageParam
 
 from dataflow.core.ai.base import BaseLLMClient
+from dataflow.core.ai.governor import (
+    GovernorSlot,
+    Priority,
+    estimate_tokens,
+    get_llm_governor,
+    parse_retry_after,
+)
 from dataflow.core.ai.models import ModelConfig, LLMMessage, LLMProvider, LLMResponse, LLMUsage
 from dataflow.core.cache import llm_cache
+from dataflow.core.telemetry import span
 from dataflow.exceptions import LLMError, LLMRateLimitError, LLMTimeoutError
 from dataflow.utils import get_logger
 
@@ -30,22 +39,53 @@ logger = get_logger("ai.openai")
 class OpenAIClient(BaseLLMClient):
     """OpenAI客户端实现"""
 
-    def __init__(self, config: ModelConfig) -> None:
+    def __init__(self, config: ModelConfig, priority: Priority = Priority.NORMAL) -> None:
         """
         初始化OpenAI客户端
 
         Args:
             config: LLM配置
+            priority: 调用优先级（同一模型的所有调用共享调度器，交互流量优先）
         """
         super().__init__(config)
+        self.priority = priority
 
         # 创建AsyncOpenAI客户端
+        # 启用调度器时关闭 SDK 内部重试：429 需要被调度器看到（降并发 + Retry-After），
+        # 重试由 LLMRetryClient 统一负责
+        from dataflow.core.config import get_settings
+
+        self.governed = get_settings().llm_governor_enabled
+        client_kwargs: dict[str, Any] = {}
+        if self.governed:
+            client_kwargs["max_retries"] = 0
         self.client = AsyncOpenAI(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
+            **client_kwargs,
         )
 
+    @asynccontextmanager
+    async def _governor_slot(
+        self,
+        messages: List[LLMMessage],
+        measure_latency: bool = True,
+    ) -> AsyncIterator[Optional[GovernorSlot]]:
+        """获取调度器许可（未启用调度器时直接放行）"""
+        if not self.governed:
+            yield None
+            return
+
+        governor = get_llm_governor(self.config.model, self.config.base_url)
+        estimated = estimate_tokens([m.content for m in messages])
+        async with governor.slot(
+            priority=self.priority,
+            estimated_tokens=estimated,
+            measure_latency=measure_latency,
+        ) as slot:
+            yield slot
+
     async def chat(
         self,
         messages: List[LLMMessage],
@@ -70,12 +110,19 @@ class OpenAIClient(BaseLLMClient):
             LLMTimeoutError: 调用超时
             LLMRateLimitError: 速率限制
         """
-        response, is_cached = await self._chat_with_cache(
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
+        with span("llm.chat", kind="llm", messages=len(messages)) as current:
+            response, is_cached = await self._chat_with_cache(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+            current.set(cached=int(is_cached))
+            if not is_cached and response.usage:
+                current.set(
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                )
         return response
 
     @llm_cache
@@ -89,6 +136,44 @@ class OpenAIClient(BaseLLMClient):
         """
         OpenAI聊天补全（内部实现，应用缓存装饰器）
 
+        缓存命中时不占用调度器许可；未命中时经调度器限速/限并发后调用 API。
+
+        Args:
+            messages: 消息列表
+            temperature: 温度参数
+            max_tokens: 最大输出token数
+            **kwargs: 其他参数
+
+        Returns:
+            LLM响应
+
+        Raises:
+            LLMError: 调用失败
+            LLMTimeoutError: 调用超时
+            LLMRateLimitError: 速率限制
+            LLMCircuitOpenError: 熔断打开
+        """
+        async with self._governor_slot(messages) as slot:
+            response = await self._create_completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+            if slot is not None and response.usage.total_tokens:
+                slot.record_tokens(response.usage.total_tokens)
+        return response
+
+    async def _create_completion(
+        self,
+        messages: List[LLMMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """
+        调用 Chat Completions API 并转换异常
+
         Args:
             messages: 消息列表
             temperature: 温度参数
@@ -205,7 +290,8 @@ class OpenAIClient(BaseLLMClient):
                 self.config.model,
                 e,
             )
-            raise LLMRateLimitError(f"OpenAI速率限制: {e}") from e
+            retry_after = parse_retry_after(getattr(getattr(e, "response", None), "headers", None))
+            raise LLMRateLimitError(f"OpenAI速率限制: {e}", retry_after=retry_after) from e
         except (APIError, APIConnectionError) as e:
             logger.error(
                 "❌ OpenAI调用失败 - 模型: %s, base_url: %s, 错误: %s",
@@ -242,7 +328,27 @@ class OpenAIClient(BaseLLMClient):
 
         Raises:
             LLMError: 调用失败
+            LLMCircuitOpenError: 熔断打开
         """
+        async with self._governor_slot(messages, measure_latency=False):
+            async for item in self._stream_completion(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                include_reasoning=include_reasoning,
+                **kwargs,
+            ):
+                yield item
+
+    async def _stream_completion(
+        self,
+        messages: List[LLMMessage],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        include_reasoning: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[tuple[str, Optional[str]]]:
+        """调用流式 Chat Completions API 并转换异常"""
         try:
             # 记录使用的模型信息（添加max_tokens）
             logger.info(
@@ -309,6 +415,10 @@ class OpenAIClient(BaseLLMClient):
         except APITimeoutError as e:
             logger.error("OpenAI流式调用超时: %s", e)
             raise LLMTimeoutError(f"OpenAI流式调用超时: {e}") from e
+        except RateLimitError as e:
+            logger.error("OpenAI流式调用速率限制: %s", e)
+            retry_after = parse_retry_after(getattr(getattr(e, "response", None), "headers", None))
+            raise LLMRateLimitError(f"OpenAI流式调用速率限制: {e}", retry_after=retry_after) from e
         except (APIError, APIConnectionError) as e:
             logger.error("OpenAI流式调用失败: %s", e, exc_info=True)
             raise LLMError(f"OpenAI流式调用失败: {e}") from e
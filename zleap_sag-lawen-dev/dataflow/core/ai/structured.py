@@ -0,0 +1,387 @@
+"""
+结构化输出解析与校验
+
+chat_with_schema 的快速路径：
+- JSON 提取：响应本身就是 JSON 时直接解析，否则定位 ``` 代码块（不对整段响应做正则匹配）
+- 解码器：已安装 orjson 时优先使用（LLM_JSON_DECODER=auto），否则使用标准库 json
+- 校验器：按 schema 内容缓存预编译的 jsonschema 校验器（check_schema 每个 schema 只执行一次）
+- 增量解析：流式响应中顶层数组属性的元素一闭合即解码并校验，与生成过程重叠；
+  元素不合法时立即报错，不必等待整段响应生成完毕
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dataflow.utils import get_logger
+
+logger = get_logger("ai.structured")
+
+# 校验器缓存上限（不同 schema 的数量）
+_VALIDATOR_CACHE_SIZE = 128
+
+_lock = threading.Lock()
+_validators: "OrderedDict[str, SchemaValidator]" = OrderedDict()
+# 同一个 schema 对象的快速命中（保留 schema 引用，避免 id 被复用）
+_validators_by_id: Dict[int, Tuple[Dict[str, Any], "SchemaValidator"]] = {}
+
+_decoder: Optional[Callable[[Any], Any]] = None
+_decoder_name: Optional[str] = None
+
+
+def _select_decoder() -> Tuple[str, Callable[[Any], Any]]:
+    """按 LLM_JSON_DECODER 配置选择解码器（auto: orjson 可用时使用）"""
+    from dataflow.core.config import get_settings
+
+    preferred = get_settings().llm_json_decoder
+    if preferred in ("auto", "orjson"):
+        try:
+            import orjson
+
+            return "orjson", orjson.loads
+        except ImportError:
+            if preferred == "orjson":
+                logger.warning("⚠️ 未安装 orjson，回退到标准库 json")
+    return "json", json.loads
+
+
+def loads(text: str) -> Any:
+    """
+    解码 JSON
+
+    Raises:
+        json.JSONDecodeError: 格式无效（orjson.JSONDecodeError 是其子类）
+    """
+    global _decoder, _decoder_name
+    if _decoder is None:
+        _decoder_name, _decoder = _select_decoder()
+        logger.debug(f"结构化输出 JSON 解码器: {_decoder_name}")
+    return _decoder(text)
+
+
+def reset_decoder() -> None:
+    """重新按配置选择解码器（测试或配置变更后使用）"""
+    global _decoder, _decoder_name
+    _decoder = None
+    _decoder_name = None
+
+
+def extract_json_text(content: str) -> str:
+    """
+    从 LLM 响应中提取 JSON 文本
+
+    响应以 {…} / […] 包裹时原样返回；否则取第一个 ``` 代码块的内容；都不满足时返回去除空白后的原文
+    """
+    content = content.strip()
+    if content[:1] in ("{", "[") and content[-1:] in ("}", "]"):
+        return content
+
+    fence = content.find("```")
+    if fence != -1:
+        body_start = content.find("\n", fence)
+        if body_start != -1:
+            body_end = content.find("\n```", body_start)
+            if body_end != -1:
+                logger.debug("从 markdown 代码块中提取 JSON")
+                return content[body_start + 1:body_end].strip()
+    return content
+
+
+class SchemaValidator:
+    """预编译的 schema 校验器"""
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema
+        self._validator = None
+        try:
+            from jsonschema.validators import validator_for
+
+            validator_cls = validator_for(schema)
+            validator_cls.check_schema(schema)
+            self._validator = validator_cls(schema)
+        except ImportError:
+            logger.debug("jsonschema 未安装，仅校验必需字段")
+        self._item_validators: Dict[str, Optional[SchemaValidator]] = {}
+        self._shell: Optional[SchemaValidator] = None
+
+    def validate(self, instance: Any) -> None:
+        """
+        校验实例
+
+        Raises:
+            ValueError: 不符合 schema（消息为最相关的一条错误）
+        """
+        if self._validator is None:
+            if isinstance(instance, dict) and "properties" in self.schema:
+                for field in self.schema.get("required", []):
+                    if field not in instance:
+                        raise ValueError(f"缺少必需字段: {field}")
+            return
+
+        # 合法时只走一次 is_valid；不合法时再收集错误取最相关的一条（与 jsonschema.validate 一致）
+        if self._validator.is_valid(instance):
+            return
+        from jsonschema.exceptions import best_match
+
+        error = best_match(self._validator.iter_errors(instance))
+        path = "/".join(str(p) for p in error.absolute_path)
+        raise ValueError(f"{error.message}" + (f" (位置: {path})" if path else ""))
+
+    def item_validator(self, key: str) -> Optional["SchemaValidator"]:
+        """顶层数组属性 key 的元素校验器（不是数组属性时返回 None）"""
+        if key not in self._item_validators:
+            prop = (self.schema.get("properties") or {}).get(key) or {}
+            items = prop.get("items")
+            valid = prop.get("type") == "array" and isinstance(items, dict)
+            self._item_validators[key] = get_validator(items) if valid else None
+        return self._item_validators[key]
+
+    def shell_validator(self) -> "SchemaValidator":
+        """数组属性元素不做约束的顶层校验器（元素已在流式过程中逐个校验）"""
+        if self._shell is None:
+            properties = dict(self.schema.get("properties") or {})
+            for key, prop in properties.items():
+                if isinstance(prop, dict) and prop.get("type") == "array" and isinstance(prop.get("items"), dict):
+                    properties[key] = {k: v for k, v in prop.items() if k != "items"}
+            self._shell = get_validator({**self.schema, "properties": properties})
+        return self._shell
+
+
+def _schema_key(schema: Dict[str, Any]) -> str:
+    return json.dumps(schema, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def get_validator(schema: Dict[str, Any]) -> SchemaValidator:
+    """
+    获取 schema 的预编译校验器（按 schema 内容缓存，进程内共享）
+
+    Args:
+        schema: JSON Schema
+
+    Returns:
+        SchemaValidator
+    """
+    cached = _validators_by_id.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    key = _schema_key(schema)
+    with _lock:
+        validator = _validators.get(key)
+        if validator is None:
+            validator = SchemaValidator(schema)
+            _validators[key] = validator
+            if len(_validators) > _VALIDATOR_CACHE_SIZE:
+                _validators.popitem(last=False)
+        else:
+            _validators.move_to_end(key)
+        if len(_validators_by_id) >= _VALIDATOR_CACHE_SIZE:
+            _validators_by_id.clear()
+        _validators_by_id[id(schema)] = (schema, validator)
+    return validator
+
+
+def clear_validator_cache() -> None:
+    """清空校验器缓存（测试）"""
+    with _lock:
+        _validators.clear()
+        _validators_by_id.clear()
+
+
+def parse_structured(content: str, schema: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    解析并校验结构化输出
+
+    Args:
+        content: LLM 响应文本
+        schema: JSON Schema（可选）
+
+    Returns:
+        解析后的 JSON 对象
+
+    Raises:
+        json.JSONDecodeError: JSON 格式无效
+        ValueError: 不符合 schema
+    """
+    result = loads(extract_json_text(content))
+    if schema:
+        get_validator(schema).validate(result)
+    return result
+
+
+# 流式扫描：字符串外关注结构字符，字符串内只关注引号与转义
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+_IN_STRING = re.compile(r'["\\]')
+
+
+class IncrementalJSONParser:
+    """
+    流式结构化输出的增量解析器
+
+    逐段 feed 响应文本；顶层对象中数组属性（如抽取结果的 items）的对象/数组元素一闭合，
+    立即解码并按 schema 中该属性的 items 校验。finish() 解析完整响应，
+    已逐个校验过的数组不再重复校验元素。
+
+    使用方式：
+        parser = IncrementalJSONParser(schema)
+        async for content, _ in client.chat_stream(messages):
+            parser.feed(content)          # 元素不合法时抛出 ValueError
+        result = parser.finish()
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None) -> None:
+        self.validator = get_validator(schema) if schema else None
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._broken = False
+        # 顶层（depth 1）键名跟踪
+        self._expect_key = False
+        self._key_parts: Optional[List[str]] = None
+        self._key: Optional[str] = None
+        # 当前顶层数组属性及其元素
+        self._array_key: Optional[str] = None
+        self._element_parts: Optional[List[str]] = None
+        self.validated: Dict[str, int] = {}
+
+    def feed(self, text: str) -> None:
+        """
+        追加一段响应文本
+
+        Raises:
+            ValueError: 已闭合的数组元素不符合 schema
+        """
+        if not text:
+            return
+        self._chunks.append(text)
+        if self._broken or self.validator is None:
+            return
+
+        pos = 0
+        length = len(text)
+        element_from = 0 if self._element_parts is not None else None
+
+        while pos < length:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _IN_STRING.search(text, pos)
+                if match is None:
+                    if self._key_parts is not None:
+                        self._key_parts.append(text[pos:])
+                    break
+                index = match.start()
+                if match.group() == "\\":
+                    if self._key_parts is not None:
+                        self._key_parts.append(text[pos:index + 2])
+                    if index + 1 >= length:
+                        self._escape = True
+                    pos = index + 2
+                    continue
+                # 字符串结束
+                self._in_string = False
+                if self._key_parts is not None:
+                    self._key_parts.append(text[pos:index])
+                    self._key = "".join(self._key_parts)
+                    self._key_parts = None
+                pos = index + 1
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                break
+            index = match.start()
+            char = match.group()
+            pos = index + 1
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_parts = []
+                    self._expect_key = False
+            elif char in "{[":
+                if self._depth == 0 and char == "[":
+                    # 顶层是数组：不做流式校验
+                    self._broken = True
+                    break
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2 and char == "[" and self._key is not None:
+                    if self.validator.item_validator(self._key) is not None:
+                        self._array_key = self._key
+                        self.validated.setdefault(self._array_key, 0)
+                elif self._depth == 3 and self._array_key is not None:
+                    self._element_parts = []
+                    element_from = index
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth < 0:
+                    self._broken = True
+                    break
+                if self._depth == 2 and self._element_parts is not None:
+                    self._element_parts.append(text[element_from:index + 1])
+                    self._check_element("".join(self._element_parts))
+                    self._element_parts = None
+                    element_from = None
+                elif self._depth == 1:
+                    self._array_key = None
+            elif char == "," and self._depth == 1:
+                self._expect_key = True
+                self._key = None
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+
+        if self._element_parts is not None and element_from is not None:
+            self._element_parts.append(text[element_from:])
+
+    def _check_element(self, element_text: str) -> None:
+        key = self._array_key
+        try:
+            element = loads(element_text)
+        except json.JSONDecodeError:
+            # 无法单独解码（扫描与实际结构不一致），交给 finish() 完整校验
+            self._broken = True
+            return
+        try:
+            self.validator.item_validator(key).validate(element)
+        except ValueError as e:
+            raise ValueError(f"{key}[{self.validated[key]}]: {e}") from e
+        self.validated[key] += 1
+
+    @property
+    def text(self) -> str:
+        """已接收的完整响应文本"""
+        return "".join(self._chunks)
+
+    def finish(self) -> Any:
+        """
+        解析完整响应并完成校验
+
+        Raises:
+            json.JSONDecodeError: JSON 格式无效
+            ValueError: 不符合 schema
+        """
+        result = loads(extract_json_text(self.text))
+        if self.validator is None:
+            return result
+
+        streamed = (
+            not self._broken
+            and isinstance(result, dict)
+            and bool(self.validated)
+            and all(
+                isinstance(result.get(key), list) and len(result[key]) == count
+                for key, count in self.validated.items()
+            )
+        )
+        if streamed:
+            self.validator.shell_validator().validate(result)
+        else:
+            self.validator.validate(result)
+        return result
@@ -10,6 +10,11 @@
     >>> from dataflow.core.ai.tokensize import tokenize
     >>> tokens = tokenize("我喜欢Python编程")
     ['我', '喜欢', 'Python', '编程']
+
+    # 批量分词（结果与逐条 tokenize 一致）
+    >>> from dataflow.core.ai.tokensize import tokenize_many
+    >>> tokenize_many(["我喜欢Python", "Python编程"])
+    [['我', '喜欢', 'Python'], ['Python', '编程']]
     
     # 关键词提取
     >>> from dataflow.core.ai.tokensize import extract_keywords, POS
@@ -19,16 +24,29 @@
     >>> keywords = await extract_keywords_async("文本", mode="llm")
 """
 
+import math
+import multiprocessing
 import re
 import threading
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import List, Optional, Set, Tuple
+from typing import List, Optional, Sequence, Set, Tuple
 
+from dataflow.core.config import get_settings
 from dataflow.utils import get_logger
 
 logger = get_logger("ai.tokenizer")
 
 
+# 预编译正则
+_NON_CHINESE_PATTERN = re.compile(r"[^\u4e00-\u9fa5]+")  # 非中文（英文、数字、符号等）
+_CHINESE_PATTERN = re.compile(r"[\u4e00-\u9fa5]+")
+_ENGLISH_WORD_PATTERN = re.compile(r"\b[a-zA-Z][a-zA-Z0-9]*\b")
+
+# spaCy nlp.pipe 每批文本数
+_SPACY_BATCH_SIZE = 64
+
+
 # ==================== 词性枚举（统一抽象） ====================
 
 
@@ -250,67 +268,84 @@ class MixedTokenizer:
             >>> tokenizer.tokenize("我喜欢用Python编程", fast_mode=True)  # 快速模式
             ['我', '喜欢', '用', 'Python', '编程']
         """
+        return self.tokenize_many([text], fast_mode=fast_mode)[0]
+
+    def tokenize_many(self, texts: Sequence[str], fast_mode: bool = False) -> List[List[str]]:
+        """
+        批量分词，结果与逐条调用 tokenize() 完全一致
+
+        先把所有文本切分为中文 / 非中文片段，再按类型整批处理：
+        - 中文片段：jieba 分词，总字数较多时交给 jieba 进程池
+        - 英文片段：spaCy nlp.pipe 批量识别实体（fast_mode 或 spaCy 不可用时空格分词）
+
+        Args:
+            texts: 待分词的文本列表
+            fast_mode: 快速模式，跳过 spaCy 分词（默认False）
+
+        Returns:
+            List[List[str]]: 与 texts 一一对应的分词结果
+
+        示例：
+            >>> tokenizer = MixedTokenizer.get_instance()
+            >>> tokenizer.tokenize_many(["我喜欢Python", "Python编程"], fast_mode=True)
+            [['我', '喜欢', 'Python'], ['Python', '编程']]
+        """
         # 懒加载 spaCy 模型（仅在非快速模式下）
         if not fast_mode and not self._spacy_loaded and not self._spacy_failed:
             self._load_spacy_model()
 
-        # 正则匹配非中文字符（英文、数字、符号等）
-        pattern = re.compile(r"[^\u4e00-\u9fa5]+")
-        matches = pattern.finditer(text)
-        segments = []
-        last_end = 0
-
-        for match in matches:
-            start, end = match.start(), match.end()
-
-            # 处理中文部分
-            if start > last_end:
-                chinese_part = text[last_end:start]
-                try:
-                    import jieba
-                    segments.extend(jieba.lcut(chinese_part))
-                except ImportError:
-                    # jieba未安装，使用简单分词
-                    segments.extend(chinese_part.split())
-
-            # 处理英文部分
-            english_part = text[start:end].strip()
-            if english_part:
-                if fast_mode:
-                    # 快速模式：直接空格分词
-                    segments.extend(self._tokenize_english_simple(english_part))
-                elif self._spacy_loaded and self._nlp_en is not None:
-                    # 使用 spaCy 识别实体并合并
-                    segments.extend(self._tokenize_english_with_spacy(english_part))
-                else:
-                    # 降级方案：简单的空格分词
-                    segments.extend(self._tokenize_english_simple(english_part))
-
-            last_end = end
-
-        # 处理剩余中文
-        if last_end < len(text):
-            try:
-                import jieba
-                segments.extend(jieba.lcut(text[last_end:]))
-            except ImportError:
-                # jieba未安装，使用简单分词
-                segments.extend(text[last_end:].split())
+        split_texts = [_split_segments(text) for text in texts]
+        chinese_parts = [part for parts in split_texts for is_chinese, part in parts if is_chinese]
+        english_parts = [part for parts in split_texts for is_chinese, part in parts if not is_chinese]
+
+        chinese_tokens = iter(_cut_chinese_batch(chinese_parts))
+        english_tokens = iter(self._tokenize_english_batch(english_parts, fast_mode))
+
+        # 按原顺序拼回每条文本
+        results = []
+        for parts in split_texts:
+            segments = []
+            for is_chinese, _ in parts:
+                segments.extend(next(chinese_tokens) if is_chinese else next(english_tokens))
+            # 过滤空白
+            results.append([seg for seg in segments if seg.strip()])
+        return results
+
+    def _tokenize_english_batch(self, texts: List[str], fast_mode: bool) -> List[List[str]]:
+        """
+        批量英文分词
+
+        Args:
+            texts: 英文片段列表
+            fast_mode: 快速模式（直接空格分词）
 
-        # 过滤空白
-        return [seg for seg in segments if seg.strip()]
+        Returns:
+            List[List[str]]: 与 texts 一一对应的分词结果
+        """
+        if not texts:
+            return []
+        if fast_mode or not self._spacy_loaded or self._nlp_en is None:
+            # 快速模式 / 降级方案：简单的空格分词
+            return [self._tokenize_english_simple(text) for text in texts]
 
-    def _tokenize_english_with_spacy(self, text: str) -> List[str]:
+        # 使用 spaCy 识别实体并合并
+        docs = self._nlp_en.pipe(texts, batch_size=_SPACY_BATCH_SIZE)
+        return [self._merge_entities(doc, text) for text, doc in zip(texts, docs)]
+
+    def _merge_entities(self, doc, text: str) -> List[str]:
         """
-        使用 spaCy 对英文文本分词，识别并保留实体完整性
+        按 spaCy 识别的实体合并分词结果，保留实体完整性
+
+        非实体部分只需切词，使用 nlp.tokenizer（与完整 pipeline 的切词结果相同）
 
         Args:
+            doc: spaCy Doc
             text: 英文文本
 
         Returns:
             List[str]: 分词结果
         """
-        doc = self._nlp_en(text)
+        tokenizer = self._nlp_en.tokenizer
         segments = []
         current_pos = 0
 
@@ -319,7 +354,7 @@ class MixedTokenizer:
             if ent.start_char > current_pos:
                 non_ent_text = text[current_pos : ent.start_char]
                 segments.extend(
-                    [token.text for token in self._nlp_en(non_ent_text) if token.text.strip()]
+                    [token.text for token in tokenizer(non_ent_text) if token.text.strip()]
                 )
             # 合并实体（如人名"Scott Derrickson"作为整体）
             segments.append(ent.text)
@@ -329,7 +364,7 @@ class MixedTokenizer:
         if current_pos < len(text):
             remaining_text = text[current_pos:]
             segments.extend(
-                [token.text for token in self._nlp_en(remaining_text) if token.text.strip()]
+                [token.text for token in tokenizer(remaining_text) if token.text.strip()]
             )
 
         return segments
@@ -367,6 +402,97 @@ class MixedTokenizer:
         return self._nlp_en
 
 
+# ==================== 批量分词辅助 ====================
+
+
+def _split_segments(text: str) -> List[Tuple[bool, str]]:
+    """
+    按中文 / 非中文切分文本
+
+    Returns:
+        List[Tuple[bool, str]]: (是否中文, 片段)，非中文片段已去除首尾空白，空片段跳过
+    """
+    parts = []
+    last_end = 0
+
+    for match in _NON_CHINESE_PATTERN.finditer(text):
+        start, end = match.start(), match.end()
+        if start > last_end:
+            parts.append((True, text[last_end:start]))
+        english_part = match.group().strip()
+        if english_part:
+            parts.append((False, english_part))
+        last_end = end
+
+    # 剩余中文
+    if last_end < len(text):
+        parts.append((True, text[last_end:]))
+    return parts
+
+
+def _cut_chinese(texts: List[str]) -> List[List[str]]:
+    """jieba 分词一批中文片段（也在进程池 worker 中执行）"""
+    try:
+        import jieba
+    except ImportError:
+        # jieba未安装，使用简单分词
+        return [text.split() for text in texts]
+    return [jieba.lcut(text) for text in texts]
+
+
+_jieba_pool: Optional[ProcessPoolExecutor] = None
+_jieba_pool_lock = threading.Lock()
+
+
+def _get_jieba_pool(workers: int) -> ProcessPoolExecutor:
+    """获取 jieba 进程池（懒创建；spawn 启动，避免 fork 继承事件循环与线程状态）"""
+    global _jieba_pool
+    if _jieba_pool is None:
+        with _jieba_pool_lock:
+            if _jieba_pool is None:
+                _jieba_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"🧵 jieba 分词进程池已创建（workers={workers}）")
+    return _jieba_pool
+
+
+def shutdown_tokenizer_pool() -> None:
+    """关闭 jieba 分词进程池"""
+    global _jieba_pool
+    with _jieba_pool_lock:
+        pool, _jieba_pool = _jieba_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _cut_chinese_batch(texts: List[str]) -> List[List[str]]:
+    """
+    批量中文分词：总字数达到 TOKENIZER_POOL_MIN_CHARS 时分块交给进程池，否则在当前进程执行
+
+    进程池异常时回退到当前进程，结果不变
+    """
+    settings = get_settings()
+    workers = settings.tokenizer_pool_workers
+
+    if (
+        workers > 0
+        and len(texts) > 1
+        and sum(len(text) for text in texts) >= settings.tokenizer_pool_min_chars
+    ):
+        # 每个 worker 分到若干块，平衡负载与进程间通信开销
+        chunk_size = math.ceil(len(texts) / (workers * 4))
+        chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            pool = _get_jieba_pool(workers)
+            return [tokens for chunk in pool.map(_cut_chinese, chunks) for tokens in chunk]
+        except Exception as e:
+            logger.warning(f"⚠️ jieba 进程池分词失败，改为当前进程分词: {e}")
+            shutdown_tokenizer_pool()
+
+    return _cut_chinese(texts)
+
+
 # ==================== KeywordExtractor ====================
 
 
@@ -589,7 +715,7 @@ class KeywordExtractor:
             spacy_entities = self._convert_pos_to_spacy_entities(pos)
             
             # 只处理英文部分
-            en_text = re.sub(r'[\u4e00-\u9fa5]+', ' ', text)
+            en_text = _CHINESE_PATTERN.sub(' ', text)
             doc = nlp(en_text)
             
             keywords = []
@@ -621,7 +747,7 @@ class KeywordExtractor:
         stopwords: Set[str],
     ) -> List[str]:
         """简单英文提取（降级方案，无词性过滤）"""
-        words = re.findall(r'\b[a-zA-Z][a-zA-Z0-9]*\b', text)
+        words = _ENGLISH_WORD_PATTERN.findall(text)
         filtered = [w for w in words if len(w) >= self.min_len and w.lower() not in stopwords]
         result = self._dedupe(filtered)
         return result[:top_k] if top_k else result
@@ -790,6 +916,20 @@ def tokenize(text: str) -> List[str]:
     return get_mixed_tokenizer().tokenize(text)
 
 
+def tokenize_many(texts: Sequence[str], fast_mode: bool = False) -> List[List[str]]:
+    """
+    快捷批量分词函数（结果与逐条 tokenize 一致）
+
+    Args:
+        texts: 待分词的文本列表
+        fast_mode: 快速模式，跳过 spaCy 分词
+
+    Returns:
+        List[List[str]]: 与 texts 一一对应的分词结果
+    """
+    return get_mixed_tokenizer().tokenize_many(texts, fast_mode=fast_mode)
+
+
 def get_keyword_extractor() -> KeywordExtractor:
     """获取关键词提取器单例"""
     return KeywordExtractor.get_instance()
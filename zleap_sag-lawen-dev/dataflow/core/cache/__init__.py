@@ -7,8 +7,26 @@ LLM 缓存模块
 - 使用 Redis 替代 SQLite，支持分布式部署
 - 无过期机制，缓存永久保存（与 HippoRAG2 一致）
 - 缓存键参数：messages, model, seed, temperature
+
+同时提供带数据版本的搜索结果缓存（内存 + 可选 Redis），
+数据源入库/删除时通过 bump_source_version() 自动失效；
+以及按事项更新时间失效的事项补全结果缓存（内存，短 TTL）。
 """
 
+from dataflow.core.cache.enrich_cache import EnrichedEventCache, get_enrich_cache
 from dataflow.core.cache.llm_cache import clear_llm_cache, llm_cache
+from dataflow.core.cache.search_cache import (
+    SearchResultCache,
+    bump_source_version,
+    get_search_cache,
+)
 
-__all__ = ["llm_cache", "clear_llm_cache"]
+__all__ = [
+    "llm_cache",
+    "clear_llm_cache",
+    "SearchResultCache",
+    "get_search_cache",
+    "bump_source_version",
+    "EnrichedEventCache",
+    "get_enrich_cache",
+]
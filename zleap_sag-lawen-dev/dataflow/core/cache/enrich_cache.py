@@ -0,0 +1,128 @@
+"""
+事项补全结果缓存
+
+搜索结果中的热门事项会被反复补全（实体、来源名称、原文引用），本模块在进程内
+短期缓存补全后的事项数据，避免每次搜索都重新查询与组装。
+
+缓存键组成：
+- 事项ID
+- 事项更新时间（updated_time，为空时用 created_time）：事项被修改后旧键不再命中
+- 字段投影（standard / full）
+
+实体关联、信息源名称等不会改变事项更新时间的数据由较短的 TTL 兜底。
+
+使用方式：
+    from dataflow.core.cache import get_enrich_cache
+
+    cache = get_enrich_cache()
+    key = cache.build_key(event_id, updated_time, "full")
+    payload = cache.get(key)
+    ...
+    cache.set(key, payload)
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from dataflow.core.config import get_settings
+from dataflow.utils import get_logger
+
+logger = get_logger("cache.enrich")
+
+EnrichCacheKey = Tuple[str, str, str]
+
+
+class EnrichedEventCache:
+    """
+    事项补全结果缓存（内存 LRU + TTL）
+
+    缓存的 payload 由多个请求共享，调用方只读不改（需要修改时先复制）。
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """
+        初始化补全缓存
+
+        Args:
+            max_entries: 最大条目数（LRU 淘汰）
+            ttl: 条目过期时间（秒）
+        """
+        settings = get_settings()
+
+        self.max_entries = max_entries or settings.enrich_cache_max_entries
+        self.ttl = ttl if ttl is not None else settings.enrich_cache_ttl
+
+        # key -> (expire_at, payload)
+        self._entries: "OrderedDict[EnrichCacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def build_key(event_id: str, version: Optional[datetime], projection: str) -> EnrichCacheKey:
+        """
+        构建缓存键
+
+        Args:
+            event_id: 事项ID
+            version: 事项更新时间
+            projection: 字段投影
+
+        Returns:
+            缓存键
+        """
+        return (event_id, version.isoformat() if version else "", projection)
+
+    def get(self, key: EnrichCacheKey) -> Optional[Dict[str, Any]]:
+        """读取缓存（过期或未命中返回 None）"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expire_at, payload = entry
+            if expire_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self._entries.pop(key, None)
+        self.misses += 1
+        return None
+
+    def set(self, key: EnrichCacheKey, payload: Dict[str, Any]) -> None:
+        """写入缓存"""
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# 全局实例（单例）
+_enrich_cache: Optional[EnrichedEventCache] = None
+
+
+def get_enrich_cache() -> EnrichedEventCache:
+    """
+    获取事项补全缓存单例
+
+    Returns:
+        EnrichedEventCache实例
+    """
+    global _enrich_cache
+    if _enrich_cache is None:
+        _enrich_cache = EnrichedEventCache()
+    return _enrich_cache
@@ -28,13 +28,15 @@ LLM 缓存模块
 import functools
 import hashlib
 import json
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
-from dataflow.core.ai.models import LLMResponse, LLMUsage
 from dataflow.core.config import get_settings
 from dataflow.core.storage.redis import get_redis_client
 from dataflow.utils import get_logger
 
+if TYPE_CHECKING:
+    from dataflow.core.ai.models import LLMResponse
+
 logger = get_logger("ai.cache")
 
 
@@ -54,9 +56,12 @@ def llm_cache(func):
         - LLMResponse: LLM 响应对象
         - bool: 是否命中缓存（True=命中，False=未命中）
     """
+    # 延迟导入：dataflow.core.cache 会被加载/存储层直接导入，
+    # 顶层导入 core.ai 会与 core.ai.llm -> core.cache 形成循环依赖（注解使用 TYPE_CHECKING 导入）
+    from dataflow.core.ai import models as ai_models
 
     @functools.wraps(func)
-    async def wrapper(self, *args, **kwargs) -> Tuple[LLMResponse, bool]:
+    async def wrapper(self, *args, **kwargs) -> Tuple["LLMResponse", bool]:
         settings = get_settings()
 
         # 如果缓存未启用，直接调用原函数
@@ -99,10 +104,10 @@ def llm_cache(func):
                 # 缓存命中，重建 LLMResponse 对象
                 logger.info(f"缓存命中 - 模型: {model}")
 
-                response = LLMResponse(
+                response = ai_models.LLMResponse(
                     content=cached_data["content"],
                     model=cached_data["model"],
-                    usage=LLMUsage(**cached_data["usage"]),
+                    usage=ai_models.LLMUsage(**cached_data["usage"]),
                     finish_reason=cached_data["finish_reason"],
                 )
                 return response, True
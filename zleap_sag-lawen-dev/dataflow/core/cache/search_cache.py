@@ -0,0 +1,430 @@
+"""
+搜索结果缓存模块
+
+相同 query + 相同搜索配置 + 相同数据源集合的搜索会完整重跑 Recall → Expand → Rerank
+（包括 LLM query 重写）。本模块提供带数据版本的搜索结果缓存：
+
+缓存键组成：
+- 规范化后的 query（NFKC + 折叠空白 + casefold）
+- 结果相关配置字段的规范化哈希（由调用方给出 payload）
+- 每个 source_config_id 的数据版本号（入库/删除时递增）
+
+失效机制：
+- 数据源发生入库或删除时调用 bump_source_version()，版本号变化后旧键不再命中
+- 版本号存放在 Redis 中（多 worker、CLI 入库与 API 进程之间保持一致）；
+  读取版本失败时本次搜索不使用缓存，避免返回其他进程已失效的结果
+- 内存层同时按 source 反向索引，版本递增时立即清理相关条目
+- 配置只读副本时，版本递增后的复制延迟窗口内只读不写：此时副本可能尚未同步，
+  搜索读到的旧数据不能以新版本号写入缓存
+
+存储层级：
+- 内存 LRU（默认启用，进程内）
+- Redis（可选，多 worker 共享结果快照）
+
+使用方式：
+    from dataflow.core.cache import get_search_cache, bump_source_version
+
+    cache = get_search_cache()
+    key, writable = await cache.resolve_key(query, config_payload, source_config_ids)
+    if key is not None:  # None 表示数据版本不可用，跳过缓存
+        cached = await cache.get(key)
+    ...
+    if writable:  # 数据源刚变化、副本可能尚未同步时不写入
+        await cache.set(key, value, source_config_ids, redis_value=snapshot)
+
+    # 数据源变化后
+    await bump_source_version(source_config_id)
+"""
+
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from dataflow.core.config import get_settings
+from dataflow.utils import get_logger
+
+logger = get_logger("cache.search")
+
+
+def normalize_query(query: str) -> str:
+    """
+    规范化查询文本
+
+    NFKC 归一（全角/半角统一）→ 折叠空白 → casefold
+
+    Args:
+        query: 原始查询
+
+    Returns:
+        规范化后的查询
+    """
+    text = unicodedata.normalize("NFKC", query or "")
+    return " ".join(text.split()).casefold()
+
+
+def hash_config_payload(payload: Dict[str, Any]) -> str:
+    """
+    计算配置 payload 的规范化哈希
+
+    键排序 + 紧凑分隔符，保证字段顺序不同的等价配置得到同一哈希
+
+    Args:
+        payload: 与结果相关的配置字段（JSON 可序列化）
+
+    Returns:
+        SHA256 十六进制摘要
+    """
+    canonical = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheKey(NamedTuple):
+    """缓存键解析结果"""
+
+    key: Optional[str]  # 数据版本不可用时为 None（本次不读写缓存）
+    writable: bool  # 是否允许写入（复制延迟窗口内为 False）
+
+
+class SearchResultCache:
+    """
+    带数据版本的搜索结果缓存
+
+    内存层保存调用方给出的原始结果对象；Redis 层保存可 JSON 序列化的快照
+    （由调用方负责快照与还原，例如事项只保存 ID，命中后再按 ID 回表）。
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis_enabled: Optional[bool] = None,
+        key_prefix: Optional[str] = None,
+        shared_versions: Optional[bool] = None,
+        replica_lag_window: Optional[int] = None,
+    ) -> None:
+        """
+        初始化搜索缓存
+
+        Args:
+            max_entries: 内存层最大条目数（LRU 淘汰）
+            ttl: 条目过期时间（秒）
+            redis_enabled: 是否启用 Redis 层
+            key_prefix: Redis 键前缀
+            shared_versions: 数据版本号是否存放在 Redis（启用 Redis 层时强制开启）
+            replica_lag_window: 版本递增后不写缓存的时间窗口（秒），默认仅在配置只读副本时生效
+        """
+        settings = get_settings()
+
+        self.max_entries = max_entries or settings.search_cache_max_entries
+        self.ttl = ttl if ttl is not None else settings.cache_search_ttl
+        self.redis_enabled = (
+            redis_enabled if redis_enabled is not None else settings.search_cache_redis_enabled
+        )
+        self.key_prefix = key_prefix or settings.search_cache_prefix
+        self.shared_versions = self.redis_enabled or (
+            shared_versions if shared_versions is not None else settings.search_cache_shared_versions
+        )
+        if replica_lag_window is None:
+            replica_lag_window = (
+                settings.search_cache_replica_lag_window if settings.mysql_replica_url else 0
+            )
+        self.replica_lag_window = replica_lag_window
+
+        # 内存层：key -> (expire_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # source_config_id -> 相关缓存键（版本递增时主动清理）
+        self._source_keys: Dict[str, Set[str]] = {}
+        # 本地数据版本（仅在关闭 shared_versions 的单进程部署中作为版本来源）
+        self._local_versions: Dict[str, int] = {}
+        # 本进程最近一次递增版本的时间（monotonic）
+        self._bumped_at: Dict[str, float] = {}
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+
+    # ============ 数据版本 ============
+
+    def _version_key(self, source_config_id: str) -> str:
+        return f"{self.key_prefix}version:{source_config_id}"
+
+    def _settling_key(self, source_config_id: str) -> str:
+        """版本递增后复制延迟窗口的标记键（随窗口过期）"""
+        return f"{self.key_prefix}settling:{source_config_id}"
+
+    async def _read_versions(
+        self, source_config_ids: Iterable[str]
+    ) -> Optional[Tuple[Dict[str, int], bool]]:
+        """
+        读取数据源版本号及是否处于复制延迟窗口
+
+        共享版本时版本号与窗口标记在同一次 MGET 中读取
+
+        Returns:
+            (source_config_id -> 版本号, 是否处于窗口内)，版本不可用时为 None
+        """
+        ids = sorted(set(source_config_ids))
+        now = time.monotonic()
+        settling = any(
+            now - self._bumped_at.get(sid, float("-inf")) < self.replica_lag_window for sid in ids
+        )
+        if not self.shared_versions or not ids:
+            return {sid: self._local_versions.get(sid, 0) for sid in ids}, settling
+
+        keys = [self._version_key(sid) for sid in ids]
+        if self.replica_lag_window > 0:
+            keys += [self._settling_key(sid) for sid in ids]
+        try:
+            from dataflow.core.storage.redis import get_redis_client
+
+            values = await get_redis_client().client.mget(keys)
+        except Exception as e:
+            logger.warning(f"读取搜索缓存版本失败: {e}，本次搜索不使用缓存")
+            return None
+        versions = {
+            sid: int(value) if value is not None else 0 for sid, value in zip(ids, values)
+        }
+        settling = settling or any(value is not None for value in values[len(ids):])
+        return versions, settling
+
+    async def get_versions(self, source_config_ids: Iterable[str]) -> Optional[Dict[str, int]]:
+        """
+        获取数据源版本号
+
+        共享版本时使用一次 MGET 从 Redis 读取；读取失败返回 None（调用方跳过缓存），
+        不回退到本地版本，否则其他进程递增的版本会被忽略
+
+        Args:
+            source_config_ids: 数据源ID列表
+
+        Returns:
+            source_config_id -> 版本号，版本不可用时为 None
+        """
+        result = await self._read_versions(source_config_ids)
+        return result[0] if result is not None else None
+
+    async def bump_version(self, source_config_id: str) -> int:
+        """
+        递增数据源版本号，并清理内存层中该数据源的条目
+
+        Args:
+            source_config_id: 数据源ID
+
+        Returns:
+            递增后的版本号
+        """
+        version = self._local_versions.get(source_config_id, 0) + 1
+        self._local_versions[source_config_id] = version
+        self._bumped_at[source_config_id] = time.monotonic()
+
+        if self.shared_versions:
+            try:
+                from dataflow.core.storage.redis import get_redis_client
+
+                redis = get_redis_client()
+                version = await redis.incr(self._version_key(source_config_id))
+                self._local_versions[source_config_id] = version
+                if self.replica_lag_window > 0:
+                    # 其他进程在窗口内按新版本号只读不写（副本可能尚未同步本次变化）
+                    await redis.set(
+                        self._settling_key(source_config_id),
+                        version,
+                        expire=self.replica_lag_window,
+                    )
+            except Exception as e:
+                logger.error(f"❌ 递增搜索缓存版本失败: {e}，其他进程的缓存将在 TTL 内保持旧结果")
+
+        self._evict_source(source_config_id)
+        logger.debug(f"数据源版本递增: {source_config_id} -> {version}")
+        return version
+
+    def _evict_source(self, source_config_id: str) -> None:
+        """清理内存层中与数据源相关的条目"""
+        for key in self._source_keys.pop(source_config_id, set()):
+            self._entries.pop(key, None)
+
+    # ============ 缓存读写 ============
+
+    async def resolve_key(
+        self,
+        query: str,
+        config_payload: Dict[str, Any],
+        source_config_ids: List[str],
+    ) -> CacheKey:
+        """
+        构建缓存键，并判断本次搜索结果是否可以写入缓存
+
+        任一数据源处于版本递增后的复制延迟窗口内时不可写：搜索从只读副本读取，
+        副本可能还是旧数据，写入会把旧结果固化在新版本号下。判断在搜索开始前进行，
+        窗口结束后才开始的搜索读到的副本数据已包含本次变化
+
+        Args:
+            query: 查询文本
+            config_payload: 与结果相关的配置字段
+            source_config_ids: 数据源ID列表
+
+        Returns:
+            CacheKey(key, writable)
+        """
+        result = await self._read_versions(source_config_ids)
+        if result is None:
+            return CacheKey(None, False)
+        versions, settling = result
+        return CacheKey(self._make_key(query, config_payload, versions), not settling)
+
+    async def build_key(
+        self,
+        query: str,
+        config_payload: Dict[str, Any],
+        source_config_ids: List[str],
+    ) -> Optional[str]:
+        """
+        构建缓存键
+
+        Args:
+            query: 查询文本
+            config_payload: 与结果相关的配置字段
+            source_config_ids: 数据源ID列表
+
+        Returns:
+            缓存键；数据版本不可用时为 None（本次不读写缓存）
+        """
+        return (await self.resolve_key(query, config_payload, source_config_ids)).key
+
+    def _make_key(self, query: str, config_payload: Dict[str, Any], versions: Dict[str, int]) -> str:
+        key_data = {
+            "query": normalize_query(query),
+            "config": hash_config_payload(config_payload),
+            "sources": sorted(versions.items()),
+        }
+        key_hash = hashlib.sha256(
+            json.dumps(key_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return f"{self.key_prefix}result:{key_hash}"
+
+    async def get(self, key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (value, tier)：
+            - tier="memory": value 为 set() 时传入的原始对象
+            - tier="redis": value 为 set() 时传入的 redis_value 快照
+            - 未命中: (None, None)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expire_at, value = entry
+            if expire_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, "memory"
+            self._entries.pop(key, None)
+
+        if self.redis_enabled:
+            try:
+                from dataflow.core.storage.redis import get_redis_client
+
+                snapshot = await get_redis_client().get(key)
+                if snapshot is not None:
+                    self.hits += 1
+                    return snapshot, "redis"
+            except Exception as e:
+                logger.warning(f"读取搜索缓存失败: {e}")
+
+        self.misses += 1
+        return None, None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        source_config_ids: List[str],
+        redis_value: Optional[Any] = None,
+    ) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 内存层保存的结果
+            source_config_ids: 结果涉及的数据源（用于主动失效）
+            redis_value: Redis 层保存的 JSON 快照（None 表示不写 Redis）
+        """
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        for sid in source_config_ids:
+            self._source_keys.setdefault(sid, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            for keys in self._source_keys.values():
+                keys.discard(evicted_key)
+
+        if self.redis_enabled and redis_value is not None:
+            try:
+                from dataflow.core.storage.redis import get_redis_client
+
+                await get_redis_client().set(key, redis_value, expire=self.ttl)
+            except Exception as e:
+                logger.warning(f"写入搜索缓存失败: {e}，不影响返回结果")
+
+    def clear(self) -> None:
+        """清空内存层（不影响版本号）"""
+        self._entries.clear()
+        self._source_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "redis_enabled": self.redis_enabled,
+            "shared_versions": self.shared_versions,
+            "replica_lag_window": self.replica_lag_window,
+        }
+
+
+# 全局实例（单例）
+_search_cache: Optional[SearchResultCache] = None
+
+
+def get_search_cache() -> SearchResultCache:
+    """
+    获取搜索缓存单例
+
+    Returns:
+        SearchResultCache实例
+    """
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchResultCache()
+    return _search_cache
+
+
+async def bump_source_version(*source_config_ids: Optional[str]) -> None:
+    """
+    递增数据源版本号（入库/删除后调用）
+
+    失败只记录日志，不影响调用方的主流程
+
+    Args:
+        *source_config_ids: 发生变化的数据源ID
+    """
+    cache = get_search_cache()
+    for source_config_id in {sid for sid in source_config_ids if sid}:
+        try:
+            await cache.bump_version(source_config_id)
+        except Exception as e:
+            logger.warning(f"搜索缓存失效失败: {source_config_id}, {e}")
@@ -30,6 +30,12 @@ class Settings(BaseSettings):
     mysql_password: str = Field(default="dataflow_pass", description="MySQL密码")
     mysql_database: str = Field(default="dataflow", description="MySQL数据库名")
 
+    # 只读副本（可选）：搜索 / 结果补全 / 统计等只读会话走副本，写入仍走主库
+    mysql_replica_host: str = Field(default="", description="MySQL只读副本主机（为空则读写都走主库）")
+    mysql_replica_port: Optional[int] = Field(default=None, description="MySQL只读副本端口（默认同主库）")
+    mysql_replica_user: Optional[str] = Field(default=None, description="MySQL只读副本用户（默认同主库）")
+    mysql_replica_password: Optional[str] = Field(default=None, description="MySQL只读副本密码（默认同主库）")
+
     # ======================
     # Elasticsearch配置
     # ======================
@@ -41,6 +47,21 @@ class Settings(BaseSettings):
         default=None, description="ES密码", validation_alias="ELASTIC_PASSWORD"
     )
 
+    # 向量索引类型（建索引 / 迁移时写入 dense_vector 的 index_options）
+    es_vector_index_type: str = Field(
+        default="hnsw",
+        description="向量索引类型(hnsw/int8_hnsw/int4_hnsw)，量化类型可显著降低内存占用",
+    )
+
+    # 按信息源路由（写入统一以 source_config_id 为路由键，检索只访问相关分片）
+    es_multi_source_routing: bool = Field(
+        default=False,
+        description="多信息源检索时使用多值路由（须先执行 scripts/reindex_source_routing.py 迁移存量未路由数据）",
+    )
+    es_routing_max_sources: int = Field(
+        default=6, ge=1, description="多值路由最多包含的信息源数，超过时不路由（与全分片检索代价接近）"
+    )
+
     # ======================
     # Redis配置
     # ======================
@@ -69,6 +90,29 @@ class Settings(BaseSettings):
     llm_timeout: int = Field(default=300, ge=1, description="LLM超时时间(秒)")
     llm_max_retries: int = Field(default=3, ge=0, description="LLM最大重试次数")
 
+    # LLM 调度（同一 model+base_url 进程内共享：限速 / 自适应并发 / 熔断）
+    llm_governor_enabled: bool = Field(default=True, description="是否启用LLM调度器")
+    llm_rpm_limit: int = Field(default=0, ge=0, description="每分钟请求数上限（0=不限）")
+    llm_tpm_limit: int = Field(default=0, ge=0, description="每分钟token数上限（0=不限）")
+    llm_initial_concurrency: int = Field(default=8, ge=1, description="LLM初始并发上限")
+    llm_min_concurrency: int = Field(default=1, ge=1, description="LLM并发下限")
+    llm_max_concurrency: int = Field(default=32, ge=1, description="LLM并发上限")
+    llm_latency_tolerance: float = Field(
+        default=2.0, ge=0.0, description="延迟超过基线多少倍时降低并发（0=不按延迟调节）"
+    )
+    llm_breaker_failure_threshold: int = Field(
+        default=5, ge=0, description="连续失败多少次触发熔断（0=关闭熔断）"
+    )
+    llm_breaker_cooldown: float = Field(default=30.0, ge=0.0, description="熔断冷却时间(秒)")
+
+    # 结构化输出（chat_with_schema）
+    llm_json_decoder: str = Field(
+        default="auto", description="结构化输出JSON解码器（auto=已安装orjson时使用 / orjson / json）"
+    )
+    llm_schema_streaming: bool = Field(
+        default=False, description="结构化输出是否流式生成并增量校验（不经过LLM缓存）"
+    )
+
     # 数据库配置开关
     use_db_config: bool = Field(default=True, description="是否使用数据库配置")
 
@@ -104,6 +148,15 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", description="日志级别")
     log_format: str = Field(default="json", description="日志格式")
 
+    # 可观测性（Span 耗时 / Prometheus 指标 / 详细日志采样）
+    metrics_enabled: bool = Field(default=True, description="是否记录 Span 指标并开放 /metrics")
+    trace_verbose_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="详细诊断日志采样率（0=仅 DEBUG 级别输出，1=每次请求都输出）",
+    )
+
     # ======================
     # API 配置
     # ======================
@@ -111,6 +164,22 @@ class Settings(BaseSettings):
     api_port: int = Field(default=8000, description="API 服务端口")
     api_workers: int = Field(default=4, description="API Worker 数量")
 
+    # 准入控制（每个 worker 进程独立计数，超出并发且排队超时后返回 503）
+    admission_enabled: bool = Field(default=True, description="是否启用搜索/对话准入控制")
+    admission_search_concurrency: int = Field(default=16, ge=1, description="搜索最大并发数（每 worker）")
+    admission_chat_concurrency: int = Field(default=8, ge=1, description="对话最大并发数（每 worker）")
+    admission_per_source_concurrency: int = Field(
+        default=4, ge=0, description="单个信息源的最大并发数（每 worker，0=不限）"
+    )
+    admission_queue_size: int = Field(default=32, ge=0, description="排队请求数上限（超出立即拒绝）")
+    admission_queue_timeout: float = Field(default=2.0, ge=0.0, description="排队最长等待时间(秒)")
+    admission_retry_after: int = Field(default=2, ge=1, description="拒绝时返回的 Retry-After(秒)")
+
+    # 启动预热（分词器 / 提示词模板 / 连接池，完成后 /ready 返回就绪）
+    warmup_enabled: bool = Field(default=True, description="是否在启动时后台预热")
+    warmup_timeout: float = Field(default=60.0, gt=0, description="单个预热步骤超时时间(秒)")
+    warmup_db_connections: int = Field(default=5, ge=1, description="预热时预先建立的 MySQL 连接数")
+
     # ======================
     # 文件上传配置
     # ======================
@@ -118,6 +187,14 @@ class Settings(BaseSettings):
     max_upload_size: int = Field(
         default=100 * 1024 * 1024, description="最大上传大小（字节，默认100MB）"
     )
+    upload_concurrency: int = Field(default=4, ge=1, description="批量上传时并发落盘的文件数")
+
+    # 数据清理（删除信息源/文档：先软删除，再由后台任务分批删除）
+    purge_batch_size: int = Field(default=1000, ge=1, description="后台清理每批删除的 MySQL 行数")
+    purge_es_batch_size: int = Field(default=5000, ge=1, description="后台清理每批删除的 ES 文档数")
+    purge_stale_seconds: int = Field(
+        default=300, ge=1, description="清理任务超过多久未更新视为中断（启动时接管续跑）"
+    )
 
     # 实体权重配置
     # entity_weights: str = Field(
@@ -131,6 +208,8 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=10, description="数据库连接池大小")
     db_max_overflow: int = Field(default=20, description="数据库连接池最大溢出")
     db_pool_recycle: int = Field(default=3600, description="数据库连接回收时间(秒)")
+    db_replica_pool_size: int = Field(default=20, ge=1, description="只读副本连接池大小")
+    db_replica_max_overflow: int = Field(default=40, ge=0, description="只读副本连接池最大溢出")
 
     # 缓存TTL
     cache_entity_ttl: int = Field(default=86400, description="实体缓存TTL(秒)")
@@ -141,6 +220,42 @@ class Settings(BaseSettings):
     llm_cache_enabled: bool = Field(default=True, description="是否启用LLM缓存")
     llm_cache_prefix: str = Field(default="llm:cache:", description="LLM缓存键前缀")
 
+    # 搜索结果缓存配置（TTL 使用 cache_search_ttl）
+    search_cache_enabled: bool = Field(default=True, description="是否启用搜索结果缓存")
+    search_cache_max_entries: int = Field(
+        default=512, ge=1, description="搜索结果内存缓存最大条目数"
+    )
+    search_cache_redis_enabled: bool = Field(
+        default=False, description="是否启用搜索结果Redis缓存层（多worker共享）"
+    )
+    search_cache_shared_versions: bool = Field(
+        default=True,
+        description="搜索缓存数据版本号存放在Redis（多worker/CLI入库时保证失效一致，仅单进程部署可关闭）",
+    )
+    search_cache_replica_lag_window: int = Field(
+        default=5,
+        ge=0,
+        description="配置只读副本时，数据源版本递增后不写搜索缓存的时间窗口(秒)，应大于副本复制延迟",
+    )
+    search_cache_prefix: str = Field(default="search:cache:", description="搜索缓存键前缀")
+
+    # 事项补全缓存（按事项ID + 更新时间 + 字段投影缓存补全后的事项，进程内）
+    enrich_cache_enabled: bool = Field(default=True, description="是否缓存补全后的事项数据")
+    enrich_cache_ttl: int = Field(default=60, ge=1, description="事项补全缓存TTL(秒)")
+    enrich_cache_max_entries: int = Field(default=2048, ge=1, description="事项补全缓存最大条目数")
+
+    # 批量分词（tokenize_many：中文大批量时交给 jieba 进程池，0=始终在当前进程分词）
+    tokenizer_pool_workers: int = Field(default=2, ge=0, description="批量分词 jieba 进程池大小")
+    tokenizer_pool_min_chars: int = Field(
+        default=20000, ge=0, description="批量分词中文总字数达到多少时使用进程池"
+    )
+
+    # 深度研究：每轮多个子查询并发执行，同一对话内复用已搜索过的查询 / 实体结果
+    research_search_concurrency: int = Field(
+        default=4, ge=1, description="深度研究每轮子查询的最大并发数"
+    )
+    research_memo_enabled: bool = Field(default=True, description="是否在多轮研究中复用已有搜索结果")
+
     @property
     def mysql_url(self) -> str:
         """MySQL连接URL"""
@@ -155,6 +270,23 @@ class Settings(BaseSettings):
             f"?charset=utf8mb4"
         )
 
+    @property
+    def mysql_replica_url(self) -> Optional[str]:
+        """MySQL只读副本连接URL（未配置副本时为None）"""
+        if not self.mysql_replica_host:
+            return None
+        from urllib.parse import quote_plus
+
+        encoded_user = quote_plus(self.mysql_replica_user or self.mysql_user)
+        encoded_password = quote_plus(
+            self.mysql_replica_password if self.mysql_replica_password is not None else self.mysql_password
+        )
+        return (
+            f"mysql+aiomysql://{encoded_user}:{encoded_password}"
+            f"@{self.mysql_replica_host}:{self.mysql_replica_port or self.mysql_port}/{self.mysql_database}"
+            f"?charset=utf8mb4"
+        )
+
     @property
     def elasticsearch_url(self) -> str:
         """Elasticsearch连接URL"""
@@ -187,6 +319,15 @@ class Settings(BaseSettings):
             raise ValueError(f"日志级别必须是: {', '.join(allowed)}")
         return v.upper()
 
+    @field_validator("es_vector_index_type")
+    @classmethod
+    def validate_es_vector_index_type(cls, v: str) -> str:
+        """验证向量索引类型"""
+        allowed = ["hnsw", "int8_hnsw", "int4_hnsw"]
+        if v.lower() not in allowed:
+            raise ValueError(f"向量索引类型必须是: {', '.join(allowed)}")
+        return v.lower()
+
     @field_validator("llm_language")
     @classmethod
     def validate_llm_language(cls, v: str) -> str:
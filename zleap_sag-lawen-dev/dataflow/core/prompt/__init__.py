@@ -3,6 +3,7 @@ Prompt管理模块
 """
 
 from dataflow.core.prompt.manager import (
+    CompiledPromptTemplate,
     PromptManager,
     PromptTemplate,
     get_prompt_manager,
@@ -11,6 +12,7 @@ from dataflow.core.prompt.manager import (
 
 __all__ = [
     "PromptTemplate",
+    "CompiledPromptTemplate",
     "PromptManager",
     "get_prompt_manager",
     "reset_prompt_manager",
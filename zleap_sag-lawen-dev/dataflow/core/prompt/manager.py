@@ -3,12 +3,16 @@ Prompt模板管理器
 
 支持从YAML文件加载提示词模板，变量替换
 支持多语言：默认中文(zh)，可通过 LLM_LANGUAGE 环境变量切换为英文(en)
+支持预编译模板：静态部分按缓存键渲染一次，每次调用只格式化动态部分
 """
 
 import json
 import os
+import string
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
 
 import yaml
 
@@ -90,6 +94,198 @@ class PromptTemplate:
         return len(missing) == 0
 
 
+class CompiledPromptTemplate:
+    """
+    预编译的提示词模板
+
+    模板在编译时拆分为字面量与占位符。变量分为两类：
+    - 静态变量：同一缓存键下不变（如某个信息源的实体类型说明），按缓存键渲染一次
+    - 动态变量：每次调用都会变化（如背景信息、候选关键词）
+
+    第一个动态占位符之前的内容是静态前缀，按缓存键缓存渲染结果；其后的内容中静态变量
+    同样预先代入，每次调用只对剩余的动态占位符做一次 str.format。
+    模板应把静态部分放在前面：前缀越长，OpenAI 兼容服务端的前缀缓存（prompt caching）命中越多。
+
+    Example:
+        >>> compiled = manager.compile("event_extraction", static_variables=["entity_types"])
+        >>> prompt = compiled.render(
+        ...     ("source-1", "v1"),
+        ...     static={"entity_types": "..."},
+        ...     background="...",
+        ... )
+    """
+
+    def __init__(
+        self,
+        template: PromptTemplate,
+        static_variables: Sequence[str],
+        max_entries: int = 256,
+    ) -> None:
+        """
+        编译模板
+
+        Args:
+            template: 提示词模板
+            static_variables: 静态变量名
+            max_entries: 缓存键数量上限（LRU）
+
+        Raises:
+            PromptError: 模板语法错误
+        """
+        self.template = template
+        self.name = template.name
+        self.static_variables = tuple(static_variables)
+        self.max_entries = max_entries
+
+        self._formatter = string.Formatter()
+        try:
+            # [(字面量, 字段名, 格式说明, 转换符)]，字段名为 None 表示模板结尾的纯字面量
+            self._segments = list(self._formatter.parse(template.template))
+        except ValueError as e:
+            raise PromptError(f"模板'{template.name}'语法错误: {e}") from e
+
+        static = set(self.static_variables)
+        self._dynamic_variables = [v for v in template.variables if v not in static]
+        # 静态前缀：第一个动态占位符之前的片段
+        self._prefix_end = len(self._segments)
+        for index, (_, field, _, _) in enumerate(self._segments):
+            if field is not None and self._root(field) not in static:
+                self._prefix_end = index
+                break
+
+        self._lock = threading.Lock()
+        # 缓存键 -> (静态前缀, 代入静态变量后的剩余格式串)
+        self._entries: "OrderedDict[Hashable, Tuple[str, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        from dataflow.core.telemetry import get_metrics_registry
+
+        registry = get_metrics_registry()
+        self._lookups = registry.counter(
+            "dataflow_prompt_prefix_cache", "预编译模板：静态前缀缓存查询次数", ["template", "result"]
+        )
+        # part=static_prefix 在渲染静态前缀时记录一次；part=total 每次渲染记录
+        self._chars = registry.histogram(
+            "dataflow_prompt_rendered_chars",
+            "预编译模板：渲染结果字符数",
+            ["template", "part"],
+            buckets=(0, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000),
+        )
+
+    @staticmethod
+    def _root(field: str) -> str:
+        """占位符的变量名（去掉属性访问与下标）"""
+        for index, char in enumerate(field):
+            if char in ".[":
+                return field[:index]
+        return field
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace("{", "{{").replace("}", "}}")
+
+    def _format_field(self, field: str, spec: str, conversion: Optional[str], values: Dict[str, Any]) -> str:
+        value, _ = self._formatter.get_field(field, (), values)
+        value = self._formatter.convert_field(value, conversion)
+        return self._formatter.format_field(value, spec)
+
+    def _compile_entry(self, static: Dict[str, Any]) -> Tuple[str, str]:
+        """按静态变量渲染前缀，并生成剩余部分的格式串"""
+        static_names = set(self.static_variables)
+        prefix: List[str] = []
+        tail: List[str] = []
+        try:
+            for index, (literal, field, spec, conversion) in enumerate(self._segments):
+                in_prefix = index < self._prefix_end
+                if in_prefix:
+                    prefix.append(literal)
+                else:
+                    tail.append(self._escape(literal))
+                if field is None:
+                    continue
+                if self._root(field) in static_names:
+                    text = self._format_field(field, spec, conversion, static)
+                    if in_prefix:
+                        prefix.append(text)
+                    else:
+                        tail.append(self._escape(text))
+                else:
+                    tail.append(
+                        "{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+                    )
+        except (KeyError, AttributeError, IndexError) as e:
+            raise PromptError(f"模板'{self.name}'缺少静态变量: {e}") from e
+        except Exception as e:
+            raise PromptError(f"模板渲染失败: {e}") from e
+        return "".join(prefix), "".join(tail)
+
+    def render(self, cache_key: Hashable, static: Dict[str, Any], **kwargs: Any) -> str:
+        """
+        渲染模板
+
+        Args:
+            cache_key: 静态部分的缓存键（静态变量取值变化时必须随之变化）
+            static: 静态变量值（命中缓存时不再使用）
+            **kwargs: 动态变量值
+
+        Returns:
+            渲染后的文本（与 PromptTemplate.render 的结果一致）
+
+        Raises:
+            PromptError: 缺少变量或渲染失败
+        """
+        missing = [v for v in self._dynamic_variables if v not in kwargs]
+        if missing:
+            raise PromptError(f"模板'{self.name}'缺少必需变量: {', '.join(missing)}")
+
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self.hits += 1
+            self._lookups.inc(template=self.name, result="hit")
+            with self._lock:
+                if cache_key in self._entries:
+                    self._entries.move_to_end(cache_key)
+        else:
+            self.misses += 1
+            self._lookups.inc(template=self.name, result="miss")
+            entry = self._compile_entry(static)
+            self._chars.observe(len(entry[0]), template=self.name, part="static_prefix")
+            with self._lock:
+                self._entries[cache_key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        prefix, tail = entry
+        try:
+            rendered_tail = tail.format(**kwargs)
+        except KeyError as e:
+            raise PromptError(f"模板变量错误: {e}") from e
+        except Exception as e:
+            raise PromptError(f"模板渲染失败: {e}") from e
+
+        rendered = prefix + rendered_tail
+        self._chars.observe(len(rendered), template=self.name, part="total")
+        return rendered
+
+    def clear(self) -> None:
+        """清空静态前缀缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            "template": self.name,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "static_prefix_chars": [len(prefix) for prefix, _ in list(self._entries.values())[-5:]],
+        }
+
+
 class PromptManager:
     """提示词管理器（支持多语言）"""
 
@@ -113,6 +309,8 @@ class PromptManager:
 
         self.prompts_dir = Path(prompts_dir)
         self.templates: Dict[str, PromptTemplate] = {}
+        # (模板名, 静态变量) -> 预编译模板
+        self._compiled: Dict[Tuple[str, Tuple[str, ...]], CompiledPromptTemplate] = {}
         
         # 读取语言配置
         self.language = self._get_language()
@@ -253,6 +451,37 @@ class PromptManager:
         template = self.get(name)
         return template.render(**kwargs)
 
+    def compile(self, name: str, static_variables: Sequence[str]) -> CompiledPromptTemplate:
+        """
+        获取预编译模板（按模板名与静态变量缓存；模板被替换后重新编译）
+
+        Args:
+            name: 模板名称
+            static_variables: 静态变量名
+
+        Returns:
+            预编译模板
+
+        Raises:
+            PromptError: 模板不存在或语法错误
+        """
+        template = self.get(name)
+        key = (name, tuple(static_variables))
+        compiled = self._compiled.get(key)
+        if compiled is None or compiled.template is not template:
+            compiled = CompiledPromptTemplate(template, static_variables)
+            self._compiled[key] = compiled
+        return compiled
+
+    def compiled_stats(self) -> List[Dict[str, Any]]:
+        """
+        预编译模板的缓存统计
+
+        Returns:
+            每个预编译模板的命中数、未命中数、命中率与最近的静态前缀长度
+        """
+        return [compiled.stats() for compiled in self._compiled.values()]
+
     def has(self, name: str) -> bool:
         """
         检查模板是否存在
@@ -15,6 +15,7 @@ from dataflow.core.storage.elasticsearch import (
     ElasticsearchClient,
     close_es_client,
     get_es_client,
+    source_routing,
 )
 from dataflow.core.storage.mysql import (
     MySQLClient,
@@ -45,6 +46,7 @@ __all__ = [
     "ElasticsearchClient",
     "get_es_client",
     "close_es_client",
+    "source_routing",
     # Redis
     "RedisClient",
     "get_redis_client",
@@ -7,12 +7,22 @@ Elasticsearch Document 模型
 from dataflow.core.storage.documents.source_chunk import SourceChunkDocument
 from dataflow.core.storage.documents.entity_vector import EntityVectorDocument
 from dataflow.core.storage.documents.event_vector import EventVectorDocument
+from dataflow.core.storage.documents.vector_options import (
+    VECTOR_INDEX_TYPES,
+    apply_vector_index_options,
+    build_index_definition,
+    get_vector_index_types,
+)
 
 __all__ = [
     "EntityVectorDocument",
     "EventVectorDocument",
     "SourceChunkDocument",
     "REGISTERED_DOCUMENTS",
+    "VECTOR_INDEX_TYPES",
+    "apply_vector_index_options",
+    "build_index_definition",
+    "get_vector_index_types",
 ]
 
 # 索引注册表：所有需要在 ES 中创建的 Document 类
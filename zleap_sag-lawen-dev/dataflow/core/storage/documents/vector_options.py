@@ -0,0 +1,95 @@
+"""
+向量索引选项
+
+Document 类只声明 dense_vector 字段（维度 / 相似度），索引结构（hnsw / int8_hnsw / int4_hnsw）
+在创建索引时按配置 es_vector_index_type 写入 index_options，便于同一套映射在
+全精度与量化索引之间迁移。
+"""
+
+import copy
+from typing import Any, Dict, Optional, Tuple, Type
+
+from elasticsearch_dsl import Document
+
+VECTOR_INDEX_TYPES = ("hnsw", "int8_hnsw", "int4_hnsw")
+
+
+def _resolve_index_type(index_type: Optional[str]) -> str:
+    if index_type is None:
+        from dataflow.core.config import get_settings
+
+        index_type = get_settings().es_vector_index_type
+    if index_type not in VECTOR_INDEX_TYPES:
+        raise ValueError(f"向量索引类型必须是: {', '.join(VECTOR_INDEX_TYPES)}")
+    return index_type
+
+
+def apply_vector_index_options(
+    mapping: Dict[str, Any], index_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    为映射中所有参与索引的 dense_vector 字段写入 index_options
+
+    Args:
+        mapping: 索引映射（Document._doc_type.mapping.to_dict() 的结果）
+        index_type: 向量索引类型（None 使用配置 es_vector_index_type）
+
+    Returns:
+        新的映射（不修改入参）
+    """
+    index_type = _resolve_index_type(index_type)
+    result = copy.deepcopy(mapping)
+
+    def _walk(properties: Dict[str, Any]) -> None:
+        for field in properties.values():
+            if field.get("type") == "dense_vector" and field.get("index", True):
+                options = dict(field.get("index_options") or {})
+                options["type"] = index_type
+                field["index_options"] = options
+            if "properties" in field:
+                _walk(field["properties"])
+
+    _walk(result.get("properties", {}))
+    return result
+
+
+def get_vector_index_types(mapping: Dict[str, Any]) -> Dict[str, str]:
+    """
+    读取映射中各向量字段的索引类型（未声明 index_options 的视为 hnsw）
+
+    Args:
+        mapping: 索引映射（可以是 get_mapping 返回的 {"properties": ...} 部分）
+
+    Returns:
+        字段名 -> 索引类型
+    """
+    types: Dict[str, str] = {}
+
+    def _walk(properties: Dict[str, Any], prefix: str) -> None:
+        for name, field in properties.items():
+            if field.get("type") == "dense_vector" and field.get("index", True):
+                types[f"{prefix}{name}"] = (field.get("index_options") or {}).get("type", "hnsw")
+            if "properties" in field:
+                _walk(field["properties"], f"{prefix}{name}.")
+
+    _walk(mapping.get("properties", {}), "")
+    return types
+
+
+def build_index_definition(
+    document_cls: Type[Document], index_type: Optional[str] = None
+) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    生成 Document 类对应的索引定义
+
+    Args:
+        document_cls: elasticsearch-dsl Document 类
+        index_type: 向量索引类型（None 使用配置 es_vector_index_type）
+
+    Returns:
+        (索引名, 映射, 设置)
+    """
+    index_name = document_cls.Index.name
+    mapping = apply_vector_index_options(document_cls._doc_type.mapping.to_dict(), index_type)
+    settings = dict(getattr(document_cls.Index, "settings", {}))
+    return index_name, mapping, settings
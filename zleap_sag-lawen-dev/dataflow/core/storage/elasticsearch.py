@@ -2,21 +2,68 @@
 Elasticsearch 存储客户端
 
 支持向量检索和全文检索
+
+路由约定：事项 / 实体 / 片段索引的文档一律以 source_config_id 为路由键写入，
+检索时按信息源路由（多信息源使用多值路由），只访问相关分片。
 """
 
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from elasticsearch import AsyncElasticsearch
 from elasticsearch.exceptions import NotFoundError
 
 from dataflow.core.config import get_settings
+from dataflow.core.telemetry import get_metrics_registry, span
 from dataflow.exceptions import StorageError
 from dataflow.utils import get_logger
 
 logger = get_logger("storage.elasticsearch")
 
+# 检索访问分片数的分桶
+_SHARD_BUCKETS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+
+def source_routing(source_config_ids: Optional[Sequence[Optional[str]]]) -> Optional[str]:
+    """
+    信息源列表对应的检索路由值
+
+    单个信息源直接路由；多个信息源使用多值路由（逗号分隔，只访问这些信息源所在的分片）。
+    未指定信息源、关闭多值路由（es_multi_source_routing）或信息源数超过
+    es_routing_max_sources 时返回 None，即全分片检索。
+
+    Args:
+        source_config_ids: 信息源ID列表（忽略空值，去重保序）
+
+    Returns:
+        路由值或 None
+    """
+    if not source_config_ids:
+        return None
+    ids = list(dict.fromkeys(source_id for source_id in source_config_ids if source_id))
+    if len(ids) <= 1:
+        return ids[0] if ids else None
+
+    settings = get_settings()
+    if not settings.es_multi_source_routing or len(ids) > settings.es_routing_max_sources:
+        return None
+    return ",".join(ids)
+
+
+def _record_shards(op: str, index: str, routing: Optional[str], response: Dict[str, Any]) -> Optional[int]:
+    """记录一次检索访问的分片数（dataflow_es_shards_searched）"""
+    shards = (response.get("_shards") or {}).get("total")
+    if shards is None:
+        return None
+    get_metrics_registry().histogram(
+        "dataflow_es_shards_searched",
+        "ES 检索访问的分片数（shard fan-out）",
+        ["index", "op", "routed"],
+        buckets=_SHARD_BUCKETS,
+    ).observe(shards, index=index, op=op, routed="1" if routing else "0")
+    return shards
+
 
 @dataclass
 class ESConfig:
@@ -157,7 +204,7 @@ class ElasticsearchClient:
             index: 索引名称
             document: 文档内容
             doc_id: 文档ID（可选）
-            routing: 路由键（可选，用于指定分片）
+            routing: 路由键（可选，默认使用文档的 source_config_id）
 
         Returns:
             文档ID
@@ -170,7 +217,7 @@ class ElasticsearchClient:
                 index=index,
                 document=document,
                 id=doc_id,
-                routing=routing,
+                routing=routing or document.get("source_config_id"),
             )
             return response["_id"]
         except Exception as e:
@@ -181,6 +228,7 @@ class ElasticsearchClient:
         self,
         index: str,
         doc_id: str,
+        routing: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         获取文档
@@ -188,12 +236,13 @@ class ElasticsearchClient:
         Args:
             index: 索引名称
             doc_id: 文档ID
+            routing: 路由键（文档按信息源路由写入时需传入 source_config_id）
 
         Returns:
             文档内容，不存在返回None
         """
         try:
-            response = await self.client.get(index=index, id=doc_id)
+            response = await self.client.get(index=index, id=doc_id, **({"routing": routing} if routing else {}))
             return response["_source"]
         except NotFoundError:
             return None
@@ -205,6 +254,7 @@ class ElasticsearchClient:
         self,
         index: str,
         doc_id: str,
+        routing: Optional[str] = None,
     ) -> bool:
         """
         删除文档
@@ -212,12 +262,13 @@ class ElasticsearchClient:
         Args:
             index: 索引名称
             doc_id: 文档ID
+            routing: 路由键（文档按信息源路由写入时需传入 source_config_id）
 
         Returns:
             删除成功返回True
         """
         try:
-            await self.client.delete(index=index, id=doc_id)
+            await self.client.delete(index=index, id=doc_id, **({"routing": routing} if routing else {}))
             return True
         except NotFoundError:
             return False
@@ -230,6 +281,7 @@ class ElasticsearchClient:
         index: str,
         doc_id: str,
         update_data: Dict[str, Any],
+        routing: Optional[str] = None,
     ) -> bool:
         """
         部分更新文档
@@ -238,6 +290,7 @@ class ElasticsearchClient:
             index: 索引名称
             doc_id: 文档ID
             update_data: 要更新的数据
+            routing: 路由键（文档按信息源路由写入时需传入 source_config_id）
 
         Returns:
             更新成功返回True
@@ -250,6 +303,7 @@ class ElasticsearchClient:
                 index=index,
                 id=doc_id,
                 doc=update_data,
+                **({"routing": routing} if routing else {}),
             )
             logger.info(f"文档 {doc_id} 更新成功")
             return True
@@ -264,6 +318,7 @@ class ElasticsearchClient:
         self,
         index: str,
         query: Optional[Dict[str, Any]] = None,
+        routing: Optional[str] = None,
     ) -> int:
         """
         统计文档数量
@@ -271,6 +326,7 @@ class ElasticsearchClient:
         Args:
             index: 索引名称
             query: 查询条件，默认匹配所有文档
+            routing: 路由键（可选，多值以逗号分隔）
 
         Returns:
             文档数量
@@ -282,7 +338,7 @@ class ElasticsearchClient:
             if query is None:
                 query = {"match_all": {}}
 
-            response = await self.client.count(index=index, query=query)
+            response = await self.client.count(index=index, query=query, **({"routing": routing} if routing else {}))
             return response["count"]
         except Exception as e:
             logger.error(f"统计文档数量失败: {e}", exc_info=True)
@@ -327,7 +383,7 @@ class ElasticsearchClient:
             size: 返回数量
             from_: 起始位置
             return_full_response: 是否返回完整响应（包含total、max_score等）
-            routing: 路由键（可选，用于指定分片）
+            routing: 路由键（可选，用于指定分片；多值以逗号分隔，见 source_routing）
             **kwargs: 其他参数
 
         Returns:
@@ -346,7 +402,13 @@ class ElasticsearchClient:
             if routing:
                 search_params["routing"] = routing
 
-            response = await self.client.search(**search_params)
+            with span("es.search", kind="es", index=index) as es_span:
+                response = await self.client.search(**search_params)
+                es_span.set(
+                    hits=len(response["hits"]["hits"]),
+                    took_ms=response.get("took", 0),
+                    shards=_record_shards("search", index, routing, response),
+                )
 
             if return_full_response:
                 # 返回完整信息
@@ -389,32 +451,26 @@ class ElasticsearchClient:
             vector: 查询向量
             size: 返回数量
             filter_query: 过滤条件
-            routing: 路由键（可选，用于指定分片）
+            routing: 路由键（可选，用于指定分片；多值以逗号分隔，见 source_routing）
 
         Returns:
             相似文档列表（包含_score字段）
         """
         try:
-            knn_query: Dict[str, Any] = {
-                "field": field,
-                "query_vector": vector,
-                "k": size,
-                "num_candidates": max(100, size * 2),  # 固定候选数量，k不会超过100
-            }
-
-            if filter_query:
-                knn_query["filter"] = filter_query
-
             search_params = {
                 "index": index,
-                "knn": knn_query,
-                "size": size,
-                "timeout": "30s",  # 添加查询级别超时，避免无限等待
+                **self._build_knn_body(field, vector, size, filter_query),
             }
             if routing:
                 search_params["routing"] = routing
 
-            response = await self.client.search(**search_params)
+            with span("es.knn", kind="es", index=index, k=size) as es_span:
+                response = await self.client.search(**search_params)
+                es_span.set(
+                    hits=len(response["hits"]["hits"]),
+                    took_ms=response.get("took", 0),
+                    shards=_record_shards("knn", index, routing, response),
+                )
 
             return [
                 {**hit["_source"], "_score": hit["_score"]}
@@ -424,6 +480,30 @@ class ElasticsearchClient:
             logger.error(f"向量检索失败: {e}", exc_info=True)
             raise StorageError(f"向量检索失败: {e}") from e
 
+    @staticmethod
+    def _build_knn_body(
+        field: str,
+        vector: List[float],
+        size: int,
+        filter_query: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """构建 kNN 检索请求体"""
+        knn_query: Dict[str, Any] = {
+            "field": field,
+            "query_vector": vector,
+            "k": size,
+            "num_candidates": max(100, size * 2),  # 固定候选数量，k不会超过100
+        }
+
+        if filter_query:
+            knn_query["filter"] = filter_query
+
+        return {
+            "knn": knn_query,
+            "size": size,
+            "timeout": "30s",  # 添加查询级别超时，避免无限等待
+        }
+
     async def bulk_index(
         self,
         index: str,
@@ -438,7 +518,7 @@ class ElasticsearchClient:
             index: 索引名称
             documents: 文档列表
             return_details: 是否返回详细信息（包含错误列表）
-            routing: 路由键（可选，用于指定分片）
+            routing: 路由键（可选，默认按每个文档的 source_config_id 路由）
 
         Returns:
             return_details=False: 成功索引的文档数量（向下兼容）
@@ -458,15 +538,13 @@ class ElasticsearchClient:
                     }
                 return 0
 
-            actions = [
-                {
-                    "_index": index,
-                    "_source": doc,
-                    "_id": doc.get("id"),
-                    **({"_routing": routing} if routing else {}),
-                }
-                for doc in documents
-            ]
+            actions = []
+            for doc in documents:
+                action = {"_index": index, "_source": doc, "_id": doc.get("id")}
+                doc_routing = routing or doc.get("source_config_id")
+                if doc_routing:
+                    action["_routing"] = doc_routing
+                actions.append(action)
 
             success_count, errors = await async_bulk(
                 self.client, actions, raise_on_error=False, stats_only=False
@@ -562,6 +640,65 @@ class ElasticsearchClient:
             logger.error(f"删除索引失败: {e}", exc_info=True)
             raise StorageError(f"删除索引失败: {e}") from e
 
+    async def set_write_block(self, index: str, blocked: bool) -> None:
+        """
+        设置或解除索引写入阻断（index.blocks.write）
+
+        迁移/重建索引期间阻断源索引写入，保证复制结果完整；阻断期间写入请求会直接报错
+
+        Args:
+            index: 索引名称
+            blocked: True 阻断写入，False 解除
+        """
+        try:
+            await self.client.indices.put_settings(
+                index=index, settings={"index.blocks.write": blocked}
+            )
+            logger.info(f"索引写入{'阻断' if blocked else '恢复'}: {index}")
+        except Exception as e:
+            logger.error(f"设置索引写入阻断失败: {e}", exc_info=True)
+            raise StorageError(f"设置索引写入阻断失败: {e}") from e
+
+    async def replace_with_alias(self, name: str, source_index: str, target_index: str) -> None:
+        """
+        原子地删除旧物理索引并把名称指向新索引
+
+        一次 _aliases 请求内执行 add（name → target_index）与 remove_index（source_index）：
+        name 原为物理索引或别名均适用，不存在删除到别名生效之间的不可用窗口
+
+        Args:
+            name: 业务使用的索引名（切换后为别名）
+            source_index: 旧物理索引
+            target_index: 新物理索引
+        """
+        try:
+            await self.client.indices.update_aliases(
+                actions=[
+                    {"add": {"index": target_index, "alias": name}},
+                    {"remove_index": {"index": source_index}},
+                ]
+            )
+            logger.info(f"索引切换成功: {name} -> {target_index}（已删除 {source_index}）")
+        except Exception as e:
+            logger.error(f"索引切换失败: {e}", exc_info=True)
+            raise StorageError(f"索引切换失败: {e}") from e
+
+    async def resolve_index(self, name: str) -> List[str]:
+        """
+        解析索引名或别名对应的物理索引
+
+        Args:
+            name: 索引名或别名
+
+        Returns:
+            物理索引名列表（不存在时返回空列表）
+        """
+        try:
+            response = await self.client.indices.get(index=name)
+            return sorted(response.keys())
+        except NotFoundError:
+            return []
+
     async def index_exists(self, index: str) -> bool:
         """
         检查索引是否存在
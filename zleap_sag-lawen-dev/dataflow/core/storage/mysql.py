@@ -51,15 +51,26 @@ class MySQLClient:
         self.max_overflow = max_overflow or settings.db_max_overflow
         self.pool_recycle = pool_recycle or settings.db_pool_recycle
 
-        # 创建异步引擎
+        # 创建异步引擎（启用指标时记录取连接等待时间与连接池用量，role=api）
+        pool_options: dict = {}
+        if settings.metrics_enabled:
+            from dataflow.core.telemetry import InstrumentedQueuePool
+
+            pool_options["poolclass"] = InstrumentedQueuePool
         self.engine: AsyncEngine = create_async_engine(
             self.database_url,
             pool_size=self.pool_size,
             max_overflow=self.max_overflow,
             pool_recycle=self.pool_recycle,
             pool_pre_ping=True,  # 连接前测试
+            pool_logging_name="api",
             echo=echo,
+            **pool_options,
         )
+        if settings.metrics_enabled:
+            from dataflow.core.telemetry import instrument_engine
+
+            instrument_engine(self.engine)
 
         # 创建会话工厂
         self.session_factory = async_sessionmaker(
@@ -1,5 +1,7 @@
 """
 Elasticsearch Repository 基类
+
+写入未显式指定路由键时按文档的 source_config_id 路由（与检索侧 source_routing 一致）
 """
 
 from abc import ABC
@@ -30,46 +32,50 @@ class BaseRepository(ABC):
             index: 索引名称
             doc_id: 文档ID
             document: 文档内容
-            routing: 路由键（可选）
+            routing: 路由键（可选，默认使用文档的 source_config_id）
 
         Returns:
             文档ID
         """
         response = await self.es_client.index(
-            index=index, id=doc_id, document=document, routing=routing
+            index=index, id=doc_id, document=document, routing=routing or document.get("source_config_id")
         )
         return response["_id"]
 
-    async def get_document(self, index: str, doc_id: str) -> Optional[Dict[str, Any]]:
+    async def get_document(
+        self, index: str, doc_id: str, routing: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         获取单个文档
 
         Args:
             index: 索引名称
             doc_id: 文档ID
+            routing: 路由键（文档按信息源路由写入时需传入 source_config_id）
 
         Returns:
             文档内容，不存在返回None
         """
         try:
-            response = await self.es_client.get(index=index, id=doc_id)
+            response = await self.es_client.get(index=index, id=doc_id, **({"routing": routing} if routing else {}))
             return response["_source"]
         except Exception:
             return None
 
-    async def delete_document(self, index: str, doc_id: str) -> bool:
+    async def delete_document(self, index: str, doc_id: str, routing: Optional[str] = None) -> bool:
         """
         删除单个文档
 
         Args:
             index: 索引名称
             doc_id: 文档ID
+            routing: 路由键（文档按信息源路由写入时需传入 source_config_id）
 
         Returns:
             是否成功删除
         """
         try:
-            await self.es_client.delete(index=index, id=doc_id)
+            await self.es_client.delete(index=index, id=doc_id, **({"routing": routing} if routing else {}))
             return True
         except Exception:
             return False
@@ -83,22 +89,24 @@ class BaseRepository(ABC):
         Args:
             index: 索引名称
             documents: 文档列表，每个文档需包含 _id 字段
-            routing: 路由键（可选）
+            routing: 路由键（可选，默认按每个文档的 source_config_id 路由）
 
         Returns:
             统计信息：{"success": 10, "failed": 0}
         """
         from elasticsearch.helpers import async_bulk
 
-        actions = [
-            {
+        actions = []
+        for doc in documents:
+            action = {
                 "_index": index,
                 "_id": doc.get("_id") or doc.get("id"),
                 "_source": {k: v for k, v in doc.items() if k not in ["_id", "id"]},
-                **({"_routing": routing} if routing else {}),
             }
-            for doc in documents
-        ]
+            doc_routing = routing or doc.get("source_config_id")
+            if doc_routing:
+                action["_routing"] = doc_routing
+            actions.append(action)
 
         success, failed = await async_bulk(self.es_client, actions, raise_on_error=False)
 
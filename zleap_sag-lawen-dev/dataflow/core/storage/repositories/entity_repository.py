@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from elasticsearch import AsyncElasticsearch
 from elasticsearch_dsl import Q, Search
 
+from dataflow.core.storage.elasticsearch import source_routing
 from dataflow.core.storage.repositories.base import BaseRepository
 from dataflow.db import get_session_factory
 
@@ -206,9 +207,8 @@ class EntityVectorRepository(BaseRepository):
         if filters:
             filter_query = Q("bool", must=filters).to_dict()
 
-        # 使用 source_config_id 作为路由键优化查询性能
-        # 仅在单源时使用 routing，多源时禁用以支持跨分片查询
-        routing = source_config_ids[0] if source_config_ids and len(source_config_ids) == 1 else None
+        # 按信息源路由：单源单值路由，多源多值路由（只访问这些信息源所在的分片）
+        routing = source_routing(source_config_ids)
 
         # 使用vector_search方法
         search_results = await self.es_client.vector_search(
@@ -298,6 +298,7 @@ class EntityVectorRepository(BaseRepository):
             query=query,
             size=total_size,
             return_full_response=True,
+            routing=source_routing(source_config_ids),
         )
 
         results = []
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 from elasticsearch_dsl import Q, Search
 
+from dataflow.core.storage.elasticsearch import source_routing
 from dataflow.core.storage.repositories.base import BaseRepository
 
 
@@ -251,6 +252,7 @@ class EventVectorRepository(BaseRepository):
         source_config_ids: Optional[List[str]] = None,
         category: Optional[str] = None,
         event_ids: Optional[List[str]] = None,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         通过标题向量搜索相似事件
@@ -261,6 +263,7 @@ class EventVectorRepository(BaseRepository):
             source_config_id: 信息源ID（单个，向后兼容）
             source_config_ids: 信息源ID列表（支持多源搜索）
             category: 分类（可选）
+            extra_filters: 额外的 ES filter（如时间范围，kNN 检索前生效）
 
         Returns:
             相似事件列表
@@ -273,6 +276,7 @@ class EventVectorRepository(BaseRepository):
             source_config_ids,
             category,
             event_ids,
+            extra_filters,
         )
 
     async def search_similar_by_content(
@@ -283,6 +287,7 @@ class EventVectorRepository(BaseRepository):
         source_config_ids: Optional[List[str]] = None,
         category: Optional[str] = None,
         event_ids: Optional[List[str]] = None,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         通过内容向量搜索相似事件
@@ -293,6 +298,7 @@ class EventVectorRepository(BaseRepository):
             source_config_id: 信息源ID（单个，向后兼容）
             source_config_ids: 信息源ID列表（支持多源搜索）
             category: 分类（可选）
+            extra_filters: 额外的 ES filter（如时间范围，kNN 检索前生效）
 
         Returns:
             相似事件列表
@@ -305,6 +311,7 @@ class EventVectorRepository(BaseRepository):
             source_config_ids,
             category,
             event_ids,
+            extra_filters,
         )
 
     def _is_valid_vector(self, vector: List[float]) -> bool:
@@ -338,6 +345,7 @@ class EventVectorRepository(BaseRepository):
         source_config_ids: Optional[List[str]] = None,
         category: Optional[str] = None,
         event_ids: Optional[List[str]] = None,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         向量检索（内部方法）
@@ -349,6 +357,7 @@ class EventVectorRepository(BaseRepository):
             source_config_id: 信息源ID（单个，向后兼容）
             source_config_ids: 信息源ID列表（支持多源搜索）
             category: 分类
+            extra_filters: 额外的 ES filter
 
         Returns:
             相似事件列表
@@ -376,16 +385,16 @@ class EventVectorRepository(BaseRepository):
             filters.append(Q("term", category=category))
         if event_ids:
             filters.append(Q("terms", event_id=event_ids))
+        if extra_filters:
+            filters.extend(Q(extra) for extra in extra_filters)
 
         # 构建filter
         filter_query = None
         if filters:
             filter_query = Q("bool", must=filters).to_dict()
 
-        # 使用 source_config_id 作为路由键优化查询性能
-        # 仅在单源时使用 routing，多源时禁用以支持跨分片查询
-        routing = source_config_ids[0] if source_config_ids and len(
-            source_config_ids) == 1 else None
+        # 按信息源路由：单源单值路由，多源多值路由（只访问这些信息源所在的分片）
+        routing = source_routing(source_config_ids)
 
         # 使用vector_search方法
         return await self.es_client.vector_search(
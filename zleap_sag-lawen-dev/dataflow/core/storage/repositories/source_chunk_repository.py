@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 
 from elasticsearch_dsl import Q, Search
 
+from dataflow.core.storage.elasticsearch import source_routing
 from dataflow.core.storage.repositories.base import BaseRepository
 
 
@@ -137,8 +138,8 @@ class SourceChunkRepository(BaseRepository):
         if filters:
             filter_query = Q("bool", must=filters).to_dict()
 
-        # 使用 source_config_id 作为路由键优化查询性能（仅单源时）
-        routing = source_config_id if source_config_id else None
+        # 按信息源路由（与过滤条件一致：优先 source_config_ids）
+        routing = source_routing(source_config_ids or [source_config_id])
 
         # 使用vector_search方法
         return await self.es_client.vector_search(
@@ -190,8 +191,8 @@ class SourceChunkRepository(BaseRepository):
 
         # 转换为字典并执行
         search_dict = s.to_dict()
-        # 如果指定了 source_config_id，使用 routing 优化查询性能
-        routing = source_config_id if source_config_id else None
+        # 按信息源路由（与过滤条件一致：优先 source_config_ids）
+        routing = source_routing(source_config_ids or [source_config_id])
         response = await self.es_client.search(
             index=self.INDEX_NAME,
             query=search_dict.get("query", {}),
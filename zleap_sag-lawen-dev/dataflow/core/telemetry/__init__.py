@@ -0,0 +1,50 @@
+"""
+可观测性模块
+
+提供链路追踪 Span 与 Prometheus 指标导出：
+- Span: 搜索各阶段、ES/MySQL 请求、Embedding/LLM 调用的耗时与数量属性
+- MetricsRegistry: 进程内 Counter/Gauge/Histogram，/metrics 以 Prometheus 文本格式导出
+- is_verbose(): 详细诊断日志的采样开关
+"""
+
+from dataflow.core.telemetry.db import InstrumentedQueuePool, instrument_engine
+from dataflow.core.telemetry.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from dataflow.core.telemetry.tracing import (
+    Span,
+    current_span,
+    is_verbose,
+    record_span,
+    record_timings,
+    set_span_attributes,
+    span,
+    trace,
+    traced,
+)
+
+__all__ = [
+    # 指标
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    # 追踪
+    "Span",
+    "span",
+    "trace",
+    "traced",
+    "current_span",
+    "set_span_attributes",
+    "record_span",
+    "record_timings",
+    "is_verbose",
+    # 数据库
+    "instrument_engine",
+    "InstrumentedQueuePool",
+]
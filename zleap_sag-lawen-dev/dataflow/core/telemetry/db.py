@@ -0,0 +1,122 @@
+"""
+数据库查询计时与连接池指标
+
+通过 SQLAlchemy 游标事件记录每条 SQL 的耗时与影响行数，写入 db.<verb> Span 指标
+（verb 限定为 select/insert/update/delete/other，避免标签基数膨胀）。
+
+连接池使用 InstrumentedQueuePool 时记录（按 pool_logging_name 区分 primary / replica / api）：
+- dataflow_db_pool_checkout_wait_seconds: 取连接的等待时间
+- dataflow_db_pool_timeouts: 取连接超时次数
+- dataflow_db_pool_in_use / dataflow_db_pool_overflow: 已借出连接数、溢出连接数
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from dataflow.core.telemetry.metrics import get_metrics_registry
+from dataflow.core.telemetry.tracing import record_span
+
+# 连接等待时间分桶（秒）：正常应在毫秒级，排队时可达池超时
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_START_KEY = "dataflow_query_start"
+_VERBS = {"select", "insert", "update", "delete"}
+
+
+def _statement_verb(statement: str) -> str:
+    head = (statement or "").lstrip()[:10].split(None, 1)
+    verb = head[0].lower() if head else ""
+    return verb if verb in _VERBS else "other"
+
+
+def _pool_role(pool: Any) -> str:
+    return getattr(pool, "logging_name", None) or "default"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    记录取连接等待时间与借出/溢出连接数的异步连接池
+
+    在借出、归还完成后读取连接池状态；重建连接池（dispose）时保留同一类型与 logging_name。
+    """
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        role = _pool_role(self)
+        try:
+            connection = super()._do_get()
+            _record_pool_usage(self)
+            return connection
+        except sa_exc.TimeoutError:
+            get_metrics_registry().counter(
+                "dataflow_db_pool_timeouts", "取数据库连接超时次数", ["role"]
+            ).inc(role=role)
+            raise
+        finally:
+            get_metrics_registry().histogram(
+                "dataflow_db_pool_checkout_wait_seconds",
+                "取数据库连接的等待时间（秒）",
+                ["role"],
+                buckets=POOL_WAIT_BUCKETS,
+            ).observe(time.perf_counter() - start, role=role)
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        _record_pool_usage(self)
+
+
+def _record_pool_usage(pool: Any) -> None:
+    """记录连接池当前借出数与溢出数"""
+    registry = get_metrics_registry()
+    role = _pool_role(pool)
+    registry.gauge(
+        "dataflow_db_pool_in_use", "已借出的数据库连接数", ["role"]
+    ).set(pool.checkedout(), role=role)
+    registry.gauge(
+        "dataflow_db_pool_overflow", "超出 pool_size 的溢出连接数", ["role"]
+    ).set(max(pool.overflow(), 0), role=role)
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    为引擎注册 SQL 计时事件（重复调用只注册一次）
+
+    Args:
+        engine: AsyncEngine 或 Engine
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if getattr(sync_engine, "_dataflow_instrumented", False):
+        return
+    sync_engine._dataflow_instrumented = True
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_START_KEY)
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        rowcount = getattr(cursor, "rowcount", -1)
+        attributes = {"rows": rowcount} if rowcount is not None and rowcount >= 0 else {}
+        record_span(f"db.{_statement_verb(statement)}", duration, kind="db", **attributes)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get(_START_KEY) if conn is not None else None
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        record_span(
+            f"db.{_statement_verb(exception_context.statement)}",
+            duration,
+            kind="db",
+            status="error",
+        )
@@ -0,0 +1,256 @@
+"""
+轻量级链路追踪
+
+Span 记录耗时与数量类属性（候选数、跳数、字节数等），结束时写入全局直方图：
+- dataflow_span_duration_seconds{span, kind, status}
+- dataflow_span_items{span, attribute}（仅数值属性）
+
+Span 通过 contextvars 形成父子关系，同一协程链内的子 Span 自动挂到当前 Span 下；
+根 Span（trace）同时决定本次请求是否采样输出详细诊断日志（is_verbose）。
+
+使用方式：
+    from dataflow.core.telemetry import span, traced, is_verbose
+
+    @traced("search", kind="search", root=True)
+    async def search(...):
+        ...
+        with span("es.search", kind="es", index=index) as s:
+            hits = ...
+            s.set(hits=len(hits))
+
+        if is_verbose():
+            logger.info(详细配置)
+"""
+
+import functools
+import inspect
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from dataflow.core.telemetry.metrics import DEFAULT_COUNT_BUCKETS, get_metrics_registry
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("dataflow_current_span", default=None)
+_verbose: ContextVar[bool] = ContextVar("dataflow_trace_verbose", default=False)
+
+_verbose_logger = logging.getLogger("dataflow.search")
+
+
+def _settings_enabled() -> bool:
+    from dataflow.core.config import get_settings
+
+    return get_settings().metrics_enabled
+
+
+def _span_duration_histogram():
+    return get_metrics_registry().histogram(
+        "dataflow_span_duration_seconds",
+        "Span 耗时（秒）",
+        ["span", "kind", "status"],
+    )
+
+
+def _span_items_histogram():
+    return get_metrics_registry().histogram(
+        "dataflow_span_items",
+        "Span 数量类属性分布（候选数、跳数、字节数等）",
+        ["span", "attribute"],
+        buckets=DEFAULT_COUNT_BUCKETS,
+    )
+
+
+class Span:
+    """一次计时操作"""
+
+    __slots__ = ("name", "kind", "attributes", "start", "duration", "status", "children", "parent")
+
+    def __init__(self, name: str, kind: str = "internal", parent: Optional["Span"] = None, **attributes: Any) -> None:
+        self.name = name
+        self.kind = kind
+        self.attributes: Dict[str, Any] = attributes
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.children: List["Span"] = []
+        self.parent = parent
+
+    def set(self, **attributes: Any) -> "Span":
+        """设置属性（数值属性会在结束时写入数量直方图）"""
+        self.attributes.update(attributes)
+        return self
+
+    def add(self, key: str, amount: float = 1) -> "Span":
+        """累加数值属性"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为字典（用于调试输出）"""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def _finish(current: Span) -> None:
+    current.duration = time.perf_counter() - current.start
+    _emit(current.name, current.kind, current.duration, current.status, current.attributes)
+
+
+def _emit(name: str, kind: str, duration: float, status: str, attributes: Dict[str, Any]) -> None:
+    if not _settings_enabled():
+        return
+    _span_duration_histogram().observe(duration, span=name, kind=kind, status=status)
+    items = None
+    for key, value in attributes.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if items is None:
+                items = _span_items_histogram()
+            items.observe(value, span=name, attribute=key)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span]:
+    """
+    计时 Span（同步 with，异步代码中同样适用）
+
+    Args:
+        name: Span 名称（如 search.recall、es.search）
+        kind: 类别（search / es / db / embedding / llm / internal）
+        **attributes: 初始属性
+
+    Yields:
+        Span实例
+    """
+    parent = _current_span.get()
+    current = Span(name, kind, parent, **attributes)
+    if parent is not None:
+        parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.status = "error"
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(current)
+
+
+@contextmanager
+def trace(name: str, kind: str = "internal", sample_rate: Optional[float] = None, **attributes: Any) -> Iterator[Span]:
+    """
+    根 Span：除计时外，按采样率决定本次请求是否输出详细诊断日志
+
+    Args:
+        name: Span 名称
+        kind: 类别
+        sample_rate: 详细日志采样率（None 使用配置 trace_verbose_sample_rate）
+        **attributes: 初始属性
+
+    Yields:
+        Span实例
+    """
+    if sample_rate is None:
+        from dataflow.core.config import get_settings
+
+        sample_rate = get_settings().trace_verbose_sample_rate
+
+    sampled = sample_rate >= 1.0 or (sample_rate > 0 and random.random() < sample_rate)
+    token = _verbose.set(sampled or _verbose.get())
+    try:
+        with span(name, kind, **attributes) as root:
+            root.set(verbose=sampled)
+            yield root
+    finally:
+        _verbose.reset(token)
+
+
+def traced(name: str, kind: str = "internal", root: bool = False) -> Callable:
+    """
+    为异步函数包裹 Span 的装饰器
+
+    Args:
+        name: Span 名称
+        kind: 类别
+        root: 是否作为根 Span（参与详细日志采样）
+
+    Returns:
+        装饰器
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError("traced 仅支持 async 函数")
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            context = trace(name, kind) if root else span(name, kind)
+            with context:
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """获取当前 Span（不在 Span 内时返回 None）"""
+    return _current_span.get()
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """给当前 Span 设置属性（不在 Span 内时忽略）"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def record_span(name: str, duration: float, kind: str = "internal", status: str = "ok", **attributes: Any) -> None:
+    """
+    记录一个已完成的耗时（用于已有 perf_counter 计时的步骤）
+
+    Args:
+        name: Span 名称
+        duration: 耗时（秒）
+        kind: 类别
+        status: 状态
+        **attributes: 数量类属性
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        finished = Span(name, kind, parent, **attributes)
+        finished.duration = duration
+        finished.status = status
+        parent.children.append(finished)
+    _emit(name, kind, duration, status, attributes)
+
+
+def record_timings(prefix: str, timings: Optional[Dict[str, float]], kind: str = "search") -> None:
+    """
+    批量记录步骤耗时字典（如 RecallResult.step_timings）
+
+    Args:
+        prefix: Span 名称前缀（如 search.recall）
+        timings: 步骤名 -> 耗时（秒）
+        kind: 类别
+    """
+    for step, duration in (timings or {}).items():
+        if isinstance(duration, (int, float)) and step != "total":
+            record_span(f"{prefix}.{step}", float(duration), kind=kind)
+
+
+def is_verbose() -> bool:
+    """
+    当前请求是否输出详细诊断日志
+
+    被采样的请求，或 dataflow.search 日志级别为 DEBUG 时返回 True
+    """
+    return _verbose.get() or _verbose_logger.isEnabledFor(logging.DEBUG)
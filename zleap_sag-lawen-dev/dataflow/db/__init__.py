@@ -4,7 +4,15 @@
 提供SQLAlchemy ORM模型和数据库操作
 """
 
-from dataflow.db.base import Base, get_engine, get_session_factory, init_database, close_database
+from dataflow.db.base import (
+    Base,
+    close_database,
+    get_engine,
+    get_read_session_factory,
+    get_replica_session_factory,
+    get_session_factory,
+    init_database,
+)
 from dataflow.db.models import (
     Article,
     ArticleSection,
@@ -19,12 +27,21 @@ from dataflow.db.models import (
     SourceEvent,
     Task,
 )
+from dataflow.db.soft_delete import (
+    exclude_deleted_sources,
+    get_deleted_source_ids,
+    get_deleting_article_ids,
+    mark_document_deleted,
+    mark_source_deleted,
+)
 
 __all__ = [
     # Base
     "Base",
     "get_engine",
     "get_session_factory",
+    "get_read_session_factory",
+    "get_replica_session_factory",
     "init_database",
     "close_database",
     # Models
@@ -40,4 +57,10 @@ __all__ = [
     "ChatMessage",
     "ModelConfig",
     "SourceChunk",
+    # 软删除
+    "exclude_deleted_sources",
+    "get_deleted_source_ids",
+    "get_deleting_article_ids",
+    "mark_document_deleted",
+    "mark_source_deleted",
 ]
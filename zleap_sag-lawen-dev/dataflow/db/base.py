@@ -4,7 +4,7 @@
 提供SQLAlchemy Base类和数据库初始化工具
 """
 
-from typing import AsyncIterator, Optional
+from typing import Any, AsyncIterator, Optional
 
 from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import (
@@ -39,6 +39,38 @@ class Base(DeclarativeBase):
 # 全局引擎和会话工厂
 _engine: Optional[AsyncEngine] = None
 _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+# 只读副本引擎和会话工厂（未配置副本时为空）
+_replica_engine: Optional[AsyncEngine] = None
+_replica_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def create_db_engine(url: str, role: str, **kwargs: Any) -> AsyncEngine:
+    """
+    创建数据库引擎（启用指标时使用带等待计时的连接池并注册连接池用量事件）
+
+    MySQL 连接统一设置 UTC 时区。
+
+    Args:
+        url: 数据库连接URL
+        role: 连接池角色（primary / replica），作为指标标签
+        **kwargs: 传给 create_async_engine 的其他参数（pool_size、max_overflow 等）
+
+    Returns:
+        AsyncEngine实例
+    """
+    settings = get_settings()
+    if url.startswith("mysql"):
+        kwargs.setdefault("connect_args", {"init_command": "SET time_zone='+00:00'"})  # UTC时区
+    if settings.metrics_enabled:
+        from dataflow.core.telemetry import InstrumentedQueuePool
+
+        kwargs.setdefault("poolclass", InstrumentedQueuePool)
+    engine = create_async_engine(url, pool_logging_name=role, **kwargs)
+    if settings.metrics_enabled:
+        from dataflow.core.telemetry import instrument_engine
+
+        instrument_engine(engine)
+    return engine
 
 
 def get_engine() -> AsyncEngine:
@@ -51,15 +83,15 @@ def get_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
         settings = get_settings()
-        _engine = create_async_engine(
+        _engine = create_db_engine(
             settings.mysql_url,
+            "primary",
             echo=settings.log_level == "DEBUG",
             pool_size=50,  # 增加到 50（处理大量并发）
             max_overflow=100,  # 增加到 100（峰值可达 150 个连接）
             pool_pre_ping=True,
             pool_recycle=3600,  # 1小时回收连接
             pool_timeout=60,  # 增加超时时间到 60 秒
-            connect_args={"init_command": "SET time_zone='+00:00'"}  # UTC时区
         )
         logger.info(
             "数据库引擎创建完成（UTC时区）",
@@ -68,6 +100,16 @@ def get_engine() -> AsyncEngine:
     return _engine
 
 
+def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """
     获取会话工厂（单例）
@@ -77,18 +119,55 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """
     global _session_factory
     if _session_factory is None:
-        engine = get_engine()
-        _session_factory = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
-        )
+        _session_factory = _create_session_factory(get_engine())
         logger.info("会话工厂创建完成")
     return _session_factory
 
 
+def get_replica_session_factory() -> Optional[async_sessionmaker[AsyncSession]]:
+    """
+    获取只读副本会话工厂（单例，独立连接池）
+
+    Returns:
+        async_sessionmaker实例，未配置 MYSQL_REPLICA_HOST 时返回None
+    """
+    global _replica_engine, _replica_session_factory
+    if _replica_session_factory is None:
+        settings = get_settings()
+        url = settings.mysql_replica_url
+        if url is None:
+            return None
+        _replica_engine = create_db_engine(
+            url,
+            "replica",
+            echo=settings.log_level == "DEBUG",
+            pool_size=settings.db_replica_pool_size,
+            max_overflow=settings.db_replica_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=settings.db_pool_recycle,
+            pool_timeout=60,
+        )
+        _replica_session_factory = _create_session_factory(_replica_engine)
+        logger.info(
+            "只读副本会话工厂创建完成",
+            extra={"host": settings.mysql_replica_host, "pool_size": settings.db_replica_pool_size},
+        )
+    return _replica_session_factory
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    获取只读会话工厂：配置了副本时走副本，否则回退主库
+
+    仅用于只读查询（搜索召回/扩展/排序、结果补全、统计），
+    副本存在复制延迟，刚写入的数据可能短暂不可见。
+
+    Returns:
+        async_sessionmaker实例
+    """
+    return get_replica_session_factory() or get_session_factory()
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     """
     获取数据库会话（用于依赖注入）
@@ -151,10 +230,16 @@ async def close_database() -> None:
     Example:
         >>> await close_database()
     """
-    global _engine, _session_factory
+    global _engine, _session_factory, _replica_engine, _replica_session_factory
 
     if _engine is not None:
         await _engine.dispose()
         _engine = None
         _session_factory = None
         logger.info("数据库连接已关闭")
+
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+        _replica_engine = None
+        _replica_session_factory = None
+        logger.info("只读副本连接已关闭")
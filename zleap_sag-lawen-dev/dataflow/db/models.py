@@ -47,6 +47,9 @@ class SourceConfig(Base):
     # 偏好设置：{"focus": ["AI"], "language": "zh"}
     config: Mapped[Optional[dict]] = mapped_column(JSON)
 
+    # 软删除时间（非空表示正在后台清理，对列表和搜索不可见）
+    deleted_time: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
     # 时间戳
     created_time: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
@@ -118,6 +121,9 @@ class Article(Base):
     # 扩展数据：{"url": "", "headings": []}
     extra_data: Mapped[Optional[dict]] = mapped_column(JSON)
 
+    # 上传文件内容的 SHA-256（同一信息源内去重）
+    content_hash: Mapped[Optional[str]] = mapped_column(CHAR(64))
+
     # 时间戳
     created_time: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
@@ -149,6 +155,8 @@ class Article(Base):
     __table_args__ = (
         Index("idx_source_config_id", "source_config_id"),
         Index("idx_source_config_status", "source_config_id", "status"),
+        # 同一信息源内容唯一（并发上传时由唯一索引兜底去重；content_hash 为空的记录不受限制）
+        Index("uk_source_config_content_hash", "source_config_id", "content_hash", unique=True),
         Index("idx_category", "category"),
     )
 
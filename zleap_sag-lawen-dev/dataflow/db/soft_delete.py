@@ -0,0 +1,129 @@
+"""
+信息源 / 文档软删除标记
+
+删除信息源时先写入 source_config.deleted_time，删除文档时先把 article.status 置为 DELETING，
+再由后台任务分批清理数据。清理期间搜索需排除这些信息源和文档：本模块在进程内缓存
+已软删除的信息源ID与删除中的文档ID，最多每 refresh_interval 秒查询一次数据库
+（其他 worker 在一个刷新周期内可见），本进程发起的删除通过 mark_source_deleted() /
+mark_document_deleted() 立即生效。
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+
+from dataflow.utils import get_logger
+
+logger = get_logger("db.soft_delete")
+
+# 缓存刷新间隔（秒）
+DELETED_SOURCES_REFRESH_INTERVAL = 5.0
+
+_deleted_source_ids: Set[str] = set()
+_local_marks: Set[str] = set()
+# 删除中的文档：article_id -> source_config_id
+_deleting_articles: Dict[str, str] = {}
+_local_article_marks: Dict[str, str] = {}
+_loaded_at: Optional[float] = None
+
+
+def mark_source_deleted(source_config_id: str) -> None:
+    """标记信息源已软删除（本进程立即生效）"""
+    _local_marks.add(source_config_id)
+    _deleted_source_ids.add(source_config_id)
+
+
+def mark_document_deleted(article_id: str, source_config_id: str) -> None:
+    """标记文档删除中（本进程立即生效）"""
+    _local_article_marks[article_id] = source_config_id
+    _deleting_articles[article_id] = source_config_id
+
+
+async def _refresh(refresh_interval: float) -> None:
+    """按刷新间隔从数据库重新加载软删除的信息源与删除中的文档"""
+    global _deleted_source_ids, _deleting_articles, _loaded_at
+
+    now = time.monotonic()
+    if _loaded_at is not None and now - _loaded_at < refresh_interval:
+        return
+
+    from dataflow.db.base import get_session_factory
+    from dataflow.db.models import Article, SourceConfig
+
+    try:
+        async with get_session_factory()() as session:
+            result = await session.execute(
+                select(SourceConfig.id).where(SourceConfig.deleted_time.isnot(None))
+            )
+            loaded = set(result.scalars().all())
+            result = await session.execute(
+                select(Article.id, Article.source_config_id).where(Article.status == "DELETING")
+            )
+            loaded_articles = {article_id: source_id for article_id, source_id in result.all()}
+    except Exception as e:
+        logger.warning(f"⚠️ 读取软删除信息源/文档失败，沿用上次结果: {e}")
+        _loaded_at = now
+        return
+
+    # 数据库中已彻底删除的信息源 / 文档不再需要本地标记
+    _local_marks.intersection_update(loaded)
+    _deleted_source_ids = loaded | _local_marks
+    for article_id in set(_local_article_marks) - set(loaded_articles):
+        del _local_article_marks[article_id]
+    _deleting_articles = {**loaded_articles, **_local_article_marks}
+    _loaded_at = now
+
+
+async def get_deleted_source_ids(refresh_interval: float = DELETED_SOURCES_REFRESH_INTERVAL) -> Set[str]:
+    """
+    获取已软删除（清理中）的信息源ID
+
+    Args:
+        refresh_interval: 缓存刷新间隔（秒）
+
+    Returns:
+        信息源ID集合（数据库不可用时返回上次结果）
+    """
+    await _refresh(refresh_interval)
+    return _deleted_source_ids
+
+
+async def get_deleting_article_ids(
+    source_config_ids: Optional[Iterable[str]] = None,
+    refresh_interval: float = DELETED_SOURCES_REFRESH_INTERVAL,
+) -> Set[str]:
+    """
+    获取删除中（清理未完成）的文档ID
+
+    Args:
+        source_config_ids: 只返回这些信息源下的文档（None 表示全部）
+        refresh_interval: 缓存刷新间隔（秒）
+
+    Returns:
+        文档ID集合（数据库不可用时返回上次结果）
+    """
+    await _refresh(refresh_interval)
+    if source_config_ids is None:
+        return set(_deleting_articles)
+    sources = set(source_config_ids)
+    return {article_id for article_id, source_id in _deleting_articles.items() if source_id in sources}
+
+
+async def exclude_deleted_sources(source_config_ids: Iterable[str]) -> List[str]:
+    """过滤掉已软删除的信息源（保持原顺序）"""
+    source_config_ids = list(source_config_ids)
+    deleted = await get_deleted_source_ids()
+    if not deleted:
+        return source_config_ids
+    return [s for s in source_config_ids if s not in deleted]
+
+
+def reset_deleted_sources() -> None:
+    """清空缓存（测试）"""
+    global _loaded_at
+    _deleted_source_ids.clear()
+    _local_marks.clear()
+    _deleting_articles.clear()
+    _local_article_marks.clear()
+    _loaded_at = None
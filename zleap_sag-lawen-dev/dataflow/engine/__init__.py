@@ -12,6 +12,7 @@ from dataflow.engine.config import (
 from dataflow.engine.core import DataFlowEngine
 from dataflow.engine.enums import LogLevel, OutputMode, TaskStage, TaskStatus
 from dataflow.engine.models import StageResult, TaskLog, TaskResult
+from dataflow.engine.runtime import EngineRuntime, get_engine_runtime
 from dataflow.modules.extract.config import ExtractBaseConfig
 from dataflow.modules.load.config import (
     DocumentLoadConfig,
@@ -23,6 +24,8 @@ from dataflow.modules.search.config import SearchBaseConfig
 __all__ = [
     # 核心引擎
     "DataFlowEngine",
+    "EngineRuntime",
+    "get_engine_runtime",
     # 配置类
     "ModelConfig",
     "LoadBaseConfig",
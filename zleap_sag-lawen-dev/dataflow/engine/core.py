@@ -11,8 +11,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy import select
 
-from dataflow.core.prompt.manager import get_prompt_manager
-from dataflow.db import SourceChunk, SourceConfig, get_session_factory
+from dataflow.db import SourceChunk, SourceConfig
 from dataflow.engine.config import (
     ModelConfig,
     OutputConfig,
@@ -20,6 +19,7 @@ from dataflow.engine.config import (
 )
 from dataflow.engine.enums import LogLevel, TaskStage, TaskStatus
 from dataflow.engine.models import StageResult, TaskLog, TaskResult
+from dataflow.engine.runtime import ensure_logging, get_engine_runtime
 from dataflow.modules.extract.config import ExtractBaseConfig, ExtractConfig
 from dataflow.modules.extract.extractor import EventExtractor
 from dataflow.modules.load.config import (
@@ -31,7 +31,7 @@ from dataflow.modules.load.config import (
 from dataflow.modules.load.loader import DocumentLoader, ConversationLoader
 from dataflow.modules.search.config import SearchBaseConfig, SearchConfig
 from dataflow.modules.search.searcher import EventSearcher
-from dataflow.utils import get_logger, setup_logging
+from dataflow.utils import get_logger
 
 logger = get_logger("dataflow.engine")
 
@@ -82,31 +82,27 @@ class DataFlowEngine:
             auto_setup_logging: 是否自动设置日志
         """
         if auto_setup_logging:
-            setup_logging()
+            ensure_logging()
 
         # 配置
         self.task_config = task_config
 
-        # 转换 model_config 为字典（如果有）
-        self.model_config_dict = model_config.model_dump() if model_config else None
+        # 每个引擎持有自己的配置副本（修改不影响其他引擎）
+        self.model_config: Optional[ModelConfig] = model_config.model_copy(deep=True) if model_config else None
 
         # 生成任务ID
         self.task_id = str(uuid.uuid4())
 
-        # 初始化组件
-        self.prompt_manager = get_prompt_manager()
-        self.session_factory = get_session_factory()
+        # 共享组件（进程内只构建一次）
+        self.runtime = get_engine_runtime()
+        self.prompt_manager = self.runtime.prompt_manager
+        self.session_factory = self.runtime.session_factory
 
-        self.document_loader = DocumentLoader()
-        self.conversation_loader = ConversationLoader()
-        self.extractor = EventExtractor(
-            prompt_manager=self.prompt_manager,
-            model_config=self.model_config_dict
-        )
-        self.searcher = EventSearcher(
-            prompt_manager=self.prompt_manager,
-            model_config=self.model_config_dict
-        )
+        # 阶段组件按需创建（轻量包装，引用共享组件）
+        self._document_loader: Optional[DocumentLoader] = None
+        self._conversation_loader: Optional[ConversationLoader] = None
+        self._extractor: Optional[EventExtractor] = None
+        self._searcher: Optional[EventSearcher] = None
 
         # 初始化结果
         task_name = task_config.task_name if task_config else "DataFlow任务"
@@ -123,6 +119,44 @@ class DataFlowEngine:
 
         self._log(TaskStage.INIT, LogLevel.INFO, f"引擎初始化完成: {self.task_id}")
 
+    @property
+    def model_config_dict(self) -> Optional[Dict[str, Any]]:
+        """LLM配置字典（传给提取器/搜索器）"""
+        return self.model_config.model_dump() if self.model_config else None
+
+    @property
+    def document_loader(self) -> DocumentLoader:
+        if self._document_loader is None:
+            self._document_loader = DocumentLoader(
+                parser=self.runtime.markdown_parser,
+                processor=self.runtime.document_processor,
+            )
+        return self._document_loader
+
+    @property
+    def conversation_loader(self) -> ConversationLoader:
+        if self._conversation_loader is None:
+            self._conversation_loader = ConversationLoader(processor=self.runtime.document_processor)
+        return self._conversation_loader
+
+    @property
+    def extractor(self) -> EventExtractor:
+        if self._extractor is None:
+            self._extractor = EventExtractor(
+                prompt_manager=self.prompt_manager,
+                model_config=self.model_config_dict
+            )
+        return self._extractor
+
+    @property
+    def searcher(self) -> EventSearcher:
+        if self._searcher is None:
+            self._searcher = EventSearcher(
+                prompt_manager=self.prompt_manager,
+                model_config=self.model_config_dict
+            )
+        return self._searcher
+
     def _log(
         self,
         stage: TaskStage,
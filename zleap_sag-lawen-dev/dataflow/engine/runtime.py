@@ -0,0 +1,84 @@
+"""
+引擎共享运行时
+
+DataFlowEngine 的不可变重组件每个进程只构建一次，由所有引擎实例共享：
+- 日志配置（setup_logging 只执行一次）
+- 提示词管理器、数据库会话工厂、ES 客户端（进程级单例）
+- 文档处理器（元数据生成 / 摘要器）与默认 Markdown 解析器（格式转换器、Token 估算器）
+- 系统默认实体类型（见 dataflow.modules.extract.entity_types，进程内缓存）
+
+引擎实例只持有任务级状态（配置、结果、日志），加载器/提取器/搜索器为轻量包装，
+按需创建并引用这里的共享组件。
+"""
+
+import threading
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dataflow.core.prompt.manager import PromptManager, get_prompt_manager
+from dataflow.db import get_session_factory
+from dataflow.utils import get_logger, setup_logging
+
+logger = get_logger("dataflow.engine.runtime")
+
+_lock = threading.Lock()
+_runtime: Optional["EngineRuntime"] = None
+_logging_configured = False
+
+
+def ensure_logging() -> None:
+    """配置日志系统（每个进程只执行一次）"""
+    global _logging_configured
+    if _logging_configured:
+        return
+    with _lock:
+        if not _logging_configured:
+            setup_logging()
+            _logging_configured = True
+
+
+class EngineRuntime:
+    """引擎共享组件（进程级，只读）"""
+
+    def __init__(self) -> None:
+        from dataflow.modules.load.parser import MarkdownParser
+        from dataflow.modules.load.processor import DocumentProcessor
+
+        self.prompt_manager: PromptManager = get_prompt_manager()
+        self.session_factory: async_sessionmaker[AsyncSession] = get_session_factory()
+        self.document_processor = DocumentProcessor()
+        # 默认参数的解析器（无可变状态，可并发复用）
+        self.markdown_parser = MarkdownParser(min_content_length=100, merge_short_sections=True)
+
+        logger.info("引擎共享运行时初始化完成")
+
+    @property
+    def es_client(self):
+        """ES 客户端（进程级单例，首次访问时创建）"""
+        from dataflow.core.storage.elasticsearch import get_es_client
+
+        return get_es_client()
+
+
+def get_engine_runtime() -> EngineRuntime:
+    """
+    获取引擎共享运行时（线程安全的单例）
+
+    Returns:
+        EngineRuntime实例
+    """
+    global _runtime
+    if _runtime is None:
+        with _lock:
+            if _runtime is None:
+                _runtime = EngineRuntime()
+    return _runtime
+
+
+def reset_engine_runtime() -> None:
+    """重置共享运行时（测试或配置变更后使用）"""
+    global _runtime, _logging_configured
+    with _lock:
+        _runtime = None
+        _logging_configured = False
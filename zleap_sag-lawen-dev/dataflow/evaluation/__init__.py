@@ -4,6 +4,8 @@ Evaluation package
 提供完整的评估框架，包括数据集加载、检索评估和QA评估
 """
 
+from .bench_runner import BenchmarkRunner, RecallAccumulator
+from .corpus_ingest import CorpusIngestor, IngestReport
 from .benchmark import Evaluate, EvaluationConfig, quick_evaluate
 from .utils import DatasetLoader, load_dataset, get_gold_answers, get_gold_docs
 from .metrics import (
@@ -18,6 +20,10 @@ __all__ = [
     'Evaluate',
     'EvaluationConfig',
     'quick_evaluate',
+    'BenchmarkRunner',
+    'RecallAccumulator',
+    'CorpusIngestor',
+    'IngestReport',
     # 数据加载
     'DatasetLoader',
     'load_dataset',
@@ -0,0 +1,373 @@
+"""
+检索基准执行器
+
+- 有界并发：N 个 worker 从队列取问题，每个 worker 持有独立的搜索器
+- 断点续跑：每个问题完成后立即追加写入 JSONL 检查点，中断后重新运行只处理未完成的问题
+- 增量指标：Recall@k、全部/部分/零召回、token 消耗按问题 O(1) 累加，进度回调不再重算全部结果
+- 阶段耗时：从每个问题的 Span 树提取 search / search.recall / search.expand / search.rerank 耗时，
+  汇总为 p50 / p95 / max
+
+使用方式：
+    runner = BenchmarkRunner(searcher_factory, gold_docs=gold_docs, concurrency=4,
+                             checkpoint_path="outputs/run.jsonl")
+    report = await runner.run(questions)
+    report["summary"]["recall"]   # {"Recall@1": ..., ...}
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from dataflow.core.telemetry import Span, span
+from dataflow.evaluation.perf.runner import StageResult
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.bench_runner")
+
+DEFAULT_K_LIST = (1, 2, 5, 10)
+
+# 单个问题的搜索函数：question -> SAGSearcher.search 的返回（至少包含 sections）
+SearchFn = Callable[[str], Awaitable[Dict[str, Any]]]
+
+# 当前问题的 token 计数（LLMTokenTracker.record 写入）
+_question_tokens: ContextVar[Optional[Dict[str, int]]] = ContextVar("bench_question_tokens", default=None)
+
+
+def record_question_tokens(prompt: int, completion: int, total: int) -> None:
+    """把一次 LLM 调用的 token 计入当前问题（不在基准问题内时忽略）"""
+    tokens = _question_tokens.get()
+    if tokens is None:
+        return
+    tokens["prompt"] += prompt
+    tokens["completion"] += completion
+    tokens["total"] += total
+
+
+def check_content_similarity(gold_content: str, retrieved_content: str) -> bool:
+    """标准内容的词有一半以上出现在检索内容中即认为匹配"""
+    gold_words = set(gold_content.lower().split())
+    if not gold_words:
+        return False
+    retrieved_words = set(retrieved_content.lower().split())
+    return len(gold_words & retrieved_words) / len(gold_words) >= 0.5
+
+
+def extract_retrieved_docs(sections: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """检索段落 → {title, content}（去掉标题的 markdown # 前缀，丢弃标题或内容为空的段落）"""
+    retrieved = []
+    for section in sections:
+        title = (section.get("heading") or "").lstrip("#").strip()
+        content = (section.get("content") or "").strip()
+        if title and content:
+            retrieved.append({"title": title, "content": content})
+    return retrieved
+
+
+def match_gold_docs(gold_docs: Sequence[Dict[str, str]], retrieved_docs: Sequence[Dict[str, str]]) -> List[str]:
+    """标题相同且内容相似的标准文档标题列表"""
+    matched = []
+    for gold_doc in gold_docs:
+        gold_title = gold_doc["title"].strip().lower()
+        for retrieved_doc in retrieved_docs:
+            if gold_title == retrieved_doc["title"].strip().lower() and check_content_similarity(
+                gold_doc["content"], retrieved_doc["content"]
+            ):
+                matched.append(gold_doc["title"])
+                break
+    return matched
+
+
+def dedupe_sections(sections: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """按 chunk_id 去重（保持顺序，丢弃没有 chunk_id 的段落）"""
+    seen = set()
+    unique = []
+    for section in sections:
+        chunk_id = section.get("chunk_id")
+        if chunk_id and chunk_id not in seen:
+            seen.add(chunk_id)
+            unique.append(section)
+    return unique
+
+
+class RecallAccumulator:
+    """
+    增量召回指标
+
+    每个问题 add 一次，更新计数与 Recall@k 累加和；Recall@k 与 RetrievalRecall 的池化结果一致
+    （按标题计算，标准文档为空的问题记 0）。没有标准文档信息（gold_titles 为 None）的问题
+    只计入成功/失败与 token，不计入召回指标。
+    """
+
+    def __init__(self, k_list: Sequence[int] = DEFAULT_K_LIST):
+        self.k_list = sorted(set(k_list))
+        self.processed = 0
+        self.failed = 0
+        self.evaluated = 0
+        self.full = 0
+        self.partial = 0
+        self.zero = 0
+        self.recall_sums = {k: 0.0 for k in self.k_list}
+        self.tokens = {"prompt": 0, "completion": 0, "total": 0}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """累加一个问题的结果"""
+        self.processed += 1
+        if not record.get("search_success"):
+            self.failed += 1
+        for key, value in (record.get("tokens") or {}).items():
+            if key in self.tokens:
+                self.tokens[key] += value
+
+        gold_titles = record.get("gold_titles")
+        if gold_titles is None:
+            return
+
+        self.evaluated += 1
+        matched = len(record.get("matched_docs") or [])
+        if matched == 0:
+            self.zero += 1
+        elif matched < len(gold_titles):
+            self.partial += 1
+        else:
+            self.full += 1
+
+        for k in self.k_list:
+            self.recall_sums[k] += (record.get("recall") or {}).get(f"Recall@{k}", 0.0)
+
+    def recall(self) -> Dict[str, float]:
+        """当前池化 Recall@k"""
+        if not self.evaluated:
+            return {f"Recall@{k}": 0.0 for k in self.k_list}
+        return {f"Recall@{k}": round(self.recall_sums[k] / self.evaluated, 4) for k in self.k_list}
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总统计"""
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "evaluated": self.evaluated,
+            "full_recall": self.full,
+            "partial_recall": self.partial,
+            "zero_recall": self.zero,
+            "recall": self.recall(),
+            "tokens": dict(self.tokens),
+        }
+
+    @staticmethod
+    def example_recall(gold_titles: Sequence[str], retrieved_titles: Sequence[str], k_list: Sequence[int]) -> Dict[str, float]:
+        """单个问题的 Recall@k（与 RetrievalRecall 相同的算法）"""
+        gold = set(gold_titles)
+        if not gold:
+            return {f"Recall@{k}": 0.0 for k in k_list}
+        return {f"Recall@{k}": len(set(retrieved_titles[:k]) & gold) / len(gold) for k in k_list}
+
+
+class CheckpointFile:
+    """JSONL 检查点：每行一个问题的结果，逐行追加并刷盘"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def load(self) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """读取已完成的问题（截掉中断时写了一半的末行，跳过无法解析的行）"""
+        completed: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        if not self.path.exists():
+            return completed
+        self._truncate_partial_tail()
+        with self.path.open("r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    completed[(record["question_index"], record["question"])] = record
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"⚠️ 检查点第 {line_no} 行无法解析，已跳过: {self.path}")
+        return completed
+
+    def _truncate_partial_tail(self) -> None:
+        """末行没有换行符说明写入被中断，截掉以免后续追加的记录拼接到半行上"""
+        with self.path.open("rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                logger.warning(f"⚠️ 检查点末行不完整，已截断: {self.path}")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """追加一条结果"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _stage_durations(root: Span) -> Dict[str, float]:
+    """从问题 Span 树中提取搜索阶段耗时（秒，同名阶段累加）"""
+    durations: Dict[str, float] = {}
+    stack = list(root.children)
+    while stack:
+        node = stack.pop()
+        name = node.name
+        if (name == "search" or name.startswith("search.")) and name.count(".") <= 1:
+            durations[name] = durations.get(name, 0.0) + (node.duration or 0.0)
+        stack.extend(node.children)
+    return durations
+
+
+class BenchmarkRunner:
+    """有界并发、可断点续跑的检索基准执行器"""
+
+    def __init__(
+        self,
+        searcher_factory: Callable[[], SearchFn],
+        gold_docs: Optional[Sequence[Sequence[Dict[str, str]]]] = None,
+        k_list: Sequence[int] = DEFAULT_K_LIST,
+        concurrency: int = 4,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        progress_every: int = 0,
+        on_progress: Optional[Callable[[int, int, Dict[str, Any]], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            searcher_factory: 每个 worker 调用一次，返回该 worker 使用的搜索函数
+            gold_docs: 每个问题的标准文档 [{title, content}]，与问题列表按下标对齐
+            k_list: Recall@k 的 k 值
+            concurrency: 并发问题数
+            checkpoint_path: 检查点文件（None 不写检查点）
+            progress_every: 每完成 N 个问题回调一次 on_progress（0 不回调）
+            on_progress: 进度回调 (已完成数, 总数, 当前汇总)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency 必须大于等于 1")
+        self.searcher_factory = searcher_factory
+        self.gold_docs = gold_docs
+        self.k_list = sorted(set(k_list))
+        self.concurrency = concurrency
+        self.checkpoint = CheckpointFile(checkpoint_path) if checkpoint_path else None
+        self.progress_every = progress_every
+        self.on_progress = on_progress
+
+        self.accumulator = RecallAccumulator(self.k_list)
+        self.stages: Dict[str, StageResult] = {}
+        self._total = 0
+        self._resumed = 0
+
+    def _gold_for(self, index: int) -> Optional[Sequence[Dict[str, str]]]:
+        if self.gold_docs is None or index >= len(self.gold_docs):
+            return None
+        return self.gold_docs[index]
+
+    def _record_stage(self, stage: str, seconds: float) -> None:
+        result = self.stages.get(stage)
+        if result is None:
+            result = self.stages[stage] = StageResult(stage)
+        result.add(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """当前汇总：召回指标 + 各阶段耗时分位数"""
+        summary = self.accumulator.summary()
+        summary["total"] = self._total
+        summary["resumed"] = self._resumed
+        summary["latency"] = [self.stages[name].summary() for name in sorted(self.stages)]
+        return summary
+
+    def _absorb(self, record: Dict[str, Any]) -> None:
+        """把一条结果计入累加器与阶段耗时"""
+        self.accumulator.add(record)
+        for stage, ms in (record.get("stage_ms") or {}).items():
+            self._record_stage(stage, ms / 1000)
+        if record.get("duration_ms") is not None:
+            self._record_stage("question", record["duration_ms"] / 1000)
+
+    async def _run_question(self, search: SearchFn, index: int, question: str) -> Dict[str, Any]:
+        """执行单个问题并组装结果记录"""
+        tokens = {"prompt": 0, "completion": 0, "total": 0}
+        token_ctx = _question_tokens.set(tokens)
+        record: Dict[str, Any] = {"question_index": index + 1, "question": question}
+        start = time.perf_counter()
+        try:
+            with span("benchmark.question", kind="benchmark") as root:
+                try:
+                    result = await search(question)
+                    sections = dedupe_sections(result.get("sections", []))
+                    record.update(sections=sections, total_sections=len(sections), search_success=True)
+                except Exception as e:
+                    logger.error(f"   Search failed: {e}")
+                    record.update(sections=[], total_sections=0, search_success=False, error=str(e))
+        finally:
+            _question_tokens.reset(token_ctx)
+
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        record["stage_ms"] = {name: round(sec * 1000, 3) for name, sec in _stage_durations(root).items()}
+        record["tokens"] = tokens
+
+        gold = self._gold_for(index)
+        if gold is not None:
+            retrieved = extract_retrieved_docs(record["sections"])
+            gold_titles = [doc["title"] for doc in gold]
+            record["matched_docs"] = match_gold_docs(gold, retrieved)
+            record["gold_titles"] = gold_titles
+            record["recall"] = RecallAccumulator.example_recall(
+                gold_titles, [doc["title"] for doc in retrieved], self.k_list
+            )
+        return record
+
+    async def _complete(self, record: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        """记录结果、写检查点、按需回调进度"""
+        results.append(record)
+        if self.checkpoint is not None:
+            self.checkpoint.append(record)
+        self._absorb(record)
+
+        processed = self.accumulator.processed
+        if self.on_progress and self.progress_every and processed % self.progress_every == 0:
+            await self.on_progress(processed, self._total, self.summary())
+
+    async def run(self, questions: Sequence[str]) -> Dict[str, Any]:
+        """
+        执行基准
+
+        Args:
+            questions: 问题列表（下标与 gold_docs 对齐）
+
+        Returns:
+            {"results": 按问题顺序排列的结果记录, "summary": 汇总统计}
+        """
+        self._total = len(questions)
+        results: List[Dict[str, Any]] = []
+
+        completed = self.checkpoint.load() if self.checkpoint is not None else {}
+        pending: asyncio.Queue = asyncio.Queue()
+        for index, question in enumerate(questions):
+            record = completed.get((index + 1, question))
+            if record is not None:
+                results.append(record)
+                self._absorb(record)
+            else:
+                pending.put_nowait((index, question))
+        self._resumed = len(results)
+        if self._resumed:
+            logger.info(f"♻️ 从检查点恢复 {self._resumed}/{self._total} 个已完成问题")
+
+        async def worker() -> None:
+            search = self.searcher_factory()
+            while True:
+                try:
+                    index, question = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                record = await self._run_question(search, index, question)
+                await self._complete(record, results)
+
+        workers = min(self.concurrency, pending.qsize())
+        if workers:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+
+        results.sort(key=lambda r: r["question_index"])
+        return {"results": results, "summary": self.summary()}
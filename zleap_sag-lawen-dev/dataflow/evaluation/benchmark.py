@@ -15,6 +15,9 @@
 
       可选参数:
       --chunks-per-file 500  # 每个文件的片段数（默认: 500）
+      --bulk                 # 批量入库：直接写入片段、批量向量化/索引、并发提取（不生成 markdown）
+      --resume-source ID     # 配合 --bulk：续跑中断的批量上传（只处理未完成的片段）
+      --extract-concurrency 50  # 配合 --bulk：提取并发数（默认: 50）
 
    b) Search 模式 - 执行检索并评估召回率:
       python dataflow/evaluation/benchmark.py \
@@ -28,6 +31,8 @@
       --search-verbose       # 显示详细检索过程
       --enable-qa            # 启用 QA 评估
       --no-paragraphs        # 隐藏段落详细信息
+      --concurrency 4        # 并发检索的问题数（默认: 1）
+      --checkpoint run.jsonl # 检查点文件，中断后用同一文件重跑只处理未完成的问题
 
    c) Badcase Zero 模式 - 重测 Zero Recall Badcase:
       python dataflow/evaluation/benchmark.py \
@@ -117,6 +122,12 @@ from dataflow.core.storage.elasticsearch import close_es_client
 from dataflow.core.ai.factory import create_llm_client
 from dataflow.core.ai.base import BaseLLMClient
 from dataflow.core.ai.models import LLMMessage, LLMRole
+from dataflow.evaluation.bench_runner import (
+    BenchmarkRunner,
+    check_content_similarity,
+    extract_retrieved_docs,
+    record_question_tokens,
+)
 
 # Token追踪器（最小化版本）
 class LLMTokenTracker:
@@ -145,6 +156,9 @@ class LLMTokenTracker:
         self.stages[stage]["completion"] += completion
         self.stages[stage]["total"] += total
 
+        # 同时计入当前基准问题（BenchmarkRunner 按问题统计 token）
+        record_question_tokens(prompt, completion, total)
+
     def get_summary(self) -> Dict[str, Any]:
         """获取统计"""
         return {
@@ -504,7 +518,7 @@ class Evaluate:
         }
     
     @classmethod
-    async def search_questions(cls, source_config_id: str, questions: List[str], limit: Optional[int] = None, verbose: bool = False, bench_size: Optional[int] = None, callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+    async def search_questions(cls, source_config_id: str, questions: List[str], limit: Optional[int] = None, verbose: bool = False, bench_size: Optional[int] = None, callback: Optional[Callable] = None, concurrency: int = 1, checkpoint_path: Optional[str] = None, gold_docs: Optional[List[List[Dict[str, str]]]] = None) -> List[Dict[str, Any]]:
         """
         对问题列表进行检索，返回检索结果
 
@@ -514,10 +528,13 @@ class Evaluate:
             limit: 限制处理的问题数量
             verbose: 是否显示详细信息
             bench_size: 每N个问题执行一次回调
-            callback: 回调函数，接收 (current_idx, total, results_so_far)
+            callback: 回调函数，接收 (已完成数, total, 当前汇总)，汇总格式见 BenchmarkRunner.summary
+            concurrency: 并发检索的问题数
+            checkpoint_path: 检查点文件（JSONL），已完成的问题在重新运行时直接复用
+            gold_docs: 每个问题的标准文档，提供时结果中附带 matched_docs / gold_titles / recall
 
         Returns:
-            检索结果列表
+            检索结果列表（按问题顺序）
         """
         import logging
 
@@ -565,90 +582,69 @@ class Evaluate:
             for logger_name in ['dataflow.modules.search', 'elasticsearch', 'urllib3']:
                 logging.getLogger(logger_name).setLevel(logging.ERROR)
         
-        # 初始化搜索器
-        prompt_manager = PromptManager()
-        searcher = SAGSearcher(prompt_manager=prompt_manager)
-        
         # 应用限制
         process_questions = questions[:limit] if limit else questions
-        logger.info(f"Processing {len(process_questions)} questions for search")
-        
-        search_results = []
-
-        for i, question in enumerate(process_questions, 1):
-            if verbose:
-                logger.info(f"\n[{i}/{len(process_questions)}] Searching: {question}")
-
-            # 配置搜索参数
-            search_config = SearchConfig(
-                query=question,
-                source_config_id=source_config_id,
-                return_type=ReturnType.PARAGRAPH,
-                recall=RecallConfig(
-                    use_fast_mode=False,
-                    vector_top_k=50,
-                    max_entities=50,
-                    recall_mode=RecallMode.FUZZY,
-                    entity_similarity_threshold=0.3,
-                    entity_weight_threshold=0.2
-                ),
-                expand=ExpandConfig(max_hops=3),
-                rerank=RerankConfig(
-                    max_results=10,
-                    score_threshold=0.45,
-                    strategy="pagerank"
-                )
-            )
-            
-            try:
-                # 执行搜索
-                search_result = await searcher.search(search_config)
-                sections = search_result.get("sections", [])
-                
-                # 段落去重
-                seen_chunk_ids = set()
-                unique_sections = []
-                for section in sections:
-                    chunk_id = section.get('chunk_id')
-                    if chunk_id and chunk_id not in seen_chunk_ids:
-                        seen_chunk_ids.add(chunk_id)
-                        unique_sections.append(section)
-                
-                search_results.append({
-                    'question_index': i,
-                    'question': question,
-                    'sections': unique_sections,
-                    'total_sections': len(unique_sections),
-                    'search_success': True
-                })
-                
+        logger.info(f"Processing {len(process_questions)} questions for search (concurrency={concurrency})")
+
+        def searcher_factory():
+            # 每个 worker 使用独立的搜索器，避免并发请求共享子搜索器状态
+            searcher = SAGSearcher(prompt_manager=PromptManager())
+
+            async def search(question: str) -> Dict[str, Any]:
                 if verbose:
-                    logger.info(f"   Found {len(unique_sections)} unique sections")
-                    
-            except Exception as e:
-                logger.error(f"   Search failed: {e}")
-                search_results.append({
-                    'question_index': i,
-                    'question': question,
-                    'sections': [],
-                    'total_sections': 0,
-                    'search_success': False,
-                    'error': str(e)
-                })
+                    logger.info(f"\nSearching: {question}")
+
+                # 配置搜索参数
+                search_config = SearchConfig(
+                    query=question,
+                    source_config_id=source_config_id,
+                    return_type=ReturnType.PARAGRAPH,
+                    recall=RecallConfig(
+                        use_fast_mode=False,
+                        vector_top_k=50,
+                        max_entities=50,
+                        recall_mode=RecallMode.FUZZY,
+                        entity_similarity_threshold=0.3,
+                        entity_weight_threshold=0.2
+                    ),
+                    expand=ExpandConfig(max_hops=3),
+                    rerank=RerankConfig(
+                        max_results=10,
+                        score_threshold=0.45,
+                        strategy="pagerank"
+                    )
+                )
+                return await searcher.search(search_config)
 
-            # 🆕 每 bench_size 个问题执行回调
-            if bench_size and callback and i % bench_size == 0:
-                await callback(i, len(process_questions), search_results)
+            return search
+
+        runner = BenchmarkRunner(
+            searcher_factory,
+            gold_docs=gold_docs,
+            concurrency=concurrency,
+            checkpoint_path=checkpoint_path,
+            progress_every=bench_size or 0,
+            on_progress=callback,
+        )
 
-        # 清理资源
         try:
-            await close_es_client()
-        except Exception as e:
-            logger.warning(f"Error closing ES client: {e}")
+            report = await runner.run(process_questions)
+        finally:
+            # 清理资源
+            try:
+                await close_es_client()
+            except Exception as e:
+                logger.warning(f"Error closing ES client: {e}")
+
+        search_results = report["results"]
+        for row in report["summary"]["latency"]:
+            logger.info(
+                f"   ⏱️ {row['stage']}: p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms max={row['max_ms']:.1f}ms"
+            )
 
         logger.info(f"Search completed for {len(search_results)} questions")
         return search_results
-    
+
     @classmethod
     def _check_content_similarity(cls, gold_content: str, retrieved_content: str) -> bool:
         """
@@ -661,22 +657,10 @@ class Evaluate:
         Returns:
             是否匹配
         """
-        # 简单的内容匹配逻辑：检查关键词是否存在
-        gold_words = set(gold_content.lower().split())
-        retrieved_words = set(retrieved_content.lower().split())
-        
-        # 计算交集的比例
-        if len(gold_words) == 0:
-            return False
-            
-        intersection = gold_words & retrieved_words
-        similarity_ratio = len(intersection) / len(gold_words)
-        
-        # 如果交集超过50%，认为匹配成功
-        return similarity_ratio >= 0.5
+        return check_content_similarity(gold_content, retrieved_content)
     
     @classmethod
-    async def show_retrieval_info(cls, limit: Optional[int] = None, show_paragraphs: bool = True, enable_search: bool = False, search_verbose: bool = False, enable_qa: bool = False, dataset_name: Optional[str] = None, badcase: Optional[str] = None, bench_size: Optional[int] = None, enable_mlflow: bool = False, mlflow_uri: Optional[str] = None, mlflow_experiment: Optional[str] = None) -> Dict[str, Any]:
+    async def show_retrieval_info(cls, limit: Optional[int] = None, show_paragraphs: bool = True, enable_search: bool = False, search_verbose: bool = False, enable_qa: bool = False, dataset_name: Optional[str] = None, badcase: Optional[str] = None, bench_size: Optional[int] = None, enable_mlflow: bool = False, mlflow_uri: Optional[str] = None, mlflow_experiment: Optional[str] = None, concurrency: int = 1, checkpoint_path: Optional[str] = None) -> Dict[str, Any]:
         """
         显示检索相关信息：最新的 source_config_id、dataset_name 和数据集内容，可选进行实际检索
 
@@ -688,6 +672,8 @@ class Evaluate:
             enable_qa: 是否启用 QA 评估功能
             dataset_name: 数据集名称。如果为None，则遍历所有数据集目录找最新的
             badcase: 加载特定的 badcase 进行测试 ('zero' 或 'partial')
+            concurrency: 并发检索的问题数
+            checkpoint_path: 检索检查点文件（JSONL），中断后使用同一文件重新运行可跳过已完成的问题
 
         Returns:
             完整的检索信息字典
@@ -878,8 +864,8 @@ class Evaluate:
                     bench_logger.addHandler(console_handler)
                     bench_logger.propagate = False  # 不传播到root logger
 
-                # 定义 bench_size 回调函数
-                async def bench_callback(current_idx, total, results_so_far):
+                # 定义 bench_size 回调函数（汇总由 BenchmarkRunner 增量维护，不再重算已完成问题）
+                async def bench_callback(current_idx, total, summary):
                     """每 bench_size 个问题执行的回调"""
                     # 计算批次信息 (批次从1开始编号)
                     batch_index = (current_idx + bench_size - 1) // bench_size  # 向上取整
@@ -889,95 +875,30 @@ class Evaluate:
                     bench_logger.info(f"📝 Bench 进度: 批次 {batch_index}/{total_batches} ({current_idx}/{total} 问题)")
                     bench_logger.info(f"{'='*80}")
 
-                    # 获取当前已处理问题的 gold_docs
-                    current_gold_docs = gold_docs_for_recall[:current_idx]
-
-                    # 计算累积统计（重新计算 matched_docs，因为此时还没有匹配信息）
-                    full_count = 0
-                    partial_count = 0
-                    zero_count = 0
-
-                    for i, result in enumerate(results_so_far):
-                        gold_docs = current_gold_docs[i]
-                        retrieved_docs = []
-
-                        # 获取检索结果段落（格式与召回评估一致）
-                        for section in result['sections']:
-                            heading = section.get('heading', '')
-                            content = section.get('content', '')
-                            clean_heading = heading.lstrip('#').strip()
-                            clean_content = content.strip()
-                            if clean_heading and clean_content:
-                                retrieved_docs.append({
-                                    'title': clean_heading,
-                                    'content': clean_content
-                                })
-
-                        # 重新计算 matched_docs
-                        matched_docs = []
-                        for gold_doc in gold_docs:
-                            for retrieved_doc in retrieved_docs:
-                                title_match = gold_doc['title'].strip().lower() == retrieved_doc['title'].strip().lower()
-                                content_match = cls._check_content_similarity(
-                                    gold_doc['content'],
-                                    retrieved_doc['content']
-                                )
-                                if title_match and content_match:
-                                    matched_docs.append(gold_doc['title'])
-                                    break
-
-                        if len(matched_docs) == 0:
-                            zero_count += 1
-                        elif len(matched_docs) < len(gold_docs):
-                            partial_count += 1
-                        else:
-                            full_count += 1
+                    full_count = summary['full_recall']
+                    partial_count = summary['partial_recall']
+                    zero_count = summary['zero_recall']
+                    evaluated = summary['evaluated'] or 1
 
                     # 打印累积统计
                     bench_logger.info(f"\n📊 累积召回情况统计 ({current_idx} 个问题):")
                     bench_logger.info("=" * 50)
-                    bench_logger.info(f"✅ 全部召回: {full_count} 个 ({full_count/current_idx*100:.1f}%)")
-                    bench_logger.info(f"⚠️  部分召回: {partial_count} 个 ({partial_count/current_idx*100:.1f}%)")
-                    bench_logger.info(f"❌ 零召回: {zero_count} 个 ({zero_count/current_idx*100:.1f}%)")
+                    bench_logger.info(f"✅ 全部召回: {full_count} 个 ({full_count/evaluated*100:.1f}%)")
+                    bench_logger.info(f"⚠️  部分召回: {partial_count} 个 ({partial_count/evaluated*100:.1f}%)")
+                    bench_logger.info(f"❌ 零召回: {zero_count} 个 ({zero_count/evaluated*100:.1f}%)")
                     bench_logger.info("=" * 50)
 
-                    # 🆕 准备 recall 评估数据
-                    gold_docs_list_for_recall = []
-                    retrieved_docs_list_for_recall = []
-
-                    for i, result in enumerate(results_so_far):
-                        gold_docs = current_gold_docs[i]
-                        retrieved_docs_for_recall = []
-
-                        # 获取检索结果段落（格式与召回评估一致）
-                        for section in result['sections']:
-                            heading = section.get('heading', '')
-                            content = section.get('content', '')
-                            clean_heading = heading.lstrip('#').strip()
-                            clean_content = content.strip()
-                            if clean_heading and clean_content:
-                                retrieved_docs_for_recall.append({
-                                    'title': clean_heading,
-                                    'content': clean_content
-                                })
-
-                        # 为 recall 评估准备数据
-                        gold_titles = [doc['title'] for doc in gold_docs]
-                        gold_docs_list_for_recall.append(gold_titles)
-                        retrieved_docs_list_for_recall.append([doc['title'] for doc in retrieved_docs_for_recall])
-
-                    # 计算 recall@k
-                    recall_metric = RetrievalRecall()
-                    pooled_recall, _ = recall_metric.calculate_metric_scores(
-                        gold_docs=gold_docs_list_for_recall,
-                        retrieved_docs=retrieved_docs_list_for_recall,
-                        k_list=[1, 2, 5, 10]
-                    )
-
+                    pooled_recall = summary['recall']
                     bench_logger.info(f"\n累积Recall@K:")
                     for metric, score in pooled_recall.items():
                         bench_logger.info(f"  {metric}: {score:.4f} ({score*100:.2f}%)")
 
+                    bench_logger.info(f"\n累积Token: {summary['tokens']['total']} (prompt={summary['tokens']['prompt']}, completion={summary['tokens']['completion']})")
+                    for row in summary['latency']:
+                        bench_logger.info(
+                            f"  ⏱️ {row['stage']}: p50={row['p50_ms']:.1f}ms p95={row['p95_ms']:.1f}ms max={row['max_ms']:.1f}ms"
+                        )
+
                     # 🆕 上传到 MLflow
                     if enable_mlflow and mlflow_run:
                         import mlflow
@@ -1002,7 +923,10 @@ class Evaluate:
                     limit=display_limit,
                     verbose=search_verbose,
                     bench_size=bench_size,
-                    callback=bench_callback if bench_size else None
+                    callback=bench_callback if bench_size else None,
+                    concurrency=concurrency,
+                    checkpoint_path=checkpoint_path,
+                    gold_docs=gold_docs_for_recall
                 )
 
                 # 🆕 计算SEARCH阶段耗时
@@ -1014,55 +938,19 @@ class Evaluate:
                     gold_docs_list = []
                     retrieved_docs_list = []
 
+                    # matched_docs / gold_titles 已在检索时由 BenchmarkRunner 逐题计算
                     for i, result in enumerate(search_results):
-                        if i < len(gold_docs_for_recall):
-                            # 获取标准答案文档
-                            gold_docs = gold_docs_for_recall[i]
-
-                            # 获取检索结果段落（清理markdown标记）
-                            retrieved_docs = []
-                            for section in result['sections']:
-                                heading = section.get('heading', '')
-                                content = section.get('content', '')
-                                # 清理markdown标记（# 前缀）和首尾空格
-                                clean_heading = heading.lstrip('#').strip()
-                                clean_content = content.strip()
-                                if clean_heading and clean_content:
-                                    retrieved_docs.append({
-                                        'title': clean_heading,
-                                        'content': clean_content
-                                    })
-
-                            # 进行标题+内容的双重匹配
-                            matched_docs = []
-                            for gold_doc in gold_docs:
-                                for retrieved_doc in retrieved_docs:
-                                    title_match = gold_doc['title'].strip().lower() == retrieved_doc['title'].strip().lower()
-                                    # 内容匹配：检查检索内容是否包含标准内容的关键信息
-                                    content_match = cls._check_content_similarity(
-                                        gold_doc['content'],
-                                        retrieved_doc['content']
-                                    )
-
-                                    if title_match and content_match:
-                                        matched_docs.append(gold_doc['title'])
-                                        break  # 找到匹配后退出内循环
-
-                            # 为了兼容RetrievalRecall，传递标题列表
-                            gold_titles = [doc['title'] for doc in gold_docs]
-                            gold_docs_list.append(gold_titles)  # 传递所有标准答案文档（修复bug）
-                            retrieved_docs_list.append([doc['title'] for doc in retrieved_docs])
-
-                            # 将匹配结果保存到 search_results，用于后续显示
-                            result['matched_docs'] = matched_docs
-                            result['gold_titles'] = gold_titles
-
-                            # 调试输出
-                            logger.debug(f"\n[DEBUG] 问题 {i+1}:")
-                            logger.debug(f"  标准文档: {gold_titles}")
-                            logger.debug(f"  检索文档: {[doc['title'] for doc in retrieved_docs[:5]]}...")  # 只显示前5个
-                            logger.debug(f"  匹配成功: {matched_docs}")
-                            logger.debug(f"  匹配率: {len(matched_docs)}/{len(gold_titles)}")
+                        gold_titles = result.get('gold_titles', [])
+                        retrieved_titles = [doc['title'] for doc in extract_retrieved_docs(result['sections'])]
+                        gold_docs_list.append(gold_titles)
+                        retrieved_docs_list.append(retrieved_titles)
+
+                        # 调试输出
+                        logger.debug(f"\n[DEBUG] 问题 {i+1}:")
+                        logger.debug(f"  标准文档: {gold_titles}")
+                        logger.debug(f"  检索文档: {retrieved_titles[:5]}...")  # 只显示前5个
+                        logger.debug(f"  匹配成功: {result.get('matched_docs', [])}")
+                        logger.debug(f"  匹配率: {len(result.get('matched_docs', []))}/{len(gold_titles)}")
                     # 使用RetrievalRecall进行评估
                     if gold_docs_list and retrieved_docs_list:
                         recall_metric = RetrievalRecall()
@@ -1356,7 +1244,6 @@ class Evaluate:
                                     )
 
                                     # 调用 LLM 生成答案
-                                    from dataflow.core.ai.models import LLMMessage, LLMRole
                                     response = await llm_client.chat(
                                         messages=[
                                             LLMMessage(role=LLMRole.USER, content=prompt_text)
@@ -2149,6 +2036,108 @@ class Evaluate:
 
         return result
 
+    async def bulk_upload_corpus(
+        self,
+        enable_extraction: bool = True,
+        source_config_id: Optional[str] = None,
+        source_name: Optional[str] = None,
+        source_description: Optional[str] = None,
+        extract_concurrency: int = 50
+    ) -> Dict[str, Any]:
+        """
+        批量上传数据集 corpus（不生成 markdown，直接写入片段 → 批量向量化/索引 → 并发提取）
+
+        Args:
+            enable_extraction: 是否执行提取阶段
+            source_config_id: 续跑的信息源ID（None 时新建 "{dataset_name}-{timestamp}"）
+            source_name: 信息源名称
+            source_description: 信息源描述
+            extract_concurrency: 提取并发数
+
+        Returns:
+            处理结果字典（与 upload_corpus 相同的 source_info 字段 + 入库报告）
+        """
+        from dataflow.core.config import get_settings
+        from dataflow.evaluation.corpus_ingest import CorpusIngestor
+
+        logger.info("=" * 60)
+        logger.info("开始批量上传 corpus 到系统")
+        logger.info("=" * 60)
+
+        model_name = get_settings().llm_model
+        filtered_model_name = model_name.split('/')[-1] if model_name else "default"
+
+        corpus = DatasetLoader(self.config.dataset_name).load_corpus()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        source_config_id = source_config_id or f"{self.config.dataset_name}-{timestamp}"
+        source_name = source_name or source_config_id
+        source_description = source_description or f"Evaluation corpus for {self.config.dataset_name} dataset"
+        logger.info(f"信息源 ID: {source_config_id}，语料数: {len(corpus)}")
+
+        token_tracker = LLMTokenTracker()
+        if enable_extraction:
+            enable_llm_tracking(token_tracker)
+
+        ingestor = CorpusIngestor(
+            source_config_id=source_config_id,
+            source_name=source_name,
+            source_description=source_description,
+            extract_concurrency=extract_concurrency
+        )
+        report = await ingestor.ingest(
+            corpus,
+            article_title=f"{self.config.dataset_name} corpus",
+            enable_extraction=enable_extraction
+        )
+
+        result = {
+            "source_config_id": source_config_id,
+            "source_name": source_name,
+            "source_description": source_description,
+            "dataset_name": self.config.dataset_name,
+            "model_name": model_name,
+            "filtered_model_name": filtered_model_name,
+            "article_id": report.article_id,
+            "file_count": report.total_chunks,
+            "successful_files": report.total_chunks,
+            "failed_files": 0,
+            "total_sections_count": report.total_chunks,
+            "total_events_count": report.events,
+            "processing_time": {
+                "total_load_time": round(report.timings.get("write", 0.0) + report.timings.get("index", 0.0), 1),
+                "total_extract_time": round(report.timings.get("extract", 0.0), 1),
+                "total_time": round(sum(report.timings.values()), 1)
+            },
+            "chunks_per_second": report.chunks_per_second(),
+            "ingest_report": report.to_dict(),
+            "timestamp": timestamp,
+            "status": "completed",
+            "extraction_enabled": enable_extraction,
+            "llm_token_usage": token_tracker.get_summary()
+        }
+
+        source_dir = Path(__file__).parent / "source" / "SAG" / filtered_model_name / self.config.dataset_name / timestamp
+        source_dir.mkdir(parents=True, exist_ok=True)
+        source_info_path = source_dir / "source_info.json"
+        with open(source_info_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        logger.info(f"💾 信息源结果已保存: {source_info_path}")
+
+        rates = result["chunks_per_second"]
+        logger.info("=" * 60)
+        logger.info("✅ Corpus 批量上传完成")
+        logger.info(f"  总片段数: {report.total_chunks}（续跑跳过 {report.resumed.get('write', 0)}）")
+        logger.info(f"  总事项数: {report.events}")
+        logger.info(f"  吞吐: 写入 {rates['write']} / 索引 {rates['index']} / 提取 {rates['extract']} 片段/秒")
+        logger.info("=" * 60)
+
+        try:
+            await close_database()
+        except Exception as e:
+            logger.warning(f"关闭连接时出现警告: {e}")
+
+        return result
+
     def print_summary(self, results: Dict[str, Any]):
         """
         打印评估结果摘要
@@ -2250,6 +2239,26 @@ if __name__ == "__main__":
         help="Upload markdown files to system (creates source in dataflow/evaluation/source/SAG/)"
     )
 
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="With --upload: ingest corpus chunks directly (batched writes, embedding and indexing, concurrent extraction) instead of uploading markdown files"
+    )
+
+    parser.add_argument(
+        "--resume-source",
+        type=str,
+        default=None,
+        help="With --upload --bulk: source_config_id of an interrupted bulk upload to resume"
+    )
+
+    parser.add_argument(
+        "--extract-concurrency",
+        type=int,
+        default=50,
+        help="With --upload --bulk: number of chunks extracted concurrently (default: 50)"
+    )
+
     parser.add_argument(
         "--show-retrieval-info",
         action="store_true",
@@ -2309,6 +2318,20 @@ if __name__ == "__main__":
         help="Print cumulative statistics every N questions during search (default: None, print only at the end)"
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of questions searched concurrently (default: 1)"
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="JSONL checkpoint file for search results; rerunning with the same file resumes an interrupted run"
+    )
+
     parser.add_argument(
         "--enable-mlflow",
         action="store_true",
@@ -2383,6 +2406,8 @@ if __name__ == "__main__":
                 dataset_name=args.dataset,
                 badcase=badcase,
                 bench_size=args.bench_size,
+                concurrency=args.concurrency,
+                checkpoint_path=args.checkpoint,
                 enable_mlflow=args.enable_mlflow,
                 mlflow_uri=args.mlflow_uri,
                 mlflow_experiment=args.mlflow_experiment
@@ -2490,6 +2515,12 @@ if __name__ == "__main__":
         evaluator = Evaluate(config)
 
         async def upload_task():
+            if args.bulk:
+                return await evaluator.bulk_upload_corpus(
+                    enable_extraction=True,
+                    source_config_id=args.resume_source,
+                    extract_concurrency=args.extract_concurrency
+                )
             upload_result = await evaluator.upload_corpus(
                 enable_extraction=True  # 默认启用提取
             )
@@ -0,0 +1,416 @@
+"""
+评估语料批量入库
+
+评估数据集的语料（{title, text} 文档列表）不经过 Markdown 拼接与解析，直接批量写入：
+1. 写入：每篇语料一个 SourceChunk（句子级 ArticleSection 作为引用），按批 INSERT
+2. 索引：批量生成向量 + ES bulk 索引（复用 DocumentLoader._batch_index_chunks），多批并发
+3. 提取：按批调用 EventExtractor，批内由 max_concurrency 控制并发
+
+断点续跑：片段 ID 由（信息源, 文章标题, 序号）确定，各阶段完成情况记录在 SourceChunk.extra_data，
+中断后以相同的 source_config_id 和语料重新运行，只处理未完成的片段。
+
+使用方式：
+    ingestor = CorpusIngestor(source_config_id="2wiki-bench", extract_concurrency=50)
+    report = await ingestor.ingest(corpus, article_title="2wikimultihopqa corpus")
+    report.chunks_per_second()   # {"write": ..., "index": ..., "extract": ..., "total": ...}
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dataflow.core.cache.search_cache import bump_source_version
+from dataflow.db import Article, ArticleSection, SourceChunk, SourceConfig, get_session_factory
+from dataflow.modules.load.sentence_splitter import SentenceSplitter
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.corpus_ingest")
+
+# 片段 / 段落 ID 的命名空间（保证重复运行生成相同 ID）
+_ID_NAMESPACE = uuid.UUID("6f1c8a52-3f0e-4d6b-9a57-2b7e1d4c9e10")
+
+# SourceChunk.extra_data 中记录入库进度的键
+_STATE_KEY = "corpus_ingest"
+
+# 索引函数：接收一批 SourceChunk，返回 _batch_index_chunks 风格的统计（至少包含 indexed_count）
+IndexFn = Callable[[List[SourceChunk]], Awaitable[Dict[str, Any]]]
+# 提取函数：接收一批片段 ID，返回生成的事项数
+ExtractFn = Callable[[List[str]], Awaitable[int]]
+
+
+def _stable_id(*parts: Any) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, ":".join(str(part) for part in parts)))
+
+
+@dataclass
+class IngestReport:
+    """入库报告（耗时单位：秒）"""
+
+    source_config_id: str
+    article_id: str
+    total_chunks: int
+    written: int = 0
+    indexed: int = 0
+    extracted: int = 0
+    events: int = 0
+    resumed: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def chunks_per_second(self) -> Dict[str, float]:
+        """各阶段吞吐（片段/秒，只统计本次实际处理的片段）"""
+        processed = {"write": self.written, "index": self.indexed, "extract": self.extracted}
+        rates = {
+            phase: round(count / self.timings[phase], 2) if self.timings.get(phase) else 0.0
+            for phase, count in processed.items()
+        }
+        total_time = sum(self.timings.values())
+        new_chunks = self.total_chunks - self.resumed.get("write", 0)
+        rates["total"] = round(new_chunks / total_time, 2) if total_time else 0.0
+        return rates
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["chunks_per_second"] = self.chunks_per_second()
+        return data
+
+
+class CorpusIngestor:
+    """评估语料批量入库器"""
+
+    def __init__(
+        self,
+        source_config_id: str,
+        source_name: Optional[str] = None,
+        source_description: Optional[str] = None,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        write_batch_size: int = 500,
+        index_batch_size: int = 200,
+        embedding_batch_size: int = 32,
+        es_bulk_size: int = 100,
+        index_concurrency: int = 4,
+        extract_batch_size: int = 200,
+        extract_concurrency: int = 20,
+        index_fn: Optional[IndexFn] = None,
+        extract_fn: Optional[ExtractFn] = None,
+    ):
+        """
+        Args:
+            source_config_id: 信息源ID（续跑时使用同一个）
+            source_name: 信息源名称（不存在时创建）
+            source_description: 信息源描述
+            session_factory: 会话工厂（默认使用应用的会话工厂）
+            write_batch_size: 每个写入事务的片段数
+            index_batch_size: 每个索引任务的片段数
+            embedding_batch_size: 单次向量生成请求的文本数
+            es_bulk_size: 单次 ES bulk 请求的文档数
+            index_concurrency: 并发索引任务数
+            extract_batch_size: 每次提取调用的片段数（完成后记录进度）
+            extract_concurrency: 提取时的并发片段数
+            index_fn: 自定义索引函数（默认向量化 + ES bulk 索引）
+            extract_fn: 自定义提取函数（默认 EventExtractor）
+        """
+        self.source_config_id = source_config_id
+        self.source_name = source_name or source_config_id
+        self.source_description = source_description
+        self.session_factory = session_factory or get_session_factory()
+        self.write_batch_size = write_batch_size
+        self.index_batch_size = index_batch_size
+        self.embedding_batch_size = embedding_batch_size
+        self.es_bulk_size = es_bulk_size
+        self.index_concurrency = index_concurrency
+        self.extract_batch_size = extract_batch_size
+        self.extract_concurrency = extract_concurrency
+        self.index_fn = index_fn
+        self.extract_fn = extract_fn
+        self._splitter = SentenceSplitter()
+
+    async def ingest(
+        self,
+        documents: Sequence[Dict[str, Any]],
+        article_title: str,
+        enable_index: bool = True,
+        enable_extraction: bool = True,
+    ) -> IngestReport:
+        """
+        批量入库
+
+        Args:
+            documents: 语料文档 [{title, text}]（续跑时须与首次运行的顺序一致）
+            article_title: 承载语料的文章标题（同一信息源下唯一标识本批语料）
+            enable_index: 是否生成向量并索引到 ES
+            enable_extraction: 是否提取事项
+
+        Returns:
+            IngestReport
+        """
+        article_id = _stable_id(self.source_config_id, article_title)
+        report = IngestReport(
+            source_config_id=self.source_config_id,
+            article_id=article_id,
+            total_chunks=len(documents),
+        )
+
+        await self._ensure_article(article_id, article_title)
+        states = await self._load_states(article_id)
+        report.resumed = {
+            "write": len(states),
+            "index": sum(1 for s in states.values() if s.get("indexed")),
+            "extract": sum(1 for s in states.values() if s.get("extracted")),
+        }
+        if states:
+            logger.info(f"♻️ 续跑: 已写入 {report.resumed['write']}/{len(documents)}, "
+                        f"已索引 {report.resumed['index']}, 已提取 {report.resumed['extract']}")
+
+        # 1. 写入
+        start = time.perf_counter()
+        report.written = await self._write_chunks(article_id, documents, states)
+        report.timings["write"] = time.perf_counter() - start
+        if report.written:
+            await bump_source_version(self.source_config_id)
+
+        chunk_ids = [_stable_id(article_id, "chunk", rank) for rank in range(len(documents))]
+
+        # 2. 索引
+        if enable_index:
+            start = time.perf_counter()
+            pending = [cid for cid in chunk_ids if not states[cid].get("indexed")]
+            report.indexed = await self._index_chunks(pending, states)
+            report.timings["index"] = time.perf_counter() - start
+
+        # 3. 提取
+        if enable_extraction:
+            start = time.perf_counter()
+            pending = [cid for cid in chunk_ids if not states[cid].get("extracted")]
+            report.extracted, report.events = await self._extract_chunks(article_id, pending, states)
+            report.timings["extract"] = time.perf_counter() - start
+
+        rates = report.chunks_per_second()
+        logger.info(
+            f"✅ 语料入库完成: {len(documents)} 个片段 | 写入 {rates['write']}/s, "
+            f"索引 {rates['index']}/s, 提取 {rates['extract']}/s, 整体 {rates['total']}/s"
+        )
+        return report
+
+    async def _ensure_article(self, article_id: str, article_title: str) -> None:
+        """确保信息源与承载语料的文章存在"""
+        async with self.session_factory() as session:
+            if await session.get(SourceConfig, self.source_config_id) is None:
+                session.add(SourceConfig(
+                    id=self.source_config_id,
+                    name=self.source_name[:100],
+                    description=(self.source_description or "")[:255] or None,
+                ))
+            if await session.get(Article, article_id) is None:
+                session.add(Article(
+                    id=article_id,
+                    source_config_id=self.source_config_id,
+                    title=article_title[:500],
+                    status="COMPLETED",
+                ))
+            await session.commit()
+
+    async def _load_states(self, article_id: str) -> Dict[str, Dict[str, bool]]:
+        """读取已写入片段的进度（chunk_id -> {indexed, extracted}）"""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(SourceChunk.id, SourceChunk.extra_data).where(SourceChunk.article_id == article_id)
+            )
+            return {
+                row.id: dict((row.extra_data or {}).get(_STATE_KEY) or {})
+                for row in result.all()
+            }
+
+    async def _mark(self, chunk_ids: List[str], states: Dict[str, Dict[str, bool]], **flags: bool) -> None:
+        """更新片段进度（按新状态分组，每组一条 UPDATE）"""
+        groups: Dict[str, List[str]] = {}
+        for chunk_id in chunk_ids:
+            states[chunk_id].update(flags)
+            groups.setdefault(json.dumps(states[chunk_id], sort_keys=True), []).append(chunk_id)
+
+        async with self.session_factory() as session:
+            for state, ids in groups.items():
+                await session.execute(
+                    update(SourceChunk)
+                    .where(SourceChunk.id.in_(ids))
+                    .values(extra_data={_STATE_KEY: json.loads(state)})
+                )
+            await session.commit()
+
+    async def _write_chunks(
+        self,
+        article_id: str,
+        documents: Sequence[Dict[str, Any]],
+        states: Dict[str, Dict[str, bool]],
+    ) -> int:
+        """按批写入 SourceChunk + ArticleSection（已写入的片段跳过）"""
+        # 每批在一个事务内提交，已写入的片段总是前缀
+        start_rank = len(states)
+        if start_rank >= len(documents):
+            return 0
+
+        async with self.session_factory() as session:
+            section_rank = await session.scalar(
+                select(func.coalesce(func.max(ArticleSection.rank) + 1, 0))
+                .where(ArticleSection.article_id == article_id)
+            )
+
+        written = 0
+        for batch_start in range(start_rank, len(documents), self.write_batch_size):
+            batch = documents[batch_start:batch_start + self.write_batch_size]
+            chunk_rows: List[Dict[str, Any]] = []
+            section_rows: List[Dict[str, Any]] = []
+
+            for offset, doc in enumerate(batch):
+                rank = batch_start + offset
+                chunk_id = _stable_id(article_id, "chunk", rank)
+                heading = (doc.get("title") or "")[:500]
+                content = doc.get("text") or ""
+
+                section_ids = []
+                for index, sentence in enumerate(self._splitter.split_by_punctuation(content)):
+                    section_id = _stable_id(chunk_id, index)
+                    section_ids.append(section_id)
+                    section_rows.append({
+                        "id": section_id,
+                        "article_id": article_id,
+                        "rank": section_rank,
+                        "order_index": section_rank,
+                        "heading": heading,
+                        "content": sentence,
+                        "length": len(sentence),
+                    })
+                    section_rank += 1
+
+                chunk_rows.append({
+                    "id": chunk_id,
+                    "source_type": "ARTICLE",
+                    "source_id": article_id,
+                    "source_config_id": self.source_config_id,
+                    "article_id": article_id,
+                    "heading": heading,
+                    "content": content,
+                    "rank": rank,
+                    "chunk_length": len(content),
+                    "references": section_ids,
+                    "extra_data": {_STATE_KEY: {}},
+                })
+                states[chunk_id] = {}
+
+            async with self.session_factory() as session:
+                await session.execute(insert(SourceChunk), chunk_rows)
+                if section_rows:
+                    await session.execute(insert(ArticleSection), section_rows)
+                await session.commit()
+
+            written += len(batch)
+            logger.info(f"📝 已写入 {batch_start + len(batch)}/{len(documents)} 个片段")
+
+        return written
+
+    async def _index_chunks(self, chunk_ids: List[str], states: Dict[str, Dict[str, bool]]) -> int:
+        """并发索引未索引的片段，每批完成后记录进度"""
+        if not chunk_ids:
+            return 0
+
+        es_client = None
+        index_fn = self.index_fn
+        if index_fn is None:
+            index_fn, es_client = self._default_index_fn()
+
+        semaphore = asyncio.Semaphore(self.index_concurrency)
+        indexed = 0
+
+        async def index_batch(batch_ids: List[str]) -> None:
+            nonlocal indexed
+            async with semaphore:
+                async with self.session_factory() as session:
+                    result = await session.execute(
+                        select(SourceChunk).where(SourceChunk.id.in_(batch_ids)).order_by(SourceChunk.rank)
+                    )
+                    chunks = list(result.scalars().all())
+                stats = await index_fn(chunks)
+                # 有失败时整批保留为未索引，续跑时重试（ES 文档 ID 即片段 ID，重复索引无副作用）
+                if stats.get("embedding_failed") or stats.get("es_failed"):
+                    logger.warning(f"⚠️ 索引批次存在失败: {stats}")
+                    return
+                await self._mark(batch_ids, states, indexed=True)
+                indexed += len(batch_ids)
+                logger.info(f"🔎 已索引 {indexed}/{len(chunk_ids)} 个片段")
+
+        try:
+            await asyncio.gather(*(
+                index_batch(chunk_ids[i:i + self.index_batch_size])
+                for i in range(0, len(chunk_ids), self.index_batch_size)
+            ))
+        finally:
+            if es_client is not None:
+                await es_client.client.close()
+        return indexed
+
+    def _default_index_fn(self):
+        """向量化 + ES bulk 索引（与 DocumentLoader 的批量索引一致）"""
+        from dataflow.core.storage import ElasticsearchClient, SourceChunkRepository
+        from dataflow.modules.load.loader import DocumentLoader
+
+        loader = DocumentLoader()
+        es_client = ElasticsearchClient()
+        repo = SourceChunkRepository(es_client.client)
+
+        async def index_fn(chunks: List[SourceChunk]) -> Dict[str, Any]:
+            return await loader._batch_index_chunks(
+                chunks=chunks,
+                repo=repo,
+                es_client=es_client,
+                embedding_batch_size=self.embedding_batch_size,
+                es_bulk_size=self.es_bulk_size,
+                source_config_id=self.source_config_id,
+            )
+
+        return index_fn, es_client
+
+    async def _extract_chunks(
+        self,
+        article_id: str,
+        chunk_ids: List[str],
+        states: Dict[str, Dict[str, bool]],
+    ) -> Tuple[int, int]:
+        """按批提取事项，每批完成后记录进度；返回 (处理片段数, 事项数)"""
+        if not chunk_ids:
+            return 0, 0
+
+        extract_fn = self.extract_fn or self._default_extract_fn(article_id)
+        extracted = 0
+        events = 0
+        for i in range(0, len(chunk_ids), self.extract_batch_size):
+            batch_ids = chunk_ids[i:i + self.extract_batch_size]
+            events += await extract_fn(batch_ids)
+            await self._mark(batch_ids, states, extracted=True)
+            extracted += len(batch_ids)
+            logger.info(f"🧩 已提取 {extracted}/{len(chunk_ids)} 个片段，累计 {events} 个事项")
+        return extracted, events
+
+    def _default_extract_fn(self, article_id: str) -> ExtractFn:
+        """EventExtractor 提取（批内按 extract_concurrency 并发）"""
+        from dataflow.core.prompt.manager import get_prompt_manager
+        from dataflow.modules.extract.config import ExtractConfig
+        from dataflow.modules.extract.extractor import EventExtractor
+
+        extractor = EventExtractor(prompt_manager=get_prompt_manager())
+
+        async def extract_fn(chunk_ids: List[str]) -> int:
+            result = await extractor.extract(ExtractConfig(
+                source_config_id=self.source_config_id,
+                chunk_ids=chunk_ids,
+                article_id=article_id,
+                max_concurrency=self.extract_concurrency,
+                embedding_batch_size=min(self.embedding_batch_size, 100),
+            ))
+            return len(result)
+
+        return extract_fn
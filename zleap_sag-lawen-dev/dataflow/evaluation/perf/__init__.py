@@ -0,0 +1,46 @@
+"""
+离线性能基准
+
+合成语料 + 内存存储后端 + 阶段计时，无需 ES / MySQL / Redis / Embedding API 即可测量搜索流水线
+"""
+
+from .backends import (
+    InMemoryElasticsearchClient,
+    OfflineBackend,
+    OfflineLLMClient,
+    PseudoEmbeddingClient,
+)
+from .corpus import CorpusSpec, SyntheticCorpus, generate_corpus, pseudo_embedding
+from .cross_fill import CrossFillReport, benchmark_cross_fill, generate_extraction_batch
+from .engine_bootstrap import EngineBootstrapReport, benchmark_engine_bootstrap
+from .runner import BenchmarkReport, PipelineBenchmark, StageResult, run_benchmark
+from .vector_quant import VectorQuantReport, compare_vector_indices, recall_at_k
+
+__all__ = [
+    # 语料
+    'CorpusSpec',
+    'SyntheticCorpus',
+    'generate_corpus',
+    'pseudo_embedding',
+    # 离线后端
+    'InMemoryElasticsearchClient',
+    'OfflineBackend',
+    'OfflineLLMClient',
+    'PseudoEmbeddingClient',
+    # 基准
+    'BenchmarkReport',
+    'PipelineBenchmark',
+    'StageResult',
+    'run_benchmark',
+    # 向量索引对比
+    'VectorQuantReport',
+    'compare_vector_indices',
+    'recall_at_k',
+    # 实体交叉补充
+    'CrossFillReport',
+    'benchmark_cross_fill',
+    'generate_extraction_batch',
+    # 引擎构建
+    'EngineBootstrapReport',
+    'benchmark_engine_bootstrap',
+]
@@ -0,0 +1,694 @@
+"""
+离线存储后端
+
+为搜索流水线提供不依赖外部服务的替身：
+- InMemoryElasticsearchClient: 与 ElasticsearchClient 相同的 search / vector_search 接口，
+  支持搜索模块用到的查询子集（term/terms/bool/match/multi_match/range/exists/ids）
+- SQLite（aiosqlite 内存库）替代 MySQL，表结构直接来自 ORM 模型
+- PseudoEmbeddingClient / OfflineLLMClient: 替代 Embedding API 与 LLM
+
+Repository（EventVectorRepository / EntityVectorRepository / SourceChunkRepository）
+保持原实现，只是底层 ES 客户端换成内存版本，因此过滤条件构建、路由、
+结果整形等开销都计入基准。
+
+使用方式：
+    corpus = generate_corpus(CorpusSpec.from_scale("small"))
+    async with OfflineBackend(corpus) as backend:
+        searcher = RecallSearcher(llm_client=backend.llm_client, prompt_manager=pm)
+        await searcher.search(config)
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.mysql import LONGTEXT, MEDIUMTEXT
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+from dataflow.core.ai.models import LLMResponse, LLMUsage
+from dataflow.evaluation.perf.corpus import SyntheticCorpus
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.perf.backends")
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# MySQL 专有文本类型在 SQLite 中统一映射为 TEXT
+@compiles(LONGTEXT, "sqlite")
+@compiles(MEDIUMTEXT, "sqlite")
+def _compile_mysql_text_for_sqlite(element, compiler, **kw):
+    return "TEXT"
+
+
+def _tokenize(value: Any) -> List[str]:
+    """简单分词（小写 + \\w+）"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [token for item in value for token in _tokenize(item)]
+    return _TOKEN_PATTERN.findall(str(value).lower())
+
+
+def _get_field(doc: Dict[str, Any], field: str) -> Any:
+    """读取文档字段（忽略 .keyword 子字段，支持点号路径）"""
+    if field.endswith(".keyword"):
+        field = field[: -len(".keyword")]
+    value: Any = doc
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _comparable(value: Any) -> Any:
+    """range 比较前的归一（datetime 与 ISO 字符串可比较）"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class InMemoryElasticsearchClient:
+    """
+    内存版 Elasticsearch 客户端
+
+    接口与 ElasticsearchClient 保持一致（返回格式相同），
+    文本打分使用词重叠计数近似 BM25，向量打分与 ES cosine 相同：(1 + cos) / 2。
+    """
+
+    def __init__(self) -> None:
+        # index -> doc_id -> document
+        self._indices: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (index, field) -> (doc_ids, 归一化向量矩阵)
+        self._matrix_cache: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]] = {}
+        self.request_count = 0
+
+    # ============ 写入 ============
+
+    def add_documents(self, index: str, documents: Iterable[Dict[str, Any]], id_field: str) -> int:
+        """批量写入文档（同步，供语料装载使用）"""
+        store = self._indices.setdefault(index, {})
+        count = 0
+        for doc in documents:
+            store[str(doc[id_field])] = doc
+            count += 1
+        self._invalidate(index)
+        return count
+
+    def _invalidate(self, index: str) -> None:
+        for key in [key for key in self._matrix_cache if key[0] == index]:
+            del self._matrix_cache[key]
+
+    async def index(
+        self,
+        index: str,
+        id: str,
+        document: Dict[str, Any],
+        routing: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """索引单个文档（兼容 BaseRepository.index_document）"""
+        self._indices.setdefault(index, {})[str(id)] = document
+        self._invalidate(index)
+        return {"_id": id, "result": "created"}
+
+    async def bulk_index(
+        self,
+        index: str,
+        documents: List[Dict[str, Any]],
+        return_details: bool = False,
+        routing: Optional[str] = None,
+    ) -> Union[int, Dict[str, Any]]:
+        """批量索引文档"""
+        store = self._indices.setdefault(index, {})
+        for doc in documents:
+            store[str(doc.get("id"))] = doc
+        self._invalidate(index)
+        if return_details:
+            return {
+                "success": True,
+                "total": len(documents),
+                "success_count": len(documents),
+                "error_count": 0,
+                "errors": [],
+            }
+        return len(documents)
+
+    async def index_exists(self, index: str) -> bool:
+        return index in self._indices
+
+    async def check_connection(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    def count(self, index: str) -> int:
+        """索引文档数量"""
+        return len(self._indices.get(index, {}))
+
+    # ============ 查询求值 ============
+
+    def _evaluate(self, doc_id: str, doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> Tuple[bool, float]:
+        """
+        计算文档是否匹配查询及其得分
+
+        Returns:
+            (matched, score)
+        """
+        if not query:
+            return True, 1.0
+
+        (clause, body), = query.items()
+
+        if clause == "match_all":
+            return True, 1.0
+
+        if clause == "term":
+            (field, value), = body.items()
+            if isinstance(value, dict):
+                value = value.get("value")
+            matched = value in _as_list(_get_field(doc, field))
+            return matched, 1.0 if matched else 0.0
+
+        if clause == "terms":
+            (field, values), = body.items()
+            wanted = set(values)
+            matched = any(item in wanted for item in _as_list(_get_field(doc, field)))
+            return matched, 1.0 if matched else 0.0
+
+        if clause == "ids":
+            matched = doc_id in set(body.get("values", []))
+            return matched, 1.0 if matched else 0.0
+
+        if clause == "exists":
+            matched = _get_field(doc, body["field"]) is not None
+            return matched, 1.0 if matched else 0.0
+
+        if clause == "range":
+            (field, bounds), = body.items()
+            value = _get_field(doc, field)
+            if value is None:
+                return False, 0.0
+            value = _comparable(value)
+            checks = {
+                "gte": lambda a, b: a >= b,
+                "gt": lambda a, b: a > b,
+                "lte": lambda a, b: a <= b,
+                "lt": lambda a, b: a < b,
+            }
+            for op, check in checks.items():
+                if op in bounds and not check(value, _comparable(bounds[op])):
+                    return False, 0.0
+            return True, 1.0
+
+        if clause in ("match", "match_phrase"):
+            (field, value), = body.items()
+            if isinstance(value, dict):
+                value = value.get("query")
+            query_tokens = set(_tokenize(value))
+            overlap = len(query_tokens & set(_tokenize(_get_field(doc, field))))
+            return overlap > 0, float(overlap)
+
+        if clause == "multi_match":
+            query_tokens = set(_tokenize(body.get("query")))
+            best = 0.0
+            total = 0.0
+            for field_spec in body.get("fields", []):
+                field, _, boost = field_spec.partition("^")
+                overlap = len(query_tokens & set(_tokenize(_get_field(doc, field))))
+                score = overlap * float(boost or 1.0)
+                best = max(best, score)
+                total += score
+            score = best if body.get("type", "best_fields") == "best_fields" else total
+            return score > 0, score
+
+        if clause == "bool":
+            return self._evaluate_bool(doc_id, doc, body)
+
+        raise NotImplementedError(f"内存ES不支持的查询类型: {clause}")
+
+    def _evaluate_bool(self, doc_id: str, doc: Dict[str, Any], body: Dict[str, Any]) -> Tuple[bool, float]:
+        score = 0.0
+
+        for sub in _as_list(body.get("must")):
+            matched, sub_score = self._evaluate(doc_id, doc, sub)
+            if not matched:
+                return False, 0.0
+            score += sub_score
+
+        for sub in _as_list(body.get("filter")):
+            if not self._evaluate(doc_id, doc, sub)[0]:
+                return False, 0.0
+
+        for sub in _as_list(body.get("must_not")):
+            if self._evaluate(doc_id, doc, sub)[0]:
+                return False, 0.0
+
+        should = _as_list(body.get("should"))
+        if should:
+            has_required = bool(body.get("must") or body.get("filter"))
+            minimum = int(body.get("minimum_should_match", 0 if has_required else 1))
+            matched_count = 0
+            for sub in should:
+                matched, sub_score = self._evaluate(doc_id, doc, sub)
+                if matched:
+                    matched_count += 1
+                    score += sub_score
+            if matched_count < minimum:
+                return False, 0.0
+
+        return True, score if score > 0 else 1.0
+
+    @staticmethod
+    def _project(doc: Dict[str, Any], source: Any) -> Dict[str, Any]:
+        """按 _source 参数裁剪返回字段"""
+        if source is None or source is True:
+            return dict(doc)
+        if source is False:
+            return {}
+        if isinstance(source, list):
+            return {key: doc[key] for key in source if key in doc}
+        if isinstance(source, dict):
+            includes = source.get("includes")
+            excludes = set(source.get("excludes") or [])
+            projected = {key: doc[key] for key in includes if key in doc} if includes else dict(doc)
+            for key in excludes:
+                projected.pop(key, None)
+            return projected
+        return dict(doc)
+
+    # ============ 查询接口（与 ElasticsearchClient 一致） ============
+
+    async def search(
+        self,
+        index: str,
+        query: Dict[str, Any],
+        size: int = 10,
+        from_: int = 0,
+        return_full_response: bool = False,
+        routing: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """搜索文档（返回格式与 ElasticsearchClient.search 相同）"""
+        self.request_count += 1
+        min_score = kwargs.get("min_score")
+        source = kwargs.get("_source")
+
+        hits = []
+        for doc_id, doc in self._indices.get(index, {}).items():
+            matched, score = self._evaluate(doc_id, doc, query)
+            if matched and (min_score is None or score >= min_score):
+                hits.append((score, doc_id, doc))
+
+        hits.sort(key=lambda item: item[0], reverse=True)
+        page = hits[from_:from_ + size]
+
+        if return_full_response:
+            return {
+                "total": len(hits),
+                "max_score": hits[0][0] if hits else 0,
+                "hits": [
+                    {"id": doc_id, "score": score, "source": self._project(doc, source), "index": index}
+                    for score, doc_id, doc in page
+                ],
+            }
+        return [self._project(doc, source) for _, _, doc in page]
+
+    def _vector_matrix(self, index: str, field: str) -> Tuple[List[str], np.ndarray]:
+        """获取（并缓存）索引字段的归一化向量矩阵"""
+        key = (index, field)
+        cached = self._matrix_cache.get(key)
+        if cached is None:
+            doc_ids = []
+            vectors = []
+            for doc_id, doc in self._indices.get(index, {}).items():
+                vector = doc.get(field)
+                if vector:
+                    doc_ids.append(doc_id)
+                    vectors.append(vector)
+            matrix = np.asarray(vectors, dtype=np.float32) if vectors else np.zeros((0, 1), dtype=np.float32)
+            if len(vectors):
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix = matrix / norms
+            cached = (doc_ids, matrix)
+            self._matrix_cache[key] = cached
+        return cached
+
+    async def vector_search(
+        self,
+        index: str,
+        field: str,
+        vector: List[float],
+        size: int = 10,
+        filter_query: Optional[Dict[str, Any]] = None,
+        routing: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """向量检索（精确 kNN，返回格式与 ElasticsearchClient.vector_search 相同）"""
+        self.request_count += 1
+        doc_ids, matrix = self._vector_matrix(index, field)
+        if not doc_ids:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+        scores = (1.0 + matrix @ query) / 2.0
+
+        store = self._indices[index]
+        if filter_query:
+            mask = np.array(
+                [self._evaluate(doc_id, store[doc_id], filter_query)[0] for doc_id in doc_ids],
+                dtype=bool,
+            )
+            scores = np.where(mask, scores, -1.0)
+
+        top = np.argsort(-scores)[:size]
+        return [
+            {**store[doc_ids[i]], "_score": float(scores[i])}
+            for i in top
+            if scores[i] >= 0
+        ]
+
+
+class PseudoEmbeddingClient:
+    """
+    伪向量客户端（接口与 EmbeddingClient 一致）
+
+    可通过 latency 模拟 Embedding API 的网络耗时。
+    """
+
+    def __init__(self, corpus: SyntheticCorpus, latency: float = 0.0) -> None:
+        self.corpus = corpus
+        self.latency = latency
+        self.model = "pseudo-embedding"
+        self.call_count = 0
+
+    async def generate(self, text: str) -> List[float]:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.corpus.embed(text)
+
+    async def batch_generate(self, texts: List[str]) -> List[List[float]]:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self.corpus.embed(text) for text in texts]
+
+
+class OfflineLLMClient:
+    """
+    离线 LLM 客户端
+
+    chat_with_schema 按 schema 字段返回确定性结果：实体识别返回提示词中出现的语料实体名称
+    （按出现顺序），其余字段返回空值；可通过 latency 模拟 LLM 调用耗时。
+    """
+
+    def __init__(self, corpus: SyntheticCorpus, latency: float = 0.0, max_entities: int = 10) -> None:
+        self.latency = latency
+        self.max_entities = max_entities
+        self.call_count = 0
+        self._entity_names = {entity["name"].lower(): entity["name"] for entity in corpus.entities}
+
+    def _find_entities(self, prompt: str) -> List[str]:
+        names = []
+        seen = set()
+        for token in _tokenize(prompt):
+            name = self._entity_names.get(token)
+            if name and name not in seen:
+                seen.add(name)
+                names.append(name)
+                if len(names) >= self.max_entities:
+                    break
+        return names
+
+    async def chat_with_schema(
+        self,
+        messages: List[Any],
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        prompt = "\n".join(str(getattr(message, "content", message)) for message in messages)
+        response: Dict[str, Any] = {}
+        for name, prop in ((response_schema or {}).get("properties") or {}).items():
+            if name == "entities":
+                response[name] = self._find_entities(prompt)
+            elif prop.get("type") == "array":
+                response[name] = []
+            elif prop.get("type") == "string":
+                response[name] = ""
+            else:
+                response[name] = None
+        return response
+
+    async def chat(self, messages: List[Any], **kwargs: Any) -> LLMResponse:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return LLMResponse(content="", model="offline", usage=LLMUsage())
+
+
+class OfflineBackend:
+    """
+    离线后端（SQLite + 内存 ES + 伪向量 + 离线 LLM）
+
+    进入上下文时装载语料并替换全局数据库会话工厂、ES 客户端与 Embedding 客户端，
+    退出时恢复原值，因此搜索模块在 __init__ 中获取到的都是离线后端，
+    DocumentProcessor.generate_embedding 也会走伪向量。
+    """
+
+    def __init__(
+        self,
+        corpus: SyntheticCorpus,
+        embedding_latency: float = 0.0,
+        llm_latency: float = 0.0,
+    ) -> None:
+        self.corpus = corpus
+        self.es_client = InMemoryElasticsearchClient()
+        self.embedding_client = PseudoEmbeddingClient(corpus, latency=embedding_latency)
+        self.llm_client = OfflineLLMClient(corpus, latency=llm_latency)
+        self.engine = None
+        self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._saved: Dict[str, Any] = {}
+
+    async def __aenter__(self) -> "OfflineBackend":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """创建 SQLite 库、装载语料并安装全局替身"""
+        start = time.perf_counter()
+
+        self.engine = create_async_engine(
+            "sqlite+aiosqlite://",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+            autocommit=False,
+        )
+
+        await self._create_schema()
+        await self._load_database()
+        self._load_elasticsearch()
+        self._install()
+
+        logger.info(
+            f"🧪 离线后端就绪: {self.corpus.stats()}，耗时 {time.perf_counter() - start:.2f}s"
+        )
+
+    async def close(self) -> None:
+        """恢复全局单例并释放 SQLite"""
+        self._restore()
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    # ============ 内部方法 ============
+
+    async def _create_schema(self) -> None:
+        """
+        按 ORM 模型建表
+
+        MySQL 索引名按表隔离而 SQLite 全库唯一，因此索引名加表名前缀后单独创建。
+        """
+        # 导入 models 仅为把全部 ORM 表注册到 Base.metadata（建表依赖该副作用）
+        from dataflow.db import models  # noqa: F401
+        from dataflow.db.base import Base
+
+        async with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                await conn.execute(CreateTable(table))
+                for index in table.indexes:
+                    columns = ", ".join(column.name for column in index.columns)
+                    await conn.execute(
+                        text(f'CREATE INDEX "{table.name}__{index.name}" ON "{table.name}" ({columns})')
+                    )
+
+    async def _load_database(self) -> None:
+        from dataflow.db import (
+            Article,
+            ArticleSection,
+            Entity,
+            EntityType,
+            EventEntity,
+            SourceChunk,
+            SourceConfig,
+            SourceEvent,
+        )
+
+        corpus = self.corpus
+        batches = [
+            (SourceConfig, corpus.source_configs),
+            (EntityType, corpus.entity_types),
+            (Article, corpus.articles),
+            (ArticleSection, corpus.sections),
+            (SourceChunk, corpus.chunks),
+            (SourceEvent, corpus.events),
+            (Entity, corpus.entities),
+            (EventEntity, corpus.event_entities),
+        ]
+        async with self.session_factory() as session:
+            for model, rows in batches:
+                if rows:
+                    await session.execute(model.__table__.insert(), rows)
+            await session.commit()
+
+    def _load_elasticsearch(self) -> None:
+        from dataflow.core.storage.repositories import (
+            EntityVectorRepository,
+            EventVectorRepository,
+            SourceChunkRepository,
+        )
+
+        corpus = self.corpus
+        event_entity_ids: Dict[str, List[str]] = {}
+        for link in corpus.event_entities:
+            event_entity_ids.setdefault(link["event_id"], []).append(link["entity_id"])
+
+        self.es_client.add_documents(
+            EntityVectorRepository.INDEX_NAME,
+            (
+                {
+                    "entity_id": entity["id"],
+                    "source_config_id": entity["source_config_id"],
+                    "type": entity["type"],
+                    "name": entity["name"],
+                    "vector": corpus.embed(entity["name"]),
+                }
+                for entity in corpus.entities
+            ),
+            id_field="entity_id",
+        )
+        self.es_client.add_documents(
+            EventVectorRepository.INDEX_NAME,
+            (
+                {
+                    "event_id": event["id"],
+                    "source_config_id": event["source_config_id"],
+                    "source_type": event["source_type"],
+                    "source_id": event["source_id"],
+                    "article_id": event["article_id"],
+                    "chunk_id": event["chunk_id"],
+                    "title": event["title"],
+                    "summary": event["summary"],
+                    "content": event["content"],
+                    "category": event["category"],
+                    "entity_ids": event_entity_ids.get(event["id"], []),
+                    "start_time": event["start_time"].isoformat(),
+                    "end_time": event["end_time"].isoformat(),
+                    "title_vector": corpus.embed(event["title"]),
+                    "content_vector": corpus.embed(event["content"]),
+                }
+                for event in corpus.events
+            ),
+            id_field="event_id",
+        )
+        self.es_client.add_documents(
+            SourceChunkRepository.INDEX_NAME,
+            (
+                {
+                    "chunk_id": chunk["id"],
+                    "source_id": chunk["source_id"],
+                    "source_config_id": chunk["source_config_id"],
+                    "article_id": chunk["article_id"],
+                    "rank": chunk["rank"],
+                    "heading": chunk["heading"],
+                    "content": chunk["content"],
+                    "references": chunk["references"],
+                    "heading_vector": corpus.embed(chunk["heading"]),
+                    "content_vector": corpus.embed(chunk["content"]),
+                }
+                for chunk in corpus.chunks
+            ),
+            id_field="chunk_id",
+        )
+
+    def _install(self) -> None:
+        """替换全局单例（数据库会话工厂 / ES 客户端 / Embedding 客户端）"""
+        import dataflow.core.ai.factory as ai_factory
+        import dataflow.core.storage.elasticsearch as es_module
+        import dataflow.db.base as db_base
+        from dataflow.core.storage.repositories import EntityVectorRepository
+
+        self._saved = {
+            "engine": db_base._engine,
+            "session_factory": db_base._session_factory,
+            "es_client": es_module._es_client,
+            "type_cache": dict(EntityVectorRepository._type_thresholds_cache),
+            "get_embedding_client": ai_factory.get_embedding_client,
+        }
+
+        async def _get_embedding_client(scenario: str = "general") -> PseudoEmbeddingClient:
+            return self.embedding_client
+
+        ai_factory.get_embedding_client = _get_embedding_client
+        db_base._engine = self.engine
+        db_base._session_factory = self.session_factory
+        es_module._es_client = self.es_client
+        # 实体类型阈值为类级缓存，清空避免混用其他库的数据
+        EntityVectorRepository._type_thresholds_cache.clear()
+
+    def _restore(self) -> None:
+        if not self._saved:
+            return
+
+        import dataflow.core.ai.factory as ai_factory
+        import dataflow.core.storage.elasticsearch as es_module
+        import dataflow.db.base as db_base
+        from dataflow.core.storage.repositories import EntityVectorRepository
+
+        ai_factory.get_embedding_client = self._saved["get_embedding_client"]
+        db_base._engine = self._saved["engine"]
+        db_base._session_factory = self._saved["session_factory"]
+        es_module._es_client = self._saved["es_client"]
+        EntityVectorRepository._type_thresholds_cache.clear()
+        EntityVectorRepository._type_thresholds_cache.update(self._saved["type_cache"])
+        self._saved = {}
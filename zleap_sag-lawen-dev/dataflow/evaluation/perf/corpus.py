@@ -0,0 +1,342 @@
+"""
+合成语料生成
+
+按给定规模生成信息源 / 文章 / 段落 / 片段 / 事项 / 实体，以及确定性的伪向量，
+用于离线性能基准测试（不依赖 Embedding API）。
+
+伪向量按词哈希生成后求和归一化：共享词越多的文本余弦相似度越高，
+因此向量检索、相似度阈值过滤等逻辑在合成数据上依然有意义。
+"""
+
+import hashlib
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 用于拼接实体名称的音节（纯字母，便于各类分词器切分）
+_SYLLABLES = [
+    "ka", "lo", "mi", "ra", "te", "vo", "su", "ne", "di", "ga",
+    "pe", "zu", "ha", "ri", "no", "ba", "xi", "ju", "ce", "fo",
+]
+
+# 事项描述中的填充词（模拟非实体内容）
+_FILLER_WORDS = [
+    "report", "meeting", "progress", "release", "analysis", "review",
+    "market", "growth", "plan", "update", "launch", "summary",
+    "research", "result", "budget", "policy", "partner", "project",
+]
+
+# 默认实体类型：(type, name, similarity_threshold, weight)
+DEFAULT_ENTITY_TYPES = [
+    ("person", "人物", 0.5, 1.0),
+    ("organization", "组织", 0.5, 1.0),
+    ("location", "地点", 0.5, 1.0),
+    ("topic", "主题", 0.5, 1.0),
+]
+
+
+def _stable_uuid(*parts: Any) -> str:
+    """根据输入生成稳定的 UUID 字符串（同一 seed 多次生成结果一致）"""
+    digest = hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return str(uuid.UUID(digest))
+
+
+@lru_cache(maxsize=65536)
+def _token_vector(token: str, dim: int) -> np.ndarray:
+    """单个词的伪向量（由词哈希作为随机种子）"""
+    seed = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def pseudo_embedding(text: str, dim: int = 64) -> List[float]:
+    """
+    生成确定性伪向量
+
+    Args:
+        text: 文本
+        dim: 向量维度
+
+    Returns:
+        L2 归一化后的向量
+    """
+    tokens = _TOKEN_PATTERN.findall((text or "").lower())
+    if not tokens:
+        tokens = ["__empty__"]
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in tokens:
+        vector += _token_vector(token, dim)
+
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector.tolist()
+
+
+@dataclass
+class CorpusSpec:
+    """合成语料规模配置"""
+
+    num_sources: int = 1
+    articles_per_source: int = 5
+    sections_per_article: int = 6
+    chunks_per_article: int = 3
+    events_per_chunk: int = 4
+    entities_per_source: int = 200
+    entities_per_event: int = 4
+    embedding_dim: int = 64
+    seed: int = 42
+
+    @classmethod
+    def from_scale(cls, scale: str) -> "CorpusSpec":
+        """
+        按预设规模创建配置
+
+        Args:
+            scale: small / medium / large
+
+        Returns:
+            CorpusSpec实例
+        """
+        presets = {
+            "small": cls(),
+            "medium": cls(
+                num_sources=2,
+                articles_per_source=20,
+                entities_per_source=1000,
+            ),
+            "large": cls(
+                num_sources=4,
+                articles_per_source=50,
+                chunks_per_article=4,
+                events_per_chunk=5,
+                entities_per_source=5000,
+            ),
+        }
+        if scale not in presets:
+            raise ValueError(f"未知规模: {scale}，可选: {', '.join(presets)}")
+        return presets[scale]
+
+
+@dataclass
+class SyntheticCorpus:
+    """合成语料（行数据为普通 dict，由后端负责写入 SQLite / 内存 ES）"""
+
+    spec: CorpusSpec
+    source_configs: List[Dict[str, Any]] = field(default_factory=list)
+    entity_types: List[Dict[str, Any]] = field(default_factory=list)
+    articles: List[Dict[str, Any]] = field(default_factory=list)
+    sections: List[Dict[str, Any]] = field(default_factory=list)
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    entities: List[Dict[str, Any]] = field(default_factory=list)
+    event_entities: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def source_config_ids(self) -> List[str]:
+        """全部信息源ID"""
+        return [source["id"] for source in self.source_configs]
+
+    def embed(self, text: str) -> List[float]:
+        """使用与语料相同的维度生成伪向量"""
+        return pseudo_embedding(text, self.spec.embedding_dim)
+
+    def sample_queries(self, count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        从事项中抽样生成查询
+
+        每条查询由某个事项关联的 2 个实体名称加一个填充词组成，
+        并记录该事项ID作为期望命中的结果。
+
+        Args:
+            count: 查询数量
+            seed: 随机种子（默认使用语料 seed）
+
+        Returns:
+            [{"query", "source_config_id", "expected_event_id"}]
+        """
+        rng = random.Random(self.spec.seed if seed is None else seed)
+
+        entity_names = {entity["id"]: entity["name"] for entity in self.entities}
+        event_links: Dict[str, List[str]] = {}
+        for link in self.event_entities:
+            event_links.setdefault(link["event_id"], []).append(entity_names[link["entity_id"]])
+
+        queries = []
+        for _ in range(count):
+            event = rng.choice(self.events)
+            names = event_links.get(event["id"], [])
+            picked = rng.sample(names, k=min(2, len(names)))
+            queries.append({
+                "query": " ".join(picked + [rng.choice(_FILLER_WORDS)]),
+                "source_config_id": event["source_config_id"],
+                "expected_event_id": event["id"],
+            })
+        return queries
+
+    def stats(self) -> Dict[str, int]:
+        """语料规模统计"""
+        return {
+            "sources": len(self.source_configs),
+            "articles": len(self.articles),
+            "sections": len(self.sections),
+            "chunks": len(self.chunks),
+            "events": len(self.events),
+            "entities": len(self.entities),
+            "event_entities": len(self.event_entities),
+        }
+
+
+def _make_name(rng: random.Random, used: set) -> str:
+    """生成不重复的实体名称"""
+    while True:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if name not in used:
+            used.add(name)
+            return name
+
+
+def generate_corpus(spec: Optional[CorpusSpec] = None) -> SyntheticCorpus:
+    """
+    生成合成语料
+
+    同一 spec（含 seed）多次生成的 ID、文本与向量完全一致，保证基准可复现。
+
+    Args:
+        spec: 规模配置（默认 small）
+
+    Returns:
+        SyntheticCorpus实例
+    """
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    corpus = SyntheticCorpus(spec=spec)
+    base_time = datetime(2024, 1, 1)
+
+    # 系统默认实体类型（source_config_id 为空）
+    type_ids: Dict[str, str] = {}
+    for entity_type, name, threshold, weight in DEFAULT_ENTITY_TYPES:
+        type_id = _stable_uuid(spec.seed, "entity_type", entity_type)
+        type_ids[entity_type] = type_id
+        corpus.entity_types.append({
+            "id": type_id,
+            "scope": "global",
+            "source_config_id": None,
+            "type": entity_type,
+            "name": name,
+            "weight": weight,
+            "similarity_threshold": threshold,
+            "is_active": True,
+            "is_default": True,
+        })
+
+    used_names: set = set()
+    for s in range(spec.num_sources):
+        source_id = _stable_uuid(spec.seed, "source", s)
+        corpus.source_configs.append({"id": source_id, "name": f"bench-source-{s}"})
+
+        # 实体池（每个信息源独立）
+        source_entities = []
+        for e in range(spec.entities_per_source):
+            entity_type = DEFAULT_ENTITY_TYPES[e % len(DEFAULT_ENTITY_TYPES)][0]
+            name = _make_name(rng, used_names)
+            entity = {
+                "id": _stable_uuid(spec.seed, "entity", s, e),
+                "source_config_id": source_id,
+                "entity_type_id": type_ids[entity_type],
+                "type": entity_type,
+                "name": name,
+                "normalized_name": name.lower(),
+            }
+            source_entities.append(entity)
+            corpus.entities.append(entity)
+
+        for a in range(spec.articles_per_source):
+            article_id = _stable_uuid(spec.seed, "article", s, a)
+            corpus.articles.append({
+                "id": article_id,
+                "source_config_id": source_id,
+                "title": f"Bench article {s}-{a}",
+                "status": "COMPLETED",
+            })
+
+            section_ids = []
+            for r in range(spec.sections_per_article):
+                section_id = _stable_uuid(spec.seed, "section", s, a, r)
+                section_ids.append(section_id)
+                content = " ".join(rng.choice(_FILLER_WORDS) for _ in range(12))
+                corpus.sections.append({
+                    "id": section_id,
+                    "article_id": article_id,
+                    "rank": r,
+                    "order_index": r,
+                    "heading": f"Section {r}",
+                    "content": content,
+                    "length": len(content),
+                })
+
+            per_chunk = max(1, len(section_ids) // max(1, spec.chunks_per_article))
+            for c in range(spec.chunks_per_article):
+                chunk_id = _stable_uuid(spec.seed, "chunk", s, a, c)
+                references = section_ids[c * per_chunk:(c + 1) * per_chunk] or section_ids[-1:]
+
+                chunk_texts = []
+                for v in range(spec.events_per_chunk):
+                    event_id = _stable_uuid(spec.seed, "event", s, a, c, v)
+                    linked = rng.sample(
+                        source_entities, k=min(spec.entities_per_event, len(source_entities))
+                    )
+                    names = [entity["name"] for entity in linked]
+                    fillers = [rng.choice(_FILLER_WORDS) for _ in range(4)]
+                    title = f"{names[0]} {fillers[0]}"
+                    content = " ".join(names + fillers)
+                    chunk_texts.append(content)
+
+                    start_time = base_time + timedelta(days=rng.randint(0, 365))
+                    corpus.events.append({
+                        "id": event_id,
+                        "source_config_id": source_id,
+                        "source_type": "ARTICLE",
+                        "source_id": article_id,
+                        "article_id": article_id,
+                        "chunk_id": chunk_id,
+                        "title": title,
+                        "summary": content,
+                        "content": content,
+                        "category": "bench",
+                        "rank": c * spec.events_per_chunk + v,
+                        "start_time": start_time,
+                        "end_time": start_time + timedelta(days=1),
+                        "references": references,
+                    })
+                    for rank, entity in enumerate(linked):
+                        corpus.event_entities.append({
+                            "id": _stable_uuid(spec.seed, "event_entity", event_id, entity["id"]),
+                            "event_id": event_id,
+                            "entity_id": entity["id"],
+                            "weight": round(1.0 - rank * 0.1, 2),
+                        })
+
+                chunk_content = " ".join(chunk_texts)
+                corpus.chunks.append({
+                    "id": chunk_id,
+                    "source_config_id": source_id,
+                    "source_type": "ARTICLE",
+                    "source_id": article_id,
+                    "article_id": article_id,
+                    "heading": f"Chunk {c}",
+                    "content": chunk_content,
+                    "rank": c,
+                    "chunk_length": len(chunk_content),
+                    "references": references,
+                })
+
+    return corpus
@@ -0,0 +1,227 @@
+"""
+实体交叉补充基准
+
+在合成的提取批次上对比 EventProcessor._cross_fill_entities 的两种匹配方式：
+- automaton: 实体名构建一次自动机，每个事项单次扫描文本
+- scan:      逐实体子串检查（原实现）
+
+两种方式的补充结果应完全一致，报告中的 consistent 字段用于核对。
+
+使用方法：
+    python -m dataflow.evaluation.perf.cross_fill --events 2000 --entities 10000
+    python -m dataflow.evaluation.perf.cross_fill --events 500 --entities 2000 --modes automaton --repeat 3
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataflow.evaluation.perf.corpus import DEFAULT_ENTITY_TYPES, _FILLER_WORDS, _SYLLABLES
+from dataflow.evaluation.perf.runner import StageResult
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.perf.cross_fill")
+
+CROSS_FILL_MODES = ("automaton", "scan")
+
+
+def generate_extraction_batch(
+    num_events: int,
+    num_entities: int,
+    entities_per_event: int = 5,
+    mentions_per_event: int = 8,
+    words_per_event: int = 120,
+    seed: int = 42,
+) -> List[Any]:
+    """
+    生成合成提取批次
+
+    实体按顺序轮流分配给各事项作为已抽取实体（事项足够多时每个实体都会进入候选集合），
+    每个事项正文中另外提及 mentions_per_event 个随机实体（交叉补充的目标）。
+
+    Args:
+        num_events: 事项数量
+        num_entities: 实体总数
+        entities_per_event: 每个事项已抽取的实体数
+        mentions_per_event: 每个事项正文中额外提及的实体数
+        words_per_event: 每个事项正文的填充词数
+        seed: 随机种子
+
+    Returns:
+        SourceEvent 列表（extra_data["raw_entities"] 已填充）
+    """
+    from dataflow.db.models import SourceEvent
+
+    rng = random.Random(seed)
+    entity_types = [entity_type for entity_type, *_ in DEFAULT_ENTITY_TYPES]
+
+    names: List[str] = []
+    seen = set()
+    while len(names) < num_entities:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 4)))
+        if name not in seen:
+            seen.add(name)
+            names.append(name.capitalize())
+    entities = [(rng.choice(entity_types), name) for name in names]
+
+    events = []
+    for i in range(num_events):
+        own = [entities[k % len(entities)] for k in range(i * entities_per_event, (i + 1) * entities_per_event)]
+        mentioned = rng.sample(entities, min(mentions_per_event, len(entities)))
+        words = [rng.choice(_FILLER_WORDS) for _ in range(words_per_event)]
+        for _, name in own + mentioned:
+            words.insert(rng.randrange(len(words) + 1), name)
+
+        raw_entities: Dict[str, List[Dict[str, str]]] = {}
+        for entity_type, name in own:
+            raw_entities.setdefault(entity_type, []).append({"name": name, "description": ""})
+
+        events.append(
+            SourceEvent(
+                id=f"event-{i}",
+                title=f"{own[0][1]} {rng.choice(_FILLER_WORDS)}",
+                content=" ".join(words),
+                extra_data={"raw_entities": raw_entities},
+            )
+        )
+    return events
+
+
+def _build_processor(mode: str) -> Any:
+    """构建仅用于交叉补充的 EventProcessor（不访问数据库 / LLM）"""
+    from dataflow.modules.extract.config import ExtractConfig
+    from dataflow.modules.extract.processor import EventProcessor
+
+    config = ExtractConfig(source_config_id="benchmark", chunk_ids=["benchmark"], cross_fill_mode=mode)
+    return EventProcessor(llm_client=None, prompt_manager=None, config=config)
+
+
+def _snapshot(events: Sequence[Any]) -> List[Dict[str, List[str]]]:
+    return [
+        {
+            entity_type: [entity["name"] for entity in entity_list]
+            for entity_type, entity_list in event.extra_data["raw_entities"].items()
+        }
+        for event in events
+    ]
+
+
+@dataclass
+class CrossFillReport:
+    """对比报告"""
+
+    events: int
+    entities: int
+    modes: List[Dict[str, Any]]
+    consistent: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        """格式化为文本表格"""
+        header = f"{'mode':<12}{'n':>4}{'added':>10}{'mean':>12}{'p50':>12}{'max':>12}"
+        lines = [header, "-" * len(header)]
+        for row in self.modes:
+            lines.append(
+                f"{row['mode']:<12}{row['count']:>4}{row['added']:>10}"
+                f"{row['mean_ms']:>12.1f}{row['p50_ms']:>12.1f}{row['max_ms']:>12.1f}"
+            )
+        return "\n".join(lines)
+
+
+def benchmark_cross_fill(
+    events: Sequence[Any],
+    modes: Sequence[str] = CROSS_FILL_MODES,
+    repeat: int = 1,
+) -> CrossFillReport:
+    """
+    对比交叉补充的耗时与结果
+
+    Args:
+        events: 提取批次（不会被修改，每轮使用深拷贝）
+        modes: 待对比的匹配方式
+        repeat: 每种方式的重复次数
+
+    Returns:
+        CrossFillReport
+    """
+    baseline = _snapshot(events)
+    entity_count = len({
+        (entity_type, entity["name"].lower())
+        for event in events
+        for entity_type, entity_list in event.extra_data["raw_entities"].items()
+        for entity in entity_list
+    })
+
+    rows = []
+    results = []
+    for mode in modes:
+        if mode not in CROSS_FILL_MODES:
+            raise ValueError(f"不支持的交叉补充方式: {mode}，可选: {', '.join(CROSS_FILL_MODES)}")
+        processor = _build_processor(mode)
+        timing = StageResult(mode)
+        filled: Optional[List[Dict[str, List[str]]]] = None
+        for _ in range(repeat):
+            batch = copy.deepcopy(list(events))
+            start = time.perf_counter()
+            processor._cross_fill_entities(batch)
+            timing.add(time.perf_counter() - start)
+            filled = _snapshot(batch)
+
+        added = sum(
+            len(names) for event_entities in filled for names in event_entities.values()
+        ) - sum(len(names) for event_entities in baseline for names in event_entities.values())
+        row = timing.summary()
+        row["mode"] = row.pop("stage")
+        row["added"] = added
+        rows.append(row)
+        results.append(filled)
+
+    return CrossFillReport(
+        events=len(events),
+        entities=entity_count,
+        modes=rows,
+        consistent=all(result == results[0] for result in results),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="实体交叉补充基准（automaton vs scan）")
+    parser.add_argument("--events", type=int, default=2000, help="事项数量")
+    parser.add_argument("--entities", type=int, default=10000, help="实体总数")
+    parser.add_argument("--entities-per-event", type=int, default=5, help="每个事项已抽取的实体数")
+    parser.add_argument("--mentions-per-event", type=int, default=8, help="每个事项正文额外提及的实体数")
+    parser.add_argument("--words", type=int, default=120, help="每个事项正文的填充词数")
+    parser.add_argument("--modes", nargs="+", default=list(CROSS_FILL_MODES), choices=CROSS_FILL_MODES)
+    parser.add_argument("--repeat", type=int, default=1, help="每种方式的重复次数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", default=None, help="JSON 报告输出路径")
+    args = parser.parse_args(argv)
+
+    events = generate_extraction_batch(
+        args.events,
+        args.entities,
+        entities_per_event=args.entities_per_event,
+        mentions_per_event=args.mentions_per_event,
+        words_per_event=args.words,
+        seed=args.seed,
+    )
+    report = benchmark_cross_fill(events, modes=args.modes, repeat=args.repeat)
+
+    print(f"事项: {report.events}, 实体: {report.entities}, 结果一致: {report.consistent}")
+    print(report.format_table())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+引擎构建基准
+
+对比批量创建 DataFlowEngine 的两种方式：
+- shared:   共享运行时（重组件每进程构建一次，引擎只持有轻量状态）
+- isolated: 每个引擎各自构建加载器 / 解析器 / 处理器 / 提取器 / 搜索器并重新配置日志（原实现）
+
+报告每个引擎的构建耗时与新增内存（tracemalloc）。
+
+使用方法：
+    python -m dataflow.evaluation.perf.engine_bootstrap --engines 100
+    python -m dataflow.evaluation.perf.engine_bootstrap --engines 100 --modes shared --concurrent
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataflow.evaluation.perf.runner import StageResult
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.perf.engine_bootstrap")
+
+BOOTSTRAP_MODES = ("shared", "isolated")
+
+
+def _build_engine(mode: str, index: int) -> Any:
+    """按指定方式构建一个引擎"""
+    from dataflow.engine import DataFlowEngine, ModelConfig
+
+    engine = DataFlowEngine(
+        model_config=ModelConfig(api_key=f"sk-bench-{index}", model=f"model-{index}"),
+        source_config_id=f"bench-{index}",
+        auto_setup_logging=mode == "shared",
+    )
+    # shared：阶段组件在首次使用时才创建，构建引擎不再触及它们
+    if mode == "isolated":
+        from dataflow.modules.extract.extractor import EventExtractor
+        from dataflow.modules.load.loader import ConversationLoader, DocumentLoader
+        from dataflow.modules.search.searcher import EventSearcher
+        from dataflow.utils import setup_logging
+
+        setup_logging()
+        engine._document_loader = DocumentLoader()
+        engine._conversation_loader = ConversationLoader()
+        engine._extractor = EventExtractor(prompt_manager=engine.prompt_manager, model_config=engine.model_config_dict)
+        engine._searcher = EventSearcher(prompt_manager=engine.prompt_manager, model_config=engine.model_config_dict)
+    return engine
+
+
+@dataclass
+class EngineBootstrapReport:
+    """对比报告"""
+
+    engines: int
+    concurrent: bool
+    modes: List[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        """格式化为文本表格"""
+        header = f"{'mode':<10}{'n':>6}{'mean':>10}{'p95':>10}{'total':>12}{'KiB/engine':>12}"
+        lines = [header, "-" * len(header)]
+        for row in self.modes:
+            lines.append(
+                f"{row['mode']:<10}{row['count']:>6}{row['mean_ms']:>10.3f}{row['p95_ms']:>10.3f}"
+                f"{row['total_ms']:>12.1f}{row['kib_per_engine']:>12.1f}"
+            )
+        return "\n".join(lines)
+
+
+async def _build_concurrently(mode: str, count: int, timing: StageResult) -> List[Any]:
+    async def build(index: int) -> Any:
+        start = time.perf_counter()
+        engine = _build_engine(mode, index)
+        timing.add(time.perf_counter() - start)
+        return engine
+
+    return await asyncio.gather(*(build(i) for i in range(count)))
+
+
+def benchmark_engine_bootstrap(
+    engines: int = 100,
+    modes: Sequence[str] = BOOTSTRAP_MODES,
+    concurrent: bool = False,
+) -> EngineBootstrapReport:
+    """
+    对比批量构建引擎的耗时与内存
+
+    Args:
+        engines: 每种方式构建的引擎数
+        modes: 待对比的构建方式
+        concurrent: 是否在事件循环中并发构建（asyncio.gather）
+
+    Returns:
+        EngineBootstrapReport
+    """
+    from dataflow.engine.runtime import get_engine_runtime
+
+    # 共享运行时与模块导入属于一次性成本，不计入单个引擎
+    get_engine_runtime()
+
+    rows = []
+    for mode in modes:
+        if mode not in BOOTSTRAP_MODES:
+            raise ValueError(f"不支持的构建方式: {mode}，可选: {', '.join(BOOTSTRAP_MODES)}")
+        _build_engine(mode, -1)
+
+        timing = StageResult(mode)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        if concurrent:
+            built = asyncio.run(_build_concurrently(mode, engines, timing))
+        else:
+            built = []
+            for index in range(engines):
+                start = time.perf_counter()
+                built.append(_build_engine(mode, index))
+                timing.add(time.perf_counter() - start)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        row = timing.summary()
+        row["mode"] = row.pop("stage")
+        row["total_ms"] = round(sum(timing.latencies_ms), 2)
+        row["kib_per_engine"] = round((after - before) / 1024 / max(len(built), 1), 2)
+        rows.append(row)
+        del built
+
+    return EngineBootstrapReport(engines=engines, concurrent=concurrent, modes=rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="引擎构建基准（shared vs isolated）")
+    parser.add_argument("--engines", type=int, default=100, help="每种方式构建的引擎数")
+    parser.add_argument("--modes", nargs="+", default=list(BOOTSTRAP_MODES), choices=BOOTSTRAP_MODES)
+    parser.add_argument("--concurrent", action="store_true", help="在事件循环中并发构建")
+    parser.add_argument("--output", default=None, help="JSON 报告输出路径")
+    args = parser.parse_args(argv)
+
+    report = benchmark_engine_bootstrap(args.engines, modes=args.modes, concurrent=args.concurrent)
+
+    print(f"引擎数: {report.engines}, 并发构建: {report.concurrent}")
+    print(report.format_table())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
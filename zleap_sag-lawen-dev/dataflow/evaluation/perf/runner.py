@@ -0,0 +1,313 @@
+"""
+搜索流水线离线性能基准
+
+在合成语料 + 离线后端上计时：
+- recall:          RecallSearcher.search
+- expand:          ExpandSearcher.search（输入为同一查询的 Recall 结果）
+- rerank_pagerank: 事项级 PageRank 重排（输入为同一查询的 Expand 结果）
+- rerank_rrf:      RRF 重排（输入同上）
+- end_to_end:      SAGSearcher.search（关闭结果缓存）
+
+使用方法：
+    python -m dataflow.evaluation.perf.runner --scale small --queries 20
+    python -m dataflow.evaluation.perf.runner --scale medium --stages recall expand \\
+        --embedding-latency 0.02 --llm-latency 0.5 --output perf.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataflow.evaluation.perf.backends import OfflineBackend
+from dataflow.evaluation.perf.corpus import CorpusSpec, SyntheticCorpus, generate_corpus
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.perf.runner")
+
+STAGES = ("recall", "expand", "rerank_pagerank", "rerank_rrf", "end_to_end")
+
+
+@dataclass
+class StageResult:
+    """单个阶段的计时结果（单位：毫秒）"""
+
+    stage: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def add(self, seconds: float) -> None:
+        self.latencies_ms.append(seconds * 1000)
+
+    def _percentile(self, q: float) -> float:
+        values = sorted(self.latencies_ms)
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+        return values[index]
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总统计"""
+        count = len(self.latencies_ms)
+        total_s = sum(self.latencies_ms) / 1000
+        return {
+            "stage": self.stage,
+            "count": count,
+            "errors": self.errors,
+            "mean_ms": round(statistics.fmean(self.latencies_ms), 2) if count else 0.0,
+            "p50_ms": round(self._percentile(0.50), 2),
+            "p95_ms": round(self._percentile(0.95), 2),
+            "max_ms": round(max(self.latencies_ms), 2) if count else 0.0,
+            "qps": round(count / total_s, 2) if total_s else 0.0,
+        }
+
+
+@dataclass
+class BenchmarkReport:
+    """基准报告"""
+
+    spec: Dict[str, Any]
+    corpus: Dict[str, int]
+    stages: List[Dict[str, Any]]
+    counters: Dict[str, int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        """格式化为文本表格"""
+        header = f"{'stage':<18}{'n':>6}{'err':>5}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}{'qps':>9}"
+        lines = [header, "-" * len(header)]
+        for row in self.stages:
+            lines.append(
+                f"{row['stage']:<18}{row['count']:>6}{row['errors']:>5}"
+                f"{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                f"{row['max_ms']:>10.2f}{row['qps']:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+class PipelineBenchmark:
+    """
+    搜索流水线基准执行器
+
+    各阶段按查询串联：同一查询的 Recall 结果作为 Expand 输入，Expand 结果作为重排输入，
+    只计时被选中的阶段（未选中但作为输入需要的阶段照常执行、不计时）。
+    """
+
+    def __init__(
+        self,
+        backend: OfflineBackend,
+        prompt_manager: Optional[Any] = None,
+        search_overrides: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        初始化基准执行器
+
+        Args:
+            backend: 已启动的离线后端
+            prompt_manager: 提示词管理器（默认使用全局实例）
+            search_overrides: 覆盖 SearchConfig 的字段（如 {"recall": {...}}）
+        """
+        if prompt_manager is None:
+            from dataflow.core.prompt.manager import get_prompt_manager
+
+            prompt_manager = get_prompt_manager()
+
+        self.backend = backend
+        self.prompt_manager = prompt_manager
+        self.search_overrides = search_overrides or {}
+
+    def build_config(self, query: Dict[str, Any], **overrides: Any):
+        """构建单次查询的 SearchConfig（关闭结果缓存，保证每次都真实执行）"""
+        from dataflow.modules.search import SearchConfig
+
+        payload = {
+            "query": query["query"],
+            "source_config_id": query["source_config_id"],
+            "use_cache": False,
+            **self.search_overrides,
+            **overrides,
+        }
+        return SearchConfig(**payload)
+
+    async def run_stages(
+        self,
+        queries: Sequence[Dict[str, Any]],
+        stages: Sequence[str] = STAGES,
+    ) -> List[StageResult]:
+        """
+        执行基准
+
+        Args:
+            queries: 查询列表（SyntheticCorpus.sample_queries 的输出）
+            stages: 需要计时的阶段
+
+        Returns:
+            各阶段计时结果（顺序与 STAGES 一致）
+        """
+        from dataflow.modules.search import SAGSearcher
+        from dataflow.modules.search.config import RerankStrategy
+        from dataflow.modules.search.expand import ExpandSearcher
+        from dataflow.modules.search.ranking.pagerank import (
+            RerankPageRankSearcher as EventPageRankSearcher,
+        )
+        from dataflow.modules.search.ranking.rrf import RerankRRFSearcher
+        from dataflow.modules.search.recall import RecallSearcher
+
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"未知阶段: {sorted(unknown)}，可选: {', '.join(STAGES)}")
+
+        llm_client = self.backend.llm_client
+        recall_searcher = RecallSearcher(llm_client=llm_client, prompt_manager=self.prompt_manager)
+        expand_searcher = ExpandSearcher(llm_client, self.prompt_manager, recall_searcher)
+        pagerank_searcher = EventPageRankSearcher(llm_client)
+        rrf_searcher = RerankRRFSearcher(llm_client=llm_client)
+
+        sag_searcher = SAGSearcher(prompt_manager=self.prompt_manager)
+        sag_searcher._llm_client = llm_client
+
+        results = {stage: StageResult(stage) for stage in STAGES if stage in stages}
+        need_expand = bool({"expand", "rerank_pagerank", "rerank_rrf"} & set(stages))
+        need_rerank = bool({"rerank_pagerank", "rerank_rrf"} & set(stages))
+
+        async def timed(stage: str, coro):
+            start = time.perf_counter()
+            try:
+                value = await coro
+            except Exception as e:
+                if stage in results:
+                    results[stage].errors += 1
+                logger.warning(f"⚠️ 基准阶段 {stage} 失败: {e}")
+                return None
+            if stage in results:
+                results[stage].add(time.perf_counter() - start)
+            return value
+
+        for query in queries:
+            if need_expand or "recall" in results:
+                config = self.build_config(query)
+                recall_result = await timed("recall", recall_searcher.search(config))
+
+                if need_expand and recall_result is not None:
+                    expand_result = await timed("expand", expand_searcher.search(config, recall_result))
+
+                    if need_rerank and expand_result is not None:
+                        if "rerank_pagerank" in results:
+                            pagerank_config = config.model_copy(deep=True)
+                            pagerank_config.rerank.strategy = RerankStrategy.PAGERANK
+                            await timed(
+                                "rerank_pagerank",
+                                pagerank_searcher.search(
+                                    key_final=expand_result.key_final, config=pagerank_config
+                                ),
+                            )
+                        if "rerank_rrf" in results:
+                            rrf_config = config.model_copy(deep=True)
+                            rrf_config.rerank.strategy = RerankStrategy.RRF
+                            await timed(
+                                "rerank_rrf",
+                                rrf_searcher.search(key_final=expand_result.key_final, config=rrf_config),
+                            )
+
+            if "end_to_end" in results:
+                await timed("end_to_end", sag_searcher.search(self.build_config(query)))
+
+        return [results[stage] for stage in STAGES if stage in results]
+
+
+async def run_benchmark(
+    spec: Optional[CorpusSpec] = None,
+    num_queries: int = 20,
+    stages: Sequence[str] = STAGES,
+    embedding_latency: float = 0.0,
+    llm_latency: float = 0.0,
+    warmup: int = 1,
+    corpus: Optional[SyntheticCorpus] = None,
+    search_overrides: Optional[Dict[str, Any]] = None,
+) -> BenchmarkReport:
+    """
+    生成语料、启动离线后端并执行基准
+
+    Args:
+        spec: 语料规模配置
+        num_queries: 计时查询数量
+        stages: 需要计时的阶段
+        embedding_latency: 模拟 Embedding 调用耗时（秒）
+        llm_latency: 模拟 LLM 调用耗时（秒）
+        warmup: 预热查询数量（不计入结果）
+        corpus: 已生成的语料（传入时忽略 spec）
+        search_overrides: 覆盖 SearchConfig 的字段
+
+    Returns:
+        BenchmarkReport
+    """
+    corpus = corpus or generate_corpus(spec or CorpusSpec())
+    queries = corpus.sample_queries(num_queries + warmup)
+
+    async with OfflineBackend(
+        corpus, embedding_latency=embedding_latency, llm_latency=llm_latency
+    ) as backend:
+        bench = PipelineBenchmark(backend, search_overrides=search_overrides)
+        if warmup:
+            await bench.run_stages(queries[:warmup], stages)
+        stage_results = await bench.run_stages(queries[warmup:], stages)
+
+        counters = {
+            "es_requests": backend.es_client.request_count,
+            "embedding_calls": backend.embedding_client.call_count,
+            "llm_calls": backend.llm_client.call_count,
+        }
+
+    return BenchmarkReport(
+        spec=asdict(corpus.spec),
+        corpus=corpus.stats(),
+        stages=[result.summary() for result in stage_results],
+        counters=counters,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="SAG 搜索流水线离线性能基准")
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"], help="语料规模")
+    parser.add_argument("--queries", type=int, default=20, help="计时查询数量")
+    parser.add_argument("--warmup", type=int, default=1, help="预热查询数量")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES), help="计时阶段")
+    parser.add_argument("--seed", type=int, default=None, help="语料随机种子")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="模拟 Embedding 耗时（秒）")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="模拟 LLM 耗时（秒）")
+    parser.add_argument("--output", default=None, help="JSON 报告输出路径")
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec.from_scale(args.scale)
+    if args.seed is not None:
+        spec.seed = args.seed
+
+    report = asyncio.run(
+        run_benchmark(
+            spec=spec,
+            num_queries=args.queries,
+            stages=args.stages,
+            embedding_latency=args.embedding_latency,
+            llm_latency=args.llm_latency,
+            warmup=args.warmup,
+        )
+    )
+
+    print(f"语料: {report.corpus}")
+    print(report.format_table())
+    print(f"计数: {report.counters}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
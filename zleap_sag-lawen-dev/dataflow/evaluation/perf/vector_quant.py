@@ -0,0 +1,290 @@
+"""
+向量索引召回率 / 延迟对比
+
+用同一批查询向量分别检索全精度索引与量化索引（migrate_vector_index.py 生成的 {name}__int8_hnsw 等），
+以精确 kNN（script_score 暴力余弦）为真值计算 Recall@k，同时统计各索引的检索延迟。
+
+查询来自评估数据集的问题（DatasetLoader），经当前配置的 Embedding 模型向量化。
+
+使用方法：
+    python -m dataflow.evaluation.perf.vector_quant --dataset test_hotpotqa \\
+        --index event_vectors --candidates event_vectors__int8_hnsw --k 10 --limit 100
+    python -m dataflow.evaluation.perf.vector_quant --dataset sample --index entity_vectors \\
+        --candidates entity_vectors__int8_hnsw entity_vectors__int4_hnsw --truth hnsw
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataflow.evaluation.perf.runner import StageResult
+from dataflow.utils import get_logger
+
+logger = get_logger("evaluation.perf.vector_quant")
+
+# 索引 -> (主键字段, 默认向量字段)
+INDEX_FIELDS: Dict[str, Dict[str, str]] = {
+    "event_vectors": {"id_field": "event_id", "vector_field": "content_vector"},
+    "entity_vectors": {"id_field": "entity_id", "vector_field": "vector"},
+    "source_chunks": {"id_field": "chunk_id", "vector_field": "content_vector"},
+}
+
+
+def recall_at_k(truth_ids: Sequence[str], candidate_ids: Sequence[str], k: int) -> float:
+    """
+    计算 Recall@k（候选前 k 个中命中真值前 k 个的比例）
+
+    Args:
+        truth_ids: 真值 ID（按相似度降序）
+        candidate_ids: 候选 ID（按相似度降序）
+        k: 截断数量
+
+    Returns:
+        召回率（真值为空时返回 1.0）
+    """
+    truth = set(truth_ids[:k])
+    if not truth:
+        return 1.0
+    return len(truth & set(candidate_ids[:k])) / len(truth)
+
+
+@dataclass
+class IndexComparison:
+    """单个索引的对比结果"""
+
+    index: str
+    timing: StageResult
+    recalls: List[float] = field(default_factory=list)
+
+    def summary(self, k: int) -> Dict[str, Any]:
+        row = self.timing.summary()
+        row["index"] = row.pop("stage")
+        row[f"recall@{k}"] = round(statistics.fmean(self.recalls), 4) if self.recalls else 0.0
+        return row
+
+
+@dataclass
+class VectorQuantReport:
+    """对比报告"""
+
+    field: str
+    k: int
+    truth: str
+    queries: int
+    indices: List[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def format_table(self) -> str:
+        """格式化为文本表格"""
+        recall_key = f"recall@{self.k}"
+        header = f"{'index':<36}{'n':>6}{'err':>5}{recall_key:>12}{'mean':>10}{'p50':>10}{'p95':>10}"
+        lines = [header, "-" * len(header)]
+        for row in self.indices:
+            lines.append(
+                f"{row['index']:<36}{row['count']:>6}{row['errors']:>5}{row[recall_key]:>12.4f}"
+                f"{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
+async def exact_knn(
+    es_client: Any,
+    index: str,
+    vector_field: str,
+    vector: List[float],
+    k: int,
+    id_field: str,
+) -> List[str]:
+    """
+    精确 kNN（script_score 暴力余弦，作为召回真值）
+
+    Returns:
+        按相似度降序的 ID 列表
+    """
+    query = {
+        "script_score": {
+            "query": {"match_all": {}},
+            "script": {
+                "source": f"cosineSimilarity(params.query_vector, '{vector_field}') + 1.0",
+                "params": {"query_vector": vector},
+            },
+        }
+    }
+    hits = await es_client.search(index=index, query=query, size=k, _source=[id_field])
+    return [hit[id_field] for hit in hits]
+
+
+async def compare_vector_indices(
+    es_client: Any,
+    query_vectors: Sequence[List[float]],
+    baseline_index: str,
+    candidate_indices: Sequence[str],
+    vector_field: str,
+    id_field: str,
+    k: int = 10,
+    truth: str = "exact",
+    warmup: int = 1,
+) -> VectorQuantReport:
+    """
+    对比多个向量索引的召回率与延迟
+
+    Args:
+        es_client: ES 客户端（ElasticsearchClient 或同接口实现）
+        query_vectors: 查询向量
+        baseline_index: 全精度索引（真值来源）
+        candidate_indices: 待对比索引（通常是量化索引）
+        vector_field: 向量字段名
+        id_field: 主键字段名
+        k: Top-k
+        truth: 真值来源（exact=精确 kNN，hnsw=全精度索引的 HNSW 结果）
+        warmup: 预热查询数量（不计入结果）
+
+    Returns:
+        VectorQuantReport
+    """
+    if truth not in ("exact", "hnsw"):
+        raise ValueError("truth 必须是 exact 或 hnsw")
+
+    indices = [baseline_index, *[name for name in candidate_indices if name != baseline_index]]
+    comparisons = {name: IndexComparison(name, StageResult(name)) for name in indices}
+
+    for position, vector in enumerate(query_vectors):
+        if truth == "exact":
+            truth_ids = await exact_knn(es_client, baseline_index, vector_field, vector, k, id_field)
+        else:
+            truth_ids = None
+
+        for name in indices:
+            start = time.perf_counter()
+            try:
+                hits = await es_client.vector_search(index=name, field=vector_field, vector=vector, size=k)
+            except Exception as e:
+                comparisons[name].timing.errors += 1
+                logger.warning(f"⚠️ 向量检索失败 ({name}): {e}")
+                continue
+            elapsed = time.perf_counter() - start
+
+            hit_ids = [hit[id_field] for hit in hits]
+            if truth_ids is None:
+                # truth=hnsw：以全精度索引结果为真值（基线自身召回恒为 1）
+                truth_ids = hit_ids
+
+            if position >= warmup:
+                comparisons[name].timing.add(elapsed)
+                comparisons[name].recalls.append(recall_at_k(truth_ids, hit_ids, k))
+
+    return VectorQuantReport(
+        field=vector_field,
+        k=k,
+        truth=truth,
+        queries=max(len(query_vectors) - warmup, 0),
+        indices=[comparisons[name].summary(k) for name in indices],
+    )
+
+
+async def embed_dataset_questions(dataset: str, limit: Optional[int] = None, batch_size: int = 32) -> List[List[float]]:
+    """
+    读取评估数据集问题并向量化
+
+    Args:
+        dataset: 数据集名称（同 benchmark.py --dataset）
+        limit: 问题数量上限
+        batch_size: 批量向量化大小
+
+    Returns:
+        查询向量列表
+    """
+    from dataflow.core.ai.factory import get_embedding_client
+    from dataflow.evaluation.utils.load_utils import DatasetLoader
+
+    questions = DatasetLoader(dataset).get_questions()
+    if limit:
+        questions = questions[:limit]
+
+    client = await get_embedding_client()
+    vectors: List[List[float]] = []
+    for offset in range(0, len(questions), batch_size):
+        vectors.extend(await client.batch_generate(questions[offset:offset + batch_size]))
+    return vectors
+
+
+async def run_comparison(
+    dataset: str,
+    index: str,
+    candidates: Sequence[str],
+    k: int = 10,
+    limit: Optional[int] = None,
+    truth: str = "exact",
+    vector_field: Optional[str] = None,
+    warmup: int = 1,
+) -> VectorQuantReport:
+    """连接 ES，向量化数据集问题并执行对比"""
+    from dataflow.core.storage.elasticsearch import ElasticsearchClient
+
+    fields = INDEX_FIELDS.get(index)
+    if fields is None:
+        raise ValueError(f"不支持的索引: {index}，可选: {', '.join(INDEX_FIELDS)}")
+
+    query_vectors = await embed_dataset_questions(dataset, limit=limit + warmup if limit else None)
+
+    es_client = ElasticsearchClient()
+    try:
+        return await compare_vector_indices(
+            es_client,
+            query_vectors,
+            baseline_index=index,
+            candidate_indices=candidates,
+            vector_field=vector_field or fields["vector_field"],
+            id_field=fields["id_field"],
+            k=k,
+            truth=truth,
+            warmup=warmup,
+        )
+    finally:
+        await es_client.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="向量索引召回率 / 延迟对比（全精度 vs 量化）")
+    parser.add_argument("--dataset", default="test_hotpotqa", help="评估数据集（提供查询问题）")
+    parser.add_argument("--index", default="event_vectors", choices=list(INDEX_FIELDS), help="全精度基线索引")
+    parser.add_argument("--candidates", nargs="+", required=True, help="待对比索引（如 event_vectors__int8_hnsw）")
+    parser.add_argument("--field", default=None, help="向量字段（默认按索引选择）")
+    parser.add_argument("--k", type=int, default=10, help="Top-k")
+    parser.add_argument("--limit", type=int, default=100, help="查询数量")
+    parser.add_argument("--warmup", type=int, default=1, help="预热查询数量")
+    parser.add_argument("--truth", default="exact", choices=["exact", "hnsw"], help="召回真值来源")
+    parser.add_argument("--output", default=None, help="JSON 报告输出路径")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_comparison(
+            dataset=args.dataset,
+            index=args.index,
+            candidates=args.candidates,
+            k=args.k,
+            limit=args.limit,
+            truth=args.truth,
+            vector_field=args.field,
+            warmup=args.warmup,
+        )
+    )
+
+    print(f"字段: {report.field}, 真值: {report.truth}, 查询: {report.queries}")
+    print(report.format_table())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"报告已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ DataFlow 异常定义
 所有自定义异常都继承自DataFlowError基类
 """
 
+from typing import Optional
+
 
 class DataFlowError(Exception):
     """DataFlow基础异常类"""
@@ -52,7 +54,17 @@ class LLMTimeoutError(LLMError):
 class LLMRateLimitError(LLMError):
     """LLM速率限制异常"""
 
-    pass
+    def __init__(self, message: str, *args: object, retry_after: Optional[float] = None) -> None:
+        self.retry_after = retry_after  # 服务端建议的等待秒数（Retry-After）
+        super().__init__(message, *args)
+
+
+class LLMCircuitOpenError(LLMError):
+    """LLM熔断异常（连续失败后暂停调用）"""
+
+    def __init__(self, message: str, *args: object, retry_after: Optional[float] = None) -> None:
+        self.retry_after = retry_after
+        super().__init__(message, *args)
 
 
 class AIError(DataFlowError):
@@ -95,3 +107,27 @@ class PromptError(DataFlowError):
     """提示词异常"""
 
     pass
+
+
+class ServiceOverloadedError(DataFlowError):
+    """服务过载异常（准入控制拒绝，映射为 503）"""
+
+    def __init__(self, message: str, *args: object, retry_after: Optional[float] = None) -> None:
+        self.retry_after = retry_after  # 建议客户端等待秒数（Retry-After）
+        super().__init__(message, *args)
+
+
+class UploadTooLargeError(ValidationError):
+    """上传文件超过大小限制（映射为 413）"""
+
+    def __init__(self, message: str, *args: object, max_size: Optional[int] = None) -> None:
+        self.max_size = max_size  # 允许的最大字节数
+        super().__init__(message, *args)
+
+
+class DuplicateDocumentError(ValidationError):
+    """同一信息源内重复上传相同内容的文件（映射为 409）"""
+
+    def __init__(self, message: str, *args: object, article_id: Optional[str] = None) -> None:
+        self.article_id = article_id  # 已存在的文档ID
+        super().__init__(message, *args)
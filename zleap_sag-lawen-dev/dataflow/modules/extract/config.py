@@ -60,6 +60,13 @@ class ExtractBaseConfig(DataFlowBaseModel):
         description="ES批量索引大小（每批索引的文档数量）"
     )
 
+    # === 后处理 ===
+    cross_fill_mode: str = Field(
+        default="automaton",
+        pattern="^(automaton|scan)$",
+        description="实体交叉补充方式：automaton（多模式自动机，单次扫描）/ scan（逐实体子串检查）"
+    )
+
 
 
 class ExtractConfig(ExtractBaseConfig):
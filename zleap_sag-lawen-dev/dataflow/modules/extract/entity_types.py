@@ -0,0 +1,76 @@
+"""
+系统默认实体类型缓存
+
+默认实体类型（is_default=True）不能通过 API 修改，提取时每个片段都会用到：
+本模块在进程内缓存，最多每 refresh_interval 秒查询一次数据库，所有提取器 / 引擎实例共享。
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+
+from dataflow.utils import get_logger
+
+logger = get_logger("extract.entity_types")
+
+# 缓存刷新间隔（秒）
+DEFAULT_ENTITY_TYPES_REFRESH_INTERVAL = 60.0
+
+_default_entity_types: List[Dict[str, Any]] = []
+_loaded_at: Optional[float] = None
+
+
+async def get_default_entity_types(
+    refresh_interval: float = DEFAULT_ENTITY_TYPES_REFRESH_INTERVAL,
+) -> List[Dict[str, Any]]:
+    """
+    获取启用的系统默认实体类型
+
+    Args:
+        refresh_interval: 缓存刷新间隔（秒）
+
+    Returns:
+        实体类型字典列表（type, name, description, weight, value_constraints），
+        数据库不可用时返回上次结果
+    """
+    global _default_entity_types, _loaded_at
+
+    now = time.monotonic()
+    if _loaded_at is not None and now - _loaded_at < refresh_interval:
+        return _default_entity_types
+
+    from dataflow.db.base import get_session_factory
+    from dataflow.db.models import EntityType
+
+    try:
+        async with get_session_factory()() as session:
+            result = await session.execute(
+                select(EntityType)
+                .where(EntityType.is_default == True)
+                .where(EntityType.is_active == True)
+            )
+            loaded = [{
+                "type": et.type,
+                "name": et.name,
+                "description": et.description or "",
+                "weight": float(et.weight),
+                "value_constraints": et.value_constraints,
+            } for et in result.scalars().all()]
+    except Exception as e:
+        if _loaded_at is None:
+            raise
+        logger.warning(f"⚠️ 读取默认实体类型失败，沿用上次结果: {e}")
+        _loaded_at = now
+        return _default_entity_types
+
+    _default_entity_types = loaded
+    _loaded_at = now
+    return _default_entity_types
+
+
+def reset_default_entity_types() -> None:
+    """清空缓存（测试或初始化默认类型后使用）"""
+    global _loaded_at
+    _default_entity_types.clear()
+    _loaded_at = None
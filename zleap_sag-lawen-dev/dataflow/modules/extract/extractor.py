@@ -14,8 +14,10 @@ from sqlalchemy.orm import selectinload
 
 from dataflow.core.ai.factory import get_embedding_client
 from dataflow.core.ai.base import BaseLLMClient
+from dataflow.core.cache.search_cache import bump_source_version
 from dataflow.core.prompt.manager import PromptManager
 from dataflow.core.storage.elasticsearch import get_es_client
+from dataflow.modules.extract.entity_types import get_default_entity_types
 from dataflow.core.storage.repositories.entity_repository import EntityVectorRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
 from dataflow.db import (
@@ -646,6 +648,9 @@ class EventExtractor:
                 self.logger.error(f"同步到ES失败: {e}", exc_info=True)
                 # 不中断流程，继续执行
 
+        # 3. 数据源内容变化，使搜索结果缓存失效
+        await bump_source_version(config.source_config_id)
+
     async def _load_events_by_ids(self, event_ids: List[str]) -> List[SourceEvent]:
         """
         从数据库加载事项列表（预加载关系数据）
@@ -1511,25 +1516,10 @@ class EventExtractor:
         2. source级别自定义类型
         3. config中的运行时类型
         """
-        entity_types = []
+        # 默认类型（进程内缓存）
+        entity_types = list(await get_default_entity_types())
         
         async with self.session_factory() as session:
-            # 加载默认类型
-            default_result = await session.execute(
-                select(DBEntityType)
-                .where(DBEntityType.is_default == True)
-                .where(DBEntityType.is_active == True)
-            )
-            default_types = default_result.scalars().all()
-            
-            entity_types.extend([{
-                "type": et.type,
-                "name": et.name,
-                "description": et.description or "",
-                "weight": float(et.weight),
-                "value_constraints": et.value_constraints,  # 🆕 JSON 配置
-            } for et in default_types])
-            
             # 加载source级别类型
             if config.source_config_id:
                 custom_result = await session.execute(
@@ -305,6 +305,10 @@ class EventFilter:
         # 找出需要合并的事项组
         merge_groups = []
         processed_ids = set()
+        # 事项ID映射（ID 重复时取第一个，与顺序查找一致）
+        events_by_id: Dict[str, Any] = {}
+        for event in events:
+            events_by_id.setdefault(event.id, event)
 
         for event in events:
             if event.id in processed_ids:
@@ -328,13 +332,10 @@ class EventFilter:
                 # 从 duplicate_with 字段中找出要合并的事项ID
                 for issue in duplicate_issues:
                     duplicate_event_id = issue.get("duplicate_with", "")
-                    if duplicate_event_id:
-                        # 找到对应的事项
-                        for other_event in events:
-                            if other_event.id == duplicate_event_id:
-                                group.append(other_event)
-                                processed_ids.add(duplicate_event_id)
-                                break
+                    other_event = events_by_id.get(duplicate_event_id) if duplicate_event_id else None
+                    if other_event is not None:
+                        group.append(other_event)
+                        processed_ids.add(duplicate_event_id)
 
                 if len(group) > 1:
                     merge_groups.append(group)
@@ -4,8 +4,10 @@
 负责从文章片段中提取事项和实体的核心逻辑
 """
 
+import hashlib
+import json
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import or_, select
 
@@ -27,10 +29,24 @@ from dataflow.db.models import (
 from dataflow.exceptions import ExtractError
 from dataflow.modules.extract.config import ExtractConfig
 from dataflow.modules.extract.parser import EntityValueParser
-from dataflow.utils import get_logger
+from dataflow.utils import KeywordMatcher, get_logger
 
 logger = get_logger("extract.processor")
 
+# 单个事项的输出结构示例（提示词静态部分）
+_OUTPUT_SCHEMA_EXAMPLE = json.dumps({
+    "title": "简洁标题",
+    "summary": "一句话摘要",
+    "content": "完整事件内容",
+    "category": "分类标签",
+    "references": ["item.id"],
+    "entities": [{"type": "类型", "name": "名称", "description": "描述"}],
+    "is_valid": True
+}, ensure_ascii=False, indent=2)
+
+# 事项提取提示词中按信息源与实体类型缓存的静态变量
+_STATIC_PROMPT_VARIABLES = ("entity_types", "output_schema")
+
 
 class EventProcessor:
     """事项处理器（核心提取逻辑）"""
@@ -59,6 +75,10 @@ class EventProcessor:
         self._event_repo = None
         self._embedding_client = None
         self.entity_types: List[DBEntityType] = []
+        # (实体类型列表, schema)：实体类型不变时复用同一个 schema 对象（命中校验器缓存）
+        self._extraction_schema: Optional[Tuple[Tuple[str, ...], Dict[str, Any]]] = None
+        # (实体类型签名, 版本号, 实体类型说明)：实体类型不变时复用说明文本与提示词静态前缀
+        self._entity_types_section: Optional[Tuple[Tuple, str, str]] = None
         self.logger = get_logger("extract.processor")
         self.parser = EntityValueParser()
 
@@ -911,7 +931,6 @@ class EventProcessor:
         Returns:
             SYSTEM 提示词
         """
-        import json
         from dataflow.core.ai.tokensize import extract_keywords
         
         # 1. 提取原文内容
@@ -923,31 +942,21 @@ class EventProcessor:
         # 3. 构建背景信息（包含历史事项参考）
         background = self._build_background(metadata, is_article, related_events)
         
-        # 4. 获取实体类型说明
-        entity_types = self._get_entity_types_description()
+        # 4. 获取实体类型说明（按实体类型版本缓存）
+        entity_types_version, entity_types = self._get_entity_types_section()
         
         # 5. 提取候选关键词（分词器预提取）
         keywords = extract_keywords(raw_text, top_k=50) if raw_text else []
         candidate_keywords = "、".join(keywords) if keywords else "（无）"
         
-        # 6. 构建输出 schema 示例（单个事项的结构）
-        output_schema = json.dumps({
-            "title": "简洁标题",
-            "summary": "一句话摘要",
-            "content": "完整事件内容",
-            "category": "分类标签",
-            "references": ["item.id"],
-            "entities": [{"type": "类型", "name": "名称", "description": "描述"}],
-            "is_valid": True
-        }, ensure_ascii=False, indent=2)
-        
-        # 7. 渲染模板
-        return self.prompt_manager.render(
-            "event_extraction",
+        # 6. 渲染模板：静态前缀（实体类型、输出 schema 等）按 (信息源, 实体类型版本) 缓存，
+        #    每次只格式化背景信息与候选关键词
+        compiled = self.prompt_manager.compile("event_extraction", _STATIC_PROMPT_VARIABLES)
+        return compiled.render(
+            (self.config.source_config_id, entity_types_version),
+            static={"entity_types": entity_types, "output_schema": _OUTPUT_SCHEMA_EXAMPLE},
             background=background,
-            entity_types=entity_types,
             candidate_keywords=candidate_keywords,
-            output_schema=output_schema
         )
     
     def _build_background(self, metadata: Dict, is_article: bool, related_events: List[Dict] = None) -> str:
@@ -1132,6 +1141,25 @@ class EventProcessor:
 
         return "\n".join(lines)
 
+    def _get_entity_types_section(self) -> Tuple[str, str]:
+        """
+        获取实体类型版本号与说明文本（实体类型不变时复用）
+
+        Returns:
+            (版本号, 实体类型说明)
+        """
+        signature = tuple(
+            (et.type, et.name, et.description) for et in self.entity_types
+        )
+        cached = self._entity_types_section
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        description = self._get_entity_types_description()
+        version = hashlib.md5(description.encode("utf-8")).hexdigest()[:12]
+        self._entity_types_section = (signature, version, description)
+        return version, description
+
     def _build_extraction_schema(self) -> Dict[str, Any]:
         """
         构建动态JSON Schema（统一结构：type + name + description + items）
@@ -1140,8 +1168,10 @@ class EventProcessor:
             JSON Schema字典
         """
         valid_types = [et.type for et in self.entity_types]
+        if self._extraction_schema is not None and self._extraction_schema[0] == tuple(valid_types):
+            return self._extraction_schema[1]
         
-        return {
+        schema = {
             "type": "object",
             "properties": {
                 "type": {"type": "string", "const": "output"},
@@ -1181,6 +1211,8 @@ class EventProcessor:
             },
             "required": ["type", "name", "description", "items"]
         }
+        self._extraction_schema = (tuple(valid_types), schema)
+        return schema
 
     async def _parse_extraction_result(
         self, result: Dict[str, Any], sections: List[SourceChunk]
@@ -1724,6 +1756,10 @@ class EventProcessor:
         收集本次提取的所有实体，检查每个事项的标题+正文是否包含其他事项的实体但未提取，
         如果包含则自动补充。
         
+        匹配方式由 config.cross_fill_mode 决定：
+        - automaton: 所有实体名构建一次自动机，每个事项单次扫描文本（默认）
+        - scan: 逐实体子串检查，O(事项数 × 实体数 × 文本长度)
+        
         注意：权重小于1的实体类型不参与交叉，以减少噪音。
         
         Args:
@@ -1779,6 +1815,17 @@ class EventProcessor:
             f"实体交叉补充: {len(all_entities)} 个实体待检查，过滤 {filtered_count} 个低权重类型"
         )
         
+        # 候选实体（保持收集顺序，补充顺序与逐实体检查一致）
+        entity_keys = list(all_entities)
+        if getattr(self.config, "cross_fill_mode", "automaton") == "automaton":
+            matcher = KeywordMatcher(name_lower for _, name_lower in entity_keys)
+
+            def find_mentions(text: str) -> List[tuple]:
+                return [entity_keys[index] for index in sorted(matcher.find_all(text))]
+        else:
+            def find_mentions(text: str) -> List[tuple]:
+                return [key for key in entity_keys if key[1] in text]
+        
         # 交叉补充
         total_added = 0
         for event in events:
@@ -1797,12 +1844,10 @@ class EventProcessor:
                     if name:
                         existing_by_type[entity_type].add(name)
             
-            # 检查并补充缺失的实体
+            # 检查并补充缺失的实体（仅遍历文本中出现的实体名称）
             added = []
-            for (entity_type, name_lower), entity in all_entities.items():
-                # 检查文本是否包含该实体名称
-                if name_lower not in text:
-                    continue
+            for entity_type, name_lower in find_mentions(text):
+                entity = all_entities[(entity_type, name_lower)]
                 
                 # 检查该类型是否已有该实体
                 if entity_type in existing_by_type and name_lower in existing_by_type[entity_type]:
@@ -155,3 +155,19 @@ class ConversationLoadConfig(LoadBaseConfig):
         ge=10,
         description="最小内容长度（字符数）"
     )
+
+    # === 流式加载（超长会话）===
+    streaming: bool = Field(
+        default=False,
+        description="流式加载：按时间戳分页读取消息，每个时间窗口完成后立即保存并索引（内存占用与会话长度无关）"
+    )
+    page_size: int = Field(
+        default=2000,
+        ge=100,
+        le=50000,
+        description="流式加载每页读取的消息数"
+    )
+    append: bool = Field(
+        default=False,
+        description="追加模式：只处理已加载的最后一条消息之后的新消息，保留已有分块（隐含流式加载）"
+    )
@@ -5,13 +5,15 @@
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from dataflow.core.cache.search_cache import bump_source_version
 from dataflow.db import (
     Article,
     ArticleSection,
@@ -31,6 +33,12 @@ from dataflow.utils import get_logger
 logger = get_logger("modules.load.loader")
 
 
+async def _iterate(items) -> AsyncIterator:
+    """将内存列表包装为异步迭代器"""
+    for item in items:
+        yield item
+
+
 class BaseLoader(ABC):
     """加载器基类"""
 
@@ -814,6 +822,7 @@ class DocumentLoader(BaseLoader):
                 source_chunk.references = section_ids
 
             await session.commit()
+            await bump_source_version(source_config_id)
 
             logger.info(
                 f"文章保存成功",
@@ -981,6 +990,9 @@ class ConversationLoader(BaseLoader):
         """
         加载会话（主入口方法）
 
+        默认一次性读取时间范围内的全部消息；config.streaming / config.append 时
+        按时间戳分页读取并逐窗口保存、索引（见 _load_streaming）
+
         Args:
             config: ConversationLoadConfig 配置对象
 
@@ -1009,6 +1021,10 @@ class ConversationLoader(BaseLoader):
         try:
             logger.info(f"开始加载会话: {config.conversation_id}")
 
+            # 流式 / 追加加载：分页读取消息，逐窗口保存并索引
+            if config.streaming or config.append:
+                return await self._load_streaming(config)
+
             # 1. 从数据库加载会话和消息
             async with self.session_factory() as session:
                 # 加载会话
@@ -1110,6 +1126,261 @@ class ConversationLoader(BaseLoader):
             )
             raise LoadError(f"会话加载失败: {e}") from e
 
+    async def _load_streaming(self, config: ConversationLoadConfig) -> LoadResult:
+        """
+        流式加载会话：按（时间戳, ID）分页读取消息，每个时间窗口完成后立即保存并索引
+
+        内存中只保留一页消息和当前窗口的消息。追加模式下从已加载的最后一条消息之后继续，
+        已有分块保持不变，新分块的 rank 接在其后。
+
+        Args:
+            config: ConversationLoadConfig 配置对象
+
+        Returns:
+            LoadResult（chunk_ids 只包含本次新建的分块）
+        """
+        from sqlalchemy import delete
+
+        from dataflow.utils import TokenEstimator
+
+        start_dt = datetime.fromisoformat(config.start_time)
+        end_dt = datetime.fromisoformat(config.end_time)
+
+        async with self.session_factory() as session:
+            conversation = await session.get(ChatConversation, config.conversation_id)
+            if not conversation:
+                raise LoadError(f"会话不存在: {config.conversation_id}")
+
+            source = await session.get(SourceConfig, config.source_config_id)
+            if not source:
+                raise LoadError(f"信息源不存在: {config.source_config_id}")
+
+            if not config.append:
+                # 全量重建：删除旧的 SourceChunk
+                await session.execute(
+                    delete(SourceChunk).where(
+                        SourceChunk.source_id == conversation.id,
+                        SourceChunk.source_type == "CHAT",
+                    )
+                )
+                await session.commit()
+
+        cursor, rank = (None, 0)
+        if config.append:
+            cursor, rank = await self._get_append_cursor(conversation.id)
+            logger.info(
+                f"追加加载会话: {conversation.id}",
+                extra={"after": str(cursor[0]) if cursor else None, "start_rank": rank},
+            )
+
+        es_client = repo = None
+        if config.auto_vector:
+            from dataflow.core.storage import ElasticsearchClient, SourceChunkRepository
+
+            es_client = ElasticsearchClient()
+            repo = SourceChunkRepository(es_client.client)
+
+        token_estimator = TokenEstimator()
+        chunk_ids: List[str] = []
+        message_count = 0
+        window_count = 0
+
+        try:
+            messages = self._iter_messages(
+                conversation.id, start_dt, end_dt, config.page_size, after=cursor
+            )
+            async for window_start, window_end, window_messages in self._group_windows(
+                messages, config.interval_minutes, start_dt, end_dt
+            ):
+                chunks = self._build_window_chunks(
+                    window_messages, window_start, window_end, rank, config.max_tokens, token_estimator
+                )
+                saved = await self._save_window_chunks(conversation.id, config.source_config_id, chunks)
+
+                if repo is not None:
+                    try:
+                        await self._batch_index_chunks(
+                            chunks=saved,
+                            repo=repo,
+                            es_client=es_client,
+                            embedding_batch_size=config.embedding_batch_size,
+                            es_bulk_size=config.es_bulk_index_size,
+                            source_config_id=config.source_config_id,
+                        )
+                    except Exception as e:
+                        logger.error(f"窗口索引失败: {conversation.id} {window_start}: {e}", exc_info=True)
+
+                chunk_ids.extend(chunk.id for chunk in saved)
+                rank += len(saved)
+                message_count += len(window_messages)
+                window_count += 1
+        finally:
+            if es_client is not None:
+                await es_client.client.close()
+
+        if not message_count and not config.append:
+            raise LoadError(f"会话没有消息: {config.conversation_id}")
+
+        if chunk_ids:
+            await bump_source_version(config.source_config_id)
+
+        logger.info(
+            f"会话流式加载完成: {conversation.id}",
+            extra={
+                "conversation_id": conversation.id,
+                "message_count": message_count,
+                "window_count": window_count,
+                "chunk_count": len(chunk_ids),
+            },
+        )
+
+        return LoadResult(
+            source_id=conversation.id,
+            source_type="CHAT",
+            chunk_ids=chunk_ids,
+            source_config_id=config.source_config_id,
+            title=conversation.title,
+            chunk_count=len(chunk_ids),
+            extra={
+                "message_count": message_count,
+                "time_range": f"{config.start_time} - {config.end_time}",
+                "streaming": True,
+                "appended": config.append,
+            }
+        )
+
+    async def _iter_messages(
+        self,
+        conversation_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        page_size: int,
+        after: Optional[Tuple[datetime, str]] = None,
+    ) -> AsyncIterator[ChatMessage]:
+        """
+        按（时间戳, ID）键集分页读取消息（走 idx_conv_timestamp 索引，每页一个短会话）
+
+        Args:
+            conversation_id: 会话ID
+            start_time: 开始时间
+            end_time: 结束时间
+            page_size: 每页消息数
+            after: 从该（时间戳, ID）之后开始读取（不含）
+        """
+        while True:
+            stmt = (
+                select(ChatMessage)
+                .options(
+                    load_only(
+                        ChatMessage.id, ChatMessage.timestamp, ChatMessage.content, ChatMessage.sender_name
+                    )
+                )
+                .where(
+                    ChatMessage.conversation_id == conversation_id,
+                    ChatMessage.timestamp >= start_time,
+                    ChatMessage.timestamp <= end_time,
+                )
+            )
+            if after is not None:
+                stmt = stmt.where(
+                    or_(
+                        ChatMessage.timestamp > after[0],
+                        and_(ChatMessage.timestamp == after[0], ChatMessage.id > after[1]),
+                    )
+                )
+            stmt = stmt.order_by(ChatMessage.timestamp, ChatMessage.id).limit(page_size)
+
+            async with self.session_factory() as session:
+                page = (await session.execute(stmt)).scalars().all()
+
+            for msg in page:
+                yield msg
+
+            if len(page) < page_size:
+                return
+            after = (page[-1].timestamp, page[-1].id)
+
+    async def _get_append_cursor(
+        self, conversation_id: str
+    ) -> Tuple[Optional[Tuple[datetime, str]], int]:
+        """
+        获取追加加载的起点
+
+        Returns:
+            (最后一个分块中最新消息的（时间戳, ID）, 下一个分块的 rank)；没有已加载分块时返回 (None, 0)
+        """
+        async with self.session_factory() as session:
+            last_chunk = (
+                await session.execute(
+                    select(SourceChunk)
+                    .where(
+                        SourceChunk.source_id == conversation_id,
+                        SourceChunk.source_type == "CHAT",
+                    )
+                    .order_by(SourceChunk.rank.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+
+            if last_chunk is None:
+                return None, 0
+
+            last_message = (
+                await session.execute(
+                    select(ChatMessage.timestamp, ChatMessage.id)
+                    .where(ChatMessage.id.in_(last_chunk.references or []))
+                    .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+                    .limit(1)
+                )
+            ).first()
+
+            if last_message is None:
+                raise LoadError(f"无法确定追加位置（最后一个分块的消息不存在）: {conversation_id}")
+
+            return (last_message.timestamp, last_message.id), last_chunk.rank + 1
+
+    async def _save_window_chunks(
+        self,
+        conversation_id: str,
+        source_config_id: str,
+        chunks: list[dict],
+    ) -> List[SourceChunk]:
+        """
+        保存一个时间窗口的 SourceChunk（不删除已有分块）
+
+        Returns:
+            已保存的 SourceChunk 列表
+        """
+        source_chunks = [
+            self._new_source_chunk(conversation_id, source_config_id, chunk_data)
+            for chunk_data in chunks
+        ]
+        async with self.session_factory() as session:
+            session.add_all(source_chunks)
+            await session.commit()
+        return source_chunks
+
+    @staticmethod
+    def _new_source_chunk(
+        conversation_id: str, source_config_id: str, chunk_data: dict
+    ) -> SourceChunk:
+        """根据分块数据创建会话 SourceChunk"""
+        import uuid
+
+        return SourceChunk(
+            id=str(uuid.uuid4()),
+            source_type="CHAT",
+            source_id=conversation_id,
+            source_config_id=source_config_id,
+            article_id=None,
+            conversation_id=conversation_id,
+            heading=chunk_data["heading"],
+            content=chunk_data["content"],
+            rank=chunk_data["rank"],
+            chunk_length=len(chunk_data["content"]),
+            references=chunk_data["references"],  # ChatMessage IDs（直接list）
+        )
+
     async def _create_time_window_chunks(
         self,
         messages: list,
@@ -1137,75 +1408,118 @@ class ConversationLoader(BaseLoader):
                 "references": [message_id 列表]
             }
         """
-        from datetime import timedelta
         from dataflow.utils import TokenEstimator
 
         token_estimator = TokenEstimator()
         chunks = []
-        rank = 0
 
-        # 创建时间窗口
-        current_time = start_time
-        while current_time < end_time:
-            window_end = min(
-                current_time + timedelta(minutes=interval_minutes), end_time
+        async for window_start, window_end, window_messages in self._group_windows(
+            _iterate(messages), interval_minutes, start_time, end_time
+        ):
+            chunks.extend(
+                self._build_window_chunks(
+                    window_messages, window_start, window_end, len(chunks), max_tokens, token_estimator
+                )
             )
 
-            # 过滤该时间窗口内的消息
-            window_messages = [
-                msg
-                for msg in messages
-                if current_time <= msg.timestamp < window_end
-            ]
+        return chunks
 
-            if window_messages:
-                # 格式化消息内容：发送者名称(时间戳):\n内容\n
-                formatted_messages = []
-                message_ids = []
+    async def _group_windows(
+        self,
+        messages: AsyncIterator[ChatMessage],
+        interval_minutes: int,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> AsyncIterator[Tuple[datetime, datetime, list]]:
+        """
+        按时间窗口分组（消息需按时间排序，窗口结束即产出，只保留当前窗口的消息）
 
-                for msg in window_messages:
-                    sender_name = msg.sender_name or "Unknown"
-                    timestamp_str = msg.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    formatted_content = (
-                        f"{sender_name}({timestamp_str}):\n{msg.content}\n"
-                    )
-                    formatted_messages.append(formatted_content)
-                    message_ids.append(msg.id)
-
-                # 合并所有消息
-                combined_content = "\n".join(formatted_messages)
-                token_count = token_estimator.estimate_tokens(combined_content)
-
-                # 检查 token 溢出
-                if token_count > max_tokens:
-                    # 按消息数量切分
-                    sub_chunks = self._split_messages_by_tokens(
-                        window_messages,
-                        max_tokens,
-                        current_time,
-                        window_end,
-                        rank,
-                        token_estimator,
-                    )
-                    chunks.extend(sub_chunks)
-                    rank += len(sub_chunks)
-                else:
-                    # 创建单个 chunk
-                    heading = f"{current_time.strftime('%Y-%m-%d %H:%M')}-{window_end.strftime('%H:%M')} 对话"
-                    chunks.append(
-                        {
-                            "heading": heading,
-                            "content": combined_content,
-                            "rank": rank,
-                            "references": message_ids,
-                        }
-                    )
-                    rank += 1
+        时间窗口从 start_time 起每 interval_minutes 一个，最后一个窗口截止到 end_time，
+        不在 [start_time, end_time) 内的消息被跳过
+
+        Yields:
+            (窗口开始时间, 窗口结束时间, 窗口内消息列表)，只产出有消息的窗口
+        """
+        interval = timedelta(minutes=interval_minutes)
+        current_window = None
+        window_messages = []
 
-            # 移动到下一个时间窗口
-            current_time = window_end
+        async for msg in messages:
+            if msg.timestamp < start_time or msg.timestamp >= end_time:
+                continue
 
-        return chunks
+            window_start = start_time + interval * ((msg.timestamp - start_time) // interval)
+            if window_start != current_window:
+                if window_messages:
+                    yield current_window, min(current_window + interval, end_time), window_messages
+                current_window, window_messages = window_start, []
+            window_messages.append(msg)
+
+        if window_messages:
+            yield current_window, min(current_window + interval, end_time), window_messages
+
+    def _build_window_chunks(
+        self,
+        window_messages: list,
+        window_start: datetime,
+        window_end: datetime,
+        rank: int,
+        max_tokens: int,
+        token_estimator,
+    ) -> list[dict]:
+        """
+        将一个时间窗口内的消息格式化为分块（超出 max_tokens 时按消息切分）
+
+        Args:
+            window_messages: 窗口内消息列表
+            window_start: 窗口开始时间
+            window_end: 窗口结束时间
+            rank: 起始排序号
+            max_tokens: 最大 token 数
+            token_estimator: Token 估算器
+
+        Returns:
+            分块列表
+        """
+        # 格式化消息内容：发送者名称(时间戳):\n内容\n
+        formatted_messages = []
+        message_ids = []
+
+        for msg in window_messages:
+            sender_name = msg.sender_name or "Unknown"
+            timestamp_str = msg.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            formatted_content = (
+                f"{sender_name}({timestamp_str}):\n{msg.content}\n"
+            )
+            formatted_messages.append(formatted_content)
+            message_ids.append(msg.id)
+
+        # 合并所有消息
+        combined_content = "\n".join(formatted_messages)
+        token_count = token_estimator.estimate_tokens(combined_content)
+
+        # 检查 token 溢出
+        if token_count > max_tokens:
+            # 按消息数量切分
+            return self._split_messages_by_tokens(
+                window_messages,
+                max_tokens,
+                window_start,
+                window_end,
+                rank,
+                token_estimator,
+            )
+
+        # 创建单个 chunk
+        heading = f"{window_start.strftime('%Y-%m-%d %H:%M')}-{window_end.strftime('%H:%M')} 对话"
+        return [
+            {
+                "heading": heading,
+                "content": combined_content,
+                "rank": rank,
+                "references": message_ids,
+            }
+        ]
 
     def _split_messages_by_tokens(
         self,
@@ -1311,7 +1625,6 @@ class ConversationLoader(BaseLoader):
         Returns:
             (conversation_id, chunk_ids)
         """
-        import uuid
         from sqlalchemy import delete
 
         chunk_ids = []  # 收集chunk_ids
@@ -1333,26 +1646,12 @@ class ConversationLoader(BaseLoader):
 
             # 创建新的 SourceChunk
             for chunk_data in chunks:
-                chunk_id = str(uuid.uuid4())
-                chunk_ids.append(chunk_id)  # 记录chunk_id
-                chunk_length = len(chunk_data["content"])
-
-                source_chunk = SourceChunk(
-                    id=chunk_id,
-                    source_type="CHAT",
-                    source_id=conversation_id,
-                    source_config_id=source_config_id,
-                    article_id=None,
-                    conversation_id=conversation_id,
-                    heading=chunk_data["heading"],
-                    content=chunk_data["content"],
-                    rank=chunk_data["rank"],
-                    chunk_length=chunk_length,
-                    references=chunk_data["references"],  # ChatMessage IDs（直接list）
-                )
+                source_chunk = self._new_source_chunk(conversation_id, source_config_id, chunk_data)
+                chunk_ids.append(source_chunk.id)  # 记录chunk_id
                 session.add(source_chunk)
 
             await session.commit()
+            await bump_source_version(source_config_id)
 
             logger.info(
                 f"会话 SourceChunk 保存成功",
@@ -18,6 +18,9 @@ from dataflow.modules.search.config import (
     RerankConfig,
     BM25Config,
     RerankStrategy,
+    SearchFilters,
+    TimeRange,
+    EntityValueRange,
 )
 from dataflow.modules.search.searcher import (
     SAGSearcher,
@@ -43,6 +46,9 @@ __all__ = [
     "RerankConfig",
     "BM25Config",
     "RerankStrategy",
+    "SearchFilters",
+    "TimeRange",
+    "EntityValueRange",
     # 搜索器（推荐）
     "SAGSearcher",
     "EventSearcher",
@@ -27,8 +27,8 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 
-from dataflow.core.storage.elasticsearch import get_es_client
-from dataflow.db import SourceEvent, get_session_factory
+from dataflow.core.storage.elasticsearch import get_es_client, source_routing
+from dataflow.db import SourceEvent, get_read_session_factory
 from dataflow.modules.search.config import BM25Config
 from dataflow.utils import get_logger
 
@@ -48,13 +48,14 @@ class BM25Searcher:
     def __init__(self):
         """初始化 BM25 检索器"""
         self.es_client = get_es_client()
-        self.session_factory = get_session_factory()
+        self.session_factory = get_read_session_factory()
 
     async def search(
         self,
         query: str,
         source_config_ids: List[str],
         config: Optional[BM25Config] = None,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[SourceEvent]:
         """
         使用 ES 原生 BM25 搜索 Event
@@ -63,6 +64,7 @@ class BM25Searcher:
             query: 查询文本
             source_config_ids: 信息源ID列表（支持多源搜索）
             config: BM25 配置（可选，使用默认配置）
+            extra_filters: 额外的 ES filter（如时间范围）
 
         Returns:
             List[SourceEvent]: 按 BM25 分数排序的事项列表
@@ -84,6 +86,7 @@ class BM25Searcher:
             query=query,
             source_config_ids=source_config_ids,
             config=config,
+            extra_filters=extra_filters,
         )
         es_time = time.perf_counter() - es_start
         logger.info(f"✓ ES BM25 搜索完成，命中 {len(event_ids_with_scores)} 个事项，耗时: {es_time:.3f}秒")
@@ -141,6 +144,7 @@ class BM25Searcher:
         query: str,
         source_config_ids: List[str],
         config: BM25Config,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         使用 ES multi_match 查询进行 BM25 搜索
@@ -151,6 +155,7 @@ class BM25Searcher:
             query: 查询文本
             source_config_ids: 信息源ID列表
             config: BM25 配置
+            extra_filters: 额外的 ES filter
 
         Returns:
             List[Dict]: 包含 event_id 和 score 的列表，按分数降序排列
@@ -185,6 +190,9 @@ class BM25Searcher:
             }
         }
 
+        if extra_filters:
+            query_body["bool"]["filter"].extend(extra_filters)
+
         # 如果设置了最低分数阈值，添加 min_score 参数
         search_kwargs = {}
         if config.min_score is not None:
@@ -196,6 +204,7 @@ class BM25Searcher:
                 query=query_body,
                 size=config.top_k,
                 return_full_response=True,
+                routing=source_routing(source_config_ids),
                 _source=["event_id"],  # 只需要 event_id
                 **search_kwargs,
             )
@@ -265,6 +274,7 @@ class BM25Searcher:
         query: str,
         source_config_ids: List[str],
         config: Optional[BM25Config] = None,
+        extra_filters: Optional[List[Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         搜索事项并保留 BM25 分数
@@ -275,6 +285,7 @@ class BM25Searcher:
             query: 查询文本
             source_config_ids: 信息源ID列表
             config: BM25 配置
+            extra_filters: 额外的 ES filter（如时间范围）
 
         Returns:
             List[Dict]: 包含完整信息和分数的字典列表
@@ -296,6 +307,7 @@ class BM25Searcher:
             query=query,
             source_config_ids=source_config_ids,
             config=config,
+            extra_filters=extra_filters,
         )
         es_time = time.perf_counter() - es_start
         logger.info(f"✓ ES BM25 搜索完成，命中 {len(event_ids_with_scores)} 个事项，耗时: {es_time:.3f}秒")
@@ -508,6 +520,7 @@ class BM25Searcher:
                 query=query_body,
                 size=config.top_k,
                 return_full_response=True,
+                routing=source_routing(source_config_ids),
                 _source=["chunk_id"],  # 只需要 chunk_id
                 **search_kwargs,
             )
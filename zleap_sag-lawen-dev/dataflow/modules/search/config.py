@@ -5,14 +5,20 @@
 1. RecallConfig - 实体召回
 2. ExpandConfig - 实体扩展  
 3. RerankConfig - 事项重排
+
+结构化过滤（SearchFilters）：事项时间范围、按实体类型的数值范围
 """
 
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
-from pydantic import Field
+from pydantic import Field, field_validator, model_validator
 
 from dataflow.models.base import DataFlowBaseModel
+from dataflow.utils import get_logger
+
+logger = get_logger("search.config")
 
 
 class RerankStrategy(str, Enum):
@@ -515,6 +521,87 @@ class BM25Config(DataFlowBaseModel):
     )
 
 
+class TimeRange(DataFlowBaseModel):
+    """
+    事项时间范围过滤
+
+    事项时间区间 [start_time, end_time] 与 [start, end] 有交集即命中
+    （没有 end_time 的事项按时间点 start_time 判断）
+
+    示例：
+        TimeRange(start="2023-01-01")                      # 2023 年以后
+        TimeRange(start="2024-01-01", end="2024-06-30")    # 2024 上半年
+    """
+
+    start: Optional[datetime] = Field(default=None, description="起始时间（含），为空表示不限")
+    end: Optional[datetime] = Field(default=None, description="结束时间（含），为空表示不限")
+    include_undated: bool = Field(
+        default=False,
+        description="是否保留没有时间信息的事项（start_time 与 end_time 均为空）"
+    )
+
+    @field_validator("start", "end")
+    @classmethod
+    def _to_naive(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """数据库与索引中的时间均不带时区：带时区的输入转换为本地时间"""
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "TimeRange":
+        if self.start is None and self.end is None:
+            raise ValueError("时间范围至少需要 start 或 end 之一")
+        if self.start and self.end and self.start > self.end:
+            raise ValueError("时间范围 start 不能晚于 end")
+        return self
+
+
+class EntityValueRange(DataFlowBaseModel):
+    """
+    实体数值范围过滤
+
+    事项必须关联至少一个该类型、且数值（int_value / float_value）落在范围内的实体
+
+    示例：
+        EntityValueRange(entity_type="amount", min_value=1_000_000)
+    """
+
+    entity_type: str = Field(..., min_length=1, description="实体类型标识（如 amount、price）")
+    min_value: Optional[float] = Field(default=None, description="最小值（含），为空表示不限")
+    max_value: Optional[float] = Field(default=None, description="最大值（含），为空表示不限")
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "EntityValueRange":
+        if self.min_value is None and self.max_value is None:
+            raise ValueError(f"实体类型 {self.entity_type} 的数值范围至少需要 min_value 或 max_value 之一")
+        if self.min_value is not None and self.max_value is not None and self.min_value > self.max_value:
+            raise ValueError(f"实体类型 {self.entity_type} 的数值范围 min_value 不能大于 max_value")
+        return self
+
+
+class SearchFilters(DataFlowBaseModel):
+    """
+    结构化过滤条件（Recall 和 Expand 阶段下推到 MySQL 索引列与 ES filter）
+
+    多个条件之间为“且”关系；为空时不做任何过滤
+    """
+
+    time_range: Optional[TimeRange] = Field(default=None, description="事项时间范围")
+    entity_values: List[EntityValueRange] = Field(
+        default_factory=list,
+        description="按实体类型的数值范围（事项须关联满足每个范围的实体）"
+    )
+    exclude_article_ids: List[str] = Field(
+        default_factory=list,
+        description="排除的文档ID（事项 article_id / ES source_id；删除中的文档由搜索自动加入）"
+    )
+
+    def is_active(self) -> bool:
+        """是否存在过滤条件"""
+        return self.time_range is not None or bool(self.entity_values) or bool(self.exclude_article_ids)
+
+
 class SearchBaseConfig(DataFlowBaseModel):
     """
     搜索基础配置
@@ -532,6 +619,11 @@ class SearchBaseConfig(DataFlowBaseModel):
         description="启用query重写（将口语化表述整理为更适合查询的问题）"
     )
 
+    use_cache: bool = Field(
+        default=True,
+        description="启用搜索结果缓存（相同query+配置+数据版本直接返回缓存结果）"
+    )
+
     # 实体类型过滤（Recall 和 Expand 阶段都使用）
     # 注意：当 focus_entity_types 非空时，优先使用白名单；否则使用黑名单
     exclude_entity_types: List[str] = Field(
@@ -539,6 +631,12 @@ class SearchBaseConfig(DataFlowBaseModel):
         description="[黑名单] 需要排除的实体类型（当 focus_entity_types 为空时生效）"
     )
 
+    # 结构化过滤（时间范围、实体数值范围）
+    filters: SearchFilters = Field(
+        default_factory=SearchFilters,
+        description="结构化过滤条件：在召回和扩展阶段缩小候选事项集合"
+    )
+
     # 返回类型控制
     return_type: ReturnType = Field(
         default=ReturnType.EVENT,
@@ -662,6 +760,12 @@ class SearchConfig(SearchBaseConfig):
         description="event到entity的映射缓存（event_id -> list of entity_ids）"
     )
 
+    # 结构化过滤：满足各实体数值范围的实体ID（MySQL 范围查询一次，供 ES filter 复用）
+    filter_entity_ids: Optional[List[List[str]]] = Field(
+        default=None,
+        description="与 filters.entity_values 一一对应的满足范围的实体ID，None 表示尚未解析"
+    )
+
     # 分词召回实体ID集合（用于动态加权）
     tokenizer_entity_ids: Set[str] = Field(
         default_factory=set,
@@ -716,6 +820,26 @@ class SearchConfig(SearchBaseConfig):
         description="BM25搜索中content字段的权重"
     )
 
+    # === 阶段进度回调（流式搜索） ===
+    progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = Field(
+        default=None,
+        exclude=True,
+        description="阶段进度回调（召回候选、每跳扩展、重排完成），为空时不产生任何额外开销",
+    )
+
+    async def emit_progress(self, event: Dict[str, Any]) -> None:
+        """
+        推送阶段进度（未设置回调时直接返回）
+
+        回调自身出错不影响搜索；取消（客户端断开）照常向上传播。
+        """
+        if self.progress_callback is None:
+            return
+        try:
+            await self.progress_callback(event)
+        except Exception as e:
+            logger.warning(f"⚠️ 推送搜索进度失败（{event.get('type')}）: {e}")
+
 
 __all__ = [
     # 配置
@@ -725,6 +849,9 @@ __all__ = [
     "ExpandConfig",
     "RerankConfig",
     "BM25Config",
+    "SearchFilters",
+    "TimeRange",
+    "EntityValueRange",
     "RerankStrategy",
     "ReturnType",
     "RecallMode",
@@ -4,32 +4,95 @@
 负责为搜索结果中的事项列表补充完整信息：
 - 关联实体
 - 原文片段引用
+
+按字段投影只加载调用方需要的数据：
+- minimal: 事项基础字段（标题、摘要、时间等，不含正文与关联数据，单次窄查询）
+- standard: 完整事项 + 关联实体 + 信息源名称 + 文档名称
+- full: standard + 原文片段 / 对话消息引用（默认，与原有返回一致）
+
+standard / full 的补全结果按（事项ID, 更新时间, 投影）短期缓存，热门事项不必每次重新组装。
 """
 
-from typing import List, Dict, Any, Union
-from sqlalchemy import select, and_
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
-from dataflow.db.models import SourceEvent, EventEntity, ArticleSection, ChatMessage, Article, ChatConversation
 from dataflow.api.schemas.document import SourceEventResponse
+from dataflow.core.cache.enrich_cache import EnrichedEventCache, get_enrich_cache
+from dataflow.core.config import get_settings
+from dataflow.core.telemetry import is_verbose
+from dataflow.db.models import (
+    Article,
+    ArticleSection,
+    ChatConversation,
+    ChatMessage,
+    EventEntity,
+    SourceConfig,
+    SourceEvent,
+)
+from dataflow.utils import get_logger
+
+logger = get_logger("search.enricher")
+
+
+class EnrichProjection(str, Enum):
+    """事项补全字段投影"""
+
+    MINIMAL = "minimal"  # 基础字段
+    STANDARD = "standard"  # + 正文、实体、信息源/文档名称
+    FULL = "full"  # + 原文引用
+
+
+# minimal 投影返回的字段（不加载 content / extra_data 等大字段）
+MINIMAL_FIELDS = (
+    "id",
+    "source_config_id",
+    "source_type",
+    "source_id",
+    "article_id",
+    "conversation_id",
+    "title",
+    "summary",
+    "category",
+    "rank",
+    "start_time",
+    "end_time",
+    "created_time",
+    "updated_time",
+)
 
 
 class EventEnricher:
     """事项内容扩展器"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, use_cache: bool = True):
+        """
+        Args:
+            db: 数据库会话
+            use_cache: 是否使用补全缓存（还受 ENRICH_CACHE_ENABLED 控制）
+        """
         self.db = db
+        self.cache: Optional[EnrichedEventCache] = (
+            get_enrich_cache() if use_cache and get_settings().enrich_cache_enabled else None
+        )
 
-    async def enrich_events(self, events: List[Any]) -> List[Dict[str, Any]]:
+    async def enrich_events(
+        self,
+        events: List[Any],
+        projection: Union[EnrichProjection, str] = EnrichProjection.FULL,
+    ) -> List[Dict[str, Any]]:
         """
-        为事项列表补充完整信息
+        为事项列表补充信息
 
         Args:
             events: 事项列表（可以是字典或 Pydantic 模型）
+            projection: 字段投影（minimal / standard / full）
 
         Returns:
-            扩展后的事项字典列表（包含 entities 和 references）
+            扩展后的事项字典列表（保持输入顺序，数据库中不存在的事项被跳过）
         """
         if not events:
             return []
@@ -47,56 +110,164 @@ class EventEnricher:
         if not event_ids:
             return []
 
-        # 1. 批量查询事项及其关联的实体（同时预加载 source 和 article）
+        projection = EnrichProjection(projection)
+        unique_ids = list(dict.fromkeys(event_ids))
+
+        if projection == EnrichProjection.MINIMAL:
+            payloads = await self._load_minimal(unique_ids)
+        else:
+            payloads = await self._load_with_cache(unique_ids, projection)
+
+        # 缓存中的 payload 由多个请求共享，返回浅拷贝
+        enriched_events = [dict(payloads[eid]) for eid in event_ids if eid in payloads]
+
+        logger.info(f"✅ 成功处理 {len(enriched_events)} 个事项（投影={projection.value}）")
+        return enriched_events
+
+    async def _load_minimal(self, event_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """只查询基础字段"""
         query = (
             select(SourceEvent)
             .where(SourceEvent.id.in_(event_ids))
-            .options(
-                selectinload(SourceEvent.event_associations).selectinload(EventEntity.entity),
-                selectinload(SourceEvent.source),  # 预加载 SourceConfig
-                selectinload(SourceEvent.article)  # 预加载 Article
-            )
+            .options(load_only(*(getattr(SourceEvent, name) for name in MINIMAL_FIELDS)))
+        )
+        result = await self.db.execute(query)
+        return {
+            event.id: {name: getattr(event, name) for name in MINIMAL_FIELDS}
+            for event in result.scalars().all()
+        }
+
+    async def _load_with_cache(
+        self, event_ids: List[str], projection: EnrichProjection
+    ) -> Dict[str, Dict[str, Any]]:
+        """先按（ID, 更新时间）命中缓存，只为未命中的事项查询并组装"""
+        payloads: Dict[str, Dict[str, Any]] = {}
+        missing = event_ids
+
+        if self.cache is not None:
+            versions = await self._load_versions(event_ids)
+            missing = []
+            for event_id in event_ids:
+                if event_id not in versions:
+                    continue  # 已删除
+                cached = self.cache.get(self.cache.build_key(event_id, versions[event_id], projection.value))
+                if cached is not None:
+                    payloads[event_id] = cached
+                else:
+                    missing.append(event_id)
+            if payloads:
+                logger.debug(f"⚡ 事项补全缓存命中 {len(payloads)}/{len(event_ids)}")
+
+        if missing:
+            for db_event, payload in await self._load_enriched(missing, projection):
+                payloads[db_event.id] = payload
+                if self.cache is not None:
+                    self.cache.set(
+                        self.cache.build_key(
+                            db_event.id, db_event.updated_time or db_event.created_time, projection.value
+                        ),
+                        payload,
+                    )
+
+        return payloads
+
+    async def _load_versions(self, event_ids: List[str]) -> Dict[str, Any]:
+        """查询事项版本（更新时间，为空时用创建时间）"""
+        result = await self.db.execute(
+            select(SourceEvent.id, SourceEvent.updated_time, SourceEvent.created_time)
+            .where(SourceEvent.id.in_(event_ids))
+        )
+        return {row.id: row.updated_time or row.created_time for row in result.all()}
+
+    async def _load_enriched(
+        self, event_ids: List[str], projection: EnrichProjection
+    ) -> List[Tuple[SourceEvent, Dict[str, Any]]]:
+        """查询事项、关联实体、来源名称（full 时加上原文引用）并组装"""
+        # 1. 批量查询事项及其关联的实体
+        query = (
+            select(SourceEvent)
+            .where(SourceEvent.id.in_(event_ids))
+            .options(selectinload(SourceEvent.event_associations).selectinload(EventEntity.entity))
         )
         result = await self.db.execute(query)
         db_events_list = result.scalars().all()
+        if not db_events_list:
+            return []
 
-        # 为每个事项添加 source_name 和 document_name 属性
+        # 2. 信息源名称、文档名称（只查名称列，不加载文章正文）
+        source_names, document_names = await self._load_names(db_events_list)
         for event in db_events_list:
-            event.source_name = event.source.name if event.source else ""
-            event.document_name = event.article.title if event.article else ""
+            event.source_name = source_names.get(event.source_config_id, "")
+            event.document_name = document_names.get(event.article_id, "") if event.article_id else ""
 
-        db_events = {event.id: event for event in db_events_list}
+        # 3. 原文引用
+        sections_dict: Dict[str, Any] = {}
+        messages_dict: Dict[str, Any] = {}
+        if projection == EnrichProjection.FULL:
+            sections_dict, messages_dict = await self._load_references(db_events_list)
 
-        # 2. 收集所有信息源 ID（用于后续查询过滤）
-        source_config_ids = {event.source_config_id for event in db_events_list}
+        # 4. 使用标准转换方法（根据 source_type 传入不同的 dict）
+        enriched = []
+        for db_event in db_events_list:
+            if db_event.source_type == "ARTICLE":
+                references_dict = sections_dict
+            elif db_event.source_type == "CHAT":
+                references_dict = messages_dict
+            else:
+                references_dict = {}
+
+            event_response = SourceEventResponse.from_orm_with_entities(db_event, references_dict)
+            enriched.append((db_event, event_response.model_dump()))
+        return enriched
 
-        # 3. 从数据库查询的 ORM 对象收集所有需要查询的 reference IDs
-        # 根据 source_type 区分：ARTICLE → ArticleSection, CHAT → ChatMessage
-        article_section_ids = set()
-        chat_message_ids = set()
+    async def _load_names(self, db_events: List[SourceEvent]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """批量查询信息源名称与文档标题"""
+        source_ids = {event.source_config_id for event in db_events}
+        article_ids = {event.article_id for event in db_events if event.article_id}
 
-        # 同时收集每个 reference ID 对应的 source_config_id（用于验证）
-        article_ref_sources = {}  # {section_id: source_config_id}
-        chat_ref_sources = {}  # {message_id: source_config_id}
+        source_rows = await self.db.execute(
+            select(SourceConfig.id, SourceConfig.name).where(SourceConfig.id.in_(source_ids))
+        )
+        source_names = {row.id: row.name or "" for row in source_rows.all()}
 
-        for event_id, db_event in db_events.items():
-            # 从 ORM 对象读取 references 字段（这是一个 ID 数组）
+        document_names: Dict[str, str] = {}
+        if article_ids:
+            article_rows = await self.db.execute(
+                select(Article.id, Article.title).where(Article.id.in_(article_ids))
+            )
+            document_names = {row.id: row.title or "" for row in article_rows.all()}
+
+        return source_names, document_names
+
+    async def _load_references(
+        self, db_events: List[SourceEvent]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        批量查询事项引用的原文片段 / 对话消息
+
+        根据 source_type 区分：ARTICLE → ArticleSection, CHAT → ChatMessage，
+        并限制在事项所属的信息源内
+        """
+        source_config_ids = {event.source_config_id for event in db_events}
+        article_section_ids: Set[str] = set()
+        chat_message_ids: Set[str] = set()
+
+        for db_event in db_events:
+            # references 字段是一个 ID 数组
             if db_event.references and isinstance(db_event.references, list):
                 if db_event.source_type == "ARTICLE":
                     article_section_ids.update(db_event.references)
-                    for ref_id in db_event.references:
-                        article_ref_sources[ref_id] = db_event.source_config_id
-                    print(f"📎 事项 {event_id} (ARTICLE) 的 references: {db_event.references[:2] if len(db_event.references) > 2 else db_event.references}")
+                    if is_verbose():
+                        logger.debug(f"📎 事项 {db_event.id} (ARTICLE) 的 references: {db_event.references[:2]}")
                 elif db_event.source_type == "CHAT":
                     chat_message_ids.update(db_event.references)
-                    for ref_id in db_event.references:
-                        chat_ref_sources[ref_id] = db_event.source_config_id
-                    print(f"📎 事项 {event_id} (CHAT) 的 references: {db_event.references[:2] if len(db_event.references) > 2 else db_event.references}")
+                    if is_verbose():
+                        logger.debug(f"📎 事项 {db_event.id} (CHAT) 的 references: {db_event.references[:2]}")
 
-        print(f"📊 总共收集到 {len(article_section_ids)} 个 ArticleSection ID, {len(chat_message_ids)} 个 ChatMessage ID")
-        print(f"📊 涉及的信息源: {source_config_ids}")
+        logger.debug(
+            f"📊 总共收集到 {len(article_section_ids)} 个 ArticleSection ID, {len(chat_message_ids)} 个 ChatMessage ID"
+        )
 
-        # 4. 批量查询所有片段（ArticleSection）- 关联 Article 和 source_config_id
         sections_dict = {}
         if article_section_ids:
             sections_query = (
@@ -111,9 +282,8 @@ class EventEnricher:
             )
             sections_result = await self.db.execute(sections_query)
             sections_dict = {section.id: section for section in sections_result.scalars().all()}
-            print(f"✅ 成功查询到 {len(sections_dict)} 个 ArticleSection (过滤信息源后)")
+            logger.debug(f"✅ 成功查询到 {len(sections_dict)} 个 ArticleSection (过滤信息源后)")
 
-        # 5. 批量查询所有消息（ChatMessage）- 关联 ChatConversation 和 source_config_id
         messages_dict = {}
         if chat_message_ids:
             messages_query = (
@@ -128,41 +298,6 @@ class EventEnricher:
             )
             messages_result = await self.db.execute(messages_query)
             messages_dict = {msg.id: msg for msg in messages_result.scalars().all()}
-            print(f"✅ 成功查询到 {len(messages_dict)} 个 ChatMessage (过滤信息源后)")
-
-        if not article_section_ids and not chat_message_ids:
-            print("⚠️ 没有需要查询的片段ID")
+            logger.debug(f"✅ 成功查询到 {len(messages_dict)} 个 ChatMessage (过滤信息源后)")
 
-        # 6. 为每个事项使用标准转换方法（根据 source_type 传入不同的 dict）
-        enriched_events = []
-        for event in events:
-            # 获取事项 ID
-            if isinstance(event, dict):
-                event_id = event.get('id')
-            else:
-                event_id = getattr(event, 'id', None)
-
-            if not event_id or event_id not in db_events:
-                continue
-
-            # 使用标准转换方法（与文档管理一致）
-            db_event = db_events[event_id]
-
-            # 根据 source_type 选择对应的 references dict
-            if db_event.source_type == "ARTICLE":
-                references_dict = sections_dict
-            elif db_event.source_type == "CHAT":
-                references_dict = messages_dict
-            else:
-                references_dict = {}
-
-            event_response = SourceEventResponse.from_orm_with_entities(
-                db_event,
-                references_dict
-            )
-
-            # 转换为字典
-            enriched_events.append(event_response.model_dump())
-
-        print(f"✅ 成功处理 {len(enriched_events)} 个事项（已扩展实体和引用）")
-        return enriched_events
+        return sections_dict, messages_dict
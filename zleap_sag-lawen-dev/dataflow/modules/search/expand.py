@@ -30,10 +30,11 @@ from dataflow.core.prompt.manager import PromptManager
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.entity_repository import EntityVectorRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
-from dataflow.db import SourceEvent, Entity, EventEntity, get_session_factory
+from dataflow.db import SourceEvent, Entity, EventEntity, get_read_session_factory
 from dataflow.exceptions import AIError
 from dataflow.modules.load.processor import DocumentProcessor
 from dataflow.modules.search.config import SearchConfig
+from dataflow.modules.search.filters import event_filter_clauses
 from dataflow.modules.search.recall import RecallSearcher, RecallResult
 from dataflow.modules.search.tracker import Tracker  # 🆕 统一使用Tracker
 from dataflow.utils import get_logger
@@ -89,7 +90,7 @@ class ExpandSearcher:
         self.llm_client = llm_client
         self.prompt_manager = prompt_manager
         self.recall_searcher = recall_searcher
-        self.session_factory = get_session_factory()
+        self.session_factory = get_read_session_factory()
         self.logger = get_logger("search.expand")
 
         # 初始化Elasticsearch仓库
@@ -374,6 +375,7 @@ class ExpandSearcher:
                     "weight_change": weight_change,
                 }
                 jump_results.append(jump_result)
+                await config.emit_progress({"type": "expand", **jump_result})
 
                 self.logger.info(f"第 {jump} 跳完成：总权重={current_total_weight:.4f}, 权重相对变化={weight_change:.2%}")
 
@@ -1159,6 +1161,11 @@ class ExpandSearcher:
                 .where(EventEntity.entity_id.in_(key_ids))
                 .order_by(EventEntity.created_time.desc())
             )
+            # 结构化过滤：截断之前按时间 / 实体数值范围缩小候选（索引列范围条件）
+            if config and config.filters.is_active():
+                query = query.join(SourceEvent, SourceEvent.id == EventEntity.event_id).where(
+                    *event_filter_clauses(config.filters, source_config_ids)
+                )
 
             result = await session.execute(query)
             all_rows = result.fetchall()
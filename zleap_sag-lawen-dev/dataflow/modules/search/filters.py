@@ -0,0 +1,234 @@
+"""
+结构化过滤下推
+
+SearchConfig.filters 在召回和扩展阶段下推，向量计算之前缩小候选事项集合：
+- MySQL：事项时间范围为 source_event.start_time / end_time（idx_start_time / idx_end_time）的范围条件；
+  实体数值范围为 entity.int_value / float_value（均有索引）范围条件的半连接子查询
+- ES：event_vectors 的 start_time / end_time range filter；实体数值范围先在 MySQL 中
+  解析出满足条件的实体ID（每次搜索只解析一次，缓存在 config 上），再作为 entity_ids 的 terms filter
+- 排除的文档（如删除中、尚未清理完的文档）：MySQL 为 source_event.article_id 的 NOT IN，
+  ES 为 source_id 的 must_not terms
+
+满足某个数值范围的实体数超过 ES terms 上限时，该条件不下推 ES，改为对 ES 结果回表过滤
+"""
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from dataflow.db import Entity, EventEntity, SourceEvent
+from dataflow.modules.search.config import EntityValueRange, SearchConfig, SearchFilters, TimeRange
+from dataflow.utils import get_logger
+
+logger = get_logger("search.filters")
+
+# 单个数值范围下推到 ES 的实体ID上限（ES index.max_terms_count 默认 65536）
+_MAX_ES_ENTITY_TERMS = 10000
+
+
+# ============ MySQL ============
+
+
+def event_time_clause(time_range: TimeRange) -> ColumnElement:
+    """
+    事项时间范围条件（作用于 SourceEvent）
+
+    区间与 [start, end] 有交集：只有一端时间的事项按该端点判断；拆成两列各自的范围条件，
+    MySQL 可分别使用 idx_start_time / idx_end_time
+    """
+    clauses = []
+    if time_range.end is not None:
+        clauses.append(or_(
+            SourceEvent.start_time <= time_range.end,
+            and_(SourceEvent.start_time.is_(None), SourceEvent.end_time <= time_range.end),
+        ))
+    if time_range.start is not None:
+        clauses.append(or_(
+            SourceEvent.end_time >= time_range.start,
+            and_(SourceEvent.end_time.is_(None), SourceEvent.start_time >= time_range.start),
+        ))
+    clause = and_(*clauses)
+    if time_range.include_undated:
+        clause = or_(clause, and_(SourceEvent.start_time.is_(None), SourceEvent.end_time.is_(None)))
+    return clause
+
+
+def entity_value_clause(value_range: EntityValueRange) -> ColumnElement:
+    """实体数值范围条件（作用于 Entity：int_value 或 float_value 落在范围内）"""
+    columns = []
+    for column in (Entity.int_value, Entity.float_value):
+        bounds = []
+        if value_range.min_value is not None:
+            bounds.append(column >= value_range.min_value)
+        if value_range.max_value is not None:
+            bounds.append(column <= value_range.max_value)
+        columns.append(and_(*bounds))
+    return and_(Entity.type == value_range.entity_type, or_(*columns))
+
+
+def event_filter_clauses(filters: SearchFilters, source_config_ids: Iterable[str] = ()) -> List[ColumnElement]:
+    """
+    事项过滤条件列表（作用于 SourceEvent，调用方需 join / 查询 SourceEvent）
+
+    Args:
+        filters: 结构化过滤条件
+        source_config_ids: 信息源ID（限定实体子查询范围，可使用 idx_source_config_type）
+
+    Returns:
+        SQLAlchemy 条件列表（无过滤条件时为空）
+    """
+    clauses: List[ColumnElement] = []
+    if filters.time_range is not None:
+        clauses.append(event_time_clause(filters.time_range))
+    if filters.exclude_article_ids:
+        clauses.append(or_(
+            SourceEvent.article_id.is_(None),
+            SourceEvent.article_id.notin_(filters.exclude_article_ids),
+        ))
+
+    source_config_ids = list(source_config_ids)
+    for value_range in filters.entity_values:
+        matched = (
+            select(EventEntity.event_id)
+            .join(Entity, Entity.id == EventEntity.entity_id)
+            .where(entity_value_clause(value_range))
+        )
+        if source_config_ids:
+            matched = matched.where(Entity.source_config_id.in_(source_config_ids))
+        clauses.append(SourceEvent.id.in_(matched))
+    return clauses
+
+
+async def resolve_filter_entity_ids(config: SearchConfig, session_factory) -> List[List[str]]:
+    """
+    解析满足各实体数值范围的实体ID（每次搜索一次，结果缓存在 config.filter_entity_ids）
+
+    每个范围最多取 _MAX_ES_ENTITY_TERMS + 1 个：超过上限说明该条件不适合下推 ES
+
+    Returns:
+        与 config.filters.entity_values 一一对应的实体ID列表
+    """
+    if config.filter_entity_ids is not None:
+        return config.filter_entity_ids
+
+    resolved: List[List[str]] = []
+    if config.filters.entity_values:
+        async with session_factory() as session:
+            for value_range in config.filters.entity_values:
+                query = (
+                    select(Entity.id)
+                    .where(Entity.source_config_id.in_(config.get_source_config_ids()))
+                    .where(entity_value_clause(value_range))
+                    .limit(_MAX_ES_ENTITY_TERMS + 1)
+                )
+                ids = list((await session.execute(query)).scalars().all())
+                resolved.append(ids)
+                logger.info(
+                    f"🔎 实体数值过滤 {value_range.entity_type} "
+                    f"[{value_range.min_value}, {value_range.max_value}]: 命中 {len(ids)} 个实体"
+                )
+
+    config.filter_entity_ids = resolved
+    return resolved
+
+
+async def filter_event_ids(config: SearchConfig, session_factory, event_ids: Iterable[str]) -> Set[str]:
+    """按过滤条件回表筛选事项ID（ES 无法完整下推时使用）"""
+    event_ids = [event_id for event_id in dict.fromkeys(event_ids) if event_id]
+    if not event_ids or not config.filters.is_active():
+        return set(event_ids)
+
+    async with session_factory() as session:
+        query = select(SourceEvent.id).where(
+            SourceEvent.id.in_(event_ids),
+            *event_filter_clauses(config.filters, config.get_source_config_ids()),
+        )
+        return set((await session.execute(query)).scalars().all())
+
+
+# ============ Elasticsearch ============
+
+
+def _missing(field: str) -> Dict[str, Any]:
+    return {"bool": {"must_not": {"exists": {"field": field}}}}
+
+
+def es_time_filter(time_range: TimeRange) -> Dict[str, Any]:
+    """事项时间范围的 ES filter（语义同 event_time_clause）"""
+    clauses = []
+    if time_range.end is not None:
+        end = time_range.end.isoformat()
+        clauses.append({"bool": {"should": [
+            {"range": {"start_time": {"lte": end}}},
+            {"bool": {"filter": [_missing("start_time"), {"range": {"end_time": {"lte": end}}}]}},
+        ], "minimum_should_match": 1}})
+    if time_range.start is not None:
+        start = time_range.start.isoformat()
+        clauses.append({"bool": {"should": [
+            {"range": {"end_time": {"gte": start}}},
+            {"bool": {"filter": [_missing("end_time"), {"range": {"start_time": {"gte": start}}}]}},
+        ], "minimum_should_match": 1}})
+    clause: Dict[str, Any] = {"bool": {"filter": clauses}}
+    if time_range.include_undated:
+        clause = {"bool": {"should": [
+            clause,
+            {"bool": {"filter": [_missing("start_time"), _missing("end_time")]}},
+        ], "minimum_should_match": 1}}
+    return clause
+
+
+async def es_event_filters(config: SearchConfig, session_factory) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    事项检索的 ES filter
+
+    Returns:
+        (filter 列表, 是否完整下推)。未完整下推时调用方需用 filter_event_ids 回表过滤结果
+    """
+    filters = config.filters
+    if not filters.is_active():
+        return [], True
+
+    clauses: List[Dict[str, Any]] = []
+    if filters.time_range is not None:
+        clauses.append(es_time_filter(filters.time_range))
+    if filters.exclude_article_ids:
+        clauses.append({"bool": {"must_not": {"terms": {"source_id": filters.exclude_article_ids}}}})
+
+    exact = True
+    resolved = await resolve_filter_entity_ids(config, session_factory)
+    for value_range, entity_ids in zip(filters.entity_values, resolved):
+        if len(entity_ids) > _MAX_ES_ENTITY_TERMS:
+            exact = False
+            logger.warning(
+                f"⚠️ 实体数值过滤 {value_range.entity_type} 命中实体超过 {_MAX_ES_ENTITY_TERMS} 个，不下推 ES，改为回表过滤"
+            )
+            continue
+        # 空列表不匹配任何事项
+        clauses.append({"terms": {"entity_ids": entity_ids}})
+    return clauses, exact
+
+
+async def filter_event_hits(
+    config: SearchConfig,
+    session_factory,
+    hits: List[Dict[str, Any]],
+    exact: bool,
+) -> List[Dict[str, Any]]:
+    """ES 事项结果回表过滤（已完整下推时原样返回）"""
+    if exact or not hits:
+        return hits
+    allowed = await filter_event_ids(config, session_factory, (hit.get("event_id") for hit in hits))
+    return [hit for hit in hits if hit.get("event_id") in allowed]
+
+
+__all__ = [
+    "event_time_clause",
+    "entity_value_clause",
+    "event_filter_clauses",
+    "resolve_filter_entity_ids",
+    "filter_event_ids",
+    "es_time_filter",
+    "es_event_filters",
+    "filter_event_hits",
+]
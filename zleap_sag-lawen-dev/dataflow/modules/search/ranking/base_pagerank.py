@@ -19,10 +19,11 @@ import time
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.source_chunk_repository import SourceChunkRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
-from dataflow.db import get_session_factory
+from dataflow.db import get_read_session_factory
 from dataflow.exceptions import AIError
 from dataflow.modules.load.processor import DocumentProcessor
 from dataflow.modules.search.config import SearchConfig
+from dataflow.modules.search.filters import event_filter_clauses
 from dataflow.utils import get_logger
 
 
@@ -126,7 +127,7 @@ class BasePageRankSearcher:
         Args:
             llm_client: LLM客户端（可选）
         """
-        self.session_factory = get_session_factory()
+        self.session_factory = get_read_session_factory()
         self.logger = get_logger("search.rerank.pagerank")
 
         # 初始化 ES 客户端和仓库
@@ -295,55 +296,6 @@ class BasePageRankSearcher:
 
         return scores
 
-    async def _search_similar_items_from_es(
-        self,
-        query_vector: List[float],
-        source_config_ids: List[str],
-        k: int,
-        index_name: str
-    ) -> List[Dict[str, Any]]:
-        """
-        从 ES 搜索相似项目（KNN）
-
-        Args:
-            query_vector: 查询向量
-            source_config_ids: 数据源ID列表
-            k: 返回数量
-            index_name: ES索引名称
-
-        Returns:
-            相似项目列表
-        """
-        all_results = []
-
-        for source_config_id in source_config_ids:
-            try:
-                # 根据索引类型选择不同的仓库和方法
-                if "chunk" in index_name.lower():
-                    # 段落搜索：使用 search_similar_by_content
-                    results = await self.content_repo.search_similar_by_content(
-                        query_vector=query_vector,
-                        source_config_id=source_config_id,
-                        k=k
-                    )
-                else:
-                    # 事项搜索：使用 search_by_vector
-                    results = await self.event_repo.search_by_vector(
-                        vector=query_vector,
-                        source_config_id=source_config_id,
-                        top_k=k
-                    )
-
-                all_results.extend(results)
-
-            except Exception as e:
-                self.logger.warning(
-                    f"ES搜索失败 (source_config_id={source_config_id}): {e}"
-                )
-                continue
-
-        return all_results
-
     def _initialize_pagerank_values(
         self,
         weights: np.ndarray
@@ -1002,6 +954,12 @@ class BasePageRankSearcher:
                         )
                     )
                 )
+                # 结构化过滤（时间 / 实体数值范围）：不满足的事项不再获取向量
+                filters_active = config is not None and config.filters.is_active()
+                if filters_active:
+                    event_detail_query = event_detail_query.where(
+                        *event_filter_clauses(config.filters, source_config_ids)
+                    )
 
                 event_detail_result = await session.execute(event_detail_query)
                 events = event_detail_result.scalars().all()
@@ -1009,6 +967,8 @@ class BasePageRankSearcher:
                 if not events:
                     self.logger.warning("未找到事件详情")
                     return []
+                if filters_active:
+                    event_ids = [event.id for event in events]
 
                 self.logger.debug(f"获取到 {len(events)} 个事件的详细信息")
 
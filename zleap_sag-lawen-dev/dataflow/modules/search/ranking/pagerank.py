@@ -46,12 +46,13 @@ from collections import defaultdict
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.source_chunk_repository import SourceChunkRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
-from dataflow.db import SourceEvent, Entity, EventEntity, Article, SourceConfig, get_session_factory
+from dataflow.db import SourceEvent, Entity, EventEntity, Article, SourceConfig
 from dataflow.exceptions import AIError
 from dataflow.modules.load.processor import DocumentProcessor
 from dataflow.modules.search.config import SearchConfig, BM25Config
 from dataflow.modules.search.ranking.base_pagerank import BasePageRankSearcher
 from dataflow.modules.search.bm25 import BM25Searcher
+from dataflow.modules.search.filters import es_event_filters, filter_event_ids
 from dataflow.modules.search.tracker import Tracker
 from dataflow.utils import get_logger
 
@@ -156,11 +157,18 @@ class RerankPageRankSearcher(BasePageRankSearcher):
                     content_weight=config.bm25_content_weight
                 )
 
+                extra_filters, exact = await es_event_filters(config, self.session_factory)
                 bm25_results = await bm25_searcher.search(
                     query=config.query,
                     source_config_ids=config.get_source_config_ids(),
-                    config=bm25_config
+                    config=bm25_config,
+                    extra_filters=extra_filters or None,
                 )
+                if not exact:
+                    allowed = await filter_event_ids(
+                        config, self.session_factory, (event.id for event in bm25_results)
+                    )
+                    bm25_results = [event for event in bm25_results if event.id in allowed]
 
                 # 将 BM25 结果转换为统一格式
                 for idx, event in enumerate(bm25_results):
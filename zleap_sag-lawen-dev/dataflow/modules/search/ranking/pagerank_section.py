@@ -42,7 +42,7 @@ from sqlalchemy.orm import selectinload
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.source_chunk_repository import SourceChunkRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
-from dataflow.db import SourceEvent, Entity, EventEntity, ArticleSection, Article, SourceChunk, get_session_factory
+from dataflow.db import SourceEvent, Entity, EventEntity, ArticleSection, Article, SourceChunk
 from dataflow.exceptions import AIError
 from dataflow.modules.load.processor import DocumentProcessor
 from dataflow.modules.search.config import SearchConfig, BM25Config
@@ -55,8 +55,9 @@ from sqlalchemy.orm import selectinload
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
 from dataflow.core.ai.tokensize import get_mixed_tokenizer
-from dataflow.db import SourceEvent, EventEntity, SourceConfig, Article, get_session_factory
+from dataflow.db import SourceEvent, EventEntity, SourceConfig, Article, get_read_session_factory
 from dataflow.modules.search.config import SearchConfig
+from dataflow.modules.search.filters import event_filter_clauses
 from dataflow.modules.search.tracker import Tracker  # 🆕 添加线索追踪器
 from dataflow.utils import get_logger
 
@@ -73,7 +74,7 @@ class RerankRRFSearcher:
         Args:
             llm_client: LLM客户端（可选，暂未使用）
         """
-        self.session_factory = get_session_factory()
+        self.session_factory = get_read_session_factory()
         self.logger = get_logger("search.rerank.rrf")
 
         # 初始化Elasticsearch仓库
@@ -354,6 +355,11 @@ class RerankRRFSearcher:
                 )
                 .order_by(SourceEvent.created_time.desc())  # 🆕 按时间倒序
             )
+            # 结构化过滤（时间 / 实体数值范围）
+            if config and config.filters.is_active():
+                event_entity_query = event_entity_query.where(
+                    *event_filter_clauses(config.filters, source_config_ids)
+                )
 
             event_result = await session.execute(event_entity_query)
             event_relations = event_result.fetchall()  # 获取 (event_id, entity_id, created_time) 元组
@@ -841,6 +847,12 @@ class RerankRRFSearcher:
             )
             return sorted_events[:top_k]
 
+    @staticmethod
+    def _bm25_doc_text(event: SourceEvent) -> str:
+        """拼接事项标题、摘要、正文并小写，作为 BM25 文档"""
+        # 使用 join 代替 f-string，减少内存分配
+        return ' '.join(part for part in (event.title, event.summary, event.content) if part).lower()
+
     async def _calculate_bm25_scores(
         self,
         events: List[SourceEvent],
@@ -867,29 +879,12 @@ class RerankRRFSearcher:
             # 预处理查询（只需一次）
             query_lower = query.lower()
 
-            # 构建并分词文档语料库（一次性完成，减少中间列表）
+            # 查询与文档语料库一起批量分词
             tokenize_start = time.perf_counter()
-            tokenized_corpus = []
-
-            for event in events:
-                # 使用 join 代替 f-string，减少内存分配
-                parts = []
-                if event.title:
-                    parts.append(event.title)
-                if event.summary:
-                    parts.append(event.summary)
-                if event.content:
-                    parts.append(event.content)
-
-                # 一次性拼接并小写转换
-                doc_text = ' '.join(parts).lower()
-
-                # 直接分词并添加到结果（避免先创建 corpus 列表）
-                tokenized_corpus.append(
-                    tokenizer.tokenize(doc_text, fast_mode=True))
-
-            # 分词查询
-            tokenized_query = tokenizer.tokenize(query_lower, fast_mode=True)
+            tokenized_query, *tokenized_corpus = tokenizer.tokenize_many(
+                [query_lower] + [self._bm25_doc_text(event) for event in events],
+                fast_mode=True,
+            )
             tokenize_time = time.perf_counter() - tokenize_start
 
             # 日志：展示 query 分词结果
@@ -957,28 +952,13 @@ class RerankRRFSearcher:
             # 预处理查询（只需一次）
             query_lower = query.lower()
 
-            # 构建并分词文档语料库（一次性完成）
+            # 查询与文档语料库一起批量分词
             self.logger.debug("开始对文档语料库和查询进行分词...")
             tokenize_start = time.perf_counter()
-            tokenized_corpus = []
-
-            for event in events:
-                # 使用 join 代替 f-string，减少内存分配
-                parts = []
-                if event.title:
-                    parts.append(event.title)
-                if event.summary:
-                    parts.append(event.summary)
-                if event.content:
-                    parts.append(event.content)
-
-                # 一次性拼接、小写转换并分词
-                doc_text = ' '.join(parts).lower()
-                tokenized_corpus.append(
-                    tokenizer.tokenize(doc_text, fast_mode=True))
-
-            # 分词查询
-            tokenized_query = tokenizer.tokenize(query_lower, fast_mode=True)
+            tokenized_query, *tokenized_corpus = tokenizer.tokenize_many(
+                [query_lower] + [self._bm25_doc_text(event) for event in events],
+                fast_mode=True,
+            )
 
             tokenize_time = time.perf_counter() - tokenize_start
             self.logger.debug(f"分词完成，耗时: {tokenize_time:.4f}秒")
@@ -27,10 +27,12 @@ from dataflow.core.prompt.manager import PromptManager
 from dataflow.core.storage.elasticsearch import get_es_client
 from dataflow.core.storage.repositories.entity_repository import EntityVectorRepository
 from dataflow.core.storage.repositories.event_repository import EventVectorRepository
-from dataflow.db import SourceEvent, Entity, EventEntity, get_session_factory
+from dataflow.core.telemetry import is_verbose
+from dataflow.db import SourceEvent, Entity, EventEntity, get_read_session_factory
 from dataflow.exceptions import AIError
 from dataflow.modules.load.processor import DocumentProcessor
 from dataflow.modules.search.config import SearchConfig, RecallMode
+from dataflow.modules.search.filters import es_event_filters, event_filter_clauses, filter_event_hits
 from dataflow.modules.search.tracker import Tracker  # 🆕 统一使用Tracker
 from dataflow.utils import get_logger
 
@@ -76,7 +78,7 @@ class RecallSearcher:
         """
         self.llm_client = llm_client
         self.prompt_manager = prompt_manager
-        self.session_factory = get_session_factory()
+        self.session_factory = get_read_session_factory()
         self.logger = get_logger("search.recall")
 
         # 初始化Elasticsearch仓库
@@ -211,8 +213,8 @@ class RecallSearcher:
                     )
                 self.logger.debug(f"✅ 快速模式：为 {len(key_query_related)} 个实体创建了 query → entity 线索")
 
-            # 🔍 显示召回实体的详细信息
-            if key_query_related:
+            # 🔍 显示召回实体的详细信息（仅采样请求 / DEBUG）
+            if key_query_related and is_verbose():
                 self.logger.info(f"📋 步骤1召回实体详情 (共{len(key_query_related)}个):")
                 for idx, entity in enumerate(key_query_related, 1):
                     self.logger.info(
@@ -287,15 +289,16 @@ class RecallSearcher:
                 # 步骤3保留了所有key，直接使用key_query_related
                 retained_key_infos = key_query_related
 
-                self.logger.info(f"📋 步骤3过滤后保留的key详情 (共{len(retained_key_infos)}个):")
-                for idx, key_info in enumerate(retained_key_infos, 1):
-                    self.logger.info(
-                        f"  {idx}. 实体ID: {key_info['entity_id']}, "
-                        f"名称: '{key_info['name']}', "
-                        f"类型: {key_info['type']}, "
-                        f"原始相似度: {key_info.get('similarity', 0.0):.4f}, "
-                        f"来源属性: '{key_info.get('source_attribute', 'N/A')}'"
-                    )
+                if is_verbose():
+                    self.logger.info(f"📋 步骤3过滤后保留的key详情 (共{len(retained_key_infos)}个):")
+                    for idx, key_info in enumerate(retained_key_infos, 1):
+                        self.logger.info(
+                            f"  {idx}. 实体ID: {key_info['entity_id']}, "
+                            f"名称: '{key_info['name']}', "
+                            f"类型: {key_info['type']}, "
+                            f"原始相似度: {key_info.get('similarity', 0.0):.4f}, "
+                            f"来源属性: '{key_info.get('source_attribute', 'N/A')}'"
+                        )
             else:
                 self.logger.warning("⚠️ 步骤3后没有保留任何key，后续步骤将无结果")
 
@@ -667,11 +670,7 @@ class RecallSearcher:
         self.logger.info("📌 新策略步骤1: Query→Event（高阈值召回高质量事项）")
         substep_start = time.perf_counter()
         
-        high_quality_events = await self.event_repo.search_similar_by_content(
-            query_vector=config.query_embedding,
-            k=config.recall.query_event_max,
-            source_config_ids=config.get_source_config_ids()
-        )
+        high_quality_events = await self._search_events_by_query(config, config.recall.query_event_max)
         
         # 按阈值过滤
         high_quality_events = [
@@ -876,11 +875,7 @@ class RecallSearcher:
         self.logger.info("📌 新策略步骤6: Query→Event（低阈值用于交集过滤）")
         substep_start = time.perf_counter()
         
-        filter_events = await self.event_repo.search_similar_by_content(
-            query_vector=config.query_embedding,
-            k=config.recall.filter_event_max,
-            source_config_ids=config.get_source_config_ids()
-        )
+        filter_events = await self._search_events_by_query(config, config.recall.filter_event_max)
         
         # 按低阈值过滤
         filter_events = [
@@ -1175,6 +1170,11 @@ class RecallSearcher:
                 select(EventEntity.entity_id, EventEntity.event_id)
                 .where(EventEntity.entity_id.in_(key_entity_ids))
             )
+            # 结构化过滤：时间 / 实体数值范围作为索引列范围条件
+            if config.filters.is_active():
+                query = query.join(SourceEvent, SourceEvent.id == EventEntity.event_id).where(
+                    *event_filter_clauses(config.filters, config.get_source_config_ids())
+                )
 
             result = await session.execute(query)
             entity_event_pairs = result.fetchall()
@@ -1278,15 +1278,9 @@ class RecallSearcher:
                 config.has_query_embedding = True
                 self.logger.debug(f"📦 为query生成向量，维度: {len(config.query_embedding)}")
 
-            query_vector = config.query_embedding
-
             # 使用ES向量搜索获取候选events
-            # 搜索content_vector，获取事件基本信息
-            candidate_events = await self.event_repo.search_similar_by_content(
-                query_vector=query_vector,
-                k=config.recall.max_events,  # 多取一些，用于后续过滤
-                source_config_ids=config.get_source_config_ids(),
-            )
+            # 搜索content_vector，获取事件基本信息（多取一些，用于后续过滤）
+            candidate_events = await self._search_events_by_query(config, config.recall.max_events)
 
             if not candidate_events:
                 self.logger.info("步骤2.5: 未找到候选events")
@@ -1396,6 +1390,21 @@ class RecallSearcher:
             return [], {}
 
 
+    async def _search_events_by_query(self, config: SearchConfig, k: int) -> List[Dict[str, Any]]:
+        """
+        Query 向量检索事项
+
+        结构化过滤作为 kNN filter 下推（先过滤后取 top-k）；无法完整下推时对结果回表过滤
+        """
+        extra_filters, exact = await es_event_filters(config, self.session_factory)
+        events = await self.event_repo.search_similar_by_content(
+            query_vector=config.query_embedding,
+            k=k,
+            source_config_ids=config.get_source_config_ids(),
+            extra_filters=extra_filters or None,
+        )
+        return await filter_event_hits(config, self.session_factory, events, exact)
+
     @staticmethod
     def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         """计算余弦相似度"""
@@ -4,14 +4,33 @@
 只保留SAG引擎，实现三阶段搜索：recall → expand → rerank
 """
 
+import copy
+import json
 import time
 from typing import Dict, List, Any, Optional
 
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
 from dataflow.core.ai.base import BaseLLMClient
+from dataflow.core.cache.search_cache import SearchResultCache, get_search_cache
+from dataflow.core.config import get_settings
 from dataflow.core.prompt.manager import PromptManager
-from dataflow.db import SourceEvent
+from dataflow.core.telemetry import is_verbose, record_timings, set_span_attributes, traced
+from dataflow.db import (
+    SourceEvent,
+    exclude_deleted_sources,
+    get_deleting_article_ids,
+    get_read_session_factory,
+)
 from dataflow.exceptions import SearchError
-from dataflow.modules.search.config import SearchConfig, RerankStrategy, ReturnType
+from dataflow.modules.search.config import (
+    RerankStrategy,
+    ReturnType,
+    SearchBaseConfig,
+    SearchConfig,
+)
 from dataflow.modules.search.recall import RecallSearcher, RecallResult
 from dataflow.modules.search.expand import ExpandSearcher, ExpandResult
 from dataflow.modules.search.ranking.pagerank import RerankPageRankSearcher as EventPageRankSearcher
@@ -22,6 +41,24 @@ from dataflow.utils import get_logger
 logger = get_logger("search.searcher")
 
 
+def _copy_event(event: Any) -> Any:
+    """
+    复制缓存中的事项
+
+    ORM 对象复制为游离（transient）实例，只复制已加载的属性（集合关系复制为新列表），
+    调用方修改副本不会影响缓存中其他请求拿到的对象；非 ORM 对象按值深拷贝
+    """
+    if not isinstance(event, SourceEvent):
+        return copy.deepcopy(event)
+
+    state = inspect(event)
+    clone = state.mapper.class_manager.new_instance()
+    for key, value in state.dict.items():
+        if key in state.mapper.attrs:
+            set_committed_value(clone, key, list(value) if isinstance(value, list) else value)
+    return clone
+
+
 class SAGSearcher:
     """
     SAG搜索器（Structured + Attributes + Graph）
@@ -98,6 +135,7 @@ class SAGSearcher:
         
         return self._llm_client
     
+    @traced("search", kind="search", root=True)
     async def search(self, config: SearchConfig) -> Dict[str, Any]:
         """
         执行搜索
@@ -124,65 +162,36 @@ class SAGSearcher:
                 "query": Dict                  # 查询信息
             }
         """
+        # 正在后台清理的信息源 / 文档立即对搜索不可见
+        await self._exclude_deleted_sources(config)
+        await self._exclude_deleted_documents(config)
+
         try:
+            # 结果缓存：必须在任何阶段修改 config（query 重写、线索追踪）之前计算键
+            cache = self._get_result_cache(config)
+            cache_key, cache_writable = None, False
+            if cache is not None:
+                cache_key, cache_writable = await cache.resolve_key(
+                    query=config.query,
+                    config_payload=self._cache_config_payload(config),
+                    source_config_ids=config.get_source_config_ids(),
+                )
+                cached_response = (
+                    await self._load_cached_response(cache, cache_key) if cache_key is not None else None
+                )
+                if cached_response is not None:
+                    self.logger.info(f"⚡ 搜索缓存命中：query='{config.query}'")
+                    set_span_attributes(cache_hit=1)
+                    return cached_response
+
             # 确保LLM客户端已初始化
             await self._get_llm_client()
 
             total_start = time.perf_counter()
 
-            # 🆕 打印完整的配置参数，方便验证前端传参
-            self.logger.info("=" * 100)
-            self.logger.info("📋 SAG搜索配置参数详情:")
-            self.logger.info("=" * 100)
-
-            # 基础参数
-            self.logger.info("🔹 基础参数:")
-            self.logger.info(f"  query: '{config.query}'")
-            self.logger.info(f"  original_query: '{config.original_query}'")
-            self.logger.info(f"  source_config_id: {config.source_config_id}")
-            self.logger.info(f"  source_config_ids: {config.source_config_ids[:5]}")
-            self.logger.info(f"  enable_query_rewrite: {config.enable_query_rewrite}")
-            self.logger.info(f"  return_type: {config.return_type}")
-
-            # Recall 配置
-            self.logger.info("")
-            self.logger.info("🔹 Recall (实体召回) 配置:")
-            self.logger.info(f"  recall_mode: {config.recall.recall_mode}")
-            self.logger.info(f"  use_fast_mode: {config.recall.use_fast_mode}")
-            self.logger.info(f"  vector_top_k: {config.recall.vector_top_k}")
-            self.logger.info(f"  vector_candidates: {config.recall.vector_candidates}")
-            self.logger.info(f"  entity_similarity_threshold: {config.recall.entity_similarity_threshold}")
-            self.logger.info(f"  event_similarity_threshold: {config.recall.event_similarity_threshold}")
-            self.logger.info(f"  max_entities: {config.recall.max_entities}")
-            self.logger.info(f"  max_events: {config.recall.max_events}")
-            self.logger.info(f"  entity_weight_threshold: {config.recall.entity_weight_threshold}")
-            self.logger.info(f"  final_entity_count: {config.recall.final_entity_count}")
-            self.logger.info(
-                f"  use_tokenizer: {config.recall.use_tokenizer}")
-
-            # Expand 配置
-            self.logger.info("")
-            self.logger.info("🔹 Expand (实体扩展) 配置:")
-            self.logger.info(f"  enabled: {config.expand.enabled}")
-            self.logger.info(f"  max_hops: {config.expand.max_hops}")
-            self.logger.info(f"  entities_per_hop: {config.expand.entities_per_hop}")
-            self.logger.info(f"  weight_change_threshold: {config.expand.weight_change_threshold}")
-            self.logger.info(f"  event_similarity_threshold: {config.expand.event_similarity_threshold}")
-            self.logger.info(f"  min_events_per_hop: {config.expand.min_events_per_hop}")
-            self.logger.info(f"  max_events_per_hop: {config.expand.max_events_per_hop}")
-
-            # Rerank 配置
-            self.logger.info("")
-            self.logger.info("🔹 Rerank (事项重排) 配置:")
-            self.logger.info(f"  strategy: {config.rerank.strategy}")
-            self.logger.info(f"  score_threshold: {config.rerank.score_threshold}")
-            self.logger.info(f"  max_results: {config.rerank.max_results}")
-            self.logger.info(f"  max_key_recall_results: {config.rerank.max_key_recall_results}")
-            self.logger.info(f"  max_query_recall_results: {config.rerank.max_query_recall_results}")
-            self.logger.info(f"  pagerank_damping_factor: {config.rerank.pagerank_damping_factor}")
-            self.logger.info(f"  pagerank_max_iterations: {config.rerank.pagerank_max_iterations}")
-            self.logger.info(f"  rrf_k: {config.rerank.rrf_k}")
-            self.logger.info("=" * 100)
+            # 完整配置参数只在采样请求（或 DEBUG）中输出，避免每次请求的日志格式化开销
+            if is_verbose():
+                self._log_config(config)
 
             self.logger.info(
                 f"🔍 开始搜索：query='{config.query}', source_config_id={config.source_config_id}"
@@ -192,6 +201,8 @@ class SAGSearcher:
             recall_start = time.perf_counter()
             recall_result = await self._recall(config)
             recall_time = time.perf_counter() - recall_start
+            if config.progress_callback is not None:
+                await self._emit_recall_progress(config, recall_result)
             
             # Expand: 实体扩展（可选）
             expand_start = time.perf_counter()
@@ -205,18 +216,30 @@ class SAGSearcher:
             rerank_start = time.perf_counter()
             rerank_result = await self._rerank(config, expand_result)
             rerank_time = time.perf_counter() - rerank_start
+            await config.emit_progress({
+                "type": "rerank",
+                "count": len(rerank_result.get(
+                    "sections" if config.return_type == ReturnType.PARAGRAPH else "events", []
+                )),
+            })
             
             total_time = time.perf_counter() - total_start
 
-            # 输出耗时统计
-            self._log_timing(
-                recall_time,
-                expand_time,
-                rerank_time,
-                total_time,
-                recall_result,
-                expand_result,
-            )
+            # 输出耗时统计（详细分步耗时只在采样请求中输出，指标始终记录）
+            if is_verbose():
+                self._log_timing(
+                    recall_time,
+                    expand_time,
+                    rerank_time,
+                    total_time,
+                    recall_result,
+                    expand_result,
+                )
+            else:
+                self.logger.info(
+                    f"⏱️ 搜索耗时: 总计 {total_time:.3f}s "
+                    f"(recall {recall_time:.3f}s, expand {expand_time:.3f}s, rerank {rerank_time:.3f}s)"
+                )
             
             # 构建最终响应
             response = self._build_response(
@@ -225,6 +248,7 @@ class SAGSearcher:
                 expand_result=expand_result,
                 rerank_result=rerank_result,
             )
+            self._drop_deleted_documents(config, response)
 
             # 根据 return_type 输出不同的日志
             if config.return_type == ReturnType.PARAGRAPH:
@@ -238,12 +262,242 @@ class SAGSearcher:
                     f"{len(response['clues'])} 条线索"
                 )
 
+            if cache_key is not None and cache_writable:
+                await self._store_cached_response(cache, cache_key, config, response)
+
             return response
 
         except Exception as e:
             self.logger.error(f"❌ 搜索失败: {e}", exc_info=True)
             raise SearchError(f"搜索失败: {e}") from e
     
+    async def _exclude_deleted_sources(self, config: SearchConfig) -> None:
+        """从搜索范围中移除已软删除的信息源"""
+        source_config_ids = config.get_source_config_ids()
+        active = await exclude_deleted_sources(source_config_ids)
+        if len(active) == len(source_config_ids):
+            return
+        if not active:
+            raise SearchError(f"信息源不存在或正在删除: {', '.join(source_config_ids)}")
+        self.logger.info(f"🗑️ 跳过正在删除的信息源: {set(source_config_ids) - set(active)}")
+        config.source_config_ids = active
+        config.source_config_id = active[0]
+
+    async def _exclude_deleted_documents(self, config: SearchConfig) -> None:
+        """
+        把删除中的文档加入 filters.exclude_article_ids
+
+        召回 / 扩展 / 重排的事项查询随结构化过滤下推（MySQL NOT IN + ES must_not）；
+        排除列表属于 filters，参与结果缓存键
+        """
+        deleting = await get_deleting_article_ids(config.get_source_config_ids())
+        if not deleting or deleting <= set(config.filters.exclude_article_ids):
+            return
+        self.logger.info(f"🗑️ 跳过正在删除的文档: {len(deleting)} 个")
+        # 复制后修改，不影响调用方复用的 filters 对象
+        config.filters = config.filters.model_copy(
+            update={"exclude_article_ids": sorted(deleting | set(config.filters.exclude_article_ids))}
+        )
+
+    @staticmethod
+    def _drop_deleted_documents(config: SearchConfig, response: Dict[str, Any]) -> None:
+        """兜底移除结果中属于排除文档的事项 / 段落（段落检索不经过事项过滤）"""
+        excluded = set(config.filters.exclude_article_ids)
+        if not excluded:
+            return
+        if "events" in response:
+            response["events"] = [
+                event for event in response["events"]
+                if (event.article_id or event.source_id) not in excluded
+            ]
+        if "sections" in response:
+            response["sections"] = [
+                section for section in response["sections"] if section.get("source_id") not in excluded
+            ]
+
+    def _log_config(self, config: SearchConfig) -> None:
+        """输出完整的配置参数（方便验证前端传参）"""
+        self.logger.info("=" * 100)
+        self.logger.info("📋 SAG搜索配置参数详情:")
+        self.logger.info("=" * 100)
+
+        # 基础参数
+        self.logger.info("🔹 基础参数:")
+        self.logger.info(f"  query: '{config.query}'")
+        self.logger.info(f"  original_query: '{config.original_query}'")
+        self.logger.info(f"  source_config_id: {config.source_config_id}")
+        self.logger.info(f"  source_config_ids: {config.source_config_ids[:5]}")
+        self.logger.info(f"  enable_query_rewrite: {config.enable_query_rewrite}")
+        self.logger.info(f"  return_type: {config.return_type}")
+
+        # Recall 配置
+        self.logger.info("")
+        self.logger.info("🔹 Recall (实体召回) 配置:")
+        self.logger.info(f"  recall_mode: {config.recall.recall_mode}")
+        self.logger.info(f"  use_fast_mode: {config.recall.use_fast_mode}")
+        self.logger.info(f"  vector_top_k: {config.recall.vector_top_k}")
+        self.logger.info(f"  vector_candidates: {config.recall.vector_candidates}")
+        self.logger.info(f"  entity_similarity_threshold: {config.recall.entity_similarity_threshold}")
+        self.logger.info(f"  event_similarity_threshold: {config.recall.event_similarity_threshold}")
+        self.logger.info(f"  max_entities: {config.recall.max_entities}")
+        self.logger.info(f"  max_events: {config.recall.max_events}")
+        self.logger.info(f"  entity_weight_threshold: {config.recall.entity_weight_threshold}")
+        self.logger.info(f"  final_entity_count: {config.recall.final_entity_count}")
+        self.logger.info(
+            f"  use_tokenizer: {config.recall.use_tokenizer}")
+
+        # Expand 配置
+        self.logger.info("")
+        self.logger.info("🔹 Expand (实体扩展) 配置:")
+        self.logger.info(f"  enabled: {config.expand.enabled}")
+        self.logger.info(f"  max_hops: {config.expand.max_hops}")
+        self.logger.info(f"  entities_per_hop: {config.expand.entities_per_hop}")
+        self.logger.info(f"  weight_change_threshold: {config.expand.weight_change_threshold}")
+        self.logger.info(f"  event_similarity_threshold: {config.expand.event_similarity_threshold}")
+        self.logger.info(f"  min_events_per_hop: {config.expand.min_events_per_hop}")
+        self.logger.info(f"  max_events_per_hop: {config.expand.max_events_per_hop}")
+
+        # Rerank 配置
+        self.logger.info("")
+        self.logger.info("🔹 Rerank (事项重排) 配置:")
+        self.logger.info(f"  strategy: {config.rerank.strategy}")
+        self.logger.info(f"  score_threshold: {config.rerank.score_threshold}")
+        self.logger.info(f"  max_results: {config.rerank.max_results}")
+        self.logger.info(f"  max_key_recall_results: {config.rerank.max_key_recall_results}")
+        self.logger.info(f"  max_query_recall_results: {config.rerank.max_query_recall_results}")
+        self.logger.info(f"  pagerank_damping_factor: {config.rerank.pagerank_damping_factor}")
+        self.logger.info(f"  pagerank_max_iterations: {config.rerank.pagerank_max_iterations}")
+        self.logger.info(f"  rrf_k: {config.rerank.rrf_k}")
+        self.logger.info("=" * 100)
+
+    # ============ 结果缓存 ============
+
+    # 影响结果的运行时字段（其余运行时缓存/线索字段不参与缓存键）
+    _CACHE_RUNTIME_FIELDS = {
+        "article_id",
+        "background",
+        "bm25_enabled",
+        "bm25_top_k",
+        "bm25_title_weight",
+        "bm25_content_weight",
+    }
+
+    def _get_result_cache(self, config: SearchConfig) -> Optional[SearchResultCache]:
+        """获取结果缓存（全局开关或本次请求关闭时返回 None）"""
+        if not config.use_cache or not get_settings().search_cache_enabled:
+            return None
+        return get_search_cache()
+
+    def _cache_config_payload(self, config: SearchConfig) -> Dict[str, Any]:
+        """
+        提取与结果相关的配置字段
+
+        包含 SearchBaseConfig 的算法配置（query 单独规范化后参与键）、
+        影响结果的运行时上下文以及搜索场景的模型配置
+        """
+        base_fields = set(SearchBaseConfig.model_fields) - {"query", "original_query", "use_cache"}
+        payload = config.model_dump(
+            mode="json", include=base_fields | self._CACHE_RUNTIME_FIELDS
+        )
+        payload["model_config"] = self.model_config
+        return payload
+
+    async def _load_cached_response(
+        self,
+        cache: SearchResultCache,
+        cache_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存结果
+
+        内存层返回结果副本（事项复制为游离的 SourceEvent，不与其他请求共享同一 ORM 对象）；
+        Redis 层保存的是快照（事项只存ID），命中后按ID一次回表还原为 SourceEvent，
+        并预加载与未命中时相同的关联关系，保持相同的返回结构
+        """
+        try:
+            cached, tier = await cache.get(cache_key)
+            if cached is None:
+                return None
+
+            if tier == "redis":
+                response = dict(cached)
+                event_ids = response.pop("event_ids", None)
+                if event_ids is not None:
+                    response["events"] = await self._load_events_by_ids(event_ids, with_relations=True)
+            else:
+                response = {
+                    key: [_copy_event(event) for event in value] if key == "events" else copy.deepcopy(value)
+                    for key, value in cached.items()
+                }
+
+            response["stats"] = {**response.get("stats", {}), "cache": {"hit": True, "tier": tier}}
+            return response
+        except Exception as e:
+            self.logger.warning(f"读取搜索缓存失败: {e}，继续完整搜索")
+            return None
+
+    async def _store_cached_response(
+        self,
+        cache: SearchResultCache,
+        cache_key: str,
+        config: SearchConfig,
+        response: Dict[str, Any],
+    ) -> None:
+        """写入缓存（空结果不缓存，避免把重排失败的空列表固化下来）"""
+        result_key = "sections" if config.return_type == ReturnType.PARAGRAPH else "events"
+        if not response.get(result_key):
+            return
+
+        try:
+            snapshot = None
+            if cache.redis_enabled:
+                snapshot = dict(response)
+                if result_key == "events":
+                    snapshot["event_ids"] = [event.id for event in snapshot.pop("events")]
+                # 快照必须可 JSON 序列化，否则只保留内存层
+                try:
+                    json.dumps(snapshot, ensure_ascii=False)
+                except (TypeError, ValueError):
+                    snapshot = None
+
+            await cache.set(
+                cache_key,
+                dict(response),
+                config.get_source_config_ids(),
+                redis_value=snapshot,
+            )
+        except Exception as e:
+            self.logger.warning(f"写入搜索缓存失败: {e}，不影响返回结果")
+
+    async def _load_events_by_ids(
+        self, event_ids: List[str], with_relations: bool = False
+    ) -> List[SourceEvent]:
+        """
+        按ID批量加载事项，并保持缓存中的排序
+
+        Args:
+            event_ids: 事项ID列表
+            with_relations: 是否预加载重排阶段返回事项时加载的关联关系（来源、文章、实体关联）
+        """
+        if not event_ids:
+            return []
+
+        query = select(SourceEvent).where(SourceEvent.id.in_(event_ids))
+        if with_relations:
+            query = query.options(
+                selectinload(SourceEvent.event_associations),
+                selectinload(SourceEvent.source),
+                selectinload(SourceEvent.article),
+            )
+
+        session_factory = get_read_session_factory()
+        async with session_factory() as session:
+            result = await session.execute(query)
+            events_by_id = {event.id: event for event in result.scalars().all()}
+
+        return [events_by_id[eid] for eid in event_ids if eid in events_by_id]
+
+    @traced("search.recall", kind="search")
     async def _recall(self, config: SearchConfig) -> RecallResult:
         """
         Recall: 实体召回
@@ -253,8 +507,39 @@ class SAGSearcher:
         self.logger.info("📍 Recall: 实体召回")
         result = await self.recall_searcher.search(config)
         self.logger.info(f"✓ Recall完成：召回 {len(result.key_final)} 个实体")
+        set_span_attributes(keys=len(result.key_final))
+        record_timings("search.recall", result.step_timings)
+        record_timings("search.recall.step1", result.step1_substep_timings)
         return result
     
+    async def _emit_recall_progress(self, config: SearchConfig, recall_result: RecallResult) -> None:
+        """推送召回阶段结果：召回实体 + 按召回权重排序的候选事项（临时分数，重排后可能变化）"""
+        weights = recall_result.event_key_weights or {}
+        top_ids = sorted(weights, key=weights.get, reverse=True)[: config.rerank.max_results]
+        events = await self._load_events_by_ids(top_ids)
+        await config.emit_progress({
+            "type": "recall",
+            "entities": [
+                {
+                    "id": key.get("key_id"),
+                    "name": key.get("name"),
+                    "type": key.get("type"),
+                    "weight": float(key.get("weight") or 0.0),
+                }
+                for key in recall_result.key_final
+            ],
+            "candidates": [
+                {
+                    "id": event.id,
+                    "title": event.title,
+                    "summary": event.summary,
+                    "score": float(weights[event.id]),
+                }
+                for event in events
+            ],
+        })
+
+    @traced("search.expand", kind="search")
     async def _expand(
         self, 
         config: SearchConfig, 
@@ -271,8 +556,11 @@ class SAGSearcher:
             f"✓ Expand完成：扩展到 {len(result.key_final)} 个实体，"
             f"跳跃 {result.total_jumps} 次"
         )
+        set_span_attributes(keys=len(result.key_final), hops=result.total_jumps)
+        record_timings("search.expand", result.step_average_timings)
         return result
     
+    @traced("search.rerank", kind="search")
     async def _rerank(
         self,
         config: SearchConfig,
@@ -316,6 +604,10 @@ class SAGSearcher:
             config=config
         )
 
+        set_span_attributes(
+            results=len(result.get("sections" if return_type == ReturnType.PARAGRAPH else "events", []))
+        )
+
         # 日志输出
         if return_type == ReturnType.PARAGRAPH:
             self.logger.info(
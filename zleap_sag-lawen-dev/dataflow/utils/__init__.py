@@ -2,6 +2,7 @@
 工具函数模块
 """
 
+from dataflow.utils.keyword_matcher import KeywordMatcher
 from dataflow.utils.logger import get_logger, logger, setup_logging
 from dataflow.utils.text import (
     clean_whitespace,
@@ -46,4 +47,6 @@ __all__ = [
     "calculate_time_decay",
     # Token
     "TokenEstimator",
+    # Matcher
+    "KeywordMatcher",
 ]
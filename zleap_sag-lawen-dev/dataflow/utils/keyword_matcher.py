@@ -0,0 +1,81 @@
+"""
+多关键词匹配（Aho-Corasick 自动机）
+
+一次构建、单次扫描文本即可找出所有出现过的关键词，代价与关键词数量无关：
+    matcher = KeywordMatcher(["张三", "北京", "openai"])
+    matcher.find_all("张三在北京见了 OpenAI 的人".lower())  # {0, 1, 2}
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多模式子串匹配（区分大小写，调用方自行统一大小写）"""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        构建自动机
+
+        Args:
+            keywords: 关键词列表（空串忽略；find_all 返回其下标）
+        """
+        # 每个状态：子节点、失败指针、命中的关键词下标（含失败链上的输出）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self.size = 0
+
+        for index, keyword in enumerate(keywords):
+            self.size += 1
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        self._build_fail_links()
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # 合并失败链输出，扫描时无需再沿失败链回溯
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """
+        找出文本中出现的所有关键词
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            出现过的关键词下标集合
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
@@ -18,15 +18,20 @@
     # 方式2: 从事项ID列表获取段落
     event_ids = ["event-id-1", "event-id-2"]
     sections = await converter.get_sections_by_event_ids(event_ids)
+
+    # 方式3: 一次解析多个问题的事项（整批两次查询，段落在整个评估运行内缓存）
+    per_question = await converter.get_sections_for_questions([ids_q1, ids_q2, ...])
+
+默认复用应用的只读会话工厂（配置了只读副本时走副本）；传入 db_url 时创建独立引擎。
 """
 
-from dataflow.core.config.settings import Settings
+from dataflow.db import get_read_session_factory
 from dataflow.db.models import SourceEvent, ArticleSection
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import select
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Sequence
 from pathlib import Path
 import sys
 
@@ -34,32 +39,55 @@ import sys
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# 单条 IN 查询的最大 ID 数（避免超长 SQL）
+_IN_CHUNK_SIZE = 1000
+
+
+def _chunked(ids: Sequence[str], size: int = _IN_CHUNK_SIZE) -> Iterable[Sequence[str]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
 
 class EventToSectionConverter:
     """事项到段落转换器"""
 
-    def __init__(self, db_url: Optional[str] = None):
+    def __init__(
+        self,
+        db_url: Optional[str] = None,
+        session_factory: Optional[async_sessionmaker] = None
+    ):
         """
         初始化转换器
 
         Args:
-            db_url: 数据库连接 URL，如果不提供则从配置读取
+            db_url: 数据库连接 URL；提供时创建独立引擎（close 时释放）
+            session_factory: 会话工厂；两者都不提供时复用应用的只读会话工厂
         """
-        if db_url is None:
-            settings = Settings()
-            db_url = settings.mysql_url
-
-        # 创建异步引擎
-        self.engine = create_async_engine(db_url, echo=False)
-        self.async_session = async_sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
+        self.engine = None
+        if session_factory is not None:
+            self.async_session = session_factory
+        elif db_url is not None:
+            # 创建异步引擎
+            self.engine = create_async_engine(db_url, echo=False)
+            self.async_session = async_sessionmaker(
+                self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
+        else:
+            self.async_session = get_read_session_factory()
+
+        # 段落缓存：section_id -> 段落字典（None 表示数据库中不存在），在整个评估运行内复用
+        self._section_cache: Dict[str, Optional[Dict[str, Any]]] = {}
 
     async def close(self):
-        """关闭数据库连接"""
-        await self.engine.dispose()
+        """关闭数据库连接（只释放自己创建的引擎）"""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+    def clear_cache(self):
+        """清空段落缓存（数据重新上传后调用）"""
+        self._section_cache.clear()
 
     async def get_sections_from_events(
         self,
@@ -111,77 +139,73 @@ class EventToSectionConverter:
             events_dict: 事项信息字典（可选，避免重复查询）
 
         Returns:
-            段落列表
+            段落列表（按事项顺序，事项内按 references 顺序）
         """
         if not event_ids:
             return []
 
-        async with self.async_session() as session:
-            # 1. 查询事项，获取 references 和其他信息
-            query = select(SourceEvent).where(SourceEvent.id.in_(event_ids))
-            result = await session.execute(query)
-            events = result.scalars().all()
-
-            # 2. 收集所有被引用的 section_ids
-            event_to_sections_map = {}  # event_id -> [section_ids]
-            all_section_ids = set()
-
-            for event in events:
-                if event.references and isinstance(event.references, list):
-                    event_to_sections_map[event.id] = event.references
-                    all_section_ids.update(event.references)
-                else:
-                    event_to_sections_map[event.id] = []
-
-            if not all_section_ids:
-                print("⚠️  没有找到任何段落引用 (references 字段为空)")
-                return []
-
-            # 3. 查询所有段落
-            section_query = (
-                select(ArticleSection)
-                .where(ArticleSection.id.in_(all_section_ids))
-                .order_by(ArticleSection.article_id, ArticleSection.rank)
-            )
-            section_result = await session.execute(section_query)
-            sections = section_result.scalars().all()
+        results = await self.get_sections_for_questions(
+            [event_ids],
+            include_event_info=include_event_info,
+            events_dicts=[events_dict] if events_dict else None
+        )
+        if not results[0]:
+            print("⚠️  没有找到任何段落引用 (references 字段为空)")
+        return results[0]
+
+    async def get_sections_for_questions(
+        self,
+        event_ids_per_question: Sequence[Sequence[str]],
+        include_event_info: bool = True,
+        events_dicts: Optional[Sequence[Optional[Dict[str, Dict]]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        批量获取多个问题的事项关联段落
 
-            # 4. 构建 section_id -> section 映射
-            section_dict = {s.id: s for s in sections}
+        所有问题的事项合并为一次查询，未缓存的段落合并为一次查询
 
-            # 5. 构建结果列表
-            result_sections = []
+        Args:
+            event_ids_per_question: 每个问题的事项ID列表
+            include_event_info: 是否在结果中包含事项信息
+            events_dicts: 每个问题的事项信息字典（可选，用于补充 event_score）
 
-            for event in events:
-                section_ids = event_to_sections_map.get(event.id, [])
+        Returns:
+            与输入对齐的段落列表
+        """
+        events = await self._load_events(
+            eid for event_ids in event_ids_per_question for eid in event_ids
+        )
+        sections = await self._load_sections(
+            sid for event in events.values() for sid in event['references']
+        )
 
-                for section_id in section_ids:
-                    section = section_dict.get(section_id)
+        results = []
+        for index, event_ids in enumerate(event_ids_per_question):
+            events_dict = events_dicts[index] if events_dicts else None
+            question_sections = []
+            for event_id in dict.fromkeys(event_ids):
+                event = events.get(event_id)
+                if event is None:
+                    continue
+                for section_id in event['references']:
+                    section = sections.get(section_id)
                     if not section:
                         continue
 
-                    section_data = {
-                        'section_id': section.id,
-                        'article_id': section.article_id,
-                        'rank': section.rank,
-                        'heading': section.heading,
-                        'content': section.content,
-                        'extra_data': section.extra_data
-                    }
-
+                    section_data = dict(section)
                     if include_event_info:
-                        section_data['event_id'] = event.id
-                        section_data['event_title'] = event.title
-                        section_data['event_summary'] = event.summary
+                        section_data['event_id'] = event_id
+                        section_data['event_title'] = event['title']
+                        section_data['event_summary'] = event['summary']
 
                         # 如果提供了 events_dict，添加更多事项信息
-                        if events_dict and event.id in events_dict:
-                            section_data['event_score'] = events_dict[event.id].get(
-                                'score', 0)
+                        if events_dict and event_id in events_dict:
+                            section_data['event_score'] = events_dict[event_id].get('score', 0)
 
-                    result_sections.append(section_data)
+                    question_sections.append(section_data)
+            results.append(question_sections)
 
-            return result_sections
+        return results
 
     async def get_event_details_with_sections(
         self,
@@ -199,64 +223,135 @@ class EventToSectionConverter:
         if not event_ids:
             return []
 
+        return (await self.get_event_details_for_questions([event_ids]))[0]
+
+    async def get_event_details_for_questions(
+        self,
+        event_ids_per_question: Sequence[Sequence[str]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        批量获取多个问题的事项完整信息（包括关联的段落）
+
+        Args:
+            event_ids_per_question: 每个问题的事项ID列表
+
+        Returns:
+            与输入对齐的事项列表
+        """
+        events = await self._load_events(
+            (eid for event_ids in event_ids_per_question for eid in event_ids),
+            details=True
+        )
+        sections = await self._load_sections(
+            sid for event in events.values() for sid in event['references']
+        )
+
+        results = []
+        for event_ids in event_ids_per_question:
+            question_events = []
+            for event_id in dict.fromkeys(event_ids):
+                event = events.get(event_id)
+                if event is None:
+                    continue
+
+                event_data = {key: value for key, value in event.items() if key != 'references'}
+                # 添加关联的段落（按 rank 排序）
+                event_data['sections'] = sorted(
+                    (
+                        {key: value for key, value in sections[sid].items() if key != 'article_id'}
+                        for sid in event['references']
+                        if sections.get(sid)
+                    ),
+                    key=lambda x: x['rank']
+                )
+                question_events.append(event_data)
+            results.append(question_events)
+
+        return results
+
+    async def _load_events(
+        self,
+        event_ids: Iterable[str],
+        details: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        批量查询事项（只加载需要的列）
+
+        Args:
+            event_ids: 事项ID（可重复）
+            details: 是否加载完整事项信息（正文、时间等）
+
+        Returns:
+            event_id -> 事项字典（references 规整为列表）
+        """
+        unique_ids = list(dict.fromkeys(eid for eid in event_ids if eid))
+        if not unique_ids:
+            return {}
+
+        columns = [SourceEvent.id, SourceEvent.references, SourceEvent.title, SourceEvent.summary]
+        if details:
+            columns += [
+                SourceEvent.source_config_id, SourceEvent.article_id, SourceEvent.content,
+                SourceEvent.rank, SourceEvent.start_time, SourceEvent.end_time, SourceEvent.created_time,
+            ]
+
+        events: Dict[str, Dict[str, Any]] = {}
         async with self.async_session() as session:
-            # 查询事项
-            query = select(SourceEvent).where(SourceEvent.id.in_(event_ids))
-            result = await session.execute(query)
-            events = result.scalars().all()
-
-            # 收集所有 section_ids
-            all_section_ids = set()
-            for event in events:
-                if event.references and isinstance(event.references, list):
-                    all_section_ids.update(event.references)
-
-            # 查询段落
-            section_dict = {}
-            if all_section_ids:
-                section_query = select(ArticleSection).where(
-                    ArticleSection.id.in_(all_section_ids)
+            for batch in _chunked(unique_ids):
+                result = await session.execute(
+                    select(SourceEvent).where(SourceEvent.id.in_(batch)).options(load_only(*columns))
                 )
-                section_result = await session.execute(section_query)
-                sections = section_result.scalars().all()
-                section_dict = {s.id: s for s in sections}
-
-            # 构建结果
-            result_events = []
-            for event in events:
-                event_data = {
-                    'event_id': event.id,
-                    'source_config_id': event.source_config_id,
-                    'article_id': event.article_id,
-                    'title': event.title,
-                    'summary': event.summary,
-                    'content': event.content,
-                    'rank': event.rank,
-                    'start_time': event.start_time.isoformat() if event.start_time else None,
-                    'end_time': event.end_time.isoformat() if event.end_time else None,
-                    'created_time': event.created_time.isoformat() if event.created_time else None,
-                    'sections': []
-                }
-
-                # 添加关联的段落
-                if event.references:
-                    for section_id in event.references:
-                        section = section_dict.get(section_id)
-                        if section:
-                            event_data['sections'].append({
-                                'section_id': section.id,
-                                'rank': section.rank,
-                                'heading': section.heading,
-                                'content': section.content,
-                                'extra_data': section.extra_data
-                            })
-
-                    # 按 rank 排序
-                    event_data['sections'].sort(key=lambda x: x['rank'])
-
-                result_events.append(event_data)
-
-            return result_events
+                for event in result.scalars().all():
+                    references = event.references if isinstance(event.references, list) else []
+                    if details:
+                        event_data = {
+                            'event_id': event.id,
+                            'source_config_id': event.source_config_id,
+                            'article_id': event.article_id,
+                            'title': event.title,
+                            'summary': event.summary,
+                            'content': event.content,
+                            'rank': event.rank,
+                            'start_time': event.start_time.isoformat() if event.start_time else None,
+                            'end_time': event.end_time.isoformat() if event.end_time else None,
+                            'created_time': event.created_time.isoformat() if event.created_time else None,
+                        }
+                    else:
+                        event_data = {'title': event.title, 'summary': event.summary}
+                    event_data['references'] = references
+                    events[event.id] = event_data
+        return events
+
+    async def _load_sections(self, section_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        查询段落（先查缓存，只为未缓存的段落执行查询）
+
+        Returns:
+            section_id -> 段落字典（不存在为 None）
+        """
+        wanted = list(dict.fromkeys(section_ids))
+        missing = [sid for sid in wanted if sid not in self._section_cache]
+
+        if missing:
+            async with self.async_session() as session:
+                for batch in _chunked(missing):
+                    result = await session.execute(
+                        select(ArticleSection).where(ArticleSection.id.in_(batch))
+                    )
+                    for section in result.scalars().all():
+                        self._section_cache[section.id] = {
+                            'section_id': section.id,
+                            'article_id': section.article_id,
+                            'rank': section.rank,
+                            'heading': section.heading,
+                            'content': section.content,
+                            'extra_data': section.extra_data
+                        }
+            # 数据库中不存在的段落也缓存，避免同一运行中反复查询
+            for sid in missing:
+                self._section_cache.setdefault(sid, None)
+
+        return {sid: self._section_cache[sid] for sid in wanted}
 
 
 async def demo():
@@ -809,6 +809,98 @@ class HotpotQAProcessor:
         return result
 
 
+    async def bulk_upload_corpus(
+        self,
+        source_name: str = "HotpotQA Corpus",
+        source_description: str = "HotpotQA Evaluation Corpus (Document-level concatenation, deduplicated)",
+        enable_extraction: bool = True,
+        source_config_id: Optional[str] = None,
+        extract_concurrency: int = 50
+    ) -> Dict[str, Any]:
+        """
+        批量上传语料库（直接读取 corpus.jsonl，每个 chunk 一个片段，不经过 corpus_merged.md）
+
+        Args:
+            source_name: 信息源名称
+            source_description: 信息源描述
+            enable_extraction: 是否执行提取阶段
+            source_config_id: 续跑的信息源ID（None 时新建）
+            extract_concurrency: 提取并发数
+
+        Returns:
+            处理结果字典（字段与 upload_corpus 一致）
+        """
+        from dataflow.evaluation.corpus_ingest import CorpusIngestor
+
+        self._log("=" * 60)
+        self._log("阶段3：批量加载语料库到系统")
+        self._log("=" * 60)
+
+        if not self.corpus_path.exists():
+            error_msg = f"错误：corpus.jsonl 不存在: {self.corpus_path}"
+            self._log_error(error_msg)
+            return {'status': 'error', 'message': error_msg}
+
+        documents = []
+        with open(self.corpus_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                # chunk 文本首行是 "# {title}"，标题单独作为片段标题
+                text = chunk['text']
+                if text.startswith('# '):
+                    text = text.split('\n', 1)[1] if '\n' in text else ''
+                documents.append({'title': chunk['title'], 'text': text})
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        source_config_id = source_config_id or f"hotpotqa-corpus-{timestamp}"
+        self._log(f"   信息源 ID: {source_config_id}")
+        self._log(f"   语料 chunk 数: {len(documents)}\n")
+
+        try:
+            report = await CorpusIngestor(
+                source_config_id=source_config_id,
+                source_name=source_name,
+                source_description=source_description,
+                extract_concurrency=extract_concurrency
+            ).ingest(documents, article_title="HotpotQA corpus", enable_extraction=enable_extraction)
+        except Exception as e:
+            error_msg = f"批量加载失败: {e}"
+            self._log_error(error_msg, exc_info=True)
+            return {'status': 'error', 'message': error_msg}
+
+        load_time = report.timings.get("write", 0.0) + report.timings.get("index", 0.0)
+        extract_time = report.timings.get("extract", 0.0)
+        result = {
+            "source_config_id": source_config_id,
+            "source_name": source_name,
+            "source_description": source_description,
+            "article_id": report.article_id,
+            "sections_count": report.total_chunks,
+            "events_count": report.events,
+            "load_time_seconds": load_time,
+            "extract_time_seconds": extract_time,
+            "total_processing_time_seconds": load_time + extract_time,
+            "chunks_per_second": report.chunks_per_second(),
+            "ingest_report": report.to_dict(),
+            "corpus_file": str(self.corpus_path),
+            "timestamp": timestamp,
+            "status": "completed",
+            "extraction_enabled": enable_extraction
+        }
+
+        with open(self.process_result_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        self._log(f"💾 处理结果已保存: {self.process_result_path}\n")
+
+        rates = result["chunks_per_second"]
+        self._log("=" * 60)
+        self._log(f"✅ 阶段3完成（写入 {rates['write']} / 索引 {rates['index']} / 提取 {rates['extract']} 片段/秒）")
+        self._log("=" * 60)
+
+        return result
+
 
 # ==================== Usage Examples ====================
 
@@ -822,6 +914,8 @@ if __name__ == "__main__":
     parser.add_argument('--enable-extraction', action='store_false', help='禁用事项提取 (默认: 启用)')
     parser.add_argument('--no-upload', action='store_true', help='不上传到系统，只构建数据文件 (默认: 上传)')
     parser.add_argument('--no-log', action='store_true', help='禁用日志输出')
+    parser.add_argument('--bulk', action='store_true', help='批量上传：直接写入 corpus.jsonl 中的 chunk，批量索引、并发提取')
+    parser.add_argument('--resume-source', type=str, default=None, help='配合 --bulk：续跑中断的批量上传 (source_config_id)')
 
     args = parser.parse_args()
 
@@ -851,7 +945,13 @@ if __name__ == "__main__":
         # 阶段3: 上传到系统（可选）
         if not skip_upload:
             print("\n阶段3: 上传到系统...")
-            result = await processor.upload_corpus(enable_extraction=enable_extraction)
+            if args.bulk:
+                result = await processor.bulk_upload_corpus(
+                    enable_extraction=enable_extraction,
+                    source_config_id=args.resume_source
+                )
+            else:
+                result = await processor.upload_corpus(enable_extraction=enable_extraction)
             print(f"✓ 上传完成: source_config_id={result.get('source_config_id')}")
         else:
             print("\n阶段3: 跳过上传（--no-upload）")
@@ -0,0 +1,29 @@
+"""add article content_hash for upload dedup
+
+Revision ID: c3f1a7d2e8b4
+Revises: 94b253ab1d17
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a7d2e8b4'
+down_revision: Union[str, None] = '94b253ab1d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('article', sa.Column('content_hash', sa.CHAR(length=64), nullable=True))
+    op.create_index('idx_source_config_content_hash', 'article', ['source_config_id', 'content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_source_config_content_hash', table_name='article')
+    op.drop_column('article', 'content_hash')
@@ -0,0 +1,27 @@
+"""add source_config deleted_time for background purge
+
+Revision ID: d5e2b9c4a1f7
+Revises: c3f1a7d2e8b4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e2b9c4a1f7'
+down_revision: Union[str, None] = 'c3f1a7d2e8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('source_config', sa.Column('deleted_time', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('source_config', 'deleted_time')
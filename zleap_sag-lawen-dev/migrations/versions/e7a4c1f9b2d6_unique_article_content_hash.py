@@ -0,0 +1,41 @@
+"""make article (source_config_id, content_hash) unique for concurrent upload dedup
+
+Revision ID: e7a4c1f9b2d6
+Revises: d5e2b9c4a1f7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c1f9b2d6'
+down_revision: Union[str, None] = 'd5e2b9c4a1f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 删除中的文档不参与去重（删除时置空哈希），允许清理完成前重新上传
+    op.execute("UPDATE article SET content_hash = NULL WHERE status = 'DELETING'")
+    # 已有的重复内容只保留最早的一条哈希，其余置空，避免建唯一索引失败
+    op.execute(
+        """
+        UPDATE article a
+        JOIN article b
+          ON a.source_config_id = b.source_config_id
+         AND a.content_hash = b.content_hash
+         AND (b.created_time < a.created_time OR (b.created_time = a.created_time AND b.id < a.id))
+        SET a.content_hash = NULL
+        """
+    )
+    op.drop_index('idx_source_config_content_hash', table_name='article')
+    op.create_index('uk_source_config_content_hash', 'article', ['source_config_id', 'content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uk_source_config_content_hash', table_name='article')
+    op.create_index('idx_source_config_content_hash', 'article', ['source_config_id', 'content_hash'], unique=False)
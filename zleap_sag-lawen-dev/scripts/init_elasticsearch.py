@@ -12,7 +12,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from dataflow.core.storage.documents import REGISTERED_DOCUMENTS
+from dataflow.core.storage.documents import REGISTERED_DOCUMENTS, build_index_definition
 from dataflow.core.storage.elasticsearch import ElasticsearchClient
 from dataflow.utils import get_logger
 
@@ -63,10 +63,8 @@ async def create_indices(es_client: ElasticsearchClient) -> dict[str, str]:
 
     for document_cls in REGISTERED_DOCUMENTS:
         try:
-            # 从 Document 类获取索引配置
-            index_name = document_cls.Index.name
-            mapping = document_cls._doc_type.mapping.to_dict()
-            settings = getattr(document_cls.Index, "settings", {})
+            # 从 Document 类获取索引配置（向量字段按 es_vector_index_type 写入 index_options）
+            index_name, mapping, settings = build_index_definition(document_cls)
         except AttributeError as e:
             print_error(f"Document 类 {document_cls.__name__} 配置获取失败: {e}")
             logger.error(f"Document 类 {document_cls.__name__} 缺少必要属性: {e}")
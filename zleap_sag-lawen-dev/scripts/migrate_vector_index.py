@@ -0,0 +1,283 @@
+"""
+向量索引类型迁移脚本
+
+把向量索引迁移到指定的索引类型（如 hnsw → int8_hnsw），业务代码无需改动：
+
+1. 以目标类型创建新物理索引 {name}__{index_type}（映射/分片设置同 Document 定义）
+2. --swap 时先阻断源索引写入（index.blocks.write），再由服务端 _reindex 复制全部文档
+   （保留 _routing），轮询任务进度
+3. 刷新后重新统计源索引与目标索引的文档数量并核对
+4. --swap 时原子切换：一次 _aliases 请求内把原索引名指向新索引并删除旧物理索引，
+   切换完成后新索引可正常写入；复制或核对失败时解除源索引的写入阻断
+
+⚠️ --swap 期间源索引拒绝写入：导入/提取任务写入 ES 会直接报错，请在低峰期执行并暂停相关任务。
+   不带 --swap 时不阻断写入，复制期间的新写入不会进入新索引（核对数量会失败），
+   仅用于预先验证新索引类型；正式切换必须使用 --swap 重新复制。
+
+回滚：以 --index-type hnsw 再执行一次即可
+
+使用方法：
+    python scripts/migrate_vector_index.py --index-type int8_hnsw                  # 仅复制 + 核对
+    python scripts/migrate_vector_index.py --index-type int8_hnsw --swap           # 阻断写入 + 复制 + 切换
+    python scripts/migrate_vector_index.py --index-type int8_hnsw --indices event_vectors --swap
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dataflow.core.storage.documents import (
+    REGISTERED_DOCUMENTS,
+    VECTOR_INDEX_TYPES,
+    build_index_definition,
+    get_vector_index_types,
+)
+from dataflow.core.storage.elasticsearch import ElasticsearchClient
+from dataflow.utils import get_logger
+
+logger = get_logger("scripts.migrate_vector_index")
+
+# 默认迁移的索引（向量占用最大的两个）
+DEFAULT_INDICES = ["event_vectors", "entity_vectors"]
+
+
+# 输出辅助函数
+def print_header(text: str) -> None:
+    """打印标题"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+
+def print_success(text: str) -> None:
+    """打印成功信息"""
+    print(f"  ✓ {text}")
+
+
+def print_info(text: str) -> None:
+    """打印普通信息"""
+    print(f"  • {text}")
+
+
+def print_warning(text: str) -> None:
+    """打印警告信息"""
+    print(f"  ⚠️  {text}")
+
+
+def print_error(text: str) -> None:
+    """打印错误信息"""
+    print(f"  ✗ {text}")
+
+
+def confirm_action(prompt: str) -> bool:
+    """请求用户确认"""
+    user_input = input(f"  {prompt} (输入 'yes' 确认): ").strip().lower()
+    return user_input == "yes"
+
+
+def find_document(index_name: str):
+    """根据索引名查找 Document 类"""
+    for document_cls in REGISTERED_DOCUMENTS:
+        if document_cls.Index.name == index_name:
+            return document_cls
+    raise ValueError(f"未注册的索引: {index_name}")
+
+
+async def wait_for_task(es_client: ElasticsearchClient, task_id: str, poll_interval: float) -> Dict[str, Any]:
+    """轮询 _reindex 任务直至完成"""
+    while True:
+        task = await es_client.client.tasks.get(task_id=task_id)
+        status = task["task"].get("status", {})
+        total = status.get("total", 0)
+        done = status.get("created", 0) + status.get("updated", 0)
+        if total:
+            print_info(f"进度: {done}/{total} ({done / total:.1%})")
+        if task.get("completed"):
+            return task
+        await asyncio.sleep(poll_interval)
+
+
+async def migrate_index(
+    es_client: ElasticsearchClient,
+    index_name: str,
+    index_type: str,
+    swap: bool,
+    poll_interval: float,
+    requests_per_second: Optional[float],
+) -> bool:
+    """
+    迁移单个索引
+
+    swap=True 时复制前阻断源索引写入，切换成功后旧索引随之删除；失败时恢复写入
+
+    Returns:
+        是否成功
+    """
+    print_header(f"{index_name} → {index_type}")
+
+    physical_indices = await es_client.resolve_index(index_name)
+    if not physical_indices:
+        print_warning(f"{index_name}: 索引不存在，跳过")
+        return True
+    if len(physical_indices) > 1:
+        print_error(f"{index_name}: 别名指向多个物理索引 {physical_indices}，请先手动处理")
+        return False
+
+    source_index = physical_indices[0]
+    current_types = get_vector_index_types(await es_client.get_mapping(source_index))
+    print_info(f"当前物理索引: {source_index}，向量字段: {current_types}")
+
+    if current_types and all(t == index_type for t in current_types.values()):
+        print_success(f"{index_name}: 已是 {index_type}，无需迁移")
+        return True
+
+    _, mapping, settings = build_index_definition(find_document(index_name), index_type)
+    target_index = f"{index_name}__{index_type}"
+    if target_index == source_index:
+        print_error(f"目标索引与源索引相同: {target_index}")
+        return False
+
+    # 1. 创建目标索引（已存在则删除重建，保证映射正确）
+    if await es_client.index_exists(target_index):
+        print_warning(f"{target_index}: 已存在（上次迁移残留），删除重建")
+        await es_client.delete_index(target_index)
+    await es_client.create_index(index=target_index, mappings=mapping, settings=settings)
+    print_success(f"{target_index}: 创建成功")
+
+    # 2. 服务端复制（--swap 时先阻断源索引写入，复制期间的写入不会遗漏）
+    if not swap:
+        return await copy_index(es_client, source_index, target_index, poll_interval, requests_per_second)
+
+    await es_client.set_write_block(source_index, True)
+    print_warning(f"{source_index}: 已阻断写入（切换完成后由新索引接收写入）")
+    swapped = False
+    try:
+        if not await copy_index(es_client, source_index, target_index, poll_interval, requests_per_second):
+            return False
+
+        # 4. 原子切换：原名 → 别名，同时删除旧物理索引
+        await es_client.replace_with_alias(index_name, source_index, target_index)
+        swapped = True
+    finally:
+        if not swapped:
+            await es_client.set_write_block(source_index, False)
+            print_info(f"{source_index}: 已恢复写入")
+
+    print_success(f"{index_name} 已指向 {target_index}")
+    logger.info(f"向量索引迁移完成: {index_name} -> {target_index} ({index_type})")
+    return True
+
+
+async def copy_index(
+    es_client: ElasticsearchClient,
+    source_index: str,
+    target_index: str,
+    poll_interval: float,
+    requests_per_second: Optional[float],
+) -> bool:
+    """
+    服务端 _reindex 复制并核对文档数量
+
+    复制完成后刷新并重新统计源索引：复制期间源索引有新写入时数量不一致，判定失败
+
+    Returns:
+        复制成功且数量一致
+    """
+    # 先刷新源索引：_reindex 只能读到已刷新的文档
+    await es_client.client.indices.refresh(index=source_index)
+    print_info(f"开始 _reindex: {await es_client.count_documents(source_index)} 个文档")
+    reindex_kwargs: Dict[str, Any] = {
+        "source": {"index": source_index},
+        "dest": {"index": target_index},
+        "wait_for_completion": False,
+    }
+    if requests_per_second:
+        reindex_kwargs["requests_per_second"] = requests_per_second
+    response = await es_client.client.reindex(**reindex_kwargs)
+    task = await wait_for_task(es_client, response["task"], poll_interval)
+
+    failures = task.get("response", {}).get("failures") or []
+    if task.get("error") or failures:
+        print_error(f"_reindex 失败: {task.get('error') or failures[:3]}")
+        return False
+
+    # 3. 核对数量（复制完成后重新统计源索引）
+    await es_client.client.indices.refresh(index=[source_index, target_index])
+    source_count = await es_client.count_documents(source_index)
+    target_count = await es_client.count_documents(target_index)
+    if target_count != source_count:
+        print_error(f"文档数量不一致: 源 {source_count}，目标 {target_count}（复制期间源索引有写入？）")
+        return False
+    print_success(f"复制完成，文档数量一致: {target_count}")
+    print_info(f"新索引 {target_index} 可用 vector_quant 对比召回")
+    return True
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="向量索引类型迁移（hnsw / int8_hnsw / int4_hnsw）")
+    parser.add_argument("--index-type", required=True, choices=list(VECTOR_INDEX_TYPES), help="目标向量索引类型")
+    parser.add_argument("--indices", nargs="+", default=DEFAULT_INDICES, help="需要迁移的索引名")
+    parser.add_argument("--swap", action="store_true", help="复制完成后把原索引名切换到新索引")
+    parser.add_argument("--yes", action="store_true", help="跳过确认")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="任务进度轮询间隔（秒）")
+    parser.add_argument("--requests-per-second", type=float, default=None, help="_reindex 限速")
+    args = parser.parse_args(argv)
+
+    es_client = None
+
+    try:
+        print_header("DataFlow 向量索引迁移工具")
+        print_info(f"目标类型: {args.index_type}")
+        print_info(f"索引: {', '.join(args.indices)}")
+        if args.swap:
+            print_warning("--swap: 复制期间源索引拒绝写入（请暂停导入/提取任务），切换后删除旧物理索引")
+            if not args.yes and not confirm_action("确认继续?"):
+                print_info("操作已取消")
+                return
+
+        es_client = ElasticsearchClient()
+        if not await es_client.check_connection():
+            print_error("Elasticsearch 连接失败，请检查配置")
+            sys.exit(1)
+
+        results = {}
+        for index_name in args.indices:
+            try:
+                results[index_name] = await migrate_index(
+                    es_client,
+                    index_name,
+                    args.index_type,
+                    args.swap,
+                    args.poll_interval,
+                    args.requests_per_second,
+                )
+            except Exception as e:
+                print_error(f"{index_name}: 迁移失败 - {e}")
+                logger.error(f"向量索引迁移失败: {index_name} - {e}", exc_info=True)
+                results[index_name] = False
+
+        print_header("操作总结")
+        for index_name, ok in results.items():
+            (print_success if ok else print_error)(f"{index_name}: {'成功' if ok else '失败'}")
+        if not all(results.values()):
+            sys.exit(1)
+
+        if args.swap:
+            print_info(f"请同步设置 ES_VECTOR_INDEX_TYPE={args.index_type}，保证后续重建索引使用相同类型")
+
+    finally:
+        if es_client:
+            await es_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
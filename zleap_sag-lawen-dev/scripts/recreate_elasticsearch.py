@@ -12,7 +12,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from dataflow.core.storage.documents import REGISTERED_DOCUMENTS
+from dataflow.core.storage.documents import REGISTERED_DOCUMENTS, build_index_definition
 from dataflow.core.storage.elasticsearch import ElasticsearchClient
 from dataflow.utils import get_logger  # 添加这行
 
@@ -74,9 +74,10 @@ async def delete_indices(es_client: ElasticsearchClient) -> dict[str, bool]:
             results[index_name] = True
             continue
 
-        # 删除索引
+        # 删除索引（量化迁移后索引名是别名，删除其指向的物理索引）
         try:
-            await es_client.delete_index(index_name)
+            for physical_name in await es_client.resolve_index(index_name):
+                await es_client.delete_index(physical_name)
             print_success(f"{index_name}: 删除成功")
             results[index_name] = True
         except Exception as e:
@@ -99,10 +100,8 @@ async def create_indices(es_client: ElasticsearchClient) -> dict[str, bool]:
 
     for document_cls in REGISTERED_DOCUMENTS:
         try:
-            # 从 Document 类获取索引配置
-            index_name = document_cls.Index.name
-            mapping = document_cls._doc_type.mapping.to_dict()
-            settings = getattr(document_cls.Index, "settings", {})
+            # 从 Document 类获取索引配置（向量字段按 es_vector_index_type 写入 index_options）
+            index_name, mapping, settings = build_index_definition(document_cls)
         except AttributeError as e:
             print_error(f"Document 类 {document_cls.__name__} 配置获取失败: {e}")
             logger.error(f"Document 类 {document_cls.__name__} 缺少必要属性: {e}")
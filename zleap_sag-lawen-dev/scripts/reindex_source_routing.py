@@ -0,0 +1,366 @@
+"""
+按信息源路由重建索引
+
+事项 / 实体 / 片段索引约定以 source_config_id 为路由键写入，检索按信息源（多源为多值）路由，
+只访问相关分片。早期未带路由写入的文档位于按 _id 哈希的分片上，路由检索可能漏掉它们；
+此后再次写入同一 _id（如实体向量更新）会在路由分片上产生新副本，旧的未路由副本仍留在原分片，
+同一 _id 在索引中存在两份。本脚本检查并迁移这些存量数据：
+
+1. 检查（默认）：按信息源统计文档总数与路由可见的文档数，列出存在未路由文档的信息源
+2. --apply：创建新物理索引 {name}__routed_{时间戳}（映射/分片设置同 Document 定义，保留当前向量索引类型），
+   服务端 _reindex 分两轮复制并把 _routing 设为 source_config_id，轮询任务进度：
+   先复制未路由文档，再复制已路由文档——同一 _id 的两份副本以后写入的路由副本为准；
+   复制完成后刷新并重新统计源索引与目标索引的文档数量，扣除被覆盖的重复副本后核对一致并复检路由
+3. --swap：复制前先阻断源索引写入（index.blocks.write），核对通过后原子切换：一次 _aliases 请求内
+   把原索引名指向新索引并删除旧物理索引；复制或核对失败时解除源索引的写入阻断
+
+⚠️ --swap 期间源索引拒绝写入：导入/提取任务写入 ES 会直接报错，请在低峰期执行并暂停相关任务。
+   不带 --swap 时不阻断写入，复制期间的新写入不会进入新索引（核对数量会失败），仅用于预先验证。
+ES_MULTI_SOURCE_ROUTING 默认关闭（多信息源检索访问全部分片），迁移完成后再开启；单源检索始终按路由。
+
+使用方法：
+    python scripts/reindex_source_routing.py                                   # 仅检查
+    python scripts/reindex_source_routing.py --apply                           # 复制 + 核对
+    python scripts/reindex_source_routing.py --apply --swap --indices event_vectors  # 阻断写入 + 复制 + 切换
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dataflow.core.storage.documents import (
+    REGISTERED_DOCUMENTS,
+    build_index_definition,
+    get_vector_index_types,
+)
+from dataflow.core.storage.elasticsearch import ElasticsearchClient
+from dataflow.utils import get_logger
+
+logger = get_logger("scripts.reindex_source_routing")
+
+# 按信息源路由的索引
+DEFAULT_INDICES = ["event_vectors", "entity_vectors", "source_chunks"]
+
+# _reindex 分两轮复制，把路由键设为文档的 source_config_id（ctx._routing 为源文档的路由值）：
+# 先复制未路由的旧副本，再复制已路由的副本，同一 _id 的两份副本以后写入的路由副本覆盖旧副本
+UNROUTED_COPY_SCRIPT = {
+    "lang": "painless",
+    "source": (
+        "if (ctx._routing != null) { ctx.op = 'noop' } "
+        "else if (ctx._source.source_config_id != null) { ctx._routing = ctx._source.source_config_id }"
+    ),
+}
+ROUTED_COPY_SCRIPT = {
+    "lang": "painless",
+    "source": (
+        "if (ctx._routing == null) { ctx.op = 'noop' } "
+        "else if (ctx._source.source_config_id != null) { ctx._routing = ctx._source.source_config_id }"
+    ),
+}
+COPY_PASSES = [("未路由文档", UNROUTED_COPY_SCRIPT), ("已路由文档", ROUTED_COPY_SCRIPT)]
+
+# 单次检查统计的信息源上限
+MAX_SOURCES = 10000
+
+
+# 输出辅助函数
+def print_header(text: str) -> None:
+    """打印标题"""
+    print("\n" + "=" * 70)
+    print(f"  {text}")
+    print("=" * 70)
+
+
+def print_success(text: str) -> None:
+    """打印成功信息"""
+    print(f"  ✓ {text}")
+
+
+def print_info(text: str) -> None:
+    """打印普通信息"""
+    print(f"  • {text}")
+
+
+def print_warning(text: str) -> None:
+    """打印警告信息"""
+    print(f"  ⚠️  {text}")
+
+
+def print_error(text: str) -> None:
+    """打印错误信息"""
+    print(f"  ✗ {text}")
+
+
+def confirm_action(prompt: str) -> bool:
+    """请求用户确认"""
+    user_input = input(f"  {prompt} (输入 'yes' 确认): ").strip().lower()
+    return user_input == "yes"
+
+
+def find_document(index_name: str):
+    """根据索引名查找 Document 类"""
+    for document_cls in REGISTERED_DOCUMENTS:
+        if document_cls.Index.name == index_name:
+            return document_cls
+    raise ValueError(f"未注册的索引: {index_name}")
+
+
+async def check_routing(es_client: ElasticsearchClient, index: str) -> Dict[str, Dict[str, int]]:
+    """
+    检查索引中各信息源的文档是否都能被路由检索到
+
+    Returns:
+        存在未路由文档的信息源: {source_config_id: {"total": 总数, "routed": 路由可见数}}
+    """
+    response = await es_client.client.search(
+        index=index,
+        size=0,
+        aggs={"sources": {"terms": {"field": "source_config_id", "size": MAX_SOURCES}}},
+    )
+    buckets = response["aggregations"]["sources"]["buckets"]
+    if len(buckets) >= MAX_SOURCES:
+        print_warning(f"{index}: 信息源数达到统计上限 {MAX_SOURCES}，仅检查前 {MAX_SOURCES} 个")
+
+    mismatched: Dict[str, Dict[str, int]] = {}
+    for bucket in buckets:
+        source_config_id = bucket["key"]
+        routed = await es_client.count_documents(
+            index, query={"term": {"source_config_id": source_config_id}}, routing=source_config_id
+        )
+        if routed != bucket["doc_count"]:
+            mismatched[source_config_id] = {"total": bucket["doc_count"], "routed": routed}
+
+    total_docs = sum(bucket["doc_count"] for bucket in buckets)
+    unrouted = sum(item["total"] - item["routed"] for item in mismatched.values())
+    print_info(f"{index}: {len(buckets)} 个信息源，{total_docs} 个文档，路由不可见 {unrouted} 个")
+    for source_config_id, item in list(mismatched.items())[:10]:
+        print_warning(f"  {source_config_id}: 总数 {item['total']}，路由可见 {item['routed']}")
+    if len(mismatched) > 10:
+        print_warning(f"  ... 另有 {len(mismatched) - 10} 个信息源")
+    return mismatched
+
+
+async def wait_for_task(es_client: ElasticsearchClient, task_id: str, poll_interval: float) -> Dict[str, Any]:
+    """轮询 _reindex 任务直至完成"""
+    while True:
+        task = await es_client.client.tasks.get(task_id=task_id)
+        status = task["task"].get("status", {})
+        total = status.get("total", 0)
+        done = status.get("created", 0) + status.get("updated", 0)
+        if total:
+            print_info(f"进度: {done}/{total} ({done / total:.1%})")
+        if task.get("completed"):
+            return task
+        await asyncio.sleep(poll_interval)
+
+
+async def reindex_with_routing(
+    es_client: ElasticsearchClient,
+    index_name: str,
+    swap: bool,
+    poll_interval: float,
+    requests_per_second: Optional[float],
+) -> bool:
+    """
+    按信息源路由重建单个索引
+
+    swap=True 时复制前阻断源索引写入，切换成功后旧索引随之删除；失败时恢复写入
+
+    Returns:
+        是否成功
+    """
+    print_header(f"{index_name} → 按 source_config_id 路由")
+
+    physical_indices = await es_client.resolve_index(index_name)
+    if not physical_indices:
+        print_warning(f"{index_name}: 索引不存在，跳过")
+        return True
+    if len(physical_indices) > 1:
+        print_error(f"{index_name}: 别名指向多个物理索引 {physical_indices}，请先手动处理")
+        return False
+
+    source_index = physical_indices[0]
+    if not await check_routing(es_client, source_index):
+        print_success(f"{index_name}: 所有文档均已按信息源路由，无需迁移")
+        return True
+
+    # 保留当前向量索引类型（如已迁移为 int8_hnsw）
+    current_types = set(get_vector_index_types(await es_client.get_mapping(source_index)).values())
+    index_type = current_types.pop() if len(current_types) == 1 else None
+    _, mapping, settings = build_index_definition(find_document(index_name), index_type)
+    target_index = f"{index_name}__routed_{int(time.time())}"
+
+    # 1. 创建目标索引
+    await es_client.create_index(index=target_index, mappings=mapping, settings=settings)
+    print_success(f"{target_index}: 创建成功")
+
+    # 2. 服务端复制（--swap 时先阻断源索引写入，复制期间的写入不会遗漏）
+    if not swap:
+        if not await copy_with_routing(es_client, source_index, target_index, poll_interval, requests_per_second):
+            return False
+        print_info(f"未指定 --swap，新索引 {target_index} 保留待验证")
+        return True
+
+    await es_client.set_write_block(source_index, True)
+    print_warning(f"{source_index}: 已阻断写入（切换完成后由新索引接收写入）")
+    swapped = False
+    try:
+        if not await copy_with_routing(es_client, source_index, target_index, poll_interval, requests_per_second):
+            return False
+
+        # 4. 原子切换：原名 → 别名，同时删除旧物理索引
+        await es_client.replace_with_alias(index_name, source_index, target_index)
+        swapped = True
+    finally:
+        if not swapped:
+            await es_client.set_write_block(source_index, False)
+            print_info(f"{source_index}: 已恢复写入")
+
+    print_success(f"{index_name} 已指向 {target_index}")
+    logger.info(f"按信息源路由重建索引完成: {index_name} -> {target_index}")
+    return True
+
+
+async def copy_with_routing(
+    es_client: ElasticsearchClient,
+    source_index: str,
+    target_index: str,
+    poll_interval: float,
+    requests_per_second: Optional[float],
+) -> bool:
+    """
+    服务端 _reindex 复制（_routing = source_config_id），核对文档数量并复检路由
+
+    源索引中同一 _id 可能同时有未路由与已路由两份副本，目标索引只保留一份：
+    先复制未路由副本、再复制已路由副本，第二轮的 updated 数即重复副本数，核对时从源数量中扣除。
+    复制完成后刷新并重新统计源索引：复制期间源索引有新写入时数量不一致，判定失败
+
+    Returns:
+        复制成功、数量一致且均已路由
+    """
+    # 先刷新源索引：_reindex 只能读到已刷新的文档
+    await es_client.client.indices.refresh(index=source_index)
+    print_info(f"开始 _reindex: {await es_client.count_documents(source_index)} 个文档")
+
+    # 第二轮覆盖的文档即同一 _id 的未路由旧副本
+    duplicates = 0
+    for label, script in COPY_PASSES:
+        print_info(f"复制{label}")
+        reindex_kwargs: Dict[str, Any] = {
+            "source": {"index": source_index},
+            "dest": {"index": target_index},
+            "script": script,
+            "wait_for_completion": False,
+        }
+        if requests_per_second:
+            reindex_kwargs["requests_per_second"] = requests_per_second
+        response = await es_client.client.reindex(**reindex_kwargs)
+        task = await wait_for_task(es_client, response["task"], poll_interval)
+
+        result = task.get("response", {})
+        failures = result.get("failures") or []
+        if task.get("error") or failures:
+            print_error(f"_reindex 失败: {task.get('error') or failures[:3]}")
+            return False
+        duplicates += result.get("updated", 0)
+
+    if duplicates:
+        print_warning(f"{duplicates} 个 _id 同时存在未路由与已路由副本，已以路由副本为准")
+
+    # 3. 核对数量（复制完成后重新统计源索引）与路由
+    await es_client.client.indices.refresh(index=[source_index, target_index])
+    source_count = await es_client.count_documents(source_index)
+    target_count = await es_client.count_documents(target_index)
+    if target_count != source_count - duplicates:
+        print_error(
+            f"文档数量不一致: 源 {source_count}（其中重复副本 {duplicates}），目标 {target_count}"
+            f"（复制期间源索引有写入？）"
+        )
+        return False
+    if await check_routing(es_client, target_index):
+        print_error(f"{target_index}: 仍有未路由文档（缺少 source_config_id？），请检查后重试")
+        return False
+    print_success(f"复制完成，文档数量一致且均已路由: {target_count}")
+    return True
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="按信息源路由检查 / 重建索引")
+    parser.add_argument("--indices", nargs="+", default=DEFAULT_INDICES, help="需要处理的索引名")
+    parser.add_argument("--apply", action="store_true", help="重建存在未路由文档的索引")
+    parser.add_argument("--swap", action="store_true", help="复制完成后把原索引名切换到新索引（需 --apply）")
+    parser.add_argument("--yes", action="store_true", help="跳过确认")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="任务进度轮询间隔（秒）")
+    parser.add_argument("--requests-per-second", type=float, default=None, help="_reindex 限速")
+    args = parser.parse_args(argv)
+
+    if args.swap and not args.apply:
+        parser.error("--swap 需要与 --apply 一起使用")
+
+    es_client = None
+
+    try:
+        print_header("DataFlow 信息源路由检查 / 重建工具")
+        print_info(f"索引: {', '.join(args.indices)}")
+        if args.swap:
+            print_warning("--swap: 复制期间源索引拒绝写入（请暂停导入/提取任务），切换后删除旧物理索引")
+            if not args.yes and not confirm_action("确认继续?"):
+                print_info("操作已取消")
+                return
+
+        es_client = ElasticsearchClient()
+        if not await es_client.check_connection():
+            print_error("Elasticsearch 连接失败，请检查配置")
+            sys.exit(1)
+
+        results = {}
+        for index_name in args.indices:
+            try:
+                if args.apply:
+                    results[index_name] = await reindex_with_routing(
+                        es_client,
+                        index_name,
+                        args.swap,
+                        args.poll_interval,
+                        args.requests_per_second,
+                    )
+                else:
+                    print_header(f"检查 {index_name}")
+                    if not await es_client.index_exists(index_name):
+                        print_warning(f"{index_name}: 索引不存在，跳过")
+                        results[index_name] = True
+                        continue
+                    results[index_name] = not await check_routing(es_client, index_name)
+            except Exception as e:
+                print_error(f"{index_name}: 处理失败 - {e}")
+                logger.error(f"信息源路由处理失败: {index_name} - {e}", exc_info=True)
+                results[index_name] = False
+
+        print_header("操作总结")
+        for index_name, ok in results.items():
+            if args.apply:
+                (print_success if ok else print_error)(f"{index_name}: {'成功' if ok else '失败'}")
+            else:
+                (print_success if ok else print_warning)(
+                    f"{index_name}: {'已全部路由' if ok else '存在未路由文档，可使用 --apply 迁移'}"
+                )
+        if not all(results.values()):
+            sys.exit(1)
+
+    finally:
+        if es_client:
+            await es_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+深度研究子查询并发 / 结果复用测试
+
+备忘的查询与实体复用、作用域失效、子查询有界并发与按计划顺序合并（不依赖外部服务）
+
+运行方式:
+    pytest tests/agent/test_research_memo.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from dataflow.core.agent import ResearcherAgent, ResearchMemo
+
+
+def _event(event_id):
+    return SimpleNamespace(id=event_id)
+
+
+def _result(events, lines=None):
+    return {"events": events, "rerank_lines": lines or {}}
+
+
+def test_memo_reuses_normalized_query():
+    memo = ResearchMemo()
+    memo.record("OpenAI 融资", _result([_event("e1"), _event("e2")]))
+
+    events, source = memo.lookup("  openai  融资！")
+    assert [e.id for e in events] == ["e1", "e2"]
+    assert source == "query"
+    assert memo.lookup("别的问题") is None
+    assert memo.stats()["hits"] == 1 and memo.stats()["misses"] == 1
+
+
+def test_memo_reuses_entity_events_from_paths():
+    memo = ResearchMemo()
+    lines = {
+        "e1": [[{"query": {"text": "q"}}, {"entity": {"name": "Sam Altman", "type": "person", "hop": 1}}]],
+        "e2": [[{"entity": {"name": "sam altman", "type": "person", "hop": 1}}]],
+        "e9": [[{"entity": {"name": "未返回", "type": "topic", "hop": 1}}]],
+    }
+    memo.record("OpenAI 融资", _result([_event("e1"), _event("e2")], lines))
+
+    events, source = memo.lookup("Sam Altman")
+    assert [e.id for e in events] == ["e1", "e2"]
+    assert source == "entity"
+    # 未在最终结果中的事项不记录
+    assert memo.lookup("未返回") is None
+
+
+def test_memo_scope_change_clears():
+    memo = ResearchMemo()
+    memo.set_scope((("s1",), 10, 0.5))
+    memo.record("q", _result([_event("e1")]))
+    memo.set_scope((("s1",), 10, 0.5))
+    assert memo.lookup("q") is not None
+
+    memo.set_scope((("s1", "s2"), 10, 0.5))
+    assert memo.lookup("q") is None
+
+
+def _agent(search):
+    agent = ResearcherAgent.__new__(ResearcherAgent)
+    agent.research_memo = ResearchMemo()
+    agent._execute_search = search
+    return agent
+
+
+async def test_multi_query_search_bounded_and_ordered(monkeypatch):
+    from dataflow.core.config.settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "research_search_concurrency", 2)
+
+    running = 0
+    peak = 0
+    calls = []
+
+    async def search(query, keywords):
+        nonlocal running, peak
+        calls.append(query)
+        running += 1
+        peak = max(peak, running)
+        # 先提交的查询更晚完成
+        await asyncio.sleep(0.01 * (5 - len(calls)))
+        running -= 1
+        return _result([_event(f"{query}-1")])
+
+    agent = _agent(search)
+    events = await agent._execute_multi_query_search(["a", "b", "A", "c", "d"])
+
+    assert peak == 2
+    assert sorted(calls) == ["a", "b", "c", "d"]  # 规范化后重复的 "A" 只执行一次
+    assert [e.id for e in events] == ["a-1", "b-1", "c-1", "d-1"]
+
+    # 下一轮相同查询直接复用
+    calls.clear()
+    events = await agent._execute_multi_query_search(["b", "e"])
+    assert calls == ["e"]
+    assert [e.id for e in events] == ["b-1", "e-1"]
+
+
+async def test_multi_query_search_partial_failure():
+    async def search(query, keywords):
+        if query == "bad":
+            raise RuntimeError("boom")
+        return _result([_event(query)])
+
+    agent = _agent(search)
+    events = await agent._execute_multi_query_search(["ok", "bad"])
+    assert [e.id for e in events] == ["ok"]
+
+    with pytest.raises(RuntimeError):
+        await agent._execute_multi_query_search(["bad"])
@@ -0,0 +1,155 @@
+"""
+LLM 调度器测试
+
+优先级排队、429 降并发 + Retry-After、熔断、令牌桶（不依赖外部服务）
+
+运行方式:
+    pytest tests/ai/test_llm_governor.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from dataflow.core.ai.governor import (
+    LLMGovernor,
+    Priority,
+    TokenBucket,
+    parse_retry_after,
+)
+from dataflow.exceptions import LLMCircuitOpenError, LLMError, LLMRateLimitError
+
+
+class _ClientError(Exception):
+    status_code = 400
+
+
+async def test_priority_ordering():
+    governor = LLMGovernor("test", initial_concurrency=1, max_concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    async def holder():
+        async with governor.slot(Priority.NORMAL):
+            await release.wait()
+
+    async def call(name, priority):
+        async with governor.slot(priority):
+            order.append(name)
+
+    first = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(call("batch", Priority.BATCH)),
+        asyncio.create_task(call("normal", Priority.NORMAL)),
+        asyncio.create_task(call("chat", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert governor.stats()["waiting"] == 3
+
+    release.set()
+    await asyncio.gather(first, *tasks)
+    assert order == ["chat", "normal", "batch"]
+    assert governor.in_flight == 0
+
+
+async def test_rate_limit_halves_concurrency_and_pauses():
+    governor = LLMGovernor("test", initial_concurrency=8)
+
+    with pytest.raises(LLMRateLimitError):
+        async with governor.slot():
+            raise LLMRateLimitError("429", retry_after=0.2)
+
+    assert governor.limit == 4
+    assert governor.stats()["rate_limited"] == 1
+
+    start = time.monotonic()
+    async with governor.slot():
+        pass
+    assert time.monotonic() - start >= 0.15
+
+
+async def test_breaker_opens_and_probes():
+    governor = LLMGovernor("test", failure_threshold=2, breaker_cooldown=0.1)
+
+    for _ in range(2):
+        with pytest.raises(LLMError):
+            async with governor.slot():
+                raise LLMError("502")
+
+    with pytest.raises(LLMCircuitOpenError) as exc_info:
+        async with governor.slot():
+            pass
+    assert exc_info.value.retry_after > 0
+
+    await asyncio.sleep(0.12)
+    async with governor.slot():
+        pass
+    assert governor.stats()["breaker"] == "closed"
+
+
+async def test_cancelled_non_probe_waiter_keeps_probe():
+    """熔断关闭时放行、仍在排队的请求被取消，不释放半开状态下正在进行的探测名额"""
+    governor = LLMGovernor(
+        "test", initial_concurrency=1, max_concurrency=1, failure_threshold=1, breaker_cooldown=0.05
+    )
+    release = asyncio.Event()
+
+    async def call():
+        async with governor.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(call())
+    await asyncio.sleep(0)
+
+    # 熔断打开，冷却后由下一个请求占用探测名额（排在 waiter 之后等待槽位）
+    governor.breaker.record_failure()
+    await asyncio.sleep(0.06)
+    probe = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    assert governor.stats()["breaker"] == "half_open" and governor.stats()["waiting"] == 2
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    async def second_probe():
+        async with governor.slot():
+            pass
+
+    # 探测仍在进行，不放行第二个探测（被放行时会一直等待槽位）
+    with pytest.raises(LLMCircuitOpenError):
+        await asyncio.wait_for(second_probe(), timeout=1)
+
+    release.set()
+    await asyncio.gather(holder, probe)
+    assert governor.stats()["breaker"] == "closed"
+    assert governor.in_flight == 0
+
+
+async def test_client_errors_do_not_open_breaker():
+    governor = LLMGovernor("test", failure_threshold=1)
+
+    with pytest.raises(LLMError):
+        async with governor.slot():
+            raise LLMError("bad request") from _ClientError()
+
+    assert governor.stats()["breaker"] == "closed"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_wait():
+    bucket = TokenBucket(rate_per_minute=60, burst=2)
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert TokenBucket(0).reserve(1000) == 0
@@ -0,0 +1,200 @@
+"""
+结构化输出解析测试
+
+JSON 提取、按 schema 内容缓存校验器、流式增量校验与完整解析一致、不合法元素提前结束流式生成、
+提取 schema 复用（使用假 LLM 客户端，不依赖外部服务）
+
+运行方式:
+    pytest tests/ai/test_structured_output.py -v
+"""
+
+import copy
+import json
+import random
+
+import pytest
+
+from dataflow.core.ai import structured
+from dataflow.core.ai.base import BaseLLMClient
+from dataflow.core.ai.models import LLMProvider, LLMResponse, ModelConfig
+from dataflow.core.ai.structured import (
+    IncrementalJSONParser,
+    extract_json_text,
+    get_validator,
+    parse_structured,
+)
+from dataflow.exceptions import LLMError
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "type": {"type": "string", "const": "output"},
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "references": {"type": "array", "items": {"type": "integer"}, "minItems": 1},
+                },
+                "required": ["title", "references"],
+            },
+        },
+    },
+    "required": ["type", "items"],
+}
+
+
+def _document(count, bad_index=None):
+    items = [
+        {"title": f"事项 {i} \"引号\" \\ {{括号}} [数组]", "references": [i + 1]}
+        for i in range(count)
+    ]
+    if bad_index is not None:
+        items[bad_index]["references"] = []
+    return {"type": "output", "items": items}
+
+
+def _chunks(text, seed=0):
+    rng = random.Random(seed)
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 40)
+        yield text[pos:pos + size]
+        pos += size
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    structured.clear_validator_cache()
+    yield
+    structured.clear_validator_cache()
+
+
+def test_extract_json_text():
+    payload = '{"a": [1, 2]}'
+    assert extract_json_text(f"  {payload}\n") == payload
+    assert extract_json_text(f"结果如下：\n```json\n{payload}\n```\n以上") == payload
+    assert extract_json_text(f"```\n{payload}\n```") == payload
+    assert extract_json_text("[说明] 见下\n```json\n[1]\n```") == "[1]"
+    assert extract_json_text("not json") == "not json"
+
+
+def test_validator_cached_by_schema_content():
+    validator = get_validator(SCHEMA)
+    assert get_validator(SCHEMA) is validator
+    assert get_validator(copy.deepcopy(SCHEMA)) is validator
+    assert get_validator({**SCHEMA, "required": ["type"]}) is not validator
+
+
+def test_parse_structured_errors():
+    assert parse_structured(json.dumps(_document(3)), SCHEMA) == _document(3)
+
+    with pytest.raises(ValueError, match="位置: items/1/references"):
+        parse_structured(json.dumps(_document(3, bad_index=1)), SCHEMA)
+    with pytest.raises(json.JSONDecodeError):
+        parse_structured('{"type": "output", "items": [', SCHEMA)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_parser_matches_full_parse(seed):
+    document = _document(50)
+    text = "```json\n" + json.dumps(document, ensure_ascii=False, indent=seed % 2 or None) + "\n```"
+
+    parser = IncrementalJSONParser(SCHEMA)
+    for piece in _chunks(text, seed):
+        parser.feed(piece)
+
+    assert parser.validated == {"items": 50}
+    assert parser.finish() == document
+
+
+def test_incremental_parser_rejects_element_before_end():
+    text = json.dumps(_document(20, bad_index=3))
+    parser = IncrementalJSONParser(SCHEMA)
+    consumed = 0
+    with pytest.raises(ValueError, match=r"items\[3\]"):
+        for piece in _chunks(text):
+            consumed += len(piece)
+            parser.feed(piece)
+    assert consumed < len(text) // 2
+
+
+def test_incremental_parser_falls_back_to_full_validation():
+    # 顶层不是对象：不做流式校验，finish() 完整校验
+    parser = IncrementalJSONParser({"type": "array", "items": {"type": "integer"}})
+    parser.feed("[1, 2,")
+    parser.feed(" 3]")
+    assert parser.finish() == [1, 2, 3]
+
+    # 元素是原始值的数组：交给 finish() 校验
+    schema = {"type": "object", "properties": {"tags": {"type": "array", "items": {"type": "string"}}}}
+    parser = IncrementalJSONParser(schema)
+    parser.feed('{"tags": ["a", 1]}')
+    with pytest.raises(ValueError):
+        parser.finish()
+
+
+class FakeClient(BaseLLMClient):
+    """按片段返回预设响应的假客户端"""
+
+    def __init__(self, text):
+        super().__init__(ModelConfig(provider=LLMProvider.OPENAI, model="fake", api_key="sk"))
+        self.text = text
+        self.streamed = 0
+        self.closed = False
+        self.chat_calls = 0
+
+    async def chat(self, messages, temperature=None, max_tokens=None, **kwargs):
+        self.chat_calls += 1
+        return LLMResponse(content=self.text, model="fake")
+
+    async def chat_stream(self, messages, temperature=None, max_tokens=None, include_reasoning=False, **kwargs):
+        try:
+            for piece in _chunks(self.text):
+                self.streamed += len(piece)
+                yield piece, None
+        finally:
+            self.closed = True
+
+
+async def test_chat_with_schema_paths():
+    document = _document(10)
+    client = FakeClient("```json\n" + json.dumps(document) + "\n```")
+
+    assert await client.chat_with_schema([], response_schema=SCHEMA, streaming=False) == document
+    assert client.chat_calls == 1
+
+    assert await client.chat_with_schema([], response_schema=SCHEMA, streaming=True) == document
+    assert client.chat_calls == 1 and client.closed
+
+
+async def test_streaming_stops_on_invalid_element():
+    client = FakeClient(json.dumps(_document(40, bad_index=2)))
+
+    with pytest.raises(LLMError, match="不符合Schema"):
+        await client.chat_with_schema([], response_schema=SCHEMA, streaming=True)
+    assert client.closed
+    assert client.streamed < len(client.text) // 4
+
+
+def test_extraction_schema_reused_until_entity_types_change():
+    from types import SimpleNamespace
+
+    from dataflow.modules.extract.config import ExtractConfig
+    from dataflow.modules.extract.processor import EventProcessor
+
+    processor = EventProcessor(
+        llm_client=None,
+        prompt_manager=None,
+        config=ExtractConfig(source_config_id="s", chunk_ids=["c"]),
+    )
+    processor.entity_types = [SimpleNamespace(type="person"), SimpleNamespace(type="org")]
+    schema = processor._build_extraction_schema()
+    assert processor._build_extraction_schema() is schema
+    assert get_validator(schema) is get_validator(processor._build_extraction_schema())
+
+    processor.entity_types = [SimpleNamespace(type="person")]
+    changed = processor._build_extraction_schema()
+    assert changed is not schema
+    assert changed["properties"]["items"]["items"]["properties"]["entities"]["items"]["properties"]["type"]["enum"] == ["person"]
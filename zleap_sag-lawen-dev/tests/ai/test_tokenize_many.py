@@ -0,0 +1,115 @@
+"""
+批量分词测试
+
+tokenize_many 与逐条分词结果一致（jieba + spaCy 实体合并 / 快速模式）、jieba 进程池分词、
+进程池异常回退（spaCy 使用 blank 模型 + 实体规则，不依赖 en_core_web_sm）
+
+运行方式:
+    pytest tests/ai/test_tokenize_many.py -v
+"""
+
+import re
+
+import pytest
+
+jieba = pytest.importorskip("jieba")
+spacy = pytest.importorskip("spacy")
+
+from dataflow.core.ai import tokensize
+from dataflow.core.ai.tokensize import MixedTokenizer
+from dataflow.core.config import get_settings
+
+TEXTS = [
+    "我喜欢用Python编程",
+    "Were Scott Derrickson and Ed Wood of the same nationality?",
+    "特斯拉CEO Elon Musk宣布推出Cybertruck电动皮卡，这是特斯拉最具创新性的产品。",
+    "",
+    "   ",
+    "纯中文文本没有英文",
+    "2024年Q3营收 12.5 亿元, up 30% YoY",
+]
+
+
+@pytest.fixture
+def tokenizer():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "PERSON", "pattern": "Scott Derrickson"},
+        {"label": "PERSON", "pattern": "Ed Wood"},
+        {"label": "PERSON", "pattern": "Elon Musk"},
+    ])
+    instance = MixedTokenizer()
+    instance._nlp_en = nlp
+    instance._spacy_loaded = True
+    return instance
+
+
+def _reference_tokenize(nlp, text, fast_mode):
+    """逐条分词的参考实现（每个片段单独调用 jieba / nlp）"""
+    segments = []
+    last_end = 0
+    for match in re.finditer(r"[^\u4e00-\u9fa5]+", text):
+        start, end = match.start(), match.end()
+        if start > last_end:
+            segments.extend(jieba.lcut(text[last_end:start]))
+        english = text[start:end].strip()
+        if english:
+            if fast_mode:
+                segments.extend(english.split())
+            else:
+                doc = nlp(english)
+                pos = 0
+                for ent in doc.ents:
+                    if ent.start_char > pos:
+                        segments.extend(t.text for t in nlp(english[pos:ent.start_char]) if t.text.strip())
+                    segments.append(ent.text)
+                    pos = ent.end_char
+                if pos < len(english):
+                    segments.extend(t.text for t in nlp(english[pos:]) if t.text.strip())
+        last_end = end
+    if last_end < len(text):
+        segments.extend(jieba.lcut(text[last_end:]))
+    return [seg for seg in segments if seg.strip()]
+
+
+@pytest.mark.parametrize("fast_mode", [False, True])
+def test_tokenize_many_matches_single_text_path(tokenizer, fast_mode):
+    expected = [_reference_tokenize(tokenizer._nlp_en, text, fast_mode) for text in TEXTS]
+
+    assert tokenizer.tokenize_many(TEXTS, fast_mode=fast_mode) == expected
+    assert [tokenizer.tokenize(text, fast_mode=fast_mode) for text in TEXTS] == expected
+    assert tokenizer.tokenize_many([]) == []
+
+    if not fast_mode:
+        assert "Scott Derrickson" in expected[1]
+        assert "Elon Musk" in expected[2]
+
+
+def test_jieba_pool_gives_identical_results(tokenizer, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "tokenizer_pool_workers", 1)
+    monkeypatch.setattr(settings, "tokenizer_pool_min_chars", 0)
+
+    texts = TEXTS * 5
+    expected = [_reference_tokenize(tokenizer._nlp_en, text, True) for text in texts]
+    try:
+        assert tokenizer.tokenize_many(texts, fast_mode=True) == expected
+        assert tokensize._jieba_pool is not None
+    finally:
+        tokensize.shutdown_tokenizer_pool()
+    assert tokensize._jieba_pool is None
+
+
+def test_pool_failure_falls_back_to_in_process(tokenizer, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "tokenizer_pool_workers", 2)
+    monkeypatch.setattr(settings, "tokenizer_pool_min_chars", 0)
+
+    def broken_pool(workers):
+        raise OSError("cannot start worker")
+
+    monkeypatch.setattr(tokensize, "_get_jieba_pool", broken_pool)
+
+    expected = [_reference_tokenize(tokenizer._nlp_en, text, True) for text in TEXTS]
+    assert tokenizer.tokenize_many(TEXTS, fast_mode=True) == expected
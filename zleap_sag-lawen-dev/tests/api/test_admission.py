@@ -0,0 +1,91 @@
+"""
+准入控制测试
+
+并发上限、信息源上限、有界队列、排队超时、503 + Retry-After（不依赖外部服务）
+
+运行方式:
+    pytest tests/api/test_admission.py -v
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from dataflow.api.admission import AdmissionController
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.exceptions import ServiceOverloadedError
+
+
+async def test_queue_then_admit_in_order():
+    controller = AdmissionController("t_order", max_concurrency=1, queue_size=4, queue_timeout=1.0)
+    first = await controller.acquire(["s1"])
+
+    order = []
+
+    async def waiter(name):
+        ticket = await controller.acquire(["s1"])
+        order.append(name)
+        ticket.release()
+
+    tasks = [asyncio.create_task(waiter(n)) for n in ("a", "b")]
+    await asyncio.sleep(0)
+    assert controller.stats()["waiting"] == 2
+
+    first.release()
+    first.release()  # 重复释放无副作用
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b"]
+    assert controller.in_flight == 0 and controller.per_source == {}
+
+
+async def test_queue_full_and_timeout_reject():
+    controller = AdmissionController("t_reject", max_concurrency=1, queue_size=1, queue_timeout=0.05, retry_after=3)
+    ticket = await controller.acquire()
+
+    queued = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceOverloadedError) as exc_info:
+        await controller.acquire()
+    assert exc_info.value.retry_after == 3
+
+    with pytest.raises(ServiceOverloadedError):
+        await queued
+    assert controller.stats()["waiting"] == 0
+
+    rejected = get_metrics_registry().counter("dataflow_admission_rejected", "", ["endpoint", "reason"])
+    assert rejected.value(endpoint="t_reject", reason="queue_full") == 1
+    assert rejected.value(endpoint="t_reject", reason="timeout") == 1
+    ticket.release()
+
+
+async def test_per_source_limit_does_not_block_other_sources():
+    controller = AdmissionController("t_source", max_concurrency=4, per_source_concurrency=1, queue_timeout=1.0)
+    hot = await controller.acquire(["hot"])
+
+    blocked = asyncio.create_task(controller.acquire(["hot"]))
+    await asyncio.sleep(0)
+    other = await controller.acquire(["cold"])
+    assert not blocked.done()
+
+    hot.release()
+    (await blocked).release()
+    other.release()
+    assert controller.in_flight == 0
+
+
+def test_overloaded_handler_returns_503_with_retry_after():
+    from dataflow.api.main import overloaded_exception_handler
+
+    app = FastAPI()
+    app.add_exception_handler(ServiceOverloadedError, overloaded_exception_handler)
+
+    @app.get("/busy")
+    async def busy():
+        raise ServiceOverloadedError("busy", retry_after=5)
+
+    response = TestClient(app).get("/busy")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["error"]["code"] == "SERVICE_OVERLOADED"
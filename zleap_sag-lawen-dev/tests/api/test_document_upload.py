@@ -0,0 +1,149 @@
+"""
+文档流式上传测试
+
+分块落盘与 SHA-256、大小上限（提前拒绝 / 流式中止并清理）、批量并发落盘、
+并发重复上传由唯一索引去重（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/api/test_document_upload.py -v
+"""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from dataflow.api.services.document_service import DocumentService, save_upload_stream
+from dataflow.core.config.settings import get_settings
+from dataflow.exceptions import DuplicateDocumentError, UploadTooLargeError
+
+
+def _upload(data: bytes, name: str = "doc.md", size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=name, size=size)
+
+
+async def test_stream_hashes_and_writes_in_chunks(tmp_path):
+    data = b"0123456789" * 1000
+    target = tmp_path / "a.md"
+
+    size, digest = await save_upload_stream(_upload(data), target, chunk_size=333)
+
+    assert size == len(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert target.read_bytes() == data
+
+
+async def test_stream_rejects_oversized_and_cleans_up(tmp_path):
+    target = tmp_path / "big.md"
+    with pytest.raises(UploadTooLargeError):
+        await save_upload_stream(_upload(b"x" * 5000), target, max_size=4096, chunk_size=1024)
+    assert not target.exists()
+
+    # 已知大小时不读取内容直接拒绝
+    file = _upload(b"y" * 5000, size=5000)
+    with pytest.raises(UploadTooLargeError):
+        await save_upload_stream(file, tmp_path / "known.md", max_size=4096)
+    assert file.file.tell() == 0
+    assert not (tmp_path / "known.md").exists()
+
+
+async def test_upload_documents_saves_concurrently_and_isolates_failures(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "max_upload_size", 100)
+    monkeypatch.setattr(settings, "upload_concurrency", 2)
+
+    service = DocumentService(db=None)
+    registered = []
+
+    async def register(source_config_id, stored, background=None, auto_process=True):
+        registered.append(stored)
+        return stored
+
+    monkeypatch.setattr(service, "register_upload", register)
+
+    files = [_upload(b"a" * 10, "a.md"), _upload(b"b" * 500, "b.md"), _upload(b"c" * 20, "c.txt")]
+    results = await service.upload_documents("src-1", files)
+
+    assert [r.filename for r in results if not isinstance(r, Exception)] == ["a.md", "c.txt"]
+    assert isinstance(results[1], UploadTooLargeError)
+    assert [s.content_hash for s in registered] == [
+        hashlib.sha256(b"a" * 10).hexdigest(),
+        hashlib.sha256(b"c" * 20).hexdigest(),
+    ]
+    assert sorted(p.suffix for p in (tmp_path / "src-1").iterdir()) == [".md", ".txt"]
+
+
+async def test_concurrent_duplicate_returns_existing_document(tmp_path, monkeypatch, sqlite_session_factory):
+    """两个请求同时通过去重检查时，唯一索引拒绝后写入的一方并返回已存在的文档"""
+    from sqlalchemy.schema import CreateIndex
+
+    from dataflow.db import Article, SourceConfig
+
+    async with sqlite_session_factory() as session:
+        (index,) = [i for i in Article.__table__.indexes if i.name == "uk_source_config_content_hash"]
+        await session.execute(CreateIndex(index))
+        session.add(SourceConfig(id="src-1", name="信息源"))
+        await session.commit()
+
+    monkeypatch.setattr(get_settings(), "upload_dir", str(tmp_path))
+    data = b"same content"
+
+    async with sqlite_session_factory() as first_db, sqlite_session_factory() as second_db:
+        first, second = DocumentService(first_db), DocumentService(second_db)
+        first_stored = await first.save_upload("src-1", _upload(data))
+        second_stored = await second.save_upload("src-1", _upload(data))
+
+        # 第二个请求的去重检查发生在第一个请求提交之前
+        lookups = []
+        original_find = second._find_duplicate
+
+        async def racing_find(source_config_id, content_hash):
+            lookups.append(content_hash)
+            return None if len(lookups) == 1 else await original_find(source_config_id, content_hash)
+
+        monkeypatch.setattr(second, "_find_duplicate", racing_find)
+
+        created = await first.register_upload("src-1", first_stored, auto_process=False)
+        with pytest.raises(DuplicateDocumentError) as exc_info:
+            await second.register_upload("src-1", second_stored, auto_process=False)
+
+    assert exc_info.value.article_id == created.article_id
+    assert len(lookups) == 2
+    assert first_stored.file_path.exists() and not second_stored.file_path.exists()
+
+
+async def test_reupload_after_delete_before_purge(tmp_path, monkeypatch, sqlite_session_factory):
+    """文档删除后、后台清理完成前重新上传相同内容：不返回 409，唯一索引也不阻止插入"""
+    from sqlalchemy.schema import CreateIndex
+
+    from dataflow.api.services import purge_service
+    from dataflow.api.services.purge_service import PurgeService
+    from dataflow.db import Article, SourceConfig
+
+    async def no_bump(source_config_id):
+        return None
+
+    monkeypatch.setattr(purge_service, "bump_source_version", no_bump)
+    async with sqlite_session_factory() as session:
+        (index,) = [i for i in Article.__table__.indexes if i.name == "uk_source_config_content_hash"]
+        await session.execute(CreateIndex(index))
+        session.add(SourceConfig(id="src-1", name="信息源"))
+        await session.commit()
+
+    monkeypatch.setattr(get_settings(), "upload_dir", str(tmp_path))
+    data = b"same content"
+
+    async with sqlite_session_factory() as db:
+        service = DocumentService(db)
+        first = await service.upload_document("src-1", _upload(data), auto_process=False)
+        await PurgeService(db).start_document_purge(first.article_id)
+
+        second = await service.upload_document("src-1", _upload(data), auto_process=False)
+        assert second.article_id != first.article_id
+
+        # 新文档重新参与去重
+        with pytest.raises(DuplicateDocumentError) as exc_info:
+            await service.upload_document("src-1", _upload(data), auto_process=False)
+        assert exc_info.value.article_id == second.article_id
@@ -0,0 +1,219 @@
+"""
+信息源 / 文档后台分批清理测试
+
+软删除即时生效（删除中的文档在清理完成前对搜索不可见）、分批删除 MySQL 行与 ES 文档、
+进度写入 Task、中断后续跑（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/api/test_purge.py -v
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.api.services import purge_service
+from dataflow.api.services.purge_service import PurgeService, run_purge_task
+from dataflow.db import (
+    Article,
+    ArticleSection,
+    Entity,
+    EntityType,
+    EventEntity,
+    SourceConfig,
+    SourceEvent,
+    Task,
+    get_deleting_article_ids,
+)
+from dataflow.db.soft_delete import get_deleted_source_ids, reset_deleted_sources
+from dataflow.modules.search.config import SearchConfig
+from dataflow.modules.search.expand import ExpandSearcher
+from dataflow.modules.search.filters import es_event_filters, filter_event_ids
+from dataflow.modules.search.searcher import SAGSearcher
+from dataflow.utils import get_logger
+
+
+class FakeES:
+    """按 term 过滤、max_docs 分批删除的假 ES"""
+
+    def __init__(self, docs):
+        self.docs = docs  # {index: [doc, ...]}
+        self.calls = 0
+
+    async def delete_by_query(self, index, query, max_docs, **kwargs):
+        self.calls += 1
+        field, value = next(iter(query["term"].items()))
+        docs = self.docs.get(index, [])
+        matched = [d for d in docs if d.get(field) == value][:max_docs]
+        self.docs[index] = [d for d in docs if d not in matched]
+        return {"deleted": len(matched)}
+
+
+@pytest.fixture
+async def session_factory(sqlite_session_factory, monkeypatch):
+    async def no_bump(source_config_id):
+        return None
+
+    monkeypatch.setattr(purge_service, "bump_source_version", no_bump)
+    reset_deleted_sources()
+    yield sqlite_session_factory
+    reset_deleted_sources()
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+async def _seed(factory, source_id, articles=2, events_per_article=5):
+    async with factory() as session:
+        session.add(SourceConfig(id=source_id, name=f"src-{source_id[:4]}"))
+        entity_type = EntityType(id=_id(), source_config_id=source_id, type="person", name="人物")
+        session.add(entity_type)
+        entity = Entity(
+            id=_id(), source_config_id=source_id, entity_type_id=entity_type.id,
+            type="person", name="张三", normalized_name="张三",
+        )
+        session.add(entity)
+        article_ids = []
+        for a in range(articles):
+            article = Article(id=_id(), source_config_id=source_id, title=f"a{a}", status="COMPLETED")
+            article_ids.append(article.id)
+            session.add(article)
+            session.add(ArticleSection(
+                id=_id(), article_id=article.id, rank=0, order_index=0, heading="h", content="c", length=1,
+            ))
+            for e in range(events_per_article):
+                event = SourceEvent(
+                    id=_id(), source_config_id=source_id, source_type="ARTICLE", source_id=article.id,
+                    article_id=article.id, title=f"e{e}", summary="s", content="c",
+                )
+                session.add(event)
+                session.add(EventEntity(id=_id(), event_id=event.id, entity_id=entity.id))
+        await session.commit()
+    return article_ids
+
+
+async def _count(factory, model, *where):
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(model).where(*where))).scalar()
+
+
+async def test_source_purge_soft_deletes_then_removes_in_batches(session_factory):
+    source_id, other_id = _id(), _id()
+    await _seed(session_factory, source_id)
+    await _seed(session_factory, other_id, articles=1)
+    es = FakeES({
+        "event_vectors": [{"id": i, "source_config_id": source_id} for i in range(7)]
+        + [{"id": 7, "source_config_id": other_id}],
+        "entity_vectors": [{"id": 0, "source_config_id": source_id}],
+    })
+
+    async with session_factory() as session:
+        task_id = await PurgeService(session).start_source_purge(source_id)
+        # 重复删除返回同一任务
+        assert await PurgeService(session).start_source_purge(source_id) == task_id
+
+    # 软删除立即对搜索不可见
+    assert source_id in await get_deleted_source_ids()
+
+    assert await run_purge_task(task_id, session_factory=session_factory, es_client=es, batch_size=3, es_batch_size=3)
+
+    assert await _count(session_factory, SourceConfig, SourceConfig.id == source_id) == 0
+    assert await _count(session_factory, SourceEvent, SourceEvent.source_config_id == source_id) == 0
+    assert await _count(session_factory, Article, Article.source_config_id == source_id) == 0
+    assert await _count(session_factory, EventEntity) == 5  # 只剩其他信息源的关联
+    assert await _count(session_factory, SourceEvent, SourceEvent.source_config_id == other_id) == 5
+    assert es.docs["event_vectors"] == [{"id": 7, "source_config_id": other_id}]
+    assert es.calls >= 4  # 7 条按每批 3 条删除
+
+    async with session_factory() as session:
+        task = await session.get(Task, task_id)
+        assert task.status == "completed"
+        assert float(task.progress) == 100.0
+        assert task.result["deleted"]["source_event"] == 10
+        assert task.result["deleted"]["es:event_vectors"] == 7
+
+    # 已完成的任务不会被再次执行
+    assert not await run_purge_task(task_id, session_factory=session_factory, es_client=es)
+
+
+async def test_purge_resumes_from_recorded_step(session_factory, monkeypatch):
+    source_id = _id()
+    article_ids = await _seed(session_factory, source_id)
+
+    async with session_factory() as session:
+        task_id = await PurgeService(session).start_document_purge(article_ids[0])
+        article = await session.get(Article, article_ids[0])
+        assert article.status == "DELETING"
+
+    # 第一次执行在删除文章片段时中断
+    original = purge_service._purge_db_step
+
+    async def failing(session, step, target_id, batch_size):
+        if step.name == "article_section":
+            raise RuntimeError("connection lost")
+        async for count in original(session, step, target_id, batch_size):
+            yield count
+
+    monkeypatch.setattr(purge_service, "_purge_db_step", failing)
+    assert not await run_purge_task(task_id, session_factory=session_factory, es_client=FakeES({}), batch_size=2)
+
+    async with session_factory() as session:
+        task = await session.get(Task, task_id)
+        assert task.status == "failed"
+        names = [s.name for s in purge_service.DOCUMENT_PURGE_STEPS]
+        assert task.extra_data["step"] == names.index("article_section")
+        assert task.extra_data["deleted"]["source_event"] == 5
+        # 失败的任务重置为待执行后续跑
+        task.status = "pending"
+        await session.commit()
+
+    monkeypatch.setattr(purge_service, "_purge_db_step", original)
+    assert await run_purge_task(task_id, session_factory=session_factory, es_client=FakeES({}), batch_size=2)
+
+    assert await _count(session_factory, Article, Article.id == article_ids[0]) == 0
+    assert await _count(session_factory, Article, Article.id == article_ids[1]) == 1
+    assert await _count(session_factory, SourceEvent, SourceEvent.article_id == article_ids[1]) == 5
+    assert await _count(session_factory, Entity) == 1
+
+
+async def test_deleting_document_hidden_from_search_before_purge(session_factory):
+    """文档删除后、后台清理前：召回 / 扩展的事项查询与 ES 过滤都排除该文档"""
+    source_id = _id()
+    deleted, kept = await _seed(session_factory, source_id)
+    async with session_factory() as session:
+        events = {e.id: e for e in (await session.execute(select(SourceEvent))).scalars().all()}
+        entity_id = (await session.execute(select(Entity.id))).scalar_one()
+        await PurgeService(session).start_document_purge(deleted)
+
+    assert await get_deleting_article_ids([source_id]) == {deleted}
+    assert await get_deleting_article_ids([_id()]) == set()
+
+    searcher = SAGSearcher.__new__(SAGSearcher)
+    searcher.logger = get_logger("search.searcher")
+    config = SearchConfig(query="q", source_config_id=source_id)
+    await searcher._exclude_deleted_documents(config)
+    assert config.filters.exclude_article_ids == [deleted]
+
+    kept_events = {event_id for event_id, e in events.items() if e.article_id == kept}
+    assert await filter_event_ids(config, session_factory, events) == kept_events
+
+    es_filters, exact = await es_event_filters(config, session_factory)
+    assert exact and es_filters == [{"bool": {"must_not": {"terms": {"source_id": [deleted]}}}}]
+
+    expand = ExpandSearcher.__new__(ExpandSearcher)
+    expand.session_factory = session_factory
+    expand.logger = get_logger("search.expand")
+    assert set(await expand._step1_keys_to_events([entity_id], [source_id], config)) == kept_events
+
+    # 段落等未经事项过滤的结果在返回前兜底移除
+    response = {
+        "events": list(events.values()),
+        "sections": [{"source_id": deleted}, {"source_id": kept}],
+    }
+    searcher._drop_deleted_documents(config, response)
+    assert {e.id for e in response["events"]} == kept_events
+    assert response["sections"] == [{"source_id": kept}]
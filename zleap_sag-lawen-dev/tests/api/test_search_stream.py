@@ -0,0 +1,107 @@
+"""
+流式搜索测试
+
+阶段事件按序推送（召回候选 → 每跳扩展 → 重排 → 最终结果）、客户端断开时取消剩余阶段（不依赖外部服务）
+
+运行方式:
+    pytest tests/api/test_search_stream.py -v
+"""
+
+import asyncio
+import contextlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from dataflow.api.routers import pipeline
+from dataflow.api.routers.pipeline import SearchRequest
+
+
+class FakeEngine:
+    """按阶段推送进度的假引擎（hang=True 时在召回后挂起，模拟耗时的扩展/重排）"""
+
+    hang = False
+    cancelled = False
+
+    def __init__(self, source_config_id):
+        self.source_config_id = source_config_id
+
+    async def search_async(self, config):
+        await config.emit_progress({
+            "type": "recall",
+            "entities": [{"id": "k1", "name": "张三", "type": "person", "weight": 1.0}],
+            "candidates": [{"id": "e1", "title": "t1", "summary": "s1", "score": 0.9}],
+        })
+        if FakeEngine.hang:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                FakeEngine.cancelled = True
+                raise
+        for jump in (1, 2):
+            await config.emit_progress({"type": "expand", "jump": jump, "keys_count": jump * 3})
+        await config.emit_progress({"type": "rerank", "count": 1})
+
+    def get_result(self):
+        return SimpleNamespace(search_result=SimpleNamespace(status="success"))
+
+
+@pytest.fixture(autouse=True)
+def fake_search(monkeypatch):
+    async def build_response(result, db, projection=None):
+        return {"events": [{"id": "e1", "title": "t1"}]}
+
+    @contextlib.asynccontextmanager
+    async def session():
+        yield None
+
+    FakeEngine.hang = False
+    FakeEngine.cancelled = False
+    monkeypatch.setattr(pipeline, "DataFlowEngine", FakeEngine)
+    monkeypatch.setattr(pipeline, "_build_search_response", build_response)
+    monkeypatch.setattr(pipeline, "get_read_session_factory", lambda: session)
+
+
+def _events(text):
+    return [json.loads(line[len("data: "):]) for line in text.split("\n\n") if line.startswith("data: ")]
+
+
+def test_stream_emits_stages_in_order():
+    app = FastAPI()
+    app.include_router(pipeline.router, prefix="/api/v1")
+
+    response = TestClient(app).post(
+        "/api/v1/pipeline/search/stream", json={"source_config_id": "s1", "query": "张三"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [e["type"] for e in events] == ["recall", "expand", "expand", "rerank", "result", "done"]
+    assert events[0]["candidates"][0]["score"] == 0.9
+    assert [e["jump"] for e in events if e["type"] == "expand"] == [1, 2]
+    assert events[4]["data"]["events"][0]["id"] == "e1"
+
+
+async def test_closing_stream_cancels_remaining_stages():
+    FakeEngine.hang = True
+    response = await pipeline.run_search_stream(SearchRequest(source_config_id="s1", query="张三"))
+    stream = response.body_iterator
+
+    first = await stream.__anext__()
+    assert json.loads(first[len("data: "):])["type"] == "recall"
+
+    # 客户端断开：Starlette 关闭生成器
+    await stream.aclose()
+    assert FakeEngine.cancelled
+
+
+def test_missing_source_is_rejected():
+    app = FastAPI()
+    app.include_router(pipeline.router, prefix="/api/v1")
+
+    response = TestClient(app).post("/api/v1/pipeline/search/stream", json={"query": "张三"})
+    assert response.status_code == 400
@@ -0,0 +1,99 @@
+"""
+纯 ASGI 中间件与启动预热测试
+
+耗时响应头与指标、每请求单行日志、流式响应直通、预热步骤失败/超时隔离、/ready 就绪切换（不依赖外部服务）
+
+运行方式:
+    pytest tests/api/test_warmup.py -v
+"""
+
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from dataflow.api.middleware import LoggingMiddleware, TimingMiddleware
+from dataflow.api.warmup import WarmupState, run_warmup
+from dataflow.core.telemetry import get_metrics_registry
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def gen():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(gen(), media_type="text/event-stream")
+
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(LoggingMiddleware)
+    return app
+
+
+def test_middleware_sets_header_records_route_and_logs_once(caplog):
+    client = TestClient(_app())
+
+    with caplog.at_level(logging.INFO):
+        response = client.get("/items/42")
+
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+    lines = [r for r in caplog.records if r.name == "dataflow.api.middleware"]
+    assert len(lines) == 1
+    assert "200" in lines[0].getMessage()
+
+    # 指标按路由模板聚合
+    rendered = get_metrics_registry().render()
+    assert 'route="/items/{item_id}"' in rendered
+
+    streamed = client.get("/stream")
+    assert streamed.status_code == 200
+    assert streamed.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert "X-Process-Time" in streamed.headers
+
+
+async def test_warmup_isolates_failing_and_slow_steps():
+    calls = []
+
+    async def ok():
+        calls.append("ok")
+
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    state = WarmupState()
+    await run_warmup(state, steps=[("slow", slow), ("broken", broken), ("ok", ok)], timeout=0.05)
+
+    assert state.ready
+    assert calls == ["ok"]
+    assert state.steps["slow"]["status"] == "timeout"
+    assert state.steps["broken"] == {"status": "failed", "error": "refused", "duration": state.steps["broken"]["duration"]}
+    assert state.steps["ok"]["status"] == "ok"
+    assert state.to_dict()["status"] == "ready"
+
+
+def test_ready_endpoint_flips_after_warmup():
+    from dataflow.api.main import app
+
+    client = TestClient(app)
+    app.state.warmup = WarmupState()
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    app.state.warmup.ready = True
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -0,0 +1,235 @@
+"""
+搜索结果缓存测试
+
+只使用内存层（共享版本号使用内存中的假 Redis），不依赖 Redis / MySQL / ES
+
+运行方式:
+    pytest tests/cache/test_search_cache.py -v
+"""
+
+import pytest
+
+from dataflow.core.cache import search_cache as search_cache_module
+from dataflow.core.cache.search_cache import (
+    SearchResultCache,
+    hash_config_payload,
+    normalize_query,
+)
+from dataflow.core.storage import redis as redis_module
+from dataflow.db import SourceEvent
+from dataflow.modules.search import searcher as searcher_module
+from dataflow.modules.search.searcher import SAGSearcher
+from dataflow.utils import get_logger
+
+
+class FakeRedis:
+    """进程间共享的版本号存储（只实现搜索缓存用到的接口）"""
+
+    def __init__(self):
+        self.values = {}
+        self.down = False
+        self.client = self
+
+    async def mget(self, keys):
+        if self.down:
+            raise ConnectionError("redis down")
+        return [self.values.get(key) for key in keys]
+
+    async def incr(self, key, amount=1):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.values[key] = self.values.get(key, 0) + amount
+        return self.values[key]
+
+    async def set(self, key, value, expire=None):
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_module, "get_redis_client", lambda: fake)
+    return fake
+
+
+def test_normalize_query():
+    """全角、大小写和空白差异归一到同一 query"""
+    assert normalize_query("  AI   Agent ") == "ai agent"
+    assert normalize_query("ＡＩ\tagent") == "ai agent"
+
+
+def test_config_hash_is_order_independent():
+    """字段顺序不同的等价配置得到同一哈希"""
+    a = {"recall": {"max_entities": 25, "vector_top_k": 40}, "return_type": "event"}
+    b = {"return_type": "event", "recall": {"vector_top_k": 40, "max_entities": 25}}
+    assert hash_config_payload(a) == hash_config_payload(b)
+    assert hash_config_payload(a) != hash_config_payload({**a, "return_type": "paragraph"})
+
+
+async def test_hit_and_miss():
+    cache = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, shared_versions=False)
+    key = await cache.build_key("人工智能", {"k": 1}, ["s1", "s2"])
+
+    assert await cache.get(key) == (None, None)
+
+    await cache.set(key, {"events": ["e1"]}, ["s1", "s2"])
+    value, tier = await cache.get(key)
+    assert value == {"events": ["e1"]}
+    assert tier == "memory"
+
+    # source 顺序不影响键
+    assert await cache.build_key("人工智能 ", {"k": 1}, ["s2", "s1"]) == key
+    assert cache.stats()["hits"] == 1
+
+
+async def test_version_bump_invalidates_source():
+    cache = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, shared_versions=False)
+    key_s1 = await cache.build_key("q", {}, ["s1"])
+    key_s2 = await cache.build_key("q", {}, ["s2"])
+    await cache.set(key_s1, "r1", ["s1"])
+    await cache.set(key_s2, "r2", ["s2"])
+
+    await cache.bump_version("s1")
+
+    # 旧条目被主动清理，新键不同
+    assert await cache.get(key_s1) == (None, None)
+    assert await cache.build_key("q", {}, ["s1"]) != key_s1
+    # 其他数据源不受影响
+    assert (await cache.get(key_s2))[0] == "r2"
+
+
+async def test_lru_and_ttl_eviction():
+    cache = SearchResultCache(max_entries=2, ttl=60, redis_enabled=False, shared_versions=False)
+    for i in range(3):
+        await cache.set(f"k{i}", i, ["s"])
+    assert await cache.get("k0") == (None, None)
+    assert (await cache.get("k2"))[0] == 2
+
+    expired = SearchResultCache(max_entries=2, ttl=0, redis_enabled=False, shared_versions=False)
+    await expired.set("k", 1, ["s"])
+    expired._entries["k"] = (0.0, 1)
+    assert await expired.get("k") == (None, None)
+
+
+async def test_shared_versions_invalidate_other_workers(fake_redis):
+    """另一个进程（worker / CLI 入库）递增版本后，本进程的旧键不再使用"""
+    api_worker = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False)
+    ingest_cli = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False)
+    assert api_worker.shared_versions
+
+    key = await api_worker.build_key("q", {}, ["s1"])
+    await api_worker.set(key, "stale", ["s1"])
+
+    await ingest_cli.bump_version("s1")
+
+    assert await api_worker.build_key("q", {}, ["s1"]) != key
+
+
+async def test_version_unavailable_bypasses_cache(fake_redis):
+    """Redis 不可用时不回退到本地版本，本次不使用缓存"""
+    cache = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False)
+    fake_redis.down = True
+    assert await cache.get_versions(["s1"]) is None
+    assert await cache.build_key("q", {}, ["s1"]) is None
+
+
+async def test_no_store_within_replica_lag_window(monkeypatch):
+    """版本递增后的复制延迟窗口内只读不写，窗口结束后开始的搜索可以写入"""
+    cache = SearchResultCache(
+        max_entries=8, ttl=60, redis_enabled=False, shared_versions=False, replica_lag_window=5
+    )
+    await cache.bump_version("s1")
+
+    key, writable = await cache.resolve_key("q", {}, ["s1", "s2"])
+    assert key == await cache.build_key("q", {}, ["s1", "s2"])
+    assert not writable
+    assert (await cache.resolve_key("q", {}, ["s2"])).writable
+
+    window_end = cache._bumped_at["s1"] + 5
+    monkeypatch.setattr(search_cache_module.time, "monotonic", lambda: window_end)
+    assert await cache.resolve_key("q", {}, ["s1", "s2"]) == (key, True)
+
+    # 未配置只读副本时不启用窗口
+    primary_only = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, shared_versions=False)
+    assert primary_only.replica_lag_window == 0
+
+
+async def test_replica_lag_window_is_shared(fake_redis):
+    """其他进程（CLI 入库）递增版本后，本进程同样在窗口内不写缓存"""
+    api_worker = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, replica_lag_window=5)
+    ingest_cli = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, replica_lag_window=5)
+
+    await ingest_cli.bump_version("s1")
+    assert not (await api_worker.resolve_key("q", {}, ["s1"])).writable
+
+    # 标记随窗口过期
+    fake_redis.values.pop(api_worker._settling_key("s1"))
+    key, writable = await api_worker.resolve_key("q", {}, ["s1"])
+    assert writable and key == await ingest_cli.build_key("q", {}, ["s1"])
+
+
+def _searcher():
+    searcher = SAGSearcher.__new__(SAGSearcher)
+    searcher.logger = get_logger("search.searcher")
+    return searcher
+
+
+async def test_memory_hit_returns_copies():
+    """内存层命中返回副本，修改不影响缓存与其他请求"""
+    cache = SearchResultCache(max_entries=8, ttl=60, redis_enabled=False, shared_versions=False)
+    event = SourceEvent(id="e1", source_config_id="s1", title="标题", summary="s", content="c")
+    response = {"events": [event], "clues": [{"from": "a"}], "stats": {"total": 1}}
+    await cache.set("k", response, ["s1"])
+
+    first = await _searcher()._load_cached_response(cache, "k")
+    second = await _searcher()._load_cached_response(cache, "k")
+
+    assert first["events"][0] is not event and first["events"][0] is not second["events"][0]
+    assert first["events"][0].id == "e1" and first["events"][0].title == "标题"
+    first["events"][0].title = "已修改"
+    first["clues"][0]["from"] = "b"
+    assert event.title == "标题" and second["events"][0].title == "标题"
+    assert response["clues"][0]["from"] == "a"
+    assert first["stats"]["cache"] == {"hit": True, "tier": "memory"}
+    assert "cache" not in response["stats"]
+
+
+class _Result:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return [SourceEvent(id="e2", source_config_id="s1"), SourceEvent(id="e1", source_config_id="s1")]
+
+
+class _Session:
+    def __init__(self, statements):
+        self.statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+
+async def test_redis_hit_loads_same_relations_as_miss(monkeypatch):
+    """Redis 层命中回表时预加载与重排阶段相同的关联关系"""
+    statements = []
+    monkeypatch.setattr(searcher_module, "get_read_session_factory", lambda: lambda: _Session(statements))
+
+    class RedisTierCache:
+        async def get(self, key):
+            return {"event_ids": ["e1", "e2"], "clues": [], "stats": {}}, "redis"
+
+    response = await _searcher()._load_cached_response(RedisTierCache(), "k")
+
+    assert [event.id for event in response["events"]] == ["e1", "e2"]
+    loaded = {str(option.path) for option in statements[0]._with_options}
+    assert len(loaded) == 3
+    assert all(any(name in path for path in loaded) for name in ("event_associations", "source", "article"))
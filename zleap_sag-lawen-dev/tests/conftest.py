@@ -0,0 +1,57 @@
+"""
+全局测试配置
+
+提供基于 SQLite（aiosqlite）的 ORM 建表会话工厂，替代各测试文件中重复的建库代码：
+- sqlite_session_factory: 按 ORM 模型建表后的 async_sessionmaker（每个测试独立的库）
+- sql_statements: 该会话工厂执行过的 SQL（按执行顺序，用于断言查询次数）
+- sqlite_url: 数据库地址，默认内存库；需要落盘的测试可在模块内覆盖
+"""
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects.mysql import LONGTEXT, MEDIUMTEXT
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateTable
+
+
+# 模型使用 MySQL 专有文本类型，SQLite 下按 TEXT 建表
+@compiles(LONGTEXT, "sqlite")
+@compiles(MEDIUMTEXT, "sqlite")
+def _compile_text(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def sqlite_url():
+    """测试数据库地址（默认内存库）"""
+    return "sqlite+aiosqlite://"
+
+
+@pytest.fixture
+def sql_statements():
+    """sqlite_session_factory 执行过的 SQL 语句"""
+    return []
+
+
+@pytest.fixture
+async def sqlite_session_factory(sqlite_url, sql_statements):
+    """
+    按 ORM 模型建表的 SQLite 会话工厂
+
+    索引名在 MySQL 中按表区分、SQLite 中全库唯一，这里只建表不建索引
+    """
+    pytest.importorskip("aiosqlite")
+    from dataflow.db import Base
+
+    engine = create_async_engine(sqlite_url)
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(CreateTable(table))
+
+    @sa_event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        sql_statements.append(statement)
+
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
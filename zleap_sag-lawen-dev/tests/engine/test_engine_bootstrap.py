@@ -0,0 +1,116 @@
+"""
+引擎共享运行时测试
+
+并发创建 100 个引擎只构建一次重组件与日志配置、引擎级组件按需创建且互相独立、
+默认实体类型进程内缓存、构建基准（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/engine/test_engine_bootstrap.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from dataflow.engine import DataFlowEngine, ModelConfig
+from dataflow.engine import runtime as runtime_module
+from dataflow.evaluation.perf import benchmark_engine_bootstrap
+from dataflow.modules.extract import entity_types as entity_types_module
+from dataflow.modules.load import processor as processor_module
+
+
+@pytest.fixture
+def fresh_runtime(monkeypatch):
+    """重置共享运行时，并统计重组件的构建次数"""
+    counts = {"processor": 0, "logging": 0}
+    original_init = processor_module.DocumentProcessor.__init__
+
+    def counting_init(self, *args, **kwargs):
+        counts["processor"] += 1
+        original_init(self, *args, **kwargs)
+
+    def counting_setup_logging(*args, **kwargs):
+        counts["logging"] += 1
+
+    monkeypatch.setattr(processor_module.DocumentProcessor, "__init__", counting_init)
+    monkeypatch.setattr(runtime_module, "setup_logging", counting_setup_logging)
+    runtime_module.reset_engine_runtime()
+    yield counts
+    runtime_module.reset_engine_runtime()
+
+
+async def test_concurrent_engines_share_runtime(fresh_runtime):
+    async def create(index):
+        return DataFlowEngine(
+            model_config=ModelConfig(api_key=f"sk-{index}", model=f"model-{index}"),
+            source_config_id=f"source-{index}",
+        )
+
+    engines = await asyncio.gather(*(create(i) for i in range(100)))
+
+    assert fresh_runtime == {"processor": 1, "logging": 1}
+    runtime = engines[0].runtime
+    assert all(engine.runtime is runtime for engine in engines)
+    assert all(engine.prompt_manager is runtime.prompt_manager for engine in engines)
+
+    # 阶段组件按需创建：共享解析器 / 处理器，但各引擎的包装对象独立
+    first, second = engines[0], engines[1]
+    assert first._document_loader is None and first._extractor is None
+    assert first.document_loader is first.document_loader
+    assert first.document_loader is not second.document_loader
+    assert first.document_loader.parser is second.document_loader.parser is runtime.markdown_parser
+    assert first.conversation_loader.processor is runtime.document_processor
+    assert fresh_runtime["processor"] == 1
+
+    assert first.extractor is not second.extractor
+    assert first.extractor.model_config["api_key"] == "sk-0"
+    assert second.searcher.model_config["model"] == "model-1"
+
+
+def test_model_config_is_per_engine(fresh_runtime):
+    shared = ModelConfig(api_key="sk-original", model="m")
+    first = DataFlowEngine(model_config=shared, auto_setup_logging=False)
+    second = DataFlowEngine(model_config=shared, auto_setup_logging=False)
+
+    first.model_config.api_key = "sk-modified"
+
+    assert second.model_config.api_key == shared.api_key == "sk-original"
+    assert first.extractor.model_config["api_key"] == "sk-modified"
+    assert DataFlowEngine(auto_setup_logging=False).model_config_dict is None
+    assert fresh_runtime["logging"] == 0
+
+
+async def test_default_entity_types_cached(sqlite_session_factory, sql_statements, monkeypatch):
+    from dataflow.db import EntityType
+
+    factory = sqlite_session_factory
+    async with factory() as session:
+        session.add(EntityType(id="t-person", type="person", name="人物", is_default=True, weight=1.0))
+        session.add(EntityType(id="t-custom", type="custom", name="自定义", source_config_id=None,
+                               is_default=False, weight=1.0))
+        await session.commit()
+    sql_statements.clear()
+
+    monkeypatch.setattr("dataflow.db.base.get_session_factory", lambda: factory)
+    entity_types_module.reset_default_entity_types()
+    try:
+        first = await entity_types_module.get_default_entity_types()
+        second = await entity_types_module.get_default_entity_types()
+        assert [t["type"] for t in first] == ["person"]
+        assert second is first
+        assert len(sql_statements) == 1
+
+        # 刷新间隔过后重新读取；读取失败时沿用上次结果
+        monkeypatch.setattr("dataflow.db.base.get_session_factory", lambda: None)
+        stale = await entity_types_module.get_default_entity_types(refresh_interval=0)
+        assert [t["type"] for t in stale] == ["person"]
+    finally:
+        entity_types_module.reset_default_entity_types()
+
+
+def test_bootstrap_benchmark_reports_both_modes():
+    report = benchmark_engine_bootstrap(engines=5)
+
+    assert [row["mode"] for row in report.modes] == ["shared", "isolated"]
+    assert all(row["count"] == 5 for row in report.modes)
+    assert "KiB/engine" in report.format_table()
@@ -0,0 +1,181 @@
+"""
+检索基准执行器测试
+
+增量 Recall@k 与 RetrievalRecall 一致、有界并发、检查点断点续跑、按问题统计 token 与阶段耗时
+（使用假搜索函数，不依赖外部服务）
+
+运行方式:
+    pytest tests/evaluation/test_bench_runner.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from dataflow.core.telemetry import span
+from dataflow.evaluation.bench_runner import (
+    BenchmarkRunner,
+    RecallAccumulator,
+    record_question_tokens,
+)
+from dataflow.evaluation.metrics import RetrievalRecall
+
+QUESTIONS = [f"question {i}" for i in range(12)]
+
+
+def _doc(title):
+    return {"title": title, "content": f"{title} body text words"}
+
+
+# 第 i 题的标准文档为 d{i} 与 d{i+1}
+GOLD = [[_doc(f"d{i}"), _doc(f"d{i + 1}")] for i in range(len(QUESTIONS))]
+
+
+def _sections(index):
+    """偶数题全部召回，3 的倍数只召回一篇，其余零召回；含重复 chunk"""
+    if index % 2 == 0:
+        titles = [f"x{index}", f"d{index}", f"d{index + 1}"]
+    elif index % 3 == 0:
+        titles = [f"d{index}"]
+    else:
+        titles = [f"y{index}"]
+    sections = [
+        {"chunk_id": f"c-{title}", "heading": f"# {title}", "content": f"{title} body text words"}
+        for title in titles
+    ]
+    return sections + sections[:1]
+
+
+class FakeSearch:
+    """记录并发度的假搜索器"""
+
+    def __init__(self, fail_on=()):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.fail_on = set(fail_on)
+
+    def factory(self):
+        async def search(question):
+            self.calls.append(question)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                index = QUESTIONS.index(question)
+                with span("search", kind="search"):
+                    with span("search.recall", kind="search"):
+                        await asyncio.sleep(0.001 * (index % 3))
+                        record_question_tokens(10, 5, 15)
+                    with span("search.rerank", kind="search"):
+                        await asyncio.sleep(0)
+                if question in self.fail_on:
+                    raise RuntimeError("es down")
+                return {"sections": _sections(index)}
+            finally:
+                self.active -= 1
+
+        return search
+
+
+async def test_incremental_metrics_match_full_recomputation():
+    fake = FakeSearch()
+    snapshots = []
+
+    async def on_progress(processed, total, summary):
+        snapshots.append((processed, total, summary["recall"]))
+
+    runner = BenchmarkRunner(fake.factory, gold_docs=GOLD, concurrency=3, progress_every=4, on_progress=on_progress)
+    report = await runner.run(QUESTIONS)
+    results, summary = report["results"], report["summary"]
+
+    assert [r["question_index"] for r in results] == list(range(1, 13))
+    assert all(r["total_sections"] == len({s["chunk_id"] for s in r["sections"]}) for r in results)
+
+    retrieved = [[s["heading"].lstrip("#").strip() for s in r["sections"]] for r in results]
+    expected, _ = RetrievalRecall().calculate_metric_scores(
+        gold_docs=[[d["title"] for d in gold] for gold in GOLD],
+        retrieved_docs=retrieved,
+        k_list=[1, 2, 5, 10],
+    )
+    assert summary["recall"] == expected
+
+    # 偶数题 6 个全部召回；3、9 两题部分召回；其余 4 题零召回
+    assert (summary["full_recall"], summary["partial_recall"], summary["zero_recall"]) == (6, 2, 4)
+    assert summary["tokens"] == {"prompt": 120, "completion": 60, "total": 180}
+    assert [(p, t) for p, t, _ in snapshots] == [(4, 12), (8, 12), (12, 12)]
+    assert snapshots[-1][2] == expected
+
+
+async def test_concurrency_is_bounded():
+    fake = FakeSearch()
+    await BenchmarkRunner(fake.factory, concurrency=2).run(QUESTIONS)
+    assert fake.peak == 2
+    assert sorted(fake.calls) == sorted(QUESTIONS)
+
+
+async def test_stage_latency_and_failures():
+    fake = FakeSearch(fail_on={"question 1"})
+    report = await BenchmarkRunner(fake.factory, gold_docs=GOLD, concurrency=4).run(QUESTIONS)
+
+    failed = report["results"][1]
+    assert failed["search_success"] is False and failed["error"] == "es down"
+    assert failed["matched_docs"] == []
+    assert report["summary"]["failed"] == 1
+
+    record = report["results"][0]
+    assert set(record["stage_ms"]) == {"search", "search.recall", "search.rerank"}
+    assert record["tokens"]["total"] == 15
+
+    stages = {row["stage"]: row for row in report["summary"]["latency"]}
+    assert set(stages) == {"question", "search", "search.recall", "search.rerank"}
+    assert stages["search.recall"]["count"] == len(QUESTIONS)
+    assert stages["question"]["p95_ms"] >= stages["question"]["p50_ms"]
+
+
+class Interrupted(BaseException):
+    """模拟进程被中断（不是普通的检索失败）"""
+
+
+async def test_resume_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+
+    def interrupting_factory():
+        async def search(question):
+            index = QUESTIONS.index(question)
+            if index == 5:
+                raise Interrupted()
+            return {"sections": _sections(index)}
+
+        return search
+
+    # 第一次运行：前 5 题完成后中断，最后一行只写了一半
+    with pytest.raises(Interrupted):
+        await BenchmarkRunner(interrupting_factory, gold_docs=GOLD, concurrency=1, checkpoint_path=checkpoint).run(QUESTIONS)
+    with checkpoint.open("a", encoding="utf-8") as f:
+        f.write('{"question_index": 6, "quest')
+
+    # 第二次运行：只检索剩余 7 题，指标与一次跑完一致
+    fake = FakeSearch()
+    resumed = await BenchmarkRunner(fake.factory, gold_docs=GOLD, concurrency=3, checkpoint_path=checkpoint).run(QUESTIONS)
+    assert sorted(fake.calls) == sorted(QUESTIONS[5:])
+    assert resumed["summary"]["resumed"] == 5
+    assert resumed["summary"]["processed"] == len(QUESTIONS)
+
+    fresh = await BenchmarkRunner(FakeSearch().factory, gold_docs=GOLD, concurrency=3).run(QUESTIONS)
+    assert resumed["summary"]["recall"] == fresh["summary"]["recall"]
+    assert [r["matched_docs"] for r in resumed["results"]] == [r["matched_docs"] for r in fresh["results"]]
+
+    # 全部完成后再次运行不再检索
+    again = FakeSearch()
+    await BenchmarkRunner(again.factory, gold_docs=GOLD, checkpoint_path=checkpoint).run(QUESTIONS)
+    assert again.calls == []
+
+
+def test_accumulator_skips_questions_without_gold():
+    acc = RecallAccumulator(k_list=[1, 5])
+    acc.add({"search_success": True, "tokens": {"total": 3}})
+    acc.add({"search_success": False, "gold_titles": ["a"], "matched_docs": [], "recall": {"Recall@1": 0.0}})
+    summary = acc.summary()
+    assert summary["processed"] == 2 and summary["evaluated"] == 1
+    assert summary["zero_recall"] == 1 and summary["failed"] == 1
+    assert summary["tokens"]["total"] == 3
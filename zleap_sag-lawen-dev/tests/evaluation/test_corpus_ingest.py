@@ -0,0 +1,152 @@
+"""
+评估语料批量入库测试
+
+片段与句子段落按批写入且互相引用、索引失败的批次续跑时重试、提取中断后只处理剩余片段、吞吐统计
+（SQLite 文件库 + 假索引/提取函数，不依赖外部服务）
+
+运行方式:
+    pytest tests/evaluation/test_corpus_ingest.py -v
+"""
+
+import pytest
+from sqlalchemy import select
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.db import ArticleSection, SourceChunk
+from dataflow.evaluation import corpus_ingest
+from dataflow.evaluation.corpus_ingest import CorpusIngestor
+
+CORPUS = [
+    {"title": f"Doc {i}", "text": f"First sentence of doc {i}! Second sentence of doc {i}?"}
+    for i in range(23)
+]
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    # 文件库：并发索引批次各自使用独立连接（内存库共享单连接，会话关闭时的回滚会互相影响）
+    return f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}"
+
+
+@pytest.fixture
+def factory(sqlite_session_factory, monkeypatch):
+    async def no_bump(source_config_id):
+        return None
+
+    monkeypatch.setattr(corpus_ingest, "bump_source_version", no_bump)
+    return sqlite_session_factory
+
+
+class FakeIndex:
+    """记录索引的片段，可让指定批次失败"""
+
+    def __init__(self, fail_batches=()):
+        self.calls = []
+        self.fail_batches = set(fail_batches)
+
+    async def __call__(self, chunks):
+        self.calls.append([c.id for c in chunks])
+        if len(self.calls) - 1 in self.fail_batches:
+            return {"indexed_count": 0, "es_failed": len(chunks)}
+        return {"indexed_count": len(chunks)}
+
+
+class Interrupted(BaseException):
+    """模拟进程被中断"""
+
+
+class FakeExtract:
+    """每个片段生成一个事项，可在第 N 次调用时中断"""
+
+    def __init__(self, interrupt_at=None):
+        self.calls = []
+        self.interrupt_at = interrupt_at
+
+    async def __call__(self, chunk_ids):
+        if len(self.calls) == self.interrupt_at:
+            raise Interrupted()
+        self.calls.append(list(chunk_ids))
+        return len(chunk_ids)
+
+
+def _ingestor(factory, index_fn=None, extract_fn=None, **kwargs):
+    return CorpusIngestor(
+        source_config_id="bench-source",
+        session_factory=factory,
+        write_batch_size=10,
+        index_batch_size=5,
+        extract_batch_size=4,
+        index_fn=index_fn or FakeIndex(),
+        extract_fn=extract_fn or FakeExtract(),
+        **kwargs,
+    )
+
+
+async def test_chunks_and_sections_written_in_batches(factory, sql_statements):
+    sql_statements.clear()
+    report = await _ingestor(factory).ingest(CORPUS, article_title="bench corpus")
+
+    # 23 篇语料分 3 批写入，每批片段与段落各一条 INSERT
+    chunk_inserts = [s for s in sql_statements if s.startswith("INSERT INTO source_chunk")]
+    section_inserts = [s for s in sql_statements if s.startswith("INSERT INTO article_section")]
+    assert len(chunk_inserts) == len(section_inserts) == 3
+
+    async with factory() as session:
+        chunks = (await session.execute(select(SourceChunk).order_by(SourceChunk.rank))).scalars().all()
+        sections = (await session.execute(select(ArticleSection).order_by(ArticleSection.rank))).scalars().all()
+
+    assert [c.heading for c in chunks] == [d["title"] for d in CORPUS]
+    assert len(sections) == 2 * len(CORPUS)
+    assert [s.rank for s in sections] == list(range(len(sections)))
+    section_by_id = {s.id: s for s in sections}
+    assert [section_by_id[ref].content for ref in chunks[1].references] == [
+        "First sentence of doc 1", "Second sentence of doc 1"
+    ]
+    assert all(c.article_id == report.article_id for c in chunks)
+    assert all(c.extra_data["corpus_ingest"] == {"indexed": True, "extracted": True} for c in chunks)
+
+    assert (report.written, report.indexed, report.extracted, report.events) == (23, 23, 23, 23)
+    rates = report.chunks_per_second()
+    assert set(rates) == {"write", "index", "extract", "total"}
+    assert all(rate > 0 for rate in rates.values())
+
+
+async def test_resume_after_interrupted_extraction(factory):
+    index = FakeIndex(fail_batches={1})
+    with pytest.raises(Interrupted):
+        await _ingestor(factory, index_fn=index, extract_fn=FakeExtract(interrupt_at=2)).ingest(
+            CORPUS, article_title="bench corpus"
+        )
+    # 第 2 个索引批次失败，其余 4 批完成
+    assert len(index.calls) == 5
+
+    index_again, extract_again = FakeIndex(), FakeExtract()
+    report = await _ingestor(factory, index_fn=index_again, extract_fn=extract_again).ingest(
+        CORPUS, article_title="bench corpus"
+    )
+
+    chunk_ids = [corpus_ingest._stable_id(report.article_id, "chunk", rank) for rank in range(len(CORPUS))]
+    assert report.resumed == {"write": 23, "index": 18, "extract": 8}
+    assert report.written == 0
+    # 只重试失败的索引批次（并发下第 2 个完成读取的批次），只提取前两批之后的片段
+    assert index_again.calls == [index.calls[1]]
+    assert [cid for batch in extract_again.calls for cid in batch] == chunk_ids[8:]
+    assert report.extracted == 15
+
+    async with factory() as session:
+        count = len((await session.execute(select(SourceChunk.id))).all())
+    assert count == len(CORPUS)
+
+
+async def test_resume_appends_new_documents(factory):
+    await _ingestor(factory).ingest(CORPUS[:12], article_title="bench corpus", enable_extraction=False)
+    report = await _ingestor(factory).ingest(CORPUS, article_title="bench corpus")
+
+    assert report.resumed["write"] == 12
+    assert report.written == 11
+    assert report.extracted == 23
+
+    async with factory() as session:
+        ranks = (await session.execute(select(ArticleSection.rank).order_by(ArticleSection.rank))).scalars().all()
+    assert ranks == list(range(2 * len(CORPUS)))
@@ -0,0 +1,118 @@
+"""
+事项转段落批量查询测试
+
+多问题批量解析与逐题结果一致、整批只执行两次查询、段落缓存跨问题复用、
+事项详情按 rank 排序（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/evaluation/test_event_to_sections.py -v
+"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.db import Article, ArticleSection, SourceConfig, SourceEvent
+from evaluation.hotpotqa_evaluation.modules.event_to_sections import EventToSectionConverter
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+async def _seed(factory):
+    """一篇文章 4 个段落，事项 e0..e3 分别引用不同段落（e3 引用一个不存在的段落）"""
+    source_id, article_id = _id(), _id()
+    section_ids = [_id() for _ in range(4)]
+    async with factory() as session:
+        session.add(SourceConfig(id=source_id, name="hotpotqa"))
+        session.add(Article(id=article_id, source_config_id=source_id, title="doc", status="COMPLETED"))
+        for rank, section_id in enumerate(section_ids):
+            session.add(ArticleSection(
+                id=section_id, article_id=article_id, rank=rank, order_index=rank,
+                heading=f"h{rank}", content=f"c{rank}", length=2,
+            ))
+        references = [
+            [section_ids[2], section_ids[0]],
+            [section_ids[1]],
+            [section_ids[0], section_ids[3]],
+            ["missing-section"],
+        ]
+        event_ids = []
+        for i, refs in enumerate(references):
+            event = SourceEvent(
+                id=_id(), source_config_id=source_id, source_type="ARTICLE", source_id=article_id,
+                article_id=article_id, title=f"e{i}", summary=f"s{i}", content="正文", references=refs,
+            )
+            event_ids.append(event.id)
+            session.add(event)
+        await session.commit()
+    return event_ids, section_ids
+
+
+async def test_batched_lookup_matches_per_question(sqlite_session_factory, sql_statements):
+    event_ids, section_ids = await _seed(sqlite_session_factory)
+    questions = [
+        [event_ids[0], event_ids[1]],
+        [event_ids[2], "unknown-event", event_ids[2]],
+        [event_ids[3]],
+        [],
+    ]
+
+    per_question = []
+    for ids in questions:
+        converter = EventToSectionConverter(session_factory=sqlite_session_factory)
+        per_question.append(await converter.get_sections_by_event_ids(ids))
+
+    converter = EventToSectionConverter(session_factory=sqlite_session_factory)
+    sql_statements.clear()
+    batched = await converter.get_sections_for_questions(questions)
+
+    # 事项一次查询 + 段落一次查询
+    assert len(sql_statements) == 2
+    assert batched == per_question
+    assert [s["section_id"] for s in batched[0]] == [section_ids[2], section_ids[0], section_ids[1]]
+    assert batched[0][0]["event_title"] == "e0"
+    assert batched[2] == [] and batched[3] == []
+
+
+async def test_section_cache_is_shared_across_questions(sqlite_session_factory, sql_statements):
+    event_ids, section_ids = await _seed(sqlite_session_factory)
+    converter = EventToSectionConverter(session_factory=sqlite_session_factory)
+
+    await converter.get_sections_by_event_ids([event_ids[0], event_ids[3]])
+    sql_statements.clear()
+    sections = await converter.get_sections_by_event_ids(
+        [event_ids[0]], events_dict={event_ids[0]: {"score": 0.7}}
+    )
+
+    # 段落（包括不存在的段落）已缓存，只查询事项
+    assert len(sql_statements) == 1
+    assert sections[0]["event_score"] == 0.7
+
+    sql_statements.clear()
+    await converter.get_sections_by_event_ids([event_ids[3]])
+    assert len(sql_statements) == 1
+
+    converter.clear_cache()
+    sql_statements.clear()
+    await converter.get_sections_by_event_ids([event_ids[0]])
+    assert len(sql_statements) == 2
+
+
+async def test_event_details_sorted_by_rank(sqlite_session_factory):
+    event_ids, section_ids = await _seed(sqlite_session_factory)
+    converter = EventToSectionConverter(session_factory=sqlite_session_factory)
+
+    details = await converter.get_event_details_with_sections([event_ids[0], event_ids[3]])
+
+    assert [e["title"] for e in details] == ["e0", "e3"]
+    assert [s["section_id"] for s in details[0]["sections"]] == [section_ids[0], section_ids[2]]
+    assert "article_id" not in details[0]["sections"][0]
+    assert details[1]["sections"] == []
+    assert details[0]["content"] == "正文"
+
+    batched = await converter.get_event_details_for_questions([[event_ids[0]], [event_ids[3]]])
+    assert batched == [details[:1], details[1:]]
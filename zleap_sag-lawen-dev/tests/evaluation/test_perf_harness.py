@@ -0,0 +1,94 @@
+"""
+离线性能基准测试
+
+使用合成语料 + SQLite + 内存 ES，不依赖外部服务
+
+运行方式:
+    pytest tests/evaluation/test_perf_harness.py -v
+"""
+
+from dataflow.evaluation.perf import (
+    CorpusSpec,
+    InMemoryElasticsearchClient,
+    generate_corpus,
+    pseudo_embedding,
+    run_benchmark,
+)
+
+TINY_SPEC = CorpusSpec(
+    articles_per_source=2,
+    sections_per_article=4,
+    chunks_per_article=2,
+    events_per_chunk=3,
+    entities_per_source=40,
+    embedding_dim=32,
+)
+
+
+def test_corpus_is_deterministic():
+    """同一 spec 生成的语料与查询完全一致"""
+    a = generate_corpus(TINY_SPEC)
+    b = generate_corpus(TINY_SPEC)
+    assert [e["id"] for e in a.events] == [e["id"] for e in b.events]
+    assert a.sample_queries(3) == b.sample_queries(3)
+    assert a.stats()["events"] == 2 * 2 * 3
+
+
+def test_pseudo_embedding_similarity():
+    """共享词越多的文本向量越接近"""
+    import numpy as np
+
+    base = np.array(pseudo_embedding("kalo mira report", 32))
+    close = np.array(pseudo_embedding("kalo mira budget", 32))
+    far = np.array(pseudo_embedding("zuxi nedi policy", 32))
+    assert float(base @ close) > float(base @ far)
+    assert abs(float(np.linalg.norm(base)) - 1.0) < 1e-5
+
+
+async def test_in_memory_es_query_subset():
+    """内存 ES 的返回格式与 ElasticsearchClient 一致"""
+    client = InMemoryElasticsearchClient()
+    client.add_documents(
+        "idx",
+        [
+            {"doc_id": "1", "source_config_id": "s1", "name": "Alpha", "vector": [1.0, 0.0]},
+            {"doc_id": "2", "source_config_id": "s2", "name": "Beta", "vector": [0.0, 1.0]},
+        ],
+        id_field="doc_id",
+    )
+
+    docs = await client.search("idx", {"terms": {"source_config_id": ["s1"]}})
+    assert [d["doc_id"] for d in docs] == ["1"]
+
+    full = await client.search(
+        "idx",
+        {"bool": {"should": [{"term": {"name.keyword": "Beta"}}], "minimum_should_match": 1}},
+        return_full_response=True,
+    )
+    assert full["total"] == 1 and full["hits"][0]["source"]["doc_id"] == "2"
+
+    hits = await client.vector_search(
+        "idx", "vector", [1.0, 0.1], size=2,
+        filter_query={"bool": {"must": [{"term": {"source_config_id": "s2"}}]}},
+    )
+    assert [h["doc_id"] for h in hits] == ["2"]
+    assert 0.0 <= hits[0]["_score"] <= 1.0
+
+
+async def test_run_benchmark_all_stages():
+    """所有阶段在离线后端上执行成功，且退出后恢复全局单例"""
+    import dataflow.core.storage.elasticsearch as es_module
+    import dataflow.db.base as db_base
+
+    saved = (db_base._session_factory, es_module._es_client)
+
+    report = await run_benchmark(spec=TINY_SPEC, num_queries=2, warmup=0)
+
+    assert [row["stage"] for row in report.stages] == [
+        "recall", "expand", "rerank_pagerank", "rerank_rrf", "end_to_end",
+    ]
+    for row in report.stages:
+        assert row["errors"] == 0
+        assert row["count"] == 2
+    assert report.counters["es_requests"] > 0
+    assert (db_base._session_factory, es_module._es_client) == saved
@@ -0,0 +1,86 @@
+"""
+量化向量索引测试
+
+映射生成 + 召回/延迟对比（内存 ES，不依赖外部服务）
+
+运行方式:
+    pytest tests/evaluation/test_vector_quant.py -v
+"""
+
+import numpy as np
+import pytest
+
+from dataflow.core.storage.documents import (
+    EventVectorDocument,
+    apply_vector_index_options,
+    build_index_definition,
+    get_vector_index_types,
+)
+from dataflow.evaluation.perf import (
+    InMemoryElasticsearchClient,
+    compare_vector_indices,
+    pseudo_embedding,
+    recall_at_k,
+)
+
+
+def test_build_index_definition_sets_index_options():
+    name, mapping, settings = build_index_definition(EventVectorDocument, "int8_hnsw")
+
+    assert name == "event_vectors"
+    assert settings["number_of_shards"] == 12
+    assert get_vector_index_types(mapping) == {
+        "title_vector": "int8_hnsw",
+        "content_vector": "int8_hnsw",
+    }
+    # 原 Document 映射不被修改
+    assert "index_options" not in EventVectorDocument._doc_type.mapping.to_dict()["properties"]["content_vector"]
+
+
+def test_apply_vector_index_options_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        apply_vector_index_options({"properties": {}}, "pq")
+
+
+def test_recall_at_k():
+    assert recall_at_k(["a", "b", "c"], ["a", "c", "x"], 3) == pytest.approx(2 / 3)
+    assert recall_at_k([], ["a"], 3) == 1.0
+
+
+async def test_compare_vector_indices():
+    """模拟量化：候选索引的向量按 int8 取整，召回率应接近但不超过基线"""
+    dim = 32
+    docs = [
+        {"event_id": f"e{i}", "content_vector": pseudo_embedding(f"doc {i} topic {i % 7}", dim)}
+        for i in range(200)
+    ]
+    client = InMemoryElasticsearchClient()
+    client.add_documents("event_vectors", docs, id_field="event_id")
+    client.add_documents(
+        "event_vectors__int8_hnsw",
+        [
+            {**doc, "content_vector": (np.round(np.array(doc["content_vector"]) * 8) / 8).tolist()}
+            for doc in docs
+        ],
+        id_field="event_id",
+    )
+
+    queries = [pseudo_embedding(f"topic {i}", dim) for i in range(6)]
+    report = await compare_vector_indices(
+        client,
+        queries,
+        baseline_index="event_vectors",
+        candidate_indices=["event_vectors__int8_hnsw"],
+        vector_field="content_vector",
+        id_field="event_id",
+        k=10,
+        truth="hnsw",
+        warmup=1,
+    )
+
+    baseline, candidate = report.indices
+    assert report.queries == 5
+    assert baseline["recall@10"] == 1.0
+    assert 0.0 < candidate["recall@10"] <= 1.0
+    assert candidate["count"] == 5 and candidate["errors"] == 0
+    assert "event_vectors__int8_hnsw" in report.format_table()
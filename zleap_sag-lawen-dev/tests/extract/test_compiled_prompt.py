@@ -0,0 +1,135 @@
+"""
+预编译提示词模板测试
+
+预编译渲染与 PromptTemplate.render 结果一致、静态前缀按缓存键复用、模板替换后重新编译、
+事项提取 SYSTEM 提示词的静态部分在前且按 (信息源, 实体类型版本) 命中缓存、命中率与渲染长度指标
+
+运行方式:
+    pytest tests/extract/test_compiled_prompt.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from dataflow.core.prompt import CompiledPromptTemplate, PromptManager, PromptTemplate
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.exceptions import PromptError
+
+
+@pytest.fixture(scope="module")
+def prompt_manager():
+    return PromptManager()
+
+
+def test_compiled_render_matches_plain_render():
+    template = PromptTemplate(
+        name="demo",
+        template="# {title}\n{rules!r} {{固定}} {count:>4}\n---\n{context}\n{rules}\n结尾 {{x}}",
+        variables=["title", "rules", "count", "context"],
+    )
+    compiled = CompiledPromptTemplate(template, ["title", "rules", "count"])
+    static = {"title": "标题 {不是变量}", "rules": "规则{0}", "count": 7}
+
+    for context in ("第一段", "第二段 {花括号}"):
+        expected = template.render(context=context, **static)
+        assert compiled.render("k", static=static, context=context) == expected
+
+    assert (compiled.hits, compiled.misses) == (1, 1)
+    with pytest.raises(PromptError, match="缺少必需变量: context"):
+        compiled.render("k", static=static)
+    with pytest.raises(PromptError, match="缺少静态变量"):
+        compiled.render("other", static={"title": "t"}, context="c")
+
+
+def test_cache_keys_and_recompile(prompt_manager):
+    manager = PromptManager(prompts_dir=prompt_manager.prompts_dir)
+    manager.add_template("greet", "你好 {name}，{question}", variables=["name", "question"])
+
+    compiled = manager.compile("greet", ["name"])
+    assert manager.compile("greet", ["name"]) is compiled
+    assert compiled.render("a", static={"name": "甲"}, question="?") == "你好 甲，?"
+    # 缓存键相同时沿用已渲染的静态部分
+    assert compiled.render("a", static={"name": "乙"}, question="!") == "你好 甲，!"
+    assert compiled.render("b", static={"name": "乙"}, question="!") == "你好 乙，!"
+
+    manager.add_template("greet", "Hi {name}: {question}", variables=["name", "question"])
+    recompiled = manager.compile("greet", ["name"])
+    assert recompiled is not compiled
+    assert recompiled.render("a", static={"name": "甲"}, question="?") == "Hi 甲: ?"
+
+    stats = {row["template"]: row for row in manager.compiled_stats()}
+    assert stats["greet"]["misses"] == 1
+
+
+def _processor(prompt_manager, source_config_id="source-1"):
+    from dataflow.modules.extract.config import ExtractConfig
+    from dataflow.modules.extract.processor import EventProcessor
+
+    processor = EventProcessor(
+        llm_client=None,
+        prompt_manager=prompt_manager,
+        config=ExtractConfig(source_config_id=source_config_id, chunk_ids=["c"]),
+    )
+    processor.entity_types = [
+        SimpleNamespace(type="person", name="人物", description="人名\n详细说明"),
+        SimpleNamespace(type="org", name="组织", description=None),
+    ]
+
+    async def no_recall(raw_text):
+        return []
+
+    processor._recall_related_events = no_recall
+    return processor
+
+
+async def test_extraction_prompt_static_prefix(prompt_manager):
+    compiled = prompt_manager.compile("event_extraction", ("entity_types", "output_schema"))
+    compiled.clear()
+    hits_before = get_metrics_registry().counter(
+        "dataflow_prompt_prefix_cache", "", ["template", "result"]
+    ).value(template="event_extraction", result="hit")
+
+    processor = _processor(prompt_manager)
+    chunks = [
+        [SimpleNamespace(content="张三加入了研发部。")],
+        [SimpleNamespace(content="李四在上海发布了新产品。")],
+    ]
+    prompts = [
+        await processor._build_system_prompt(items, {"document_title": f"文档{i}"}, is_article=True)
+        for i, items in enumerate(chunks)
+    ]
+
+    # 实体类型说明按版本缓存；模板开头原样保留
+    version, entity_types = processor._get_entity_types_section()
+    assert "- **person** (人物): 人名" in entity_types
+    assert prompts[0].startswith(prompt_manager.get("event_extraction").template.split("{entity_types}")[0])
+
+    # 静态部分（实体类型、输出格式）在背景信息与候选实体之前，两次调用共享同一前缀
+    for prompt in prompts:
+        assert prompt.index("## 实体类型") < prompt.index("## 输入输出格式") < prompt.index("## 背景信息")
+        assert prompt.index("## 背景信息") < prompt.index("## 候选实体")
+    shared = prompts[0][: prompts[0].index("## 背景信息")]
+    assert prompts[1].startswith(shared)
+    assert "文档0" not in shared and "- **org** (组织)" in shared
+
+    assert (compiled.hits, compiled.misses) == (1, 1)
+    registry = get_metrics_registry()
+    assert registry.counter("dataflow_prompt_prefix_cache", "", ["template", "result"]).value(
+        template="event_extraction", result="hit"
+    ) == hits_before + 1
+    assert "dataflow_prompt_rendered_chars_bucket" in registry.render()
+
+    # 其他处理器（同信息源、同实体类型）复用缓存；实体类型变化后重新渲染
+    other = _processor(prompt_manager)
+    await other._build_system_prompt(chunks[0], {}, is_article=True)
+    assert other._get_entity_types_section()[0] == version
+    assert compiled.hits == 2
+
+    other.entity_types = other.entity_types[:1]
+    prompt = await other._build_system_prompt(chunks[0], {}, is_article=True)
+    assert compiled.misses == 2
+    assert "- **org**" not in prompt
+
+    await _processor(prompt_manager, source_config_id="source-2")._build_system_prompt(chunks[0], {}, is_article=True)
+    assert compiled.misses == 3
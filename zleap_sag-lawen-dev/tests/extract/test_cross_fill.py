@@ -0,0 +1,58 @@
+"""
+实体交叉补充 / 重复事项合并测试
+
+自动机匹配与逐实体检查结果一致、ID 映射合并（不依赖外部服务）
+
+运行方式:
+    pytest tests/extract/test_cross_fill.py -v
+"""
+
+import random
+
+from dataflow.db.models import SourceEvent
+from dataflow.evaluation.perf import benchmark_cross_fill, generate_extraction_batch
+from dataflow.modules.extract.filter import EventFilter
+from dataflow.utils import KeywordMatcher
+
+
+def test_keyword_matcher_matches_substring_checks():
+    rng = random.Random(7)
+    for _ in range(200):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(8)]
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+        expected = {i for i, keyword in enumerate(keywords) if keyword and keyword in text}
+        assert KeywordMatcher(keywords).find_all(text) == expected
+
+
+def test_keyword_matcher_chinese_overlapping():
+    matcher = KeywordMatcher(["北京", "北京大学", "大学", "上海"])
+    assert matcher.find_all("他毕业于北京大学") == {0, 1, 2}
+
+
+def test_cross_fill_modes_consistent():
+    events = generate_extraction_batch(60, 200, mentions_per_event=6, words_per_event=40, seed=3)
+    report = benchmark_cross_fill(events, modes=["automaton", "scan"])
+
+    assert report.consistent
+    assert report.entities == 200
+    assert report.modes[0]["added"] == report.modes[1]["added"] > 0
+    # 原批次不被修改
+    assert benchmark_cross_fill(events, modes=["scan"]).modes[0]["added"] == report.modes[1]["added"]
+
+
+def test_merge_duplicate_events_by_id():
+    def make(event_id, content, names):
+        return SourceEvent(
+            id=event_id,
+            title=event_id,
+            content=content,
+            extra_data={"raw_entities": {"person": [{"name": n} for n in names]}},
+        )
+
+    events = [make("a", "short", ["张三"]), make("b", "much longer content", ["李四", "张三"]), make("c", "x", [])]
+    evaluations = [{"event_id": "a", "issues": [{"type": "duplicate", "duplicate_with": "b"}]}]
+
+    merged = EventFilter()._merge_duplicate_events(events, {e["event_id"]: e for e in evaluations}, 0)
+
+    assert [event.id for event in merged] == ["b", "c"]
+    assert [e["name"] for e in merged[0].extra_data["raw_entities"]["person"]] == ["张三", "李四"]
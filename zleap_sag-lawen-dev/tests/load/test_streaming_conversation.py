@@ -0,0 +1,144 @@
+"""
+会话流式加载测试
+
+流式分块与全量加载结果一致、键集分页每页不超过 page_size、追加模式只处理新消息且保留已有分块
+（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/load/test_streaming_conversation.py -v
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.db import ChatConversation, ChatMessage, SourceChunk, SourceConfig
+from dataflow.modules.load import loader as loader_module
+from dataflow.modules.load.config import ConversationLoadConfig
+from dataflow.modules.load.loader import ConversationLoader
+
+BASE_TIME = datetime(2025, 1, 1, 0, 0, 0)
+
+
+@pytest.fixture
+def factory(sqlite_session_factory, monkeypatch):
+    async def no_bump(source_config_id):
+        return None
+
+    monkeypatch.setattr(loader_module, "get_session_factory", lambda: sqlite_session_factory)
+    monkeypatch.setattr(loader_module, "bump_source_version", no_bump)
+    return sqlite_session_factory
+
+
+async def _seed(factory, count, offset=0, source_id=None, conversation_id=None):
+    """每 7 分钟一条消息，部分消息较长以触发窗口内 token 切分"""
+    source_id = source_id or str(uuid.uuid4())
+    conversation_id = conversation_id or str(uuid.uuid4())
+    async with factory() as session:
+        if offset == 0:
+            session.add(SourceConfig(id=source_id, name="客服"))
+            session.add(ChatConversation(id=conversation_id, source_config_id=source_id, title="支持群"))
+        for i in range(offset, offset + count):
+            session.add(ChatMessage(
+                id=str(uuid.uuid4()),
+                conversation_id=conversation_id,
+                timestamp=BASE_TIME + timedelta(minutes=7 * i),
+                content=("长消息" * 200) if i % 5 == 0 else f"消息 {i}",
+                sender_name=f"user{i % 3}",
+            ))
+        await session.commit()
+    return source_id, conversation_id
+
+
+def _config(source_id, conversation_id, end, **kwargs):
+    return ConversationLoadConfig(
+        source_config_id=source_id,
+        conversation_id=conversation_id,
+        start_time=BASE_TIME.isoformat(sep=" "),
+        end_time=end.isoformat(sep=" "),
+        interval_minutes=60,
+        max_tokens=300,
+        auto_vector=False,
+        **kwargs,
+    )
+
+
+async def _chunks(factory, conversation_id):
+    async with factory() as session:
+        rows = (
+            await session.execute(
+                select(SourceChunk).where(SourceChunk.source_id == conversation_id).order_by(SourceChunk.rank)
+            )
+        ).scalars().all()
+    return [(c.rank, c.heading, c.content, c.references) for c in rows], [c.id for c in rows]
+
+
+async def test_streaming_matches_in_memory_load(factory):
+    source_id, conversation_id = await _seed(factory, 250)
+    end = BASE_TIME + timedelta(minutes=7 * 260)
+    loader = ConversationLoader(processor=object())
+
+    result = await loader.load(_config(source_id, conversation_id, end))
+    expected, _ = await _chunks(factory, conversation_id)
+    assert any("第2段" in heading for _, heading, _, _ in expected)  # 触发过 token 切分
+
+    streamed = await loader.load(_config(source_id, conversation_id, end, streaming=True, page_size=100))
+    actual, chunk_ids = await _chunks(factory, conversation_id)
+
+    assert actual == expected
+    assert streamed.chunk_ids == chunk_ids
+    assert streamed.extra["message_count"] == result.extra["message_count"] == 250
+
+
+async def test_message_pages_are_bounded(factory, sql_statements):
+    source_id, conversation_id = await _seed(factory, 250)
+    loader = ConversationLoader(processor=object())
+
+    sql_statements.clear()
+
+    messages = [
+        msg async for msg in loader._iter_messages(
+            conversation_id, BASE_TIME, BASE_TIME + timedelta(days=30), page_size=100
+        )
+    ]
+
+    # 250 条消息分 3 页读取（100 + 100 + 50）
+    assert len(sql_statements) == 3
+    assert all("LIMIT" in q for q in sql_statements)
+    assert len({m.id for m in messages}) == 250
+    assert [m.timestamp for m in messages] == sorted(m.timestamp for m in messages)
+
+
+async def test_append_only_processes_new_messages(factory):
+    source_id, conversation_id = await _seed(factory, 40)
+    loader = ConversationLoader(processor=object())
+
+    first_end = BASE_TIME + timedelta(minutes=7 * 40)
+    first = await loader.load(_config(source_id, conversation_id, first_end, streaming=True))
+    before, before_ids = await _chunks(factory, conversation_id)
+    assert first.chunk_ids == before_ids
+
+    await _seed(factory, 30, offset=40, source_id=source_id, conversation_id=conversation_id)
+    second_end = BASE_TIME + timedelta(minutes=7 * 80)
+    appended = await loader.load(_config(source_id, conversation_id, second_end, append=True))
+
+    after, after_ids = await _chunks(factory, conversation_id)
+    # 已有分块不变，新分块排在其后
+    assert after[: len(before)] == before
+    assert after_ids[: len(before_ids)] == before_ids
+    assert appended.chunk_ids == after_ids[len(before_ids):]
+    assert [rank for rank, *_ in after] == list(range(len(after)))
+    assert appended.extra["message_count"] == 30
+
+    old_refs = {ref for *_, refs in before for ref in refs}
+    new_refs = [ref for *_, refs in after[len(before):] for ref in refs]
+    assert len(new_refs) == 30
+    assert not old_refs & set(new_refs)
+
+    # 没有新消息时追加为空操作
+    noop = await loader.load(_config(source_id, conversation_id, second_end, append=True))
+    assert noop.chunk_ids == []
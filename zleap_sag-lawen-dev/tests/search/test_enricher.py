@@ -0,0 +1,127 @@
+"""
+事项补全投影与缓存测试
+
+minimal / standard / full 三种投影的返回字段、保持输入顺序、按（ID, 更新时间）命中缓存、
+事项更新后缓存失效（SQLite 内存库，不依赖外部服务）
+
+运行方式:
+    pytest tests/search/test_enricher.py -v
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.core.cache.enrich_cache import EnrichedEventCache
+from dataflow.db import (
+    Article,
+    ArticleSection,
+    Entity,
+    EntityType,
+    EventEntity,
+    SourceConfig,
+    SourceEvent,
+)
+from dataflow.modules.search.enricher import MINIMAL_FIELDS, EventEnricher
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+async def _seed(factory):
+    source_id, article_id, section_id = _id(), _id(), _id()
+    async with factory() as session:
+        session.add(SourceConfig(id=source_id, name="新闻源"))
+        entity_type = EntityType(id=_id(), source_config_id=source_id, type="person", name="人物")
+        entity = Entity(
+            id=_id(), source_config_id=source_id, entity_type_id=entity_type.id,
+            type="person", name="张三", normalized_name="张三",
+        )
+        session.add_all([entity_type, entity])
+        session.add(Article(id=article_id, source_config_id=source_id, title="年度报告", status="COMPLETED"))
+        session.add(ArticleSection(
+            id=section_id, article_id=article_id, rank=0, order_index=0, heading="h", content="原文", length=2,
+        ))
+        event_ids = []
+        for i in range(3):
+            event = SourceEvent(
+                id=_id(), source_config_id=source_id, source_type="ARTICLE", source_id=article_id,
+                article_id=article_id, title=f"e{i}", summary="s", content="正文" * 100,
+                references=[section_id], updated_time=datetime(2024, 1, 1),
+            )
+            event_ids.append(event.id)
+            session.add(event)
+            session.add(EventEntity(id=_id(), event_id=event.id, entity_id=entity.id, weight=1.0))
+        await session.commit()
+    return event_ids
+
+
+async def test_projections_load_only_requested_fields(sqlite_session_factory):
+    event_ids = await _seed(sqlite_session_factory)
+    order = [event_ids[2], event_ids[0]]
+
+    async with sqlite_session_factory() as session:
+        minimal = await EventEnricher(session, use_cache=False).enrich_events(
+            [{"id": eid} for eid in order], "minimal"
+        )
+    assert [e["id"] for e in minimal] == order
+    assert set(minimal[0]) == set(MINIMAL_FIELDS)
+
+    async with sqlite_session_factory() as session:
+        standard = await EventEnricher(session, use_cache=False).enrich_events(
+            [{"id": eid} for eid in order], "standard"
+        )
+    assert [e["id"] for e in standard] == order
+    assert standard[0]["entities"][0]["name"] == "张三"
+    assert standard[0]["source_name"] == "新闻源"
+    assert standard[0]["document_name"] == "年度报告"
+    assert standard[0]["references"] == []
+
+    async with sqlite_session_factory() as session:
+        full = await EventEnricher(session, use_cache=False).enrich_events([{"id": eid} for eid in order])
+    assert full[0]["references"][0]["content"] == "原文"
+    assert full[0]["content"] == standard[0]["content"]
+
+
+async def test_cache_hits_until_event_is_updated(sqlite_session_factory, sql_statements):
+    event_ids = await _seed(sqlite_session_factory)
+    events = [{"id": eid} for eid in event_ids]
+    enricher_cache = EnrichedEventCache(max_entries=100, ttl=60)
+
+    async def enrich():
+        async with sqlite_session_factory() as session:
+            enricher = EventEnricher(session)
+            enricher.cache = enricher_cache
+            return await enricher.enrich_events(events, "full")
+
+    first = await enrich()
+    sql_statements.clear()
+    second = await enrich()
+
+    # 命中缓存：只执行一次版本查询
+    assert len(sql_statements) == 1
+    assert sql_statements[0].lstrip().upper().startswith("SELECT")
+    assert second == first
+    assert enricher_cache.stats()["hits"] == 3
+
+    # 返回副本，调用方修改不影响缓存
+    second[0]["title"] = "changed"
+    assert (await enrich())[0]["title"] == "e0"
+
+    # 事项更新后旧缓存不再命中
+    async with sqlite_session_factory() as session:
+        await session.execute(
+            update(SourceEvent)
+            .where(SourceEvent.id == event_ids[0])
+            .values(title="new", updated_time=datetime(2024, 1, 1) + timedelta(hours=1))
+        )
+        await session.commit()
+
+    refreshed = await enrich()
+    assert refreshed[0]["title"] == "new"
+    assert refreshed[1]["title"] == "e1"
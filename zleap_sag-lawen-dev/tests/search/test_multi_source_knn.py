@@ -0,0 +1,79 @@
+"""
+多数据源 KNN 检索测试
+
+使用内存 ES，经 RecallSearcher 的 Query 检索事项路径验证：多个数据源只产生一次 kNN 请求
+（terms 过滤 + 多值路由），返回全局 top-k，与逐个数据源检索后合并取 top-k 的结果一致
+
+运行方式:
+    pytest tests/search/test_multi_source_knn.py -v
+"""
+
+from dataflow.core.storage.elasticsearch import source_routing
+from dataflow.core.storage.repositories.event_repository import EventVectorRepository
+from dataflow.evaluation.perf import InMemoryElasticsearchClient, pseudo_embedding
+from dataflow.modules.search.config import SearchConfig
+from dataflow.modules.search.recall import RecallSearcher
+from dataflow.utils import get_logger
+
+DIM = 16
+SOURCES = [f"source-{i}" for i in range(5)]
+
+
+class RecordingClient(InMemoryElasticsearchClient):
+    """记录 kNN 请求的路由值"""
+
+    def __init__(self):
+        super().__init__()
+        self.routings = []
+
+    async def vector_search(self, index, field, vector, size=10, filter_query=None, routing=None):
+        self.routings.append(routing)
+        return await super().vector_search(index, field, vector, size, filter_query, routing)
+
+
+def _make_searcher() -> RecallSearcher:
+    client = RecordingClient()
+    client.add_documents(
+        EventVectorRepository.INDEX_NAME,
+        [
+            {
+                "event_id": f"{source}-e{j}",
+                "source_config_id": source,
+                "content_vector": pseudo_embedding(f"{source} topic {j}", DIM),
+            }
+            for source in SOURCES + ["other-source"]
+            for j in range(6)
+        ],
+        id_field="event_id",
+    )
+
+    # 跳过 __init__（会连接真实 ES / 数据库）；无过滤条件时不访问数据库
+    searcher = RecallSearcher.__new__(RecallSearcher)
+    searcher.session_factory = None
+    searcher.logger = get_logger("search.recall")
+    searcher.event_repo = EventVectorRepository(client)
+    return searcher
+
+
+async def test_multi_source_query_recall_is_single_knn():
+    searcher = _make_searcher()
+    client = searcher.event_repo.es_client
+    query = pseudo_embedding("topic 3", DIM)
+    config = SearchConfig(query="topic 3", source_config_id=SOURCES[0], source_config_ids=SOURCES)
+    config.query_embedding = query
+
+    hits = await searcher._search_events_by_query(config, k=8)
+
+    assert client.request_count == 1
+    assert client.routings == [source_routing(SOURCES)]
+    assert {hit["source_config_id"] for hit in hits} <= set(SOURCES)
+    assert len({hit["source_config_id"] for hit in hits}) > 1
+
+    # 与逐个数据源检索后合并取全局 top-k 一致
+    per_source = []
+    for source in SOURCES:
+        per_source.extend(
+            await searcher.event_repo.search_similar_by_content(query, k=8, source_config_id=source)
+        )
+    expected = sorted(per_source, key=lambda hit: hit["_score"], reverse=True)[:8]
+    assert [hit["event_id"] for hit in hits] == [hit["event_id"] for hit in expected]
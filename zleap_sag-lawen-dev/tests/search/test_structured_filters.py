@@ -0,0 +1,237 @@
+"""
+结构化过滤下推测试
+
+时间范围 / 实体数值范围的参数校验、MySQL 范围条件与 ES filter 语义一致、Query 检索事项时
+下推为 kNN filter（实体ID每次搜索只解析一次）、超过 terms 上限时回表过滤、
+扩展阶段 keys→events 在截断前过滤（SQLite 内存库 + 内存 ES，不依赖外部服务）
+
+运行方式:
+    pytest tests/search/test_structured_filters.py -v
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.db import Entity, EntityType, EventEntity, SourceConfig, SourceEvent
+from dataflow.modules.search import filters as filters_module
+from dataflow.modules.search.config import EntityValueRange, SearchConfig, SearchFilters, TimeRange
+from dataflow.modules.search.expand import ExpandSearcher
+from dataflow.modules.search.filters import es_event_filters, filter_event_ids
+from dataflow.modules.search.recall import RecallSearcher
+from dataflow.utils import get_logger
+
+
+SOURCE = "source-1"
+
+# 事项: (start_time, end_time, 金额)
+EVENTS = {
+    "e2022": (datetime(2022, 5, 1), datetime(2022, 6, 1), 50),
+    "e2023": (datetime(2023, 3, 1), None, 1_500_000),
+    "span": (datetime(2022, 11, 1), datetime(2023, 2, 1), 2.5),
+    "end_only": (None, datetime(2024, 1, 10), None),
+    "undated": (None, None, 3_000_000),
+}
+
+
+@pytest.fixture
+async def factory(sqlite_session_factory):
+    async with sqlite_session_factory() as session:
+        session.add(SourceConfig(id=SOURCE, name="新闻源"))
+        types = {
+            name: EntityType(id=str(uuid.uuid4()), source_config_id=SOURCE, type=name, name=name)
+            for name in ("org", "amount")
+        }
+        session.add_all(types.values())
+        company = Entity(
+            id="company", source_config_id=SOURCE, entity_type_id=types["org"].id,
+            type="org", name="公司", normalized_name="公司",
+        )
+        session.add(company)
+        for i, (event_id, (start, end, amount)) in enumerate(EVENTS.items()):
+            created = datetime(2024, 1, 1) + timedelta(days=i)
+            session.add(SourceEvent(
+                id=event_id, source_config_id=SOURCE, source_type="ARTICLE", source_id="a",
+                title=event_id, summary="s", content="c", start_time=start, end_time=end, created_time=created,
+            ))
+            session.add(EventEntity(
+                id=str(uuid.uuid4()), event_id=event_id, entity_id="company", weight=1.0, created_time=created,
+            ))
+            if amount is not None:
+                entity = Entity(
+                    id=f"amount-{event_id}", source_config_id=SOURCE, entity_type_id=types["amount"].id,
+                    type="amount", name=str(amount), normalized_name=str(amount),
+                    value_type="int" if isinstance(amount, int) else "float",
+                    int_value=amount if isinstance(amount, int) else None,
+                    float_value=None if isinstance(amount, int) else amount,
+                )
+                session.add(entity)
+                session.add(EventEntity(id=str(uuid.uuid4()), event_id=event_id, entity_id=entity.id, weight=1.0))
+        await session.commit()
+    return sqlite_session_factory
+
+
+def _config(**filters):
+    return SearchConfig(query="q", source_config_id=SOURCE, filters=SearchFilters(**filters))
+
+
+def _es_documents():
+    """与 SQLite 数据一致的 event_vectors 文档（时间为 isoformat 字符串）"""
+    return [
+        {
+            "event_id": event_id,
+            "source_config_id": SOURCE,
+            "start_time": start.isoformat() if start else None,
+            "end_time": end.isoformat() if end else None,
+            "entity_ids": ["company"] + ([f"amount-{event_id}"] if amount is not None else []),
+        }
+        for event_id, (start, end, amount) in EVENTS.items()
+    ]
+
+
+def _matches(doc, clause):
+    """最小的 ES filter 求值（bool / range / exists / term / terms）"""
+    kind, body = next(iter(clause.items()))
+    if kind == "bool":
+        if not all(_matches(doc, c) for key in ("must", "filter") for c in _as_list(body.get(key))):
+            return False
+        if any(_matches(doc, c) for c in _as_list(body.get("must_not"))):
+            return False
+        should = _as_list(body.get("should"))
+        return not should or sum(_matches(doc, c) for c in should) >= body.get("minimum_should_match", 1)
+    field, condition = next(iter(body.items()))
+    value = doc.get(field)
+    if kind == "exists":
+        return doc.get(condition) is not None
+    if kind == "range":
+        ops = {"gte": lambda a, b: a >= b, "lte": lambda a, b: a <= b}
+        return value is not None and all(ops[op](value, bound) for op, bound in condition.items())
+    values = value if isinstance(value, list) else [value]
+    if kind == "term":
+        return condition in values
+    return bool(set(values) & set(condition))
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class FakeEventRepository:
+    """按 filter 在内存文档中检索，记录下推的 filter"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def search_similar_by_content(self, query_vector, k=10, source_config_ids=None, extra_filters=None, **kwargs):
+        self.calls.append(extra_filters)
+        docs = [doc for doc in _es_documents() if all(_matches(doc, c) for c in extra_filters or [])]
+        return [{"event_id": doc["event_id"], "_score": 0.9} for doc in docs[:k]]
+
+
+def _recall(factory):
+    searcher = RecallSearcher.__new__(RecallSearcher)
+    searcher.session_factory = factory
+    searcher.logger = get_logger("search.recall")
+    searcher.event_repo = FakeEventRepository()
+    return searcher
+
+
+CASES = [
+    ({"time_range": TimeRange(start="2023-01-01")}, {"e2023", "span", "end_only"}),
+    ({"time_range": TimeRange(end="2022-12-31")}, {"e2022", "span"}),
+    ({"time_range": TimeRange(start="2023-06-01", end="2024-12-31")}, {"end_only"}),
+    ({"time_range": TimeRange(start="2023-06-01", include_undated=True)}, {"end_only", "undated"}),
+    ({"entity_values": [EntityValueRange(entity_type="amount", min_value=1_000_000)]}, {"e2023", "undated"}),
+    ({"entity_values": [EntityValueRange(entity_type="amount", min_value=2, max_value=100)]}, {"e2022", "span"}),
+    (
+        {
+            "time_range": TimeRange(start="2022-01-01", end="2023-12-31"),
+            "entity_values": [EntityValueRange(entity_type="amount", max_value=2_000_000)],
+        },
+        {"e2022", "e2023", "span"},
+    ),
+]
+
+
+def test_filter_validation():
+    assert not SearchFilters().is_active()
+    with pytest.raises(ValidationError, match="start 不能晚于 end"):
+        TimeRange(start="2024-01-01", end="2023-01-01")
+    with pytest.raises(ValidationError, match="至少需要"):
+        TimeRange()
+    with pytest.raises(ValidationError, match="min_value 或 max_value"):
+        EntityValueRange(entity_type="amount")
+
+    aware = TimeRange(start=datetime(2023, 1, 1, tzinfo=timezone.utc))
+    assert aware.start.tzinfo is None
+
+    # 过滤条件属于基础配置，参与结果缓存键
+    dumped = _config(time_range=TimeRange(start="2023-01-01")).model_dump(mode="json")
+    assert dumped["filters"]["time_range"]["start"] == "2023-01-01T00:00:00"
+
+
+@pytest.mark.parametrize("filters, expected", CASES)
+async def test_sql_and_es_filters_agree(factory, filters, expected):
+    config = _config(**filters)
+    assert await filter_event_ids(config, factory, EVENTS) == expected
+
+    es_filters, exact = await es_event_filters(config, factory)
+    assert exact
+    assert {doc["event_id"] for doc in _es_documents() if all(_matches(doc, c) for c in es_filters)} == expected
+
+
+async def test_recall_pushes_filters_into_knn(factory, sql_statements):
+    config = _config(
+        time_range=TimeRange(start="2022-01-01"),
+        entity_values=[EntityValueRange(entity_type="amount", min_value=1_000)],
+    )
+    config.query_embedding = [0.1, 0.2]
+    searcher = _recall(factory)
+
+    first = await searcher._search_events_by_query(config, k=10)
+    entity_queries = len(sql_statements)
+    second = await searcher._search_events_by_query(config, k=10)
+
+    assert {e["event_id"] for e in first} == {e["event_id"] for e in second} == {"e2023"}
+    assert [sorted(ids) for ids in config.filter_entity_ids] == [["amount-e2023", "amount-undated"]]
+    # 实体ID只解析一次，之后的检索不再访问数据库
+    assert len(sql_statements) == entity_queries
+    pushed = searcher.event_repo.calls[0]
+    assert len(pushed) == 2 and "range" in str(pushed[0])
+    assert sorted(pushed[1]["terms"]["entity_ids"]) == ["amount-e2023", "amount-undated"]
+
+    # 无过滤条件时不附加 filter
+    await searcher._search_events_by_query(_config(), k=10)
+    assert searcher.event_repo.calls[-1] is None
+
+
+async def test_oversized_entity_filter_falls_back_to_post_filter(factory, monkeypatch):
+    monkeypatch.setattr(filters_module, "_MAX_ES_ENTITY_TERMS", 1)
+    config = _config(entity_values=[EntityValueRange(entity_type="amount", min_value=1_000)])
+    config.query_embedding = [0.1]
+    searcher = _recall(factory)
+
+    events = await searcher._search_events_by_query(config, k=10)
+    assert searcher.event_repo.calls[0] is None
+    assert {e["event_id"] for e in events} == {"e2023", "undated"}
+
+
+async def test_expand_keys_to_events_filters_in_sql(factory, sql_statements):
+    searcher = ExpandSearcher.__new__(ExpandSearcher)
+    searcher.session_factory = factory
+    searcher.logger = get_logger("search.expand")
+
+    # 公司关联全部 5 个事项；过滤条件在关联查询中生效（截断之前）
+    config = _config(time_range=TimeRange(start="2023-01-01"))
+    event_ids = await searcher._step1_keys_to_events(["company"], [SOURCE], config)
+    assert set(event_ids) == {"e2023", "span", "end_only"}
+    assert any("start_time" in sql and "event_entity" in sql for sql in sql_statements)
+
+    unfiltered = await searcher._step1_keys_to_events(["company"], [SOURCE], _config())
+    assert set(unfiltered) == set(EVENTS)
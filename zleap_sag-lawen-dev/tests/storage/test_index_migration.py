@@ -0,0 +1,314 @@
+"""
+索引迁移脚本测试
+
+向量索引类型迁移与信息源路由重建：--swap 时复制前阻断源索引写入、复制后重新核对数量、
+单次 _aliases 请求原子切换、失败时恢复写入（假 ES 客户端模拟复制期间的并发写入，不依赖外部服务）
+
+运行方式:
+    pytest tests/storage/test_index_migration.py -v
+"""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from dataflow.core.storage.elasticsearch import ElasticsearchClient
+
+SCRIPTS = Path(__file__).resolve().parents[2] / "scripts"
+SOURCE = "source-1"
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeIndices:
+    def __init__(self, es):
+        self.es = es
+
+    async def refresh(self, index):
+        self.es.calls.append(("refresh", index))
+
+
+class FakeTasks:
+    def __init__(self, es):
+        self.es = es
+
+    async def get(self, task_id):
+        return {"completed": True, "task": {"status": {}}, "response": self.es.task_responses[task_id]}
+
+
+class FakeIndexClient:
+    """
+    模拟 ElasticsearchClient 的索引管理接口
+
+    indices: 物理索引 -> 文档数；writes_during_reindex: 复制期间其他任务写入源索引的文档数
+    （源索引被阻断写入时写入失败）
+    """
+
+    def __init__(self, indices, writes_during_reindex=0, aliases=None):
+        self.indices = dict(indices)
+        self.aliases = dict(aliases or {})
+        self.blocked = set()
+        self.writes_during_reindex = writes_during_reindex
+        self.rejected_writes = 0
+        self.calls = []
+        self.task_responses = {}
+        self.client = SimpleNamespace(reindex=self._reindex, tasks=FakeTasks(self), indices=FakeIndices(self))
+
+    async def resolve_index(self, name):
+        if name in self.aliases:
+            return [self.aliases[name]]
+        return [name] if name in self.indices else []
+
+    async def get_mapping(self, index):
+        return {"properties": {"content_vector": {"type": "dense_vector"}}}
+
+    async def index_exists(self, index):
+        return index in self.indices
+
+    async def delete_index(self, index):
+        self.calls.append(("delete", index))
+        self.indices.pop(index, None)
+
+    async def create_index(self, index, mappings, settings):
+        self.calls.append(("create", index))
+        self.indices[index] = 0
+
+    async def count_documents(self, index, query=None):
+        return self.indices[index]
+
+    async def set_write_block(self, index, blocked):
+        self.calls.append(("block" if blocked else "unblock", index))
+        (self.blocked.add if blocked else self.blocked.discard)(index)
+
+    async def replace_with_alias(self, name, source_index, target_index):
+        self.calls.append(("replace", name, source_index, target_index))
+        self.indices.pop(source_index)
+        self.aliases[name] = target_index
+
+    async def _reindex(self, source, dest, **kwargs):
+        self.calls.append(("reindex", source["index"], dest["index"]))
+        self.indices[dest["index"]] = self.indices[source["index"]]
+        self._concurrent_writes(source["index"])
+        return self._task({"failures": []})
+
+    def _concurrent_writes(self, index):
+        """复制期间其他任务写入源索引"""
+        if index in self.blocked:
+            self.rejected_writes += self.writes_during_reindex
+        else:
+            self.indices[index] += self.writes_during_reindex
+
+    def _task(self, response):
+        task_id = f"t{len(self.task_responses) + 1}"
+        self.task_responses[task_id] = response
+        return {"task": task_id}
+
+
+class FakeRoutingClient(FakeIndexClient):
+    """
+    按文档模拟路由：docs 为物理索引 -> {(_id, 是否带路由): 内容}，同一 _id 可同时存在
+    未路由的旧副本与路由后写入的新副本（均属于同一信息源 SOURCE）
+
+    _reindex 按 copy_routed[id(script)] 只复制未路由或已路由的文档，与路由脚本中的 noop 一致
+    """
+
+    def __init__(self, docs, copy_routed, writes_during_reindex=0):
+        super().__init__({}, writes_during_reindex)
+        self.docs = {index: dict(items) for index, items in docs.items()}
+        self.copy_routed = copy_routed
+        self.client.search = self._search
+        self._sync()
+
+    def _sync(self):
+        self.indices = {index: len(items) for index, items in self.docs.items()}
+
+    async def create_index(self, index, mappings, settings):
+        await super().create_index(index, mappings, settings)
+        self.docs[index] = {}
+
+    async def replace_with_alias(self, name, source_index, target_index):
+        await super().replace_with_alias(name, source_index, target_index)
+        self.docs.pop(source_index)
+
+    async def count_documents(self, index, query=None, routing=None):
+        return sum(1 for _, routed in self.docs[index] if routed or routing is None)
+
+    async def _search(self, index, size, aggs):
+        buckets = [{"key": SOURCE, "doc_count": len(self.docs[index])}] if self.docs[index] else []
+        return {"aggregations": {"sources": {"buckets": buckets}}}
+
+    async def _reindex(self, source, dest, script, **kwargs):
+        self.calls.append(("reindex", source["index"], dest["index"]))
+        copy_routed = self.copy_routed[id(script)]
+        target = self.docs[dest["index"]]
+        created = updated = 0
+        for (doc_id, routed), content in list(self.docs[source["index"]].items()):
+            if routed != copy_routed:
+                continue
+            if (doc_id, True) in target:
+                updated += 1
+            else:
+                created += 1
+            target[(doc_id, True)] = content
+        if source["index"] in self.blocked:
+            self.rejected_writes += self.writes_during_reindex
+        else:
+            for i in range(self.writes_during_reindex):
+                self.docs[source["index"]][(f"new-{len(self.calls)}-{i}", True)] = "new"
+        self._sync()
+        return self._task({"failures": [], "created": created, "updated": updated})
+
+
+@pytest.fixture
+def migrate_script():
+    return _load_script("migrate_vector_index")
+
+
+async def _migrate(module, es, swap=True):
+    return await module.migrate_index(es, "event_vectors", "int8_hnsw", swap, 0, None)
+
+
+async def test_swap_blocks_writes_and_swaps_atomically(migrate_script):
+    es = FakeIndexClient({"event_vectors": 10}, writes_during_reindex=3)
+
+    assert await _migrate(migrate_script, es)
+
+    ops = [call[0] for call in es.calls]
+    assert ops.index("block") < ops.index("reindex") < ops.index("replace")
+    # 没有“先删除再建别名”的空窗：切换在一次请求中完成
+    assert ("delete", "event_vectors") not in es.calls
+    assert es.aliases == {"event_vectors": "event_vectors__int8_hnsw"}
+    assert es.indices == {"event_vectors__int8_hnsw": 10}
+    assert es.rejected_writes == 3
+
+
+async def test_swap_from_alias_removes_old_physical_index(migrate_script):
+    es = FakeIndexClient({"event_vectors__hnsw": 5}, aliases={"event_vectors": "event_vectors__hnsw"})
+
+    assert await _migrate(migrate_script, es)
+    assert ("replace", "event_vectors", "event_vectors__hnsw", "event_vectors__int8_hnsw") in es.calls
+    assert es.indices == {"event_vectors__int8_hnsw": 5}
+
+
+async def test_copy_without_block_detects_concurrent_writes(migrate_script):
+    """不阻断写入时复制完成后重新统计源索引，发现复制期间的写入"""
+    es = FakeIndexClient({"event_vectors": 10}, writes_during_reindex=2)
+
+    assert not await _migrate(migrate_script, es, swap=False)
+    assert not any(call[0] in ("block", "replace") for call in es.calls)
+
+
+async def test_failed_swap_restores_writes(migrate_script):
+    es = FakeIndexClient({"event_vectors": 10})
+
+    async def _broken_reindex(**kwargs):
+        raise RuntimeError("reindex rejected")
+
+    es.client.reindex = _broken_reindex
+
+    with pytest.raises(RuntimeError):
+        await _migrate(migrate_script, es)
+    assert es.calls[-1] == ("unblock", "event_vectors")
+    assert not es.blocked and "event_vectors" in es.indices
+
+
+@pytest.fixture
+def routing_script():
+    return _load_script("reindex_source_routing")
+
+
+def _routing_client(module, docs, **kwargs):
+    copy_routed = {id(module.UNROUTED_COPY_SCRIPT): False, id(module.ROUTED_COPY_SCRIPT): True}
+    return FakeRoutingClient({"event_vectors": docs}, copy_routed, **kwargs)
+
+
+LEGACY_DOCS = {(f"e{i}", False): "v1" for i in range(4)}
+LEGACY_DOCS.update({(f"e{i}", True): "v1" for i in range(4, 10)})
+
+
+async def _reroute(module, es, swap=True):
+    return await module.reindex_with_routing(es, "event_vectors", swap, 0, None)
+
+
+async def test_routing_swap_blocks_writes_and_swaps_atomically(routing_script):
+    es = _routing_client(routing_script, LEGACY_DOCS, writes_during_reindex=3)
+
+    assert await _reroute(routing_script, es)
+
+    ops = [call[0] for call in es.calls]
+    assert ops.index("block") < ops.index("reindex") < ops.index("replace")
+    assert ("delete", "event_vectors") not in es.calls
+    target = es.aliases["event_vectors"]
+    assert target.startswith("event_vectors__routed_")
+    assert es.indices == {target: 10} and all(routed for _, routed in es.docs[target])
+    assert es.rejected_writes == 6
+
+
+async def test_routing_keeps_routed_copy_of_duplicate_ids(routing_script):
+    """同一 _id 同时有未路由旧副本与路由新副本：只保留路由副本，核对数量按去重后的 _id 计算"""
+    docs = dict(LEGACY_DOCS)
+    docs[("e0", True)] = "v2"
+    docs[("e1", True)] = "v2"
+    es = _routing_client(routing_script, docs)
+
+    assert await _reroute(routing_script, es)
+
+    target = es.aliases["event_vectors"]
+    assert es.indices == {target: 10}
+    assert es.docs[target][("e0", True)] == es.docs[target][("e1", True)] == "v2"
+    assert es.docs[target][("e2", True)] == "v1"
+
+
+async def test_routing_copy_without_block_detects_concurrent_writes(routing_script):
+    es = _routing_client(routing_script, LEGACY_DOCS, writes_during_reindex=2)
+
+    assert not await _reroute(routing_script, es, swap=False)
+    assert not any(call[0] in ("block", "replace") for call in es.calls)
+
+
+async def test_routing_failed_swap_restores_writes(routing_script):
+    es = _routing_client(routing_script, LEGACY_DOCS)
+
+    async def _broken_reindex(**kwargs):
+        raise RuntimeError("reindex rejected")
+
+    es.client.reindex = _broken_reindex
+
+    with pytest.raises(RuntimeError):
+        await _reroute(routing_script, es)
+    assert es.calls[-1] == ("unblock", "event_vectors")
+    assert not es.blocked and "event_vectors" in es.indices
+
+
+async def test_client_swap_is_single_aliases_request():
+    requests = []
+
+    async def update_aliases(actions):
+        requests.append(("aliases", actions))
+
+    async def put_settings(index, settings):
+        requests.append(("settings", index, settings))
+
+    # 跳过 __init__（会创建真实的 AsyncElasticsearch 连接）
+    client = ElasticsearchClient.__new__(ElasticsearchClient)
+    client.client = SimpleNamespace(
+        indices=SimpleNamespace(update_aliases=update_aliases, put_settings=put_settings)
+    )
+
+    await client.set_write_block("event_vectors", True)
+    await client.replace_with_alias("event_vectors", "event_vectors", "event_vectors__int8_hnsw")
+
+    assert requests == [
+        ("settings", "event_vectors", {"index.blocks.write": True}),
+        ("aliases", [
+            {"add": {"index": "event_vectors__int8_hnsw", "alias": "event_vectors"}},
+            {"remove_index": {"index": "event_vectors"}},
+        ]),
+    ]
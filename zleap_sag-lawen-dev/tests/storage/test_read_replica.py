@@ -0,0 +1,107 @@
+"""
+MySQL 只读副本路由与连接池指标测试
+
+只读会话走副本、写入走主库、未配置副本时回退主库、取连接等待时间与借出/溢出连接数
+（两个 SQLite 文件库模拟主库与副本，不依赖外部服务）
+
+运行方式:
+    pytest tests/storage/test_read_replica.py -v
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+
+pytest.importorskip("aiosqlite")
+
+from dataflow.core.config.settings import Settings
+from dataflow.core.telemetry import get_metrics_registry
+from dataflow.db import base
+
+
+@pytest.fixture
+def primary(tmp_path, monkeypatch):
+    engine = base.create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", "primary")
+    monkeypatch.setattr(base, "_engine", engine)
+    monkeypatch.setattr(base, "_session_factory", None)
+    monkeypatch.setattr(base, "_replica_engine", None)
+    monkeypatch.setattr(base, "_replica_session_factory", None)
+    yield engine
+    monkeypatch.setattr(base, "_engine", None)
+
+
+async def _init(engine, value):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        await conn.execute(text("INSERT INTO marker VALUES (:v)"), {"v": value})
+
+
+async def _marker(factory):
+    async with factory() as session:
+        return (await session.execute(text("SELECT name FROM marker"))).scalar()
+
+
+async def test_read_sessions_use_replica_and_writes_stay_on_primary(primary, tmp_path, monkeypatch):
+    await _init(primary, "primary")
+
+    # 未配置副本：只读会话回退主库
+    assert base.get_replica_session_factory() is None
+    assert base.get_read_session_factory() is base.get_session_factory()
+
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setattr(Settings, "mysql_replica_url", property(lambda self: replica_url))
+
+    read_factory = base.get_read_session_factory()
+    assert read_factory is base.get_replica_session_factory()
+    assert read_factory is not base.get_session_factory()
+    await _init(base._replica_engine, "replica")
+
+    assert await _marker(read_factory) == "replica"
+    assert await _marker(base.get_session_factory()) == "primary"
+
+    await base.close_database()
+    assert base._replica_session_factory is None
+
+
+async def test_pool_metrics_track_in_use_overflow_and_wait(tmp_path):
+    engine = base.create_db_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        "pooltest",
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.2,
+    )
+    registry = get_metrics_registry()
+    in_use = registry.gauge("dataflow_db_pool_in_use", "", ["role"])
+    overflow = registry.gauge("dataflow_db_pool_overflow", "", ["role"])
+    wait = registry.histogram("dataflow_db_pool_checkout_wait_seconds", "", ["role"])
+    timeouts = registry.counter("dataflow_db_pool_timeouts", "", ["role"])
+
+    first = await engine.connect()
+    second = await engine.connect()
+    assert in_use.value(role="pooltest") == 2
+    assert overflow.value(role="pooltest") == 1
+
+    # 连接池已满：第三个请求排队直到超时
+    with pytest.raises(sa_exc.TimeoutError):
+        await engine.connect()
+    assert timeouts.value(role="pooltest") == 1
+    assert wait.snapshot(role="pooltest")["sum"] >= 0.2
+
+    # 归还后排队的请求拿到连接
+    async def checkout():
+        return await engine.connect()
+
+    waiter = asyncio.create_task(checkout())
+    await asyncio.sleep(0.05)
+    await first.close()
+    third = await waiter
+    assert wait.snapshot(role="pooltest")["count"] == 4
+
+    await second.close()
+    await third.close()
+    assert in_use.value(role="pooltest") == 0
+    assert overflow.value(role="pooltest") == 0
+    await engine.dispose()
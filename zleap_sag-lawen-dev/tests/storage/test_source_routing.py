@@ -0,0 +1,139 @@
+"""
+按信息源路由测试
+
+写入默认按文档的 source_config_id 路由、多信息源检索使用多值路由（受开关与上限约束）、
+单源参数与多源参数并存时路由覆盖全部信息源、分片访问数指标（假 ES 客户端，不依赖外部服务）
+
+运行方式:
+    pytest tests/storage/test_source_routing.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from dataflow.core.storage import elasticsearch as es_module
+from dataflow.core.storage.elasticsearch import ElasticsearchClient, source_routing
+from dataflow.core.storage.repositories.base import BaseRepository
+from dataflow.core.storage.repositories.event_repository import EventVectorRepository
+from dataflow.core.storage.repositories.source_chunk_repository import SourceChunkRepository
+from dataflow.core.telemetry import get_metrics_registry
+
+SHARDS = 12
+
+
+class FakeAsyncElasticsearch:
+    """记录请求参数；路由检索只访问路由值个数的分片"""
+
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def _shards(routing):
+        return len(routing.split(",")) if routing else SHARDS
+
+    async def search(self, **params):
+        self.calls.append(("search", params))
+        return {"took": 1, "_shards": {"total": self._shards(params.get("routing"))}, "hits": {"hits": []}}
+
+    async def index(self, **params):
+        self.calls.append(("index", params))
+        return {"_id": params["id"]}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def es_client():
+    # 跳过 __init__（会创建真实的 AsyncElasticsearch 连接）
+    client = ElasticsearchClient.__new__(ElasticsearchClient)
+    client.hosts = []
+    client.client = FakeAsyncElasticsearch()
+    return client
+
+
+@pytest.fixture
+def routing_settings(monkeypatch):
+    settings = SimpleNamespace(es_multi_source_routing=True, es_routing_max_sources=3)
+    monkeypatch.setattr(es_module, "get_settings", lambda: settings)
+    return settings
+
+
+def _shards_histogram():
+    return get_metrics_registry().histogram(
+        "dataflow_es_shards_searched", "", ["index", "op", "routed"], buckets=es_module._SHARD_BUCKETS
+    )
+
+
+def test_source_routing_values(routing_settings):
+    assert source_routing(None) is None
+    assert source_routing([None]) is None
+    assert source_routing(["a"]) == "a"
+    assert source_routing(["a", "b", "a", None]) == "a,b"
+
+    # 超过上限或关闭多值路由：全分片检索；单源始终路由
+    assert source_routing(["a", "b", "c", "d"]) is None
+    routing_settings.es_multi_source_routing = False
+    assert source_routing(["a", "b"]) is None
+    assert source_routing(["a"]) == "a"
+
+
+async def test_multi_source_reads_use_multi_value_routing(es_client, routing_settings):
+    repo = EventVectorRepository(es_client)
+    histogram = _shards_histogram()
+    before_routed = histogram.snapshot(index="event_vectors", op="knn", routed="1")
+    before_fanout = histogram.snapshot(index="event_vectors", op="knn", routed="0")
+
+    await repo.search_similar_by_content([0.1, 0.2], k=5, source_config_ids=["s1", "s2"])
+    await repo.search_similar_by_content([0.1, 0.2], k=5, source_config_ids=["s1", "s2", "s3", "s4"])
+
+    routings = [params.get("routing") for _, params in es_client.client.calls]
+    assert routings == ["s1,s2", None]
+
+    routed = histogram.snapshot(index="event_vectors", op="knn", routed="1")
+    fanout = histogram.snapshot(index="event_vectors", op="knn", routed="0")
+    assert routed["count"] - before_routed["count"] == 1
+    assert routed["sum"] - before_routed["sum"] == 2
+    assert fanout["sum"] - before_fanout["sum"] == SHARDS
+    assert "dataflow_es_shards_searched_bucket" in get_metrics_registry().render()
+
+
+async def test_chunk_reads_route_to_all_requested_sources(es_client, routing_settings):
+    repo = SourceChunkRepository(es_client)
+
+    # 同时传入单源与多源参数时按多源过滤，路由也必须覆盖全部信息源
+    await repo.search_similar_by_content([0.1], k=3, source_config_id="s1", source_config_ids=["s1", "s2"])
+    await repo.search_similar_by_content([0.1], k=3, source_config_id="s1")
+
+    routings = [params.get("routing") for _, params in es_client.client.calls]
+    assert routings == ["s1,s2", "s1"]
+
+
+async def test_writes_default_to_source_routing(es_client, monkeypatch):
+    captured = []
+
+    async def fake_async_bulk(client, actions, **kwargs):
+        captured.append(list(actions))
+        return len(captured[-1]), []
+
+    monkeypatch.setattr("elasticsearch.helpers.async_bulk", fake_async_bulk)
+    documents = [
+        {"id": "e1", "source_config_id": "s1"},
+        {"id": "e2", "source_config_id": "s2"},
+        {"id": "e3"},
+    ]
+
+    await es_client.bulk_index("event_vectors", documents)
+    assert [action.get("_routing") for action in captured[-1]] == ["s1", "s2", None]
+
+    # 显式路由优先
+    await es_client.bulk_index("event_vectors", documents, routing="s9")
+    assert {action["_routing"] for action in captured[-1]} == {"s9"}
+
+    await BaseRepository(es_client.client).bulk_index("entity_vectors", documents)
+    assert [action.get("_routing") for action in captured[-1]] == ["s1", "s2", None]
+
+    await es_client.index_document("source_chunks", {"source_config_id": "s3"}, doc_id="c1")
+    await BaseRepository(es_client.client).index_document("source_chunks", "c2", {"source_config_id": "s4"})
+    assert [params["routing"] for _, params in es_client.client.calls] == ["s3", "s4"]
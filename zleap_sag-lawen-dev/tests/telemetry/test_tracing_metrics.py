@@ -0,0 +1,103 @@
+"""
+链路追踪与指标导出测试
+
+只使用进程内注册表，不依赖 Redis / MySQL / ES
+
+运行方式:
+    pytest tests/telemetry/test_tracing_metrics.py -v
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from dataflow.core.telemetry import (
+    MetricsRegistry,
+    get_metrics_registry,
+    instrument_engine,
+    is_verbose,
+    record_timings,
+    span,
+    trace,
+    traced,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def _span_count(name: str, kind: str, status: str = "ok") -> int:
+    histogram = get_metrics_registry().histogram(
+        "dataflow_span_duration_seconds", "", ["span", "kind", "status"]
+    )
+    return histogram.snapshot(span=name, kind=kind, status=status)["count"]
+
+
+def test_histogram_render_is_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "演示", ["op"], buckets=(0.1, 1.0))
+    latency.observe(0.05, op="a")
+    latency.observe(0.5, op="a")
+    latency.observe(5, op="a")
+    registry.counter("demo_calls", "调用次数").inc(2)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE demo_seconds histogram" in lines
+    assert 'demo_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{op="a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{op="a"} 3' in lines
+    assert "demo_calls_total 2" in lines
+
+
+def test_span_nesting_and_error_status():
+    with span("outer", kind="search") as outer:
+        with span("inner", kind="es", hits=3):
+            pass
+        with pytest.raises(ValueError):
+            with span("failing", kind="es"):
+                raise ValueError("boom")
+
+    assert [child.name for child in outer.children] == ["inner", "failing"]
+    assert outer.children[1].status == "error"
+    assert _span_count("inner", "es") == 1
+    assert _span_count("failing", "es", status="error") == 1
+
+    items = get_metrics_registry().histogram("dataflow_span_items", "", ["span", "attribute"])
+    assert items.snapshot(span="inner", attribute="hits") == {"sum": 3, "count": 1}
+
+
+async def test_traced_async_and_record_timings():
+    @traced("demo.stage", kind="search")
+    async def stage():
+        record_timings("demo.stage", {"step1": 0.01, "step2": 0.02, "total": 0.03})
+        return 42
+
+    assert await stage() == 42
+    assert _span_count("demo.stage", "search") == 1
+    assert _span_count("demo.stage.step1", "search") == 1
+    # total 不重复记录
+    assert _span_count("demo.stage.total", "search") == 0
+
+
+def test_verbose_sampling():
+    assert not is_verbose()
+    with trace("root", sample_rate=1.0):
+        assert is_verbose()
+    with trace("root", sample_rate=0.0):
+        assert not is_verbose()
+    assert not is_verbose()
+
+
+def test_instrument_engine_records_queries():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # 重复调用不会重复计数
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert _span_count("db.select", "db") == 1